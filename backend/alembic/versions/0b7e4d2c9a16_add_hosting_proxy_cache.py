@@ -0,0 +1,30 @@
+"""add_hosting_proxy_cache
+
+Revision ID: 0b7e4d2c9a16
+Revises: f8a3c61e2b47
+Create Date: 2026-10-19 17:42:05.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0b7e4d2c9a16"
+down_revision: Union[str, None] = "f8a3c61e2b47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """호스팅 프록시 캐시 설정 컬럼 추가"""
+    op.add_column("hosting", sa.Column("microcache_seconds", sa.Integer(), nullable=True))
+    op.add_column("hosting", sa.Column("cache_max_mb", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """호스팅 프록시 캐시 설정 컬럼 삭제"""
+    op.drop_column("hosting", "cache_max_mb")
+    op.drop_column("hosting", "microcache_seconds")
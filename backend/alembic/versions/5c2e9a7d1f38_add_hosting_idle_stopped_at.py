@@ -0,0 +1,28 @@
+"""add_hosting_idle_stopped_at
+
+Revision ID: 5c2e9a7d1f38
+Revises: 0b7e4d2c9a16
+Create Date: 2026-10-19 19:06:41.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c2e9a7d1f38"
+down_revision: Union[str, None] = "0b7e4d2c9a16"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """호스팅 유휴 자동 중지 시각 컬럼 추가"""
+    op.add_column("hosting", sa.Column("idle_stopped_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """호스팅 유휴 자동 중지 시각 컬럼 삭제"""
+    op.drop_column("hosting", "idle_stopped_at")
@@ -0,0 +1,51 @@
+"""add_provisioning_journal
+
+Revision ID: a3c91e5d7f20
+Revises: 78f9b7cef7e2
+Create Date: 2026-10-19 10:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a3c91e5d7f20"
+down_revision: Union[str, None] = "78f9b7cef7e2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """프로비저닝 단계 저널 테이블 생성"""
+    op.create_table(
+        "provisioning_journal",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("hosting_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "step",
+            sa.Enum(
+                "PORT_RESERVED", "KEYS_GENERATED", "CONTAINER_CREATED", "PROXY_CONFIGURED", "VERIFIED",
+                name="provisioningstep"
+            ),
+            nullable=False
+        ),
+        sa.Column("payload", sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(["hosting_id"], ["hosting.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("hosting_id", "step", name="uq_provisioning_journal_hosting_step")
+    )
+    op.create_index(op.f("ix_provisioning_journal_id"), "provisioning_journal", ["id"], unique=False)
+    op.create_index(op.f("ix_provisioning_journal_hosting_id"), "provisioning_journal", ["hosting_id"], unique=False)
+
+
+def downgrade() -> None:
+    """프로비저닝 단계 저널 테이블 삭제"""
+    op.drop_index(op.f("ix_provisioning_journal_hosting_id"), table_name="provisioning_journal")
+    op.drop_index(op.f("ix_provisioning_journal_id"), table_name="provisioning_journal")
+    op.drop_table("provisioning_journal")
+    op.execute("DROP TYPE IF EXISTS provisioningstep")
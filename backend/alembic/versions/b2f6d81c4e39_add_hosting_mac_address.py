@@ -0,0 +1,30 @@
+"""add_hosting_mac_address
+
+Revision ID: b2f6d81c4e39
+Revises: e7b40c9a2d13
+Create Date: 2026-10-19 13:05:11.480213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b2f6d81c4e39"
+down_revision: Union[str, None] = "e7b40c9a2d13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """호스팅 MAC 주소 컬럼 추가 (기존 호스팅은 NULL)"""
+    op.add_column("hosting", sa.Column("mac_address", sa.String(length=17), nullable=True))
+    op.create_index(op.f("ix_hosting_mac_address"), "hosting", ["mac_address"], unique=False)
+
+
+def downgrade() -> None:
+    """호스팅 MAC 주소 컬럼 삭제"""
+    op.drop_index(op.f("ix_hosting_mac_address"), table_name="hosting")
+    op.drop_column("hosting", "mac_address")
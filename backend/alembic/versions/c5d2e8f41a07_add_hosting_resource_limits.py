@@ -0,0 +1,38 @@
+"""add_hosting_resource_limits
+
+Revision ID: c5d2e8f41a07
+Revises: a3c91e5d7f20
+Create Date: 2026-10-19 11:02:17.530914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5d2e8f41a07"
+down_revision: Union[str, None] = "a3c91e5d7f20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """호스팅 리소스 플랜 및 cgroup 제한 컬럼 추가 (기존 호스팅은 제한 없음)"""
+    op.add_column("hosting", sa.Column("plan", sa.String(length=20), nullable=True))
+    op.add_column("hosting", sa.Column("memory_mb", sa.Integer(), nullable=True))
+    op.add_column("hosting", sa.Column("cpus", sa.Float(), nullable=True))
+    op.add_column("hosting", sa.Column("cpu_shares", sa.Integer(), nullable=True))
+    op.add_column("hosting", sa.Column("pids_limit", sa.Integer(), nullable=True))
+    op.add_column("hosting", sa.Column("blkio_weight", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """호스팅 리소스 제한 컬럼 삭제"""
+    op.drop_column("hosting", "blkio_weight")
+    op.drop_column("hosting", "pids_limit")
+    op.drop_column("hosting", "cpu_shares")
+    op.drop_column("hosting", "cpus")
+    op.drop_column("hosting", "memory_mb")
+    op.drop_column("hosting", "plan")
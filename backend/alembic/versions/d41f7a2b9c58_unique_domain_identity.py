@@ -0,0 +1,36 @@
+"""unique_domain_identity
+
+Revision ID: d41f7a2b9c58
+Revises: b2f6d81c4e39
+Create Date: 2026-10-19 13:42:36.917024
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d41f7a2b9c58"
+down_revision: Union[str, None] = "b2f6d81c4e39"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """MAC 주소 유니크 인덱스 및 도메인 UUID 컬럼 추가"""
+    op.drop_index(op.f("ix_hosting_mac_address"), table_name="hosting")
+    op.create_index(op.f("ix_hosting_mac_address"), "hosting", ["mac_address"], unique=True)
+    
+    op.add_column("hosting", sa.Column("domain_uuid", sa.String(length=36), nullable=True))
+    op.create_index(op.f("ix_hosting_domain_uuid"), "hosting", ["domain_uuid"], unique=True)
+
+
+def downgrade() -> None:
+    """도메인 UUID 컬럼 삭제 및 MAC 주소 인덱스 복원"""
+    op.drop_index(op.f("ix_hosting_domain_uuid"), table_name="hosting")
+    op.drop_column("hosting", "domain_uuid")
+    
+    op.drop_index(op.f("ix_hosting_mac_address"), table_name="hosting")
+    op.create_index(op.f("ix_hosting_mac_address"), "hosting", ["mac_address"], unique=False)
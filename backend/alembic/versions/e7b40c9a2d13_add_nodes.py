@@ -0,0 +1,53 @@
+"""add_nodes
+
+Revision ID: e7b40c9a2d13
+Revises: c5d2e8f41a07
+Create Date: 2026-10-19 11:47:52.204716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e7b40c9a2d13"
+down_revision: Union[str, None] = "c5d2e8f41a07"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Docker 노드 테이블 생성 및 호스팅 배치 노드 컬럼 추가"""
+    op.create_table(
+        "nodes",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("docker_host", sa.String(length=255), nullable=False),
+        sa.Column("address", sa.String(length=255), nullable=False),
+        sa.Column("memory_mb", sa.Integer(), nullable=False),
+        sa.Column("cpus", sa.Float(), nullable=False),
+        sa.Column("labels", sa.Text(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index(op.f("ix_nodes_id"), "nodes", ["id"], unique=False)
+    op.create_index(op.f("ix_nodes_name"), "nodes", ["name"], unique=True)
+    
+    # 기존 호스팅은 로컬 호스트 (NULL)
+    op.add_column("hosting", sa.Column("node_id", sa.Integer(), nullable=True))
+    op.create_foreign_key("fk_hosting_node_id_nodes", "hosting", "nodes", ["node_id"], ["id"])
+    op.create_index(op.f("ix_hosting_node_id"), "hosting", ["node_id"], unique=False)
+
+
+def downgrade() -> None:
+    """호스팅 배치 노드 컬럼 및 Docker 노드 테이블 삭제"""
+    op.drop_index(op.f("ix_hosting_node_id"), table_name="hosting")
+    op.drop_constraint("fk_hosting_node_id_nodes", "hosting", type_="foreignkey")
+    op.drop_column("hosting", "node_id")
+    op.drop_index(op.f("ix_nodes_name"), table_name="nodes")
+    op.drop_index(op.f("ix_nodes_id"), table_name="nodes")
+    op.drop_table("nodes")
@@ -0,0 +1,30 @@
+"""add_hosting_cpu_placement
+
+Revision ID: f8a3c61e2b47
+Revises: d41f7a2b9c58
+Create Date: 2026-10-19 15:08:12.401337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f8a3c61e2b47"
+down_revision: Union[str, None] = "d41f7a2b9c58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """호스팅 vCPU/NUMA 배치 컬럼 추가"""
+    op.add_column("hosting", sa.Column("cpuset", sa.String(length=255), nullable=True))
+    op.add_column("hosting", sa.Column("numa_node", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """호스팅 vCPU/NUMA 배치 컬럼 삭제"""
+    op.drop_column("hosting", "numa_node")
+    op.drop_column("hosting", "cpuset")
@@ -7,7 +7,8 @@ from app.api.endpoints import (
     auth_router,
     users_router,
     hosting_router,
-    health_router
+    health_router,
+    nodes_router
 )
 
 # 메인 API 라우터 생성
@@ -36,4 +37,10 @@ api_router.include_router(
     hosting_router,
     prefix="/host",
     tags=["호스팅"]
+)
+
+api_router.include_router(
+    nodes_router,
+    prefix="/nodes",
+    tags=["노드"]
 ) 
\ No newline at end of file
@@ -11,6 +11,7 @@ from app.schemas.common import StandardResponse, HealthCheck
 from app.core.config import settings
 from app.utils.response_utils import create_success_response
 from app.utils.logging_utils import get_logger
+from app.services.capability_service import get_capability_detector
 
 # 라우터 설정
 router = APIRouter(tags=["헬스체크"])
@@ -57,6 +58,13 @@ def detailed_health_check(db: Session = Depends(get_db)):
         db_status = "unhealthy"
         db_error = str(e)
     
+    # 호스트 기능 정보 (캐시 사용, fork 없음)
+    try:
+        capabilities = get_capability_detector().get().to_dict()
+    except Exception as e:
+        logger.warning(f"호스트 기능 조회 실패: {e}")
+        capabilities = {"error": str(e)}
+    
     # 전체 상태 결정
     overall_status = "healthy" if db_status == "healthy" else "unhealthy"
     
@@ -74,7 +82,8 @@ def detailed_health_check(db: Session = Depends(get_db)):
         "environment": {
             "debug": settings.DEBUG,
             "log_level": settings.LOG_LEVEL
-        }
+        },
+        "capabilities": capabilities
     }
     
     # 상태에 따른 응답 코드 설정
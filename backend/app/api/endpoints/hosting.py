@@ -3,14 +3,15 @@
 """
 import logging
 from typing import Dict, Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 from app.models.hosting import HostingStatus
 from app.schemas.hosting import (
     HostingCreate, HostingResponse, HostingDetail, HostingUpdate,
-    HostingOperation, HostingStats
+    HostingOperation, HostingStats, HostingResourceUpdate, HostingCacheUpdate
 )
 from app.schemas.common import StandardResponse, PaginatedResponse
 from app.utils.response_utils import (
@@ -21,10 +22,22 @@ from app.utils.response_utils import (
 )
 from app.utils.logging_utils import get_logger, log_request_info
 from app.services.hosting_service import HostingService
-from app.core.dependencies import get_current_user_id
+from app.services.gc_service import OrphanCollector
+from app.services.capacity_service import get_capacity_scheduler
+from app.services.image_service import get_golden_image_manager
+from app.services.boot_time_service import BootTimeRecorder
+from app.services.libvirt_service import get_libvirt_adapter
+from app.services.cpu_placement_service import CpuPlacementEngine
+from app.services.migration_service import MigrationRecorder
+from app.services.ssh_gateway_service import load_gateway_stats
+from app.services.access_log_service import AccessLogIngester
+from app.core.config import settings
+from app.core.dependencies import get_current_user_id, get_admin_user
+from app.schemas.user import UserResponse
 from app.core.exceptions import (
-    HostingNotFoundError, HostingAlreadyExistsError,
-    VMOperationError, InsufficientPermissionError
+    HostingNotFoundError, HostingAlreadyExistsError, NodeNotFoundError,
+    VMOperationError, InsufficientPermissionError, HostCapacityExceededError,
+    InvalidDeployError, DeployTooLargeError, InvalidOperationError
 )
 
 # 라우터 설정
@@ -69,6 +82,9 @@ def create_hosting(
             status_code=status.HTTP_409_CONFLICT,
             detail=e.detail
         )
+    except HostCapacityExceededError as e:
+        logger.warning(f"호스팅 생성 거부 - 용량 부족: {e.detail}")
+        raise e
     except VMOperationError as e:
         logger.error(f"호스팅 생성 실패 - VM 오류: {e.detail}")
         raise HTTPException(
@@ -190,6 +206,40 @@ def delete_my_hosting(
             detail="호스팅 삭제 중 오류가 발생했습니다."
         )
 
+@router.get(
+    "/capacity",
+    response_model=StandardResponse[Dict[str, Any]],
+    summary="호스트 용량 조회",
+    description="호스트 용량, 커밋된 리소스, 프로비저닝 대기열 상태와 내 대기 순번을 조회합니다."
+)
+def get_host_capacity(
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    """
+    호스트 용량 및 대기열 조회
+    
+    호스팅 생성 요청이 대기 중이면 **queue_position**에 대기 순번이 표시됩니다.
+    """
+    log_request_info("GET", "/hosting/capacity", user_id=current_user_id)
+    
+    try:
+        scheduler = get_capacity_scheduler()
+        capacity = scheduler.status(db)
+        capacity["queue_position"] = scheduler.queue_position(current_user_id)
+        
+        return create_success_response(
+            message="호스트 용량을 조회했습니다.",
+            data=capacity
+        )
+        
+    except Exception as e:
+        logger.error(f"호스트 용량 조회 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="호스트 용량 조회 중 오류가 발생했습니다."
+        )
+
 @router.get(
     "/{hosting_id}",
     response_model=StandardResponse[HostingDetail],
@@ -261,7 +311,8 @@ def perform_hosting_operation(
     호스팅 운영 명령 실행
     
     - **hosting_id**: 대상 호스팅 ID
-    - **operation**: 실행할 명령 (start, stop, restart, delete)
+    - **operation**: 실행할 명령 (start, stop, restart, delete, snapshot, restore)
+    - **snapshot_name**: snapshot/restore 대상 스냅샷 이름
     
     본인의 호스팅만 관리할 수 있습니다.
     """
@@ -279,7 +330,8 @@ def perform_hosting_operation(
         result = hosting_service.perform_operation(
             hosting_id, 
             operation.operation, 
-            current_user_id
+            current_user_id,
+            snapshot_name=operation.snapshot_name
         )
         
         if operation.operation == "delete" and result is None:
@@ -321,6 +373,214 @@ def perform_hosting_operation(
             detail="호스팅 운영 명령 실행 중 오류가 발생했습니다."
         )
 
+@router.get(
+    "/{hosting_id}/snapshots",
+    response_model=StandardResponse[List[Dict[str, Any]]],
+    summary="호스팅 스냅샷 목록",
+    description="호스팅 VM의 스냅샷 목록을 조회합니다."
+)
+def list_hosting_snapshots(
+    hosting_id: int,
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    """
+    호스팅 스냅샷 목록 조회
+    
+    본인의 호스팅만 조회할 수 있습니다.
+    """
+    log_request_info("GET", f"/hosting/{hosting_id}/snapshots", user_id=current_user_id)
+    
+    try:
+        return create_success_response(
+            message="스냅샷 목록을 조회했습니다.",
+            data=HostingService(db).list_hosting_snapshots(hosting_id, current_user_id)
+        )
+        
+    except HostingNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.detail
+        )
+    except InsufficientPermissionError as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=e.detail
+        )
+    except Exception as e:
+        logger.error(f"스냅샷 목록 조회 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="스냅샷 목록 조회 중 오류가 발생했습니다."
+        )
+
+@router.post(
+    "/{hosting_id}/deploy",
+    response_model=StandardResponse[Dict[str, Any]],
+    summary="웹 디렉토리 배포",
+    description=(
+        "요청 본문의 tar(gz/bz2/xz)/zip 압축 파일 또는 multipart/form-data의 files 필드(여러 파일)를 "
+        "새 릴리스로 풀고 웹 디렉토리를 원자적으로 교체합니다. 업로드는 메모리에 모으지 않고 디스크에 스트리밍하며, "
+        "응답에 업로드/압축 해제 시간과 전송 속도를 포함합니다."
+    )
+)
+async def deploy_hosting(
+    hosting_id: int,
+    request: Request,
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    """
+    웹 디렉토리 배포
+    
+    - **hosting_id**: 배포할 호스팅 ID
+    - 본문: 압축 파일 그대로 (Content-Type 무관) 또는 multipart/form-data의 files 필드
+    """
+    log_request_info("POST", f"/host/{hosting_id}/deploy", user_id=current_user_id)
+    
+    try:
+        # 권한 확인과 컨테이너 마운트 전환을 본문을 읽기 전에 처리 (docker 명령은 스레드에서)
+        deployer = await run_in_threadpool(HostingService(db).prepare_deploy, hosting_id, current_user_id)
+        
+        if request.headers.get("content-type", "").startswith("multipart/form-data"):
+            # 파일 파트는 1MB를 넘으면 임시 파일로 옮겨지므로 메모리 사용량이 파일 크기와 무관
+            async with request.form() as form:
+                result = await deployer.deploy_files([item for item in form.getlist("files") if not isinstance(item, str)])
+        else:
+            result = await deployer.deploy_archive(request.stream())
+        
+        return create_success_response(
+            message=f"릴리스 {result['release_id']}를 배포했습니다.",
+            data=result
+        )
+    
+    except HostingNotFoundError as e:
+        logger.warning(f"배포 실패: {e.detail}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.detail
+        )
+    except InsufficientPermissionError as e:
+        logger.warning(f"배포 실패 - 권한 없음: {e.detail}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=e.detail
+        )
+    except InvalidDeployError as e:
+        logger.warning(f"배포 실패 - 잘못된 파일: {e.detail}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.detail
+        )
+    except DeployTooLargeError as e:
+        logger.warning(f"배포 실패 - 크기 초과: {e.detail}")
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=e.detail
+        )
+    except VMOperationError as e:
+        logger.error(f"배포 실패 - VM 오류: {e.detail}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=e.detail
+        )
+    except Exception as e:
+        logger.error(f"배포 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="배포 중 오류가 발생했습니다."
+        )
+
+@router.get(
+    "/{hosting_id}/deploys",
+    response_model=StandardResponse[List[Dict[str, Any]]],
+    summary="배포 릴리스 목록",
+    description="롤백할 수 있는 배포 릴리스 목록을 최신순으로 조회합니다."
+)
+def list_hosting_deploys(
+    hosting_id: int,
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    """
+    배포 릴리스 목록 조회
+    
+    본인의 호스팅만 조회할 수 있습니다.
+    """
+    log_request_info("GET", f"/host/{hosting_id}/deploys", user_id=current_user_id)
+    
+    try:
+        return create_success_response(
+            message="배포 릴리스 목록을 조회했습니다.",
+            data=HostingService(db).list_deploys(hosting_id, current_user_id)
+        )
+    
+    except HostingNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.detail
+        )
+    except InsufficientPermissionError as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=e.detail
+        )
+    except Exception as e:
+        logger.error(f"배포 릴리스 목록 조회 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="배포 릴리스 목록 조회 중 오류가 발생했습니다."
+        )
+
+@router.post(
+    "/{hosting_id}/deploys/rollback",
+    response_model=StandardResponse[Dict[str, Any]],
+    summary="배포 롤백",
+    description="웹 디렉토리를 이전 릴리스로 즉시 되돌립니다. release_id가 없으면 바로 이전 릴리스로 되돌립니다."
+)
+def rollback_hosting_deploy(
+    hosting_id: int,
+    release_id: Optional[str] = Query(None, description="되돌릴 릴리스 ID"),
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    """
+    배포 롤백
+    
+    - **hosting_id**: 호스팅 ID
+    - **release_id**: 되돌릴 릴리스 ID
+    """
+    log_request_info("POST", f"/host/{hosting_id}/deploys/rollback", user_id=current_user_id)
+    
+    try:
+        result = HostingService(db).rollback_deploy(hosting_id, current_user_id, release_id)
+        return create_success_response(
+            message=f"릴리스 {result['release_id']}로 되돌렸습니다.",
+            data=result
+        )
+    
+    except HostingNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.detail
+        )
+    except InsufficientPermissionError as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=e.detail
+        )
+    except InvalidDeployError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.detail
+        )
+    except Exception as e:
+        logger.error(f"배포 롤백 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="배포 롤백 중 오류가 발생했습니다."
+        )
+
 @router.post(
     "/{hosting_id}/sync",
     response_model=StandardResponse[HostingResponse],
@@ -381,108 +641,752 @@ def sync_hosting_status(
             detail="호스팅 상태 동기화 중 오류가 발생했습니다."
         )
 
-@router.get(
-    "/all",
-    response_model=PaginatedResponse[HostingResponse],
-    summary="호스팅 목록 조회",
-    description="호스팅 목록을 페이지네이션으로 조회합니다. (관리자 기능)"
+@router.patch(
+    "/{hosting_id}/resources",
+    response_model=StandardResponse[HostingResponse],
+    summary="호스팅 리소스 제한 변경",
+    description="호스팅 리소스 플랜 또는 개별 제한값을 변경합니다. 실행 중인 컨테이너에 즉시 적용됩니다. (관리자 기능)"
 )
-def get_hostings(
-    page: int = Query(1, ge=1, description="페이지 번호"),
-    size: int = Query(10, ge=1, le=100, description="페이지 크기"),
-    current_user_id: int = Depends(get_current_user_id),
+def update_hosting_resources(
+    hosting_id: int,
+    resource_update: HostingResourceUpdate,
+    admin_user: UserResponse = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """
-    호스팅 목록 조회
-    
-    - **page**: 페이지 번호 (1부터 시작)
-    - **size**: 페이지 크기 (1-100)
+    호스팅 리소스 제한 변경
     
-    현재는 모든 인증된 사용자가 조회 가능합니다. (관리자 기능)
+    - **hosting_id**: 변경할 호스팅 ID
+    - **plan**: 리소스 플랜 (basic, standard, premium, 정적 호스팅이면 해당 플랜의 컨테이너로 전환)
+    - **memory_mb / cpus / cpu_shares / pids_limit / blkio_weight**: 개별 제한값
     """
-    log_request_info("GET", "/hosting/all", user_id=current_user_id, extra_info={"page": page, "size": size})
+    log_request_info("PATCH", f"/hosting/{hosting_id}/resources", user_id=admin_user.id)
     
     try:
-        # 페이지네이션 파라미터 검증
-        pagination = validate_pagination_params(page, size)
-        offset = calculate_offset(pagination.page, pagination.size)
-        
         hosting_service = HostingService(db)
-        hostings = hosting_service.get_all_hostings(skip=offset, limit=pagination.size)
-        
-        # 전체 호스팅 수 조회 (간단한 카운트)
-        total_hostings = len(hosting_service.get_all_hostings(skip=0, limit=10000))  # 임시 방법
-        
-        # HostingResponse로 변환
-        hosting_responses = [HostingResponse.model_validate(hosting) for hosting in hostings]
-        
-        logger.info(f"호스팅 목록 조회: 페이지 {page}, 크기 {size}, 전체 {total_hostings}개")
+        hosting = hosting_service.update_hosting_resources(hosting_id, resource_update)
         
-        return create_paginated_response(
-            items=hosting_responses,
-            total=total_hostings,
-            pagination=pagination
+        return create_success_response(
+            message="호스팅 리소스 제한이 변경되었습니다.",
+            data=HostingResponse.model_validate(hosting)
         )
         
+    except HostingNotFoundError as e:
+        logger.warning(f"호스팅 리소스 변경 실패: {e.detail}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.detail
+        )
+    except VMOperationError as e:
+        logger.error(f"호스팅 리소스 변경 실패: {e.detail}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=e.detail
+        )
     except Exception as e:
-        logger.error(f"호스팅 목록 조회 실패: {e}")
+        logger.error(f"호스팅 리소스 변경 실패: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="호스팅 목록 조회 중 오류가 발생했습니다."
+            detail="호스팅 리소스 변경 중 오류가 발생했습니다."
         )
 
-@router.get(
-    "/stats",
-    response_model=StandardResponse[dict],
-    summary="호스팅 통계 조회",
-    description="호스팅 관련 통계 정보를 조회합니다."
+@router.patch(
+    "/{hosting_id}/cache",
+    response_model=StandardResponse[HostingResponse],
+    summary="프록시 캐시 설정 변경",
+    description="HTML 마이크로캐시 시간(0-5초)과 프록시 캐시 용량 제한을 변경합니다."
 )
-def get_hosting_stats(
+def update_hosting_cache(
+    hosting_id: int,
+    cache_update: HostingCacheUpdate,
     current_user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ):
     """
-    호스팅 통계 조회
+    프록시 캐시 설정 변경
     
-    현재 사용자의 호스팅 통계를 포함한 전체 통계 정보를 반환합니다.
+    - **hosting_id**: 변경할 호스팅 ID
+    - **microcache_seconds**: HTML 마이크로캐시 시간 (0이면 사용 안 함, 쿠키/인증 요청은 캐시하지 않음)
+    - **cache_max_mb**: 프록시 캐시 용량 제한 (MB)
     """
-    log_request_info("GET", "/hosting/stats", user_id=current_user_id)
+    log_request_info("PATCH", f"/hosting/{hosting_id}/cache", user_id=current_user_id)
     
     try:
         hosting_service = HostingService(db)
-        
-        # 사용자별 호스팅 조회
-        user_hosting = hosting_service.get_hosting_by_user_id(current_user_id)
-        
-        # 전체 통계 조회 (향후 관리자 기능 확장 시 사용)
-        stats = hosting_service.get_hosting_stats()
-        
-        # 사용자별 통계 구성
-        user_stats = {
-            "total_hostings": 1 if user_hosting else 0,
-            "active_hostings": 1 if user_hosting and user_hosting.status == HostingStatus.RUNNING else 0,
-            "status_breakdown": {
-                "creating": 1 if user_hosting and user_hosting.status == HostingStatus.CREATING else 0,
-                "running": 1 if user_hosting and user_hosting.status == HostingStatus.RUNNING else 0,
-                "stopping": 1 if user_hosting and user_hosting.status == HostingStatus.STOPPING else 0,
-                "stopped": 1 if user_hosting and user_hosting.status == HostingStatus.STOPPED else 0,
-                "error": 1 if user_hosting and user_hosting.status == HostingStatus.ERROR else 0,
-            }
-        }
-        
-        logger.info(f"호스팅 통계 조회: 사용자 {current_user_id}")
+        hosting = hosting_service.update_cache_settings(hosting_id, current_user_id, cache_update)
         
         return create_success_response(
-            message="호스팅 통계를 조회했습니다.",
-            data=user_stats
+            message="프록시 캐시 설정이 변경되었습니다.",
+            data=HostingResponse.model_validate(hosting)
         )
         
-    except Exception as e:
-        logger.error(f"호스팅 통계 조회 실패: {e}")
+    except HostingNotFoundError as e:
+        logger.warning(f"프록시 캐시 설정 변경 실패: {e.detail}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.detail
+        )
+    except InsufficientPermissionError as e:
+        logger.warning(f"프록시 캐시 설정 변경 실패 - 권한 없음: {e.detail}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=e.detail
+        )
+    except VMOperationError as e:
+        logger.error(f"프록시 캐시 설정 변경 실패: {e.detail}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="호스팅 통계 조회 중 오류가 발생했습니다."
+            detail=e.detail
+        )
+    except Exception as e:
+        logger.error(f"프록시 캐시 설정 변경 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="프록시 캐시 설정 변경 중 오류가 발생했습니다."
+        )
+
+@router.post(
+    "/{hosting_id}/cache/purge",
+    response_model=StandardResponse[Dict[str, Any]],
+    summary="프록시 캐시 삭제",
+    description="호스팅의 프록시 캐시 항목을 모두 삭제합니다. 다음 요청부터 컨테이너에서 다시 가져옵니다."
+)
+def purge_hosting_cache(
+    hosting_id: int,
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    """
+    프록시 캐시 삭제
+    
+    - **hosting_id**: 캐시를 삭제할 호스팅 ID
+    """
+    log_request_info("POST", f"/hosting/{hosting_id}/cache/purge", user_id=current_user_id)
+    
+    try:
+        hosting_service = HostingService(db)
+        result = hosting_service.purge_cache(hosting_id, current_user_id)
+        
+        return create_success_response(
+            message=f"프록시 캐시 {result['removed']}개 항목이 삭제되었습니다.",
+            data=result
+        )
+        
+    except HostingNotFoundError as e:
+        logger.warning(f"프록시 캐시 삭제 실패: {e.detail}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.detail
+        )
+    except InsufficientPermissionError as e:
+        logger.warning(f"프록시 캐시 삭제 실패 - 권한 없음: {e.detail}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=e.detail
+        )
+    except Exception as e:
+        logger.error(f"프록시 캐시 삭제 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="프록시 캐시 삭제 중 오류가 발생했습니다."
+        )
+
+@router.get(
+    "/{hosting_id}/usage",
+    response_model=StandardResponse[Dict[str, Any]],
+    summary="호스팅 리소스 사용량",
+    description="호스팅 컨테이너의 CPU, 메모리, 디스크 I/O, 네트워크 사용량 추이와 기간 요약(평균/p95/최대)을 조회합니다."
+)
+def get_hosting_usage(
+    hosting_id: int,
+    window: str = Query("1h", pattern=r"^[1-9]\d*[smhd]$", description="조회 기간 (예: 15m, 1h, 1d)"),
+    points: int = Query(60, ge=1, le=1000, description="조회 기간을 나눌 구간 수 (구간별 평균)"),
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    """
+    호스팅 리소스 사용량 조회
+    
+    - **hosting_id**: 조회할 호스팅 ID
+    - **window**: 조회 기간
+    - **points**: 구간 수
+    """
+    log_request_info("GET", f"/host/{hosting_id}/usage", user_id=current_user_id)
+    
+    try:
+        hosting_service = HostingService(db)
+        
+        return create_success_response(
+            message="호스팅 리소스 사용량을 조회했습니다.",
+            data=hosting_service.get_usage(hosting_id, current_user_id, window, points)
+        )
+    
+    except HostingNotFoundError as e:
+        logger.warning(f"리소스 사용량 조회 실패: {e.detail}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.detail
+        )
+    except InsufficientPermissionError as e:
+        logger.warning(f"리소스 사용량 조회 실패 - 권한 없음: {e.detail}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=e.detail
+        )
+    except Exception as e:
+        logger.error(f"리소스 사용량 조회 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="리소스 사용량 조회 중 오류가 발생했습니다."
+        )
+
+@router.get(
+    "/all",
+    response_model=PaginatedResponse[HostingResponse],
+    summary="호스팅 목록 조회",
+    description="호스팅 목록을 페이지네이션으로 조회합니다. (관리자 기능)"
+)
+def get_hostings(
+    page: int = Query(1, ge=1, description="페이지 번호"),
+    size: int = Query(10, ge=1, le=100, description="페이지 크기"),
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    """
+    호스팅 목록 조회
+    
+    - **page**: 페이지 번호 (1부터 시작)
+    - **size**: 페이지 크기 (1-100)
+    
+    현재는 모든 인증된 사용자가 조회 가능합니다. (관리자 기능)
+    """
+    log_request_info("GET", "/hosting/all", user_id=current_user_id, extra_info={"page": page, "size": size})
+    
+    try:
+        # 페이지네이션 파라미터 검증
+        pagination = validate_pagination_params(page, size)
+        offset = calculate_offset(pagination.page, pagination.size)
+        
+        hosting_service = HostingService(db)
+        hostings = hosting_service.get_all_hostings(skip=offset, limit=pagination.size)
+        
+        # 전체 호스팅 수 조회 (간단한 카운트)
+        total_hostings = len(hosting_service.get_all_hostings(skip=0, limit=10000))  # 임시 방법
+        
+        # HostingResponse로 변환
+        hosting_responses = [HostingResponse.model_validate(hosting) for hosting in hostings]
+        
+        logger.info(f"호스팅 목록 조회: 페이지 {page}, 크기 {size}, 전체 {total_hostings}개")
+        
+        return create_paginated_response(
+            items=hosting_responses,
+            total=total_hostings,
+            pagination=pagination
+        )
+        
+    except Exception as e:
+        logger.error(f"호스팅 목록 조회 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="호스팅 목록 조회 중 오류가 발생했습니다."
+        )
+
+@router.get(
+    "/stats",
+    response_model=StandardResponse[dict],
+    summary="호스팅 통계 조회",
+    description="호스팅 관련 통계 정보를 조회합니다."
+)
+def get_hosting_stats(
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    """
+    호스팅 통계 조회
+    
+    현재 사용자의 호스팅 통계를 포함한 전체 통계 정보를 반환합니다.
+    """
+    log_request_info("GET", "/hosting/stats", user_id=current_user_id)
+    
+    try:
+        hosting_service = HostingService(db)
+        
+        # 사용자별 호스팅 조회
+        user_hosting = hosting_service.get_hosting_by_user_id(current_user_id)
+        
+        # 전체 통계 조회 (향후 관리자 기능 확장 시 사용)
+        stats = hosting_service.get_hosting_stats()
+        
+        # 사용자별 통계 구성
+        user_stats = {
+            "total_hostings": 1 if user_hosting else 0,
+            "active_hostings": 1 if user_hosting and user_hosting.status == HostingStatus.RUNNING else 0,
+            "status_breakdown": {
+                "creating": 1 if user_hosting and user_hosting.status == HostingStatus.CREATING else 0,
+                "running": 1 if user_hosting and user_hosting.status == HostingStatus.RUNNING else 0,
+                "stopping": 1 if user_hosting and user_hosting.status == HostingStatus.STOPPING else 0,
+                "stopped": 1 if user_hosting and user_hosting.status == HostingStatus.STOPPED else 0,
+                "error": 1 if user_hosting and user_hosting.status == HostingStatus.ERROR else 0,
+            }
+        }
+        
+        logger.info(f"호스팅 통계 조회: 사용자 {current_user_id}")
+        
+        return create_success_response(
+            message="호스팅 통계를 조회했습니다.",
+            data=user_stats
+        )
+        
+    except Exception as e:
+        logger.error(f"호스팅 통계 조회 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="호스팅 통계 조회 중 오류가 발생했습니다."
+        )
+
+@router.post(
+    "/admin/gc",
+    response_model=StandardResponse[Dict[str, Any]],
+    summary="고아 리소스 GC 실행",
+    description="DB에 없는 컨테이너, 프록시 설정, VM 파일을 찾아 정리합니다."
+)
+def collect_orphan_resources(
+    dry_run: Optional[bool] = Query(None, description="삭제하지 않고 보고만 함 (기본값: GC_DRY_RUN 설정)"),
+    batch_size: Optional[int] = Query(None, ge=1, le=500, description="한 번에 삭제할 리소스 수"),
+    admin_user: UserResponse = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    고아 리소스 GC 실행
+    """
+    log_request_info("POST", "/hosting/admin/gc", user_id=admin_user.id)
+    
+    try:
+        report = OrphanCollector(db).collect(dry_run=dry_run, batch_size=batch_size)
+        
+        return create_success_response(
+            message="고아 리소스 GC를 실행했습니다.",
+            data=report
+        )
+        
+    except Exception as e:
+        logger.error(f"고아 리소스 GC 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="고아 리소스 GC 중 오류가 발생했습니다."
+        )
+
+@router.get(
+    "/admin/images",
+    response_model=StandardResponse[Dict[str, Any]],
+    summary="골든 이미지 조회",
+    description="골든 이미지 템플릿 버전과 버전별 오버레이 참조 수를 조회합니다."
+)
+def get_golden_images(
+    admin_user: UserResponse = Depends(get_admin_user)
+):
+    """
+    골든 이미지 조회
+    """
+    log_request_info("GET", "/host/admin/images", user_id=admin_user.id)
+    
+    try:
+        return create_success_response(
+            message="골든 이미지 정보를 조회했습니다.",
+            data=get_golden_image_manager().status()
+        )
+        
+    except Exception as e:
+        logger.error(f"골든 이미지 조회 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="골든 이미지 조회 중 오류가 발생했습니다."
+        )
+
+@router.post(
+    "/admin/images",
+    response_model=StandardResponse[Dict[str, Any]],
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="골든 이미지 빌드",
+    description="템플릿 이미지에 패키지를 미리 설치한 새 골든 이미지 버전을 백그라운드에서 빌드합니다."
+)
+def build_golden_image(
+    background_tasks: BackgroundTasks,
+    name: Optional[str] = Query(None, description="템플릿 이름 (기본값: GOLDEN_IMAGE_NAME)"),
+    admin_user: UserResponse = Depends(get_admin_user)
+):
+    """
+    골든 이미지 빌드 (수 분 소요되므로 백그라운드 실행)
+    """
+    log_request_info("POST", "/host/admin/images", user_id=admin_user.id)
+    
+    def build():
+        try:
+            get_golden_image_manager().build_template(name)
+        except VMOperationError as e:
+            logger.error(f"골든 이미지 빌드 실패: {e.detail}")
+    
+    background_tasks.add_task(build)
+    
+    return create_success_response(
+        message="골든 이미지 빌드를 시작했습니다.",
+        data={"name": name or settings.GOLDEN_IMAGE_NAME}
+    )
+
+@router.post(
+    "/admin/images/prune",
+    response_model=StandardResponse[Dict[str, Any]],
+    summary="골든 이미지 정리",
+    description="참조하는 VM이 없는 이전 골든 이미지 버전을 삭제합니다."
+)
+def prune_golden_images(
+    keep: Optional[int] = Query(None, ge=1, description="유지할 최근 버전 수 (기본값: GOLDEN_IMAGE_KEEP_VERSIONS)"),
+    admin_user: UserResponse = Depends(get_admin_user)
+):
+    """
+    골든 이미지 정리
+    """
+    log_request_info("POST", "/host/admin/images/prune", user_id=admin_user.id)
+    
+    try:
+        removed = get_golden_image_manager().prune(keep=keep)
+        
+        return create_success_response(
+            message="사용하지 않는 골든 이미지 버전을 정리했습니다.",
+            data={"removed": removed}
+        )
+        
+    except Exception as e:
+        logger.error(f"골든 이미지 정리 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="골든 이미지 정리 중 오류가 발생했습니다."
+        )
+
+@router.post(
+    "/vm-ready/{vm_id}/{token}",
+    response_model=StandardResponse[Dict[str, Any]],
+    summary="VM 부팅 완료 알림",
+    description="cloud-init phone_home이 호출하며, 프로필별 부팅 완료 시간을 기록합니다."
+)
+def report_vm_ready(vm_id: str, token: str):
+    """
+    VM 부팅 완료 알림 (게스트에서 호출하므로 인증 대신 VM별 토큰 사용)
+    """
+    recorder = BootTimeRecorder()
+    if not recorder.verify_token(vm_id, token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="유효하지 않은 토큰입니다."
+        )
+    
+    record = recorder.mark_ready(vm_id)
+    
+    return create_success_response(
+        message="VM 부팅 완료가 기록되었습니다.",
+        data=record or {"vm_id": vm_id}
+    )
+
+@router.get(
+    "/admin/boot-times",
+    response_model=StandardResponse[Dict[str, Any]],
+    summary="부팅 시간 통계",
+    description="cloud-init 프로필별 VM 부팅 완료 시간 통계를 조회합니다."
+)
+def get_boot_time_stats(
+    admin_user: UserResponse = Depends(get_admin_user)
+):
+    """
+    프로필별 부팅 시간 통계 조회
+    """
+    log_request_info("GET", "/host/admin/boot-times", user_id=admin_user.id)
+    
+    try:
+        return create_success_response(
+            message="부팅 시간 통계를 조회했습니다.",
+            data=BootTimeRecorder().stats()
+        )
+        
+    except Exception as e:
+        logger.error(f"부팅 시간 통계 조회 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="부팅 시간 통계 조회 중 오류가 발생했습니다."
+        )
+
+@router.get(
+    "/admin/domains",
+    response_model=StandardResponse[Dict[str, Any]],
+    summary="libvirt 도메인 인덱스",
+    description="libvirt 이벤트로 갱신되는 도메인별 상태/IP 인덱스를 조회합니다."
+)
+def get_domain_index(
+    admin_user: UserResponse = Depends(get_admin_user)
+):
+    """
+    도메인 상태/IP 인덱스 조회 (libvirt 이벤트 연동이 비활성화된 경우 빈 목록)
+    """
+    log_request_info("GET", "/host/admin/domains", user_id=admin_user.id)
+    
+    try:
+        adapter = get_libvirt_adapter()
+        connected = bool(adapter and adapter.ensure_connected())
+        return create_success_response(
+            message="도메인 인덱스를 조회했습니다.",
+            data={
+                "connected": connected,
+                "domains": adapter.snapshot() if connected else {}
+            }
+        )
+        
+    except Exception as e:
+        logger.error(f"도메인 인덱스 조회 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="도메인 인덱스 조회 중 오류가 발생했습니다."
+        )
+
+@router.get(
+    "/admin/cpu-placement",
+    response_model=StandardResponse[Dict[str, Any]],
+    summary="vCPU/NUMA 배치 현황",
+    description="호스트 CPU 토폴로지와 CPU별 배정된 vCPU 수, 도메인별 배치를 조회합니다."
+)
+def get_cpu_placement(
+    db: Session = Depends(get_db),
+    admin_user: UserResponse = Depends(get_admin_user)
+):
+    """
+    vCPU/NUMA 배치 현황 조회
+    """
+    log_request_info("GET", "/host/admin/cpu-placement", user_id=admin_user.id)
+    
+    try:
+        return create_success_response(
+            message="vCPU 배치 현황을 조회했습니다.",
+            data=CpuPlacementEngine(db).status()
+        )
+        
+    except Exception as e:
+        logger.error(f"vCPU 배치 현황 조회 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="vCPU 배치 현황 조회 중 오류가 발생했습니다."
+        )
+
+@router.get(
+    "/admin/migrations",
+    response_model=StandardResponse[Dict[str, Any]],
+    summary="마이그레이션 통계",
+    description="방식(container, domain)별 마이그레이션 전송 속도와 다운타임 통계를 조회합니다."
+)
+def get_migration_stats(
+    admin_user: UserResponse = Depends(get_admin_user)
+):
+    """
+    마이그레이션 통계 조회
+    """
+    log_request_info("GET", "/host/admin/migrations", user_id=admin_user.id)
+    
+    try:
+        return create_success_response(
+            message="마이그레이션 통계를 조회했습니다.",
+            data=MigrationRecorder().stats()
+        )
+        
+    except Exception as e:
+        logger.error(f"마이그레이션 통계 조회 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="마이그레이션 통계 조회 중 오류가 발생했습니다."
+        )
+
+@router.post(
+    "/admin/migrations/{hosting_id}",
+    response_model=StandardResponse[HostingResponse],
+    summary="호스팅 노드 이동",
+    description="호스팅을 다른 노드로 이동합니다. 대상 노드의 용량을 먼저 확인합니다."
+)
+def migrate_hosting(
+    hosting_id: int,
+    target_node_id: int = Query(..., ge=1, description="이동할 노드 ID"),
+    admin_user: UserResponse = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    호스팅 노드 이동 (관리자 전용)
+    """
+    log_request_info(
+        "POST",
+        f"/host/admin/migrations/{hosting_id}",
+        user_id=admin_user.id,
+        extra_info={"target_node_id": target_node_id}
+    )
+    
+    try:
+        hosting = HostingService(db).migrate_hosting(hosting_id, target_node_id)
+        
+        return create_success_response(
+            message="호스팅을 다른 노드로 이동했습니다.",
+            data=HostingResponse.model_validate(hosting)
+        )
+    
+    except (HostingNotFoundError, NodeNotFoundError) as e:
+        logger.warning(f"호스팅 이동 실패: {e.detail}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.detail
+        )
+    except InvalidOperationError as e:
+        logger.warning(f"호스팅 이동 거부: {e.detail}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.detail
+        )
+    except HostCapacityExceededError as e:
+        logger.warning(f"호스팅 이동 거부 - 용량 부족: {e.detail}")
+        raise e
+    except VMOperationError as e:
+        logger.error(f"호스팅 이동 실패 - VM 오류: {e.detail}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=e.detail
+        )
+    except Exception as e:
+        logger.error(f"호스팅 이동 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="호스팅 이동 중 오류가 발생했습니다."
+        )
+
+@router.get(
+    "/admin/ssh-gateway",
+    response_model=StandardResponse[Dict[str, Any]],
+    summary="SSH 게이트웨이 통계",
+    description="SSH 게이트웨이의 호스팅별 활성 세션 수와 전송 바이트를 조회합니다."
+)
+def get_ssh_gateway_stats(
+    admin_user: UserResponse = Depends(get_admin_user)
+):
+    """
+    SSH 게이트웨이 통계 조회
+    """
+    log_request_info("GET", "/host/admin/ssh-gateway", user_id=admin_user.id)
+    
+    try:
+        return create_success_response(
+            message="SSH 게이트웨이 통계를 조회했습니다.",
+            data={"enabled": settings.SSH_GATEWAY_ENABLED, **load_gateway_stats()}
+        )
+        
+    except Exception as e:
+        logger.error(f"SSH 게이트웨이 통계 조회 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="SSH 게이트웨이 통계 조회 중 오류가 발생했습니다."
+        )
+
+@router.get(
+    "/admin/traffic",
+    response_model=StandardResponse[Dict[str, Any]],
+    summary="테넌트 트래픽 통계",
+    description="공유 접근 로그에서 집계한 테넌트별 요청 수, 전송 바이트, 상태 코드 분류, 응답 시간 분위수를 조회합니다."
+)
+def get_traffic_overview(
+    minutes: int = Query(60, ge=1, le=1440, description="조회 기간 (분)"),
+    admin_user: UserResponse = Depends(get_admin_user)
+):
+    """
+    테넌트 트래픽 통계 조회
+    """
+    log_request_info("GET", "/host/admin/traffic", user_id=admin_user.id)
+    
+    try:
+        return create_success_response(
+            message="테넌트 트래픽 통계를 조회했습니다.",
+            data=AccessLogIngester().overview(minutes)
+        )
+        
+    except Exception as e:
+        logger.error(f"테넌트 트래픽 통계 조회 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="테넌트 트래픽 통계 조회 중 오류가 발생했습니다."
+        )
+
+@router.get(
+    "/admin/scale-to-zero",
+    response_model=StandardResponse[Dict[str, Any]],
+    summary="유휴 자동 중지 현황",
+    description="유휴 자동 중지된 호스팅 수와 플랜별 콜드 스타트(깨우기) 시간 통계를 조회합니다."
+)
+def get_scale_to_zero_stats(
+    admin_user: UserResponse = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    유휴 자동 중지 현황 조회
+    """
+    log_request_info("GET", "/host/admin/scale-to-zero", user_id=admin_user.id)
+    
+    try:
+        return create_success_response(
+            message="유휴 자동 중지 현황을 조회했습니다.",
+            data=HostingService(db).get_scale_to_zero_stats()
+        )
+    
+    except Exception as e:
+        logger.error(f"유휴 자동 중지 현황 조회 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="유휴 자동 중지 현황 조회 중 오류가 발생했습니다."
+        )
+
+@router.get(
+    "/traffic/{hosting_id}",
+    response_model=StandardResponse[Dict[str, Any]],
+    summary="호스팅 트래픽 통계",
+    description="호스팅의 최근 요청 수, 전송 바이트, 상태 코드 분류, 응답 시간 분위수와 구간별 추이를 조회합니다."
+)
+def get_hosting_traffic(
+    hosting_id: int,
+    minutes: int = Query(60, ge=1, le=1440, description="조회 기간 (분)"),
+    current_user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    """
+    호스팅 트래픽 통계 조회
+    
+    - **hosting_id**: 조회할 호스팅 ID
+    - **minutes**: 조회 기간 (분)
+    """
+    log_request_info("GET", f"/host/traffic/{hosting_id}", user_id=current_user_id)
+    
+    try:
+        hosting_service = HostingService(db)
+        
+        return create_success_response(
+            message="호스팅 트래픽 통계를 조회했습니다.",
+            data=hosting_service.get_traffic_stats(hosting_id, current_user_id, minutes)
+        )
+        
+    except HostingNotFoundError as e:
+        logger.warning(f"트래픽 통계 조회 실패: {e.detail}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.detail
+        )
+    except InsufficientPermissionError as e:
+        logger.warning(f"트래픽 통계 조회 실패 - 권한 없음: {e.detail}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=e.detail
+        )
+    except Exception as e:
+        logger.error(f"트래픽 통계 조회 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="트래픽 통계 조회 중 오류가 발생했습니다."
         )
 
 @router.get(
@@ -0,0 +1,129 @@
+"""
+노드 API 엔드포인트 - 멀티 노드 배치용 Docker 호스트 관리 (관리자 전용)
+"""
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.schemas.node import NodeCreate, NodeResponse
+from app.schemas.common import StandardResponse
+from app.schemas.user import UserResponse
+from app.utils.response_utils import create_success_response
+from app.utils.logging_utils import get_logger, log_request_info
+from app.services.node_service import NodeService
+from app.core.dependencies import get_admin_user
+from app.core.exceptions import NodeNotFoundError, NodeAlreadyExistsError
+
+# 라우터 설정
+router = APIRouter(tags=["노드"])
+logger = get_logger("api.nodes")
+
+@router.get(
+    "",
+    response_model=StandardResponse[List[NodeResponse]],
+    summary="노드 목록 조회",
+    description="등록된 Docker 노드와 노드별 커밋된 리소스를 조회합니다."
+)
+def list_nodes(
+    admin_user: UserResponse = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    노드 목록 조회
+    """
+    log_request_info("GET", "/nodes", user_id=admin_user.id)
+    
+    try:
+        node_service = NodeService(db)
+        loads = node_service.get_node_loads()
+        
+        nodes = []
+        for node in node_service.get_nodes():
+            load = loads.get(node.id, {})
+            nodes.append(NodeResponse.model_validate(node).model_copy(update={
+                "committed_memory_mb": load.get("memory_mb", 0.0),
+                "committed_cpus": load.get("cpus", 0.0),
+                "hosting_count": load.get("hosting_count", 0)
+            }))
+        
+        return create_success_response(
+            message="노드 목록을 조회했습니다.",
+            data=nodes
+        )
+    
+    except Exception as e:
+        logger.error(f"노드 목록 조회 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="노드 목록 조회 중 오류가 발생했습니다."
+        )
+
+@router.post(
+    "",
+    response_model=StandardResponse[NodeResponse],
+    status_code=status.HTTP_201_CREATED,
+    summary="노드 등록",
+    description="테넌트 컨테이너를 배치할 Docker 노드를 등록합니다."
+)
+def register_node(
+    node_data: NodeCreate,
+    admin_user: UserResponse = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    노드 등록
+    
+    웹 디렉토리(VM_IMAGE_PATH)는 모든 노드에 같은 경로로 공유 마운트되어 있어야 합니다.
+    """
+    log_request_info("POST", "/nodes", user_id=admin_user.id)
+    
+    try:
+        node = NodeService(db).register_node(node_data)
+        
+        return create_success_response(
+            message="노드가 등록되었습니다.",
+            data=NodeResponse.model_validate(node)
+        )
+    
+    except NodeAlreadyExistsError:
+        raise
+    except Exception as e:
+        logger.error(f"노드 등록 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="노드 등록 중 오류가 발생했습니다."
+        )
+
+@router.delete(
+    "/{node_id}",
+    response_model=StandardResponse[NodeResponse],
+    summary="노드 비활성화",
+    description="노드에 새 호스팅을 배치하지 않도록 합니다. 이미 배치된 호스팅은 유지됩니다."
+)
+def deactivate_node(
+    node_id: int,
+    admin_user: UserResponse = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    노드 비활성화
+    """
+    log_request_info("DELETE", f"/nodes/{node_id}", user_id=admin_user.id)
+    
+    try:
+        node = NodeService(db).set_node_active(node_id, False)
+        
+        return create_success_response(
+            message="노드가 비활성화되었습니다.",
+            data=NodeResponse.model_validate(node)
+        )
+    
+    except NodeNotFoundError:
+        raise
+    except Exception as e:
+        logger.error(f"노드 비활성화 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="노드 비활성화 중 오류가 발생했습니다."
+        )
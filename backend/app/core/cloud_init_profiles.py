@@ -0,0 +1,72 @@
+"""
+cloud-init 프로필 정의 (사전 구성된 골든 이미지 기준)
+
+골든 이미지에 패키지가 미리 설치되어 있다고 가정하므로 부팅 시에는
+패키지 업그레이드 없이 서비스 활성화와 사용자별 설정만 수행합니다.
+"""
+from typing import Dict, Any, Optional
+
+from app.core.config import settings
+
+# 모든 프로필에 공통으로 적용되는 SSH 보안 설정
+_SSH_HARDENING = [
+    'sed -i "s/#PasswordAuthentication yes/PasswordAuthentication no/" /etc/ssh/sshd_config',
+    'sed -i "s/#PubkeyAuthentication yes/PubkeyAuthentication yes/" /etc/ssh/sshd_config',
+    'systemctl reload ssh || systemctl reload sshd',
+]
+
+_WEB_SETUP = [
+    'systemctl enable --now nginx',
+    'mkdir -p /var/www/html',
+    'chown -R www-data:www-data /var/www/html',
+    'chmod -R 755 /var/www/html',
+    'usermod -aG www-data ubuntu',
+    'usermod -aG www-data webhoster',
+    # 골든 이미지에 포함된 경우에만 방화벽/fail2ban 활성화
+    'if command -v ufw >/dev/null; then ufw allow ssh && ufw allow 80/tcp && ufw allow 443/tcp && ufw --force enable; fi',
+    'if systemctl list-unit-files fail2ban.service >/dev/null 2>&1; then systemctl enable --now fail2ban; fi',
+]
+
+CLOUD_INIT_PROFILES: Dict[str, Dict[str, Any]] = {
+    # SSH 접속만 가능한 최소 구성
+    "minimal": {
+        "packages": [],
+        "groups": [],
+        "runcmd": list(_SSH_HARDENING),
+        "web": False
+    },
+    # Nginx 웹 서버 (기본)
+    "web": {
+        "packages": [],
+        "groups": ["www-data"],
+        "runcmd": _SSH_HARDENING + _WEB_SETUP,
+        "web": True
+    },
+    # 웹 서버 + Docker (이미지에 없으면 부팅 시 설치)
+    "docker": {
+        "packages": ["docker.io", "docker-compose"],
+        "groups": ["www-data", "docker"],
+        "runcmd": _SSH_HARDENING + _WEB_SETUP + [
+            'systemctl enable --now docker',
+            'usermod -aG docker ubuntu',
+            'usermod -aG docker webhoster',
+        ],
+        "web": True
+    }
+}
+
+
+def get_cloud_init_profile(name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    프로필 이름으로 cloud-init 구성 조회 (없으면 기본 프로필)
+    """
+    name = name or settings.CLOUD_INIT_PROFILE
+    if name not in CLOUD_INIT_PROFILES:
+        raise ValueError(f"존재하지 않는 cloud-init 프로필입니다: {name}")
+    profile = CLOUD_INIT_PROFILES[name]
+    return {
+        "packages": list(profile["packages"]),
+        "groups": list(profile["groups"]),
+        "runcmd": list(profile["runcmd"]),
+        "web": profile["web"]
+    }
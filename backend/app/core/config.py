@@ -47,6 +47,66 @@ class Settings(BaseSettings):
     VM_DEFAULT_MEMORY: int = Field(default=1024, description="VM 기본 메모리 (MB)")
     VM_DEFAULT_VCPUS: int = Field(default=1, description="VM 기본 vCPU 수")
     VM_DEFAULT_DISK_SIZE: int = Field(default=20, description="VM 기본 디스크 크기 (GB)")
+    VM_DOMAIN_PROFILE: str = Field(default="balanced", description="기본 도메인 성능 프로필 (legacy, balanced, throughput)")
+    VM_DOMAIN_PROFILE_EXPERIMENT: List[str] = Field(default=[], description="A/B 비교할 도메인 프로필 목록 (vm_id 기준으로 고르게 분배, 비어 있으면 기본 프로필)")
+    VM_CPU_PLACEMENT_ENABLED: bool = Field(default=True, description="도메인별 vCPU/NUMA 노드 배치 사용 여부")
+    VM_HOST_RESERVED_CPUS: List[int] = Field(default=[0], description="도메인에 배정하지 않고 호스트용으로 남겨 둘 CPU 번호")
+    VM_HUGEPAGE_SIZE_KB: int = Field(default=2048, description="hugepages 사용 프로필의 페이지 크기 (KiB)")
+    VM_SNAPSHOT_MODE: str = Field(default="internal", description="도메인 qcow2 스냅샷 방식 (internal: 메모리 포함, external: 디스크 전용 오버레이)")
+    VM_MIGRATION_TIMEOUT: int = Field(default=1800, description="도메인 라이브 마이그레이션 제한 시간 (초)")
+    LIBVIRT_MIGRATION_URI: str = Field(default="qemu+ssh://{address}/system", description="마이그레이션 대상 libvirt URI ({address}는 대상 노드 주소)")
+    DEFAULT_RESOURCE_PLAN: str = Field(default="standard", description="기본 테넌트 리소스 플랜 (static, basic, standard, premium)")
+    
+    # 컨테이너 네트워크 설정
+    CONTAINER_NETWORK_MODE: str = Field(default="published", description="테넌트 컨테이너 네트워크 방식 (published: 호스트 웹 포트 게시, bridge: 전용 브리지 네트워크의 컨테이너 IP로 라우팅)")
+    CONTAINER_NETWORK_NAME: str = Field(default="webhost-net", description="bridge 방식에서 테넌트 컨테이너를 연결할 사용자 정의 Docker 네트워크")
+    CONTAINER_NETWORK_SUBNET: str = Field(default="172.30.0.0/16", description="테넌트 네트워크 서브넷 (복원 시 컨테이너 IP를 유지하려면 서브넷 지정 필요)")
+    CONTAINER_NETWORK_ICC: bool = Field(default=False, description="테넌트 컨테이너 간 통신 허용 여부 (호스트 nginx에서의 접근은 항상 허용)")
+    
+    # libvirt 이벤트 연동 설정
+    LIBVIRT_URI: str = Field(default="qemu:///system", description="libvirt 연결 URI")
+    LIBVIRT_EVENTS_ENABLED: bool = Field(default=True, description="libvirt 이벤트 기반 도메인 상태/IP 조회 사용 (libvirt-python 필요, 없으면 virsh 사용)")
+    DHCP_LEASE_FILES: List[str] = Field(
+        default=[
+            "/var/lib/libvirt/dnsmasq/virbr0.status",
+            "/var/lib/libvirt/dnsmasq/virbr0.leases",
+            "/var/lib/dhcp/dhcpd.leases"
+        ],
+        description="VM IP 조회에 사용할 DHCP 리스 파일 (dnsmasq 상태 JSON, dnsmasq 리스, ISC dhcpd.leases)"
+    )
+    
+    # 골든 이미지 설정
+    GOLDEN_IMAGE_NAME: str = Field(default="base", description="VM 디스크 오버레이에 사용할 골든 이미지 이름")
+    GOLDEN_IMAGE_PACKAGES: List[str] = Field(
+        default=["nginx", "openssh-server", "qemu-guest-agent", "ufw", "fail2ban"],
+        description="골든 이미지 빌드 시 미리 설치할 패키지"
+    )
+    GOLDEN_IMAGE_KEEP_VERSIONS: int = Field(default=2, description="정리 시 유지할 최근 골든 이미지 버전 수")
+    
+    # cloud-init 설정
+    CLOUD_INIT_PROFILE: str = Field(default="web", description="기본 cloud-init 프로필 (minimal, web, docker)")
+    CLOUD_INIT_PACKAGE_UPGRADE: bool = Field(default=False, description="부팅 시 패키지 업그레이드 수행 여부 (골든 이미지 사용 시 불필요)")
+    CLOUD_INIT_APT_PROXY: Optional[str] = Field(default=None, description="VM에서 사용할 로컬 apt 프록시/캐시 URL (예: http://192.168.122.1:3142)")
+    CLOUD_INIT_PHONE_HOME_URL: Optional[str] = Field(default=None, description="VM에서 접근 가능한 API 주소 (예: http://192.168.122.1:8000/api/v1, 부팅 시간 측정용)")
+    
+    # 호스트 기능 탐지 캐시 설정
+    CAPABILITY_CACHE_PATH: Optional[str] = Field(default=None, description="호스트 기능 캐시 파일 경로 (기본값: VM_IMAGE_PATH/.capabilities.json)")
+    CAPABILITY_CACHE_MAX_AGE: int = Field(default=86400, description="호스트 기능 캐시 최대 유지 시간 (초, 0이면 무제한)")
+    
+    # 임시 파일 정리 설정
+    TEMP_CLEANUP_ENABLED: bool = Field(default=True, description="임시 파일(/tmp/vm-*.xml 등) 주기 정리 여부 (1시간마다)")
+    
+    # 프로비저닝 저널 설정
+    PROVISIONING_STALE_SECONDS: int = Field(default=300, description="단계 진행이 없으면 방치된 프로비저닝으로 간주하는 시간 (초)")
+    PROVISIONING_SWEEP_ENABLED: bool = Field(default=True, description="방치된 프로비저닝 스위프 주기 실행 여부")
+    PROVISIONING_SWEEP_INTERVAL: int = Field(default=60, description="방치된 프로비저닝 스위프 주기 (초)")
+    
+    # 고아 리소스 GC 설정
+    GC_ENABLED: bool = Field(default=True, description="고아 리소스 GC 주기 실행 여부")
+    GC_INTERVAL: int = Field(default=3600, description="고아 리소스 GC 실행 주기 (초)")
+    GC_DRY_RUN: bool = Field(default=True, description="GC 시 삭제하지 않고 보고만 함")
+    GC_BATCH_SIZE: int = Field(default=20, description="GC 시 한 번에 삭제할 리소스 수")
+    GC_MIN_AGE_SECONDS: int = Field(default=3600, description="생성 후 이 시간이 지난 리소스만 GC 대상 (초)")
     
     # 보안 설정
     SSH_KEY_SIZE: int = Field(default=2048, description="SSH 키 크기 (bits)")
@@ -60,7 +120,17 @@ class Settings(BaseSettings):
     
     # 네트워크 설정
     NETWORK_TIMEOUT: int = Field(default=30, description="네트워크 연결 타임아웃 (초)")
-    MAX_CONCURRENT_VMS: int = Field(default=10, description="최대 동시 VM 수")
+    MAX_CONCURRENT_VMS: int = Field(default=10, description="최대 동시 VM 생성(프로비저닝) 수")
+    
+    # 호스트 용량 스케줄러 설정
+    CAPACITY_QUEUE_SIZE: int = Field(default=20, description="동시 생성 한도 초과 시 대기열 최대 길이")
+    CAPACITY_QUEUE_TIMEOUT: int = Field(default=120, description="대기열 최대 대기 시간 (초)")
+    CAPACITY_RESERVED_MEMORY_MB: int = Field(default=1024, description="호스트 OS용 예약 메모리 (MB)")
+    CAPACITY_MEMORY_OVERCOMMIT: float = Field(default=1.0, description="메모리 오버커밋 비율")
+    CAPACITY_CPU_OVERCOMMIT: float = Field(default=4.0, description="CPU 오버커밋 비율")
+    
+    # 멀티 노드 배치 설정
+    NODE_PLACEMENT_POLICY: str = Field(default="least_loaded", description="노드 배치 정책 (least_loaded, bin_packing)")
     
     # 백업 설정
     ENABLE_CONFIG_BACKUP: bool = Field(default=True, description="설정 백업 활성화")
@@ -73,11 +143,62 @@ class Settings(BaseSettings):
     # 서비스 도메인 설정
     SERVICE_DOMAIN: str = Field(default="localhost:8000", description="서비스 도메인")
     NGINX_CONFIG_PATH: str = Field(default="/etc/nginx/sites-available/hosting", description="Nginx 설정 파일 경로")
+    PROXY_ROUTING_MODE: str = Field(default="files", description="테넌트 라우팅 방식 (files: 사용자별 설정 파일 + 리로드, resolver: auth_request 리졸버, 리로드 없음)")
+    PROXY_ROUTE_TTL_SECONDS: int = Field(default=30, description="리졸버 라우트 테이블 항목을 DB에서 다시 확인하는 주기 (초, 다른 워커의 변경 반영)")
+    PROXY_RESOLVER_ALLOWED_CLIENTS: List[str] = Field(default=["127.0.0.1", "::1"], description="라우트 리졸버를 호출할 수 있는 nginx 주소")
+    PROXY_UPSTREAM_KEEPALIVE: int = Field(default=16, description="사용자별 upstream의 nginx 워커당 유휴 keepalive 연결 수 (0이면 요청마다 새 연결)")
+    PROXY_UPSTREAM_KEEPALIVE_REQUESTS: int = Field(default=1000, description="업스트림 keepalive 연결 하나로 보낼 최대 요청 수")
+    PROXY_UPSTREAM_KEEPALIVE_TIMEOUT: int = Field(default=60, description="업스트림 유휴 keepalive 연결 유지 시간 (초)")
+    PROXY_CACHE_PATH: str = Field(default="/var/cache/nginx/tenant-content", description="nginx 공유 프록시 캐시 디렉토리 (tenant-upstreams.conf의 proxy_cache_path와 같아야 함)")
+    PROXY_CACHE_TENANT_MAX_MB: int = Field(default=256, description="테넌트별 프록시 캐시 기본 용량 제한 (MB, 호스팅별 cache_max_mb로 변경 가능)")
+    PROXY_CACHE_ENFORCE_ENABLED: bool = Field(default=True, description="테넌트별 프록시 캐시 용량 제한 주기 점검 여부")
+    PROXY_CACHE_ENFORCE_INTERVAL: int = Field(default=300, description="테넌트별 프록시 캐시 용량 제한 점검 주기 (초)")
+    TENANT_ACCESS_LOG_PATH: str = Field(default="/var/log/nginx/tenants.access.log", description="테넌트 공유 JSON 접근 로그 경로 (템플릿의 access_log와 같아야 함)")
+    ACCESS_LOG_INGEST_ENABLED: bool = Field(default=True, description="공유 접근 로그 주기 수집 여부 (트래픽 통계와 scale-to-zero에 필요)")
+    ACCESS_LOG_INGEST_INTERVAL: int = Field(default=10, description="공유 접근 로그 수집 주기 (초)")
+    ACCESS_LOG_WINDOW_SECONDS: int = Field(default=300, description="테넌트 트래픽 집계 구간 길이 (초)")
+    ACCESS_LOG_RETENTION_WINDOWS: int = Field(default=288, description="보관할 집계 구간 수 (기본 5분 x 288 = 24시간)")
+    
+    # 유휴 컨테이너 자동 중지/깨우기 설정 (scale-to-zero, 요청이 없는 테넌트 컨테이너의 메모리 회수)
+    SCALE_TO_ZERO_ENABLED: bool = Field(default=False, description="유휴 테넌트 컨테이너 자동 중지 사용 여부")
+    SCALE_TO_ZERO_IDLE_MINUTES: int = Field(default=30, description="마지막 요청 후 컨테이너를 중지할 때까지의 시간 (분)")
+    SCALE_TO_ZERO_CHECK_INTERVAL: int = Field(default=60, description="유휴 컨테이너 점검 주기 (초)")
+    SCALE_TO_ZERO_WAKE_TIMEOUT: int = Field(default=30, description="깨운 컨테이너의 웹 포트가 응답할 때까지 기다리는 최대 시간 (초)")
+    SCALE_TO_ZERO_WAKE_UPSTREAM: str = Field(default="127.0.0.1:8000", description="nginx가 깨우기 요청을 보낼 백엔드 주소 (tenant-upstreams.conf의 tenant_wake와 같아야 함)")
+    
+    # 테넌트 리소스 사용량 수집 설정 (cgroup v2 직접 읽기, 테넌트별 고정 크기 링 버퍼)
+    USAGE_CGROUP_ROOT: str = Field(default="/sys/fs/cgroup", description="컨테이너 cgroup v2 트리 경로")
+    USAGE_COLLECT_ENABLED: bool = Field(default=True, description="테넌트 리소스 사용량 주기 수집 여부")
+    USAGE_SAMPLE_INTERVAL: int = Field(default=10, description="사용량 수집 주기 (초)")
+    USAGE_RETENTION_HOURS: int = Field(default=24, description="사용량 샘플 보관 기간 (시간, 링 버퍼 크기 = 보관 기간 / 수집 주기)")
+    
+    # 웹 디렉토리 배포 설정 (압축 파일/여러 파일 업로드 → 릴리스 디렉토리 → www 링크 교체)
+    DEPLOY_MAX_UPLOAD_MB: int = Field(default=1024, description="배포 업로드 최대 크기 (MB)")
+    DEPLOY_MAX_EXTRACTED_MB: int = Field(default=4096, description="배포 압축 해제 후 최대 크기 (MB, 압축 폭탄 방지)")
+    DEPLOY_KEEP_RELEASES: int = Field(default=5, description="롤백용으로 남겨 둘 릴리스 수 (현재 릴리스 포함)")
+    
+    # 정적 호스팅 설정 (static 플랜: 컨테이너 없이 nginx가 웹 디렉토리 직접 서빙)
+    STATIC_SITE_UPSTREAM: str = Field(default="127.0.0.1:8081", description="리졸버 모드에서 정적 호스팅을 서빙하는 nginx 내부 서버 주소")
+    STATIC_PROMOTION_PLAN: str = Field(default="basic", description="동적 콘텐츠가 발견된 정적 호스팅을 전환할 컨테이너 플랜")
+    STATIC_PROMOTION_ENABLED: bool = Field(default=True, description="정적 호스팅 사전 압축 갱신/컨테이너 플랜 전환 주기 점검 여부")
+    STATIC_PROMOTION_INTERVAL: int = Field(default=300, description="정적 호스팅의 동적 콘텐츠 검사 주기 (초)")
+    STATIC_DYNAMIC_SUFFIXES: List[str] = Field(
+        default=[".php", ".phtml", ".py", ".cgi", ".pl", ".rb", ".jsp", ".asp", ".aspx"],
+        description="정적 서빙이 불가능한 서버 측 스크립트 확장자 (발견 시 컨테이너 플랜으로 전환)"
+    )
     
     # SSH 포트 범위 설정
     SSH_PORT_RANGE_START: int = Field(default=10000, description="SSH 포트 범위 시작")
     SSH_PORT_RANGE_END: int = Field(default=10200, description="SSH 포트 범위 끝")
     
+    # SSH 게이트웨이 설정 (단일 포트에서 사용자 이름으로 테넌트 라우팅)
+    SSH_GATEWAY_ENABLED: bool = Field(default=False, description="SSH 게이트웨이 사용 여부 (로컬 컨테이너의 SSH 포트를 게시하지 않음)")
+    SSH_GATEWAY_HOST: str = Field(default="0.0.0.0", description="SSH 게이트웨이 바인드 주소")
+    SSH_GATEWAY_PORT: int = Field(default=2222, description="SSH 게이트웨이 포트")
+    SSH_GATEWAY_HOST_KEY: Optional[str] = Field(default=None, description="게이트웨이 호스트 키 경로 (기본값: VM_IMAGE_PATH/ssh-gateway/host_key, 없으면 생성)")
+    SSH_GATEWAY_CONNECT_TIMEOUT: int = Field(default=10, description="게이트웨이에서 테넌트 SSH 서버로의 연결 제한 시간 (초)")
+    SSH_GATEWAY_STATS_INTERVAL: int = Field(default=30, description="게이트웨이 세션/전송량 통계 파일 갱신 주기 (초)")
+    
     # 개발 환경 설정
     DEBUG: bool = Field(default=True, description="디버그 모드")
     LOG_LEVEL: str = Field(default="INFO", description="로그 레벨")
@@ -0,0 +1,72 @@
+"""
+libvirt 도메인 성능 프로필 정의
+
+프로필마다 머신 타입, 디스크 버스/캐시/IO 모드, hugepages, vCPU 고정,
+virtio-rng 사용 여부를 지정합니다. VM_DOMAIN_PROFILE_EXPERIMENT에 여러 프로필을
+지정하면 vm_id 기준으로 고르게 나눠 적용하며, 적용된 프로필은 도메인 XML
+<metadata>에 기록되므로 디스크/네트워크 처리량을 프로필별로 비교할 수 있습니다.
+"""
+import hashlib
+from typing import Dict, Any, Optional
+
+from app.core.config import settings
+
+DOMAIN_PROFILES: Dict[str, Dict[str, Any]] = {
+    # 기존 정의와 동일한 구성 (i440fx, IDE cdrom, 디스크 튜닝 없음) - 비교 기준
+    "legacy": {
+        "machine": "pc-i440fx-2.9",
+        "disk_bus": "virtio",
+        "disk_cache": None,
+        "disk_io": None,
+        "iothreads": 0,
+        "net_queues": 1,
+        "hugepages": False,
+        "cpu_pinning": False,
+        "rng": False
+    },
+    # q35 + 호스트 페이지 캐시 우회 (기본)
+    "balanced": {
+        "machine": "q35",
+        "disk_bus": "virtio",
+        "disk_cache": "none",
+        "disk_io": "native",
+        "iothreads": 1,
+        "net_queues": 1,
+        "hugepages": False,
+        "cpu_pinning": False,
+        "rng": True
+    },
+    # virtio-scsi 멀티큐 + hugepages + vCPU 고정 (전용 호스트용)
+    "throughput": {
+        "machine": "q35",
+        "disk_bus": "scsi",
+        "disk_cache": "none",
+        "disk_io": "native",
+        "iothreads": 1,
+        "net_queues": 4,
+        "hugepages": True,
+        "cpu_pinning": True,
+        "rng": True
+    }
+}
+
+
+def get_domain_profile(name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    프로필 이름으로 도메인 구성 조회 (없으면 기본 프로필)
+    """
+    name = name or settings.VM_DOMAIN_PROFILE
+    if name not in DOMAIN_PROFILES:
+        raise ValueError(f"존재하지 않는 도메인 프로필입니다: {name}")
+    return dict(DOMAIN_PROFILES[name])
+
+
+def select_domain_profile(vm_id: str) -> str:
+    """
+    VM에 적용할 프로필 이름 (A/B 실험 중이면 vm_id 해시로 고르게 분배)
+    """
+    candidates = settings.VM_DOMAIN_PROFILE_EXPERIMENT
+    if not candidates:
+        return settings.VM_DOMAIN_PROFILE
+    bucket = int.from_bytes(hashlib.sha256(vm_id.encode()).digest()[:4], "big")
+    return candidates[bucket % len(candidates)]
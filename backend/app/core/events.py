@@ -3,6 +3,7 @@
 """
 import asyncio
 from contextlib import asynccontextmanager
+from typing import List
 from fastapi import FastAPI
 from sqlalchemy import text
 
@@ -13,6 +14,9 @@ from app.utils.logging_utils import setup_logging, get_logger
 
 logger = get_logger("events")
 
+# 시작 이벤트에서 만든 백그라운드 작업 (종료 이벤트에서 취소)
+_background_tasks: List[asyncio.Task] = []
+
 async def create_tables():
     """
     데이터베이스 테이블 생성
@@ -41,24 +45,25 @@ async def check_database_connection():
 
 async def setup_vm_environment():
     """
-    VM 환경 설정 확인
+    VM 환경 설정 확인 (디스크 캐시된 호스트 기능 정보 재사용)
     """
     try:
-        import subprocess
+        from app.services.capability_service import get_capability_detector
         
-        # libvirt 연결 확인
-        result = subprocess.run(
-            ["virsh", "--version"],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+        # 도구가 변경되지 않았다면 fork 없이 캐시에서 읽음
+        capabilities = get_capability_detector().get()
         
-        if result.returncode == 0:
-            logger.info(f"libvirt 버전: {result.stdout.strip()}")
+        if capabilities.tool_available("virsh"):
+            logger.info(f"libvirt 클라이언트 버전: {capabilities.tool_version('virsh')} ({capabilities.source})")
+            # 클라이언트 버전은 캐시되므로 데몬 실행 여부는 소켓으로 따로 확인
+            if not capabilities.libvirt_daemon_available:
+                logger.warning("libvirt 데몬 소켓을 찾을 수 없습니다. libvirtd가 실행 중인지 확인하세요.")
         else:
             logger.warning("libvirt를 찾을 수 없습니다. VM 기능이 제한될 수 있습니다.")
         
+        if not capabilities.docker_socket_available:
+            logger.warning("Docker 소켓을 찾을 수 없습니다. 컨테이너 기능이 제한될 수 있습니다.")
+        
         # VM 이미지 디렉토리 확인
         from pathlib import Path
         vm_image_path = Path(settings.VM_IMAGE_PATH)
@@ -97,6 +102,24 @@ async def cleanup_temp_files():
     except Exception as e:
         logger.warning(f"임시 파일 정리 실패: {e}")
 
+async def load_tenant_routes():
+    """
+    리졸버 라우팅 모드에서 호스팅 DB로 라우트 테이블 채우기
+    """
+    if settings.PROXY_ROUTING_MODE != "resolver":
+        return
+    try:
+        from app.services.route_service import get_route_table, load_routes_from_db
+        
+        db = SessionLocal()
+        try:
+            count = get_route_table().load(load_routes_from_db(db))
+        finally:
+            db.close()
+        logger.info(f"테넌트 라우트 {count}개를 불러왔습니다.")
+    except Exception as e:
+        logger.warning(f"테넌트 라우트 불러오기 실패 (요청 시 DB에서 조회): {e}")
+
 def startup_event():
     """
     애플리케이션 시작 이벤트
@@ -117,9 +140,15 @@ def startup_event():
         # VM 환경 설정
         await setup_vm_environment()
         
+        # 테넌트 라우트 테이블 (리졸버 모드)
+        await load_tenant_routes()
+        
         # 임시 파일 정리
         await cleanup_temp_files()
         
+        # 주기 작업 (스위퍼, GC, 접근 로그 수집 등)
+        await start_background_tasks()
+        
         logger.info(f"{settings.PROJECT_NAME} 애플리케이션 시작이 완료되었습니다.")
     
     return startup
@@ -131,6 +160,8 @@ def shutdown_event():
     async def shutdown():
         logger.info(f"{settings.PROJECT_NAME} 애플리케이션을 종료합니다...")
         
+        await stop_background_tasks()
+        
         # 임시 파일 정리
         await cleanup_temp_files()
         
@@ -223,10 +254,171 @@ async def background_cleanup_task():
             logger.error(f"백그라운드 정리 작업 실패: {e}")
             await asyncio.sleep(300)  # 5분 후 재시도
 
-async def start_background_tasks():
+async def provisioning_sweep_task():
+    """
+    방치된 프로비저닝 작업 재개/보상
+    """
+    from app.services.hosting_service import HostingService
+    
+    def sweep():
+        db = SessionLocal()
+        try:
+            return HostingService(db).sweep_stale_provisioning()
+        finally:
+            db.close()
+    
+    while True:
+        try:
+            # 컨테이너 생성 등 블로킹 작업이 포함되므로 스레드에서 실행
+            await asyncio.to_thread(sweep)
+        except Exception as e:
+            logger.error(f"프로비저닝 스위프 실패: {e}")
+        await asyncio.sleep(settings.PROVISIONING_SWEEP_INTERVAL)
+
+async def orphan_gc_task():
+    """
+    고아 리소스 GC 주기 실행
+    """
+    from app.services.gc_service import OrphanCollector
+    
+    def collect():
+        db = SessionLocal()
+        try:
+            return OrphanCollector(db).collect()
+        finally:
+            db.close()
+    
+    while True:
+        try:
+            await asyncio.to_thread(collect)
+        except Exception as e:
+            logger.error(f"고아 리소스 GC 실패: {e}")
+        await asyncio.sleep(settings.GC_INTERVAL)
+
+async def static_promotion_task():
+    """
+    정적 호스팅 사전 압축 갱신 및 동적 콘텐츠 발견 시 컨테이너 플랜 전환
+    """
+    from app.services.hosting_service import HostingService
+    
+    def refresh():
+        db = SessionLocal()
+        try:
+            return HostingService(db).refresh_static_hostings()
+        finally:
+            db.close()
+    
+    while True:
+        try:
+            # 웹 디렉토리 순회와 컨테이너 생성이 포함되므로 스레드에서 실행
+            await asyncio.to_thread(refresh)
+        except Exception as e:
+            logger.error(f"정적 호스팅 점검 실패: {e}")
+        await asyncio.sleep(settings.STATIC_PROMOTION_INTERVAL)
+
+async def proxy_cache_cap_task():
+    """
+    테넌트별 프록시 캐시 용량 제한 적용
+    """
+    from app.services.hosting_service import HostingService
+    
+    def enforce():
+        db = SessionLocal()
+        try:
+            return HostingService(db).enforce_cache_caps()
+        finally:
+            db.close()
+    
+    while True:
+        try:
+            # 캐시 디렉토리 전체를 순회하므로 스레드에서 실행
+            await asyncio.to_thread(enforce)
+        except Exception as e:
+            logger.error(f"프록시 캐시 용량 점검 실패: {e}")
+        await asyncio.sleep(settings.PROXY_CACHE_ENFORCE_INTERVAL)
+
+async def access_log_ingest_task():
+    """
+    테넌트 공유 접근 로그 수집
+    """
+    from app.services.access_log_service import AccessLogIngester
+    
+    ingester = AccessLogIngester()
+    
+    while True:
+        try:
+            # 로그 파일 읽기와 상태 파일 기록이 포함되므로 스레드에서 실행
+            await asyncio.to_thread(ingester.poll)
+        except Exception as e:
+            logger.error(f"접근 로그 수집 실패: {e}")
+        await asyncio.sleep(settings.ACCESS_LOG_INGEST_INTERVAL)
+
+async def scale_to_zero_task():
+    """
+    유휴 테넌트 컨테이너 자동 중지
+    """
+    from app.services.hosting_service import HostingService
+    
+    def stop_idle():
+        db = SessionLocal()
+        try:
+            return HostingService(db).stop_idle_hostings()
+        finally:
+            db.close()
+    
+    while True:
+        try:
+            # docker stop이 포함되므로 스레드에서 실행
+            await asyncio.to_thread(stop_idle)
+        except Exception as e:
+            logger.error(f"유휴 컨테이너 점검 실패: {e}")
+        await asyncio.sleep(settings.SCALE_TO_ZERO_CHECK_INTERVAL)
+
+async def usage_collect_task():
+    """
+    테넌트 컨테이너 리소스 사용량 수집
+    """
+    from app.services.usage_service import UsageCollector
+    
+    collector = UsageCollector()
+    
+    while True:
+        try:
+            # cgroup 파일 읽기와 링 버퍼 기록이 포함되므로 스레드에서 실행
+            await asyncio.to_thread(collector.collect)
+        except Exception as e:
+            logger.error(f"리소스 사용량 수집 실패: {e}")
+        await asyncio.sleep(settings.USAGE_SAMPLE_INTERVAL)
+
+async def start_background_tasks() -> List[asyncio.Task]:
+    """
+    백그라운드 작업 시작 (작업마다 자체 설정 플래그로 켜고 끔)
+    """
+    loops = (
+        (settings.TEMP_CLEANUP_ENABLED, background_cleanup_task),
+        (settings.PROVISIONING_SWEEP_ENABLED, provisioning_sweep_task),
+        (settings.GC_ENABLED, orphan_gc_task),
+        (settings.STATIC_PROMOTION_ENABLED, static_promotion_task),
+        (settings.PROXY_CACHE_ENFORCE_ENABLED, proxy_cache_cap_task),
+        (settings.ACCESS_LOG_INGEST_ENABLED, access_log_ingest_task),
+        (settings.SCALE_TO_ZERO_ENABLED, scale_to_zero_task),
+        (settings.USAGE_COLLECT_ENABLED, usage_collect_task)
+    )
+    for enabled, loop in loops:
+        if enabled:
+            _background_tasks.append(asyncio.create_task(loop(), name=loop.__name__))
+    
+    logger.info(f"백그라운드 작업 {len(_background_tasks)}개가 시작되었습니다: {', '.join(task.get_name() for task in _background_tasks)}")
+    return list(_background_tasks)
+
+async def stop_background_tasks():
     """
-    백그라운드 작업 시작
+    백그라운드 작업 취소 (스레드에서 실행 중인 작업은 현재 회차를 마친 뒤 끝남)
     """
-    if not settings.DEBUG:  # 프로덕션 환경에서만 실행
-        asyncio.create_task(background_cleanup_task())
-        logger.info("백그라운드 작업이 시작되었습니다.") 
\ No newline at end of file
+    tasks = list(_background_tasks)
+    _background_tasks.clear()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if tasks:
+        logger.info(f"백그라운드 작업 {len(tasks)}개를 종료했습니다.")
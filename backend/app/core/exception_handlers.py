@@ -16,7 +16,10 @@ from app.core.exceptions import (
     InsufficientPermissionError,
     HostingNotFoundError,
     HostingAlreadyExistsError,
-    VMOperationError
+    VMOperationError,
+    HostCapacityExceededError,
+    NodeNotFoundError,
+    NodeAlreadyExistsError
 )
 from app.utils.logging_utils import get_logger, log_error_with_context
 
@@ -27,7 +30,8 @@ def create_error_response(
     status_code: int,
     message: str,
     detail: str = None,
-    error_code: str = None
+    error_code: str = None,
+    headers: dict = None
 ) -> JSONResponse:
     """
     표준 에러 응답 생성
@@ -50,7 +54,7 @@ def create_error_response(
     if request_id:
         content["request_id"] = request_id
     
-    headers = {}
+    headers = dict(headers or {})
     if request_id:
         headers["X-Request-ID"] = request_id
     
@@ -82,7 +86,8 @@ async def custom_exception_handler(
         request=request,
         status_code=exc.status_code,
         message=exc.detail,
-        error_code=exc.error_code
+        error_code=exc.error_code,
+        headers=exc.headers
     )
 
 async def http_exception_handler(
@@ -107,7 +112,8 @@ async def http_exception_handler(
         request=request,
         status_code=exc.status_code,
         message=exc.detail,
-        error_code="HTTP_ERROR"
+        error_code="HTTP_ERROR",
+        headers=getattr(exc, "headers", None)
     )
 
 async def validation_exception_handler(
@@ -226,6 +232,9 @@ def setup_exception_handlers(app):
     app.add_exception_handler(HostingNotFoundError, custom_exception_handler)
     app.add_exception_handler(HostingAlreadyExistsError, custom_exception_handler)
     app.add_exception_handler(VMOperationError, custom_exception_handler)
+    app.add_exception_handler(HostCapacityExceededError, custom_exception_handler)
+    app.add_exception_handler(NodeNotFoundError, custom_exception_handler)
+    app.add_exception_handler(NodeAlreadyExistsError, custom_exception_handler)
     app.add_exception_handler(WebHostingException, custom_exception_handler)
     
     # 표준 FastAPI 예외 핸들러들
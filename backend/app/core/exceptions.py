@@ -82,6 +82,61 @@ class InsufficientPermissionError(WebHostingException):
             error_code="INSUFFICIENT_PERMISSION"
         )
 
+class NodeNotFoundError(WebHostingException):
+    """노드 없음"""
+    def __init__(self, detail: str = "노드를 찾을 수 없습니다."):
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=detail,
+            error_code="NODE_NOT_FOUND"
+        )
+
+class NodeAlreadyExistsError(WebHostingException):
+    """노드 중복"""
+    def __init__(self, detail: str = "이미 등록된 노드 이름입니다."):
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=detail,
+            error_code="NODE_ALREADY_EXISTS"
+        )
+
+class HostCapacityExceededError(WebHostingException):
+    """호스트 용량 초과 (잠시 후 재시도 가능)"""
+    def __init__(self, detail: str = "호스트 용량이 부족합니다. 잠시 후 다시 시도해주세요.", retry_after: int = 30):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            error_code="HOST_CAPACITY_EXCEEDED",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+class InvalidOperationError(WebHostingException):
+    """요청한 운영 명령을 현재 상태에서 실행할 수 없음 (잘못된 대상 등)"""
+    def __init__(self, detail: str = "실행할 수 없는 운영 명령입니다."):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail,
+            error_code="INVALID_OPERATION"
+        )
+
+class InvalidDeployError(WebHostingException):
+    """배포 파일이 올바르지 않음 (압축 파일 형식, 허용되지 않는 경로)"""
+    def __init__(self, detail: str = "배포 파일이 올바르지 않습니다."):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail,
+            error_code="INVALID_DEPLOY"
+        )
+
+class DeployTooLargeError(WebHostingException):
+    """배포 업로드/압축 해제 크기 제한 초과"""
+    def __init__(self, detail: str = "배포 파일이 허용된 크기를 초과했습니다."):
+        super().__init__(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=detail,
+            error_code="DEPLOY_TOO_LARGE"
+        )
+
 # 예외 처리기들
 async def webhostingexception_handler(request: Request, exc: WebHostingException):
     """웹 호스팅 서비스 예외 처리기"""
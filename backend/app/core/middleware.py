@@ -7,10 +7,13 @@ from typing import Callable
 from fastapi import Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
 
 from app.core.config import settings
+from app.services.route_service import MISS, WAKE_PREFIX, get_route_table, is_wake_upstream
+from app.services.scale_to_zero_service import wake_tenant
 from app.utils.logging_utils import get_logger, log_request_info, log_performance
 
 logger = get_logger("middleware")
@@ -182,6 +185,124 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         
         return response
 
+class TenantRouteResolverMiddleware:
+    """
+    nginx auth_request용 테넌트 라우트 리졸버 (순수 ASGI)
+    
+    GET /internal/routes/{user_id} 요청에 upstream을 X-Tenant-Upstream 헤더로 응답합니다.
+    테넌트 요청마다 호출되므로 로깅/레이트 리미트 미들웨어와 라우팅을 거치지 않고
+    메모리 라우트 테이블만 조회합니다 (없으면 403 → nginx에서 404 처리).
+    """
+    
+    PREFIX = "/internal/routes/"
+    
+    def __init__(self, app):
+        self.app = app
+        self.allowed_clients = set(settings.PROXY_RESOLVER_ALLOWED_CLIENTS)
+        self.routes = get_route_table()
+    
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if scope["type"] != "http" or not path.startswith(self.PREFIX):
+            await self.app(scope, receive, send)
+            return
+        
+        client = scope.get("client")
+        if not client or client[0] not in self.allowed_clients:
+            await self.app(scope, receive, send)
+            return
+        
+        user_id = path[len(self.PREFIX):]
+        upstream = self.routes.cached(user_id)
+        if upstream is MISS:
+            # 다른 워커에서 추가되었거나 만료된 항목만 DB에서 확인
+            upstream = await run_in_threadpool(self.routes.refresh, user_id)
+        
+        if upstream:
+            status, headers = 200, [(b"x-tenant-upstream", upstream.encode()), (b"content-length", b"0")]
+            if is_wake_upstream(upstream):
+                # 깨운 뒤 바로 컨테이너로 라우팅되도록 nginx 리졸버 캐시에 남기지 않음
+                headers.append((b"x-accel-expires", b"0"))
+        else:
+            status, headers = 403, [(b"content-length", b"0")]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+
+class TenantWakeMiddleware:
+    """
+    유휴 자동 중지된 테넌트 깨우기 (순수 ASGI)
+    
+    nginx가 응답하지 않는 컨테이너 대신 보낸 /internal/wake/{user_id}[/경로] 요청에
+    컨테이너를 시작하고, 웹 포트가 응답하면 원래 주소(X-Original-URI 또는 경로)로
+    307 리다이렉트해서 클라이언트가 요청을 다시 보내게 합니다.
+    깨울 호스팅이 없거나 실패하면 잠시 후 새로고침하는 준비 중 페이지(503)를 응답하므로
+    컨테이너 자체의 오류로 리다이렉트가 반복되지 않습니다.
+    """
+    
+    PREFIX = WAKE_PREFIX
+    
+    STARTING_PAGE = (
+        '<!DOCTYPE html><html lang="ko"><head><meta charset="UTF-8"><title>서비스 준비 중</title></head>'
+        '<body style="font-family: Arial, sans-serif; text-align: center; padding: 50px;">'
+        '<h1>🔧 호스팅 준비 중</h1><p>웹사이트를 시작하고 있습니다. 잠시 후 자동으로 새로고침됩니다.</p>'
+        '</body></html>'
+    ).encode()
+    
+    def __init__(self, app):
+        self.app = app
+        self.allowed_clients = set(settings.PROXY_RESOLVER_ALLOWED_CLIENTS)
+    
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if scope["type"] != "http" or not path.startswith(self.PREFIX):
+            await self.app(scope, receive, send)
+            return
+        
+        client = scope.get("client")
+        user_id, _, rest = path[len(self.PREFIX):].partition("/")
+        if not client or client[0] not in self.allowed_clients or not user_id.isdigit():
+            await self.app(scope, receive, send)
+            return
+        
+        try:
+            woken = await run_in_threadpool(wake_tenant, user_id)
+        except Exception as e:
+            logger.warning(f"테넌트 깨우기 실패: 사용자 {user_id}: {e}")
+            woken = None
+        
+        if woken:
+            status = 307
+            headers = [
+                (b"location", self._original_uri(scope, user_id, rest).encode("latin-1")),
+                (b"cache-control", b"no-store"),
+                (b"content-length", b"0")
+            ]
+            body = b""
+        else:
+            status = 503
+            headers = [
+                (b"content-type", b"text/html; charset=utf-8"),
+                (b"cache-control", b"no-store"),
+                (b"retry-after", b"5"),
+                (b"refresh", b"5"),
+                (b"content-length", str(len(self.STARTING_PAGE)).encode())
+            ]
+            body = self.STARTING_PAGE
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+    
+    @staticmethod
+    def _original_uri(scope, user_id: str, rest: str) -> str:
+        """리다이렉트할 원래 요청 주소 (같은 사용자 경로만 허용)"""
+        headers = dict(scope.get("headers") or [])
+        original = headers.get(b"x-original-uri", b"").decode("latin-1")
+        if original == f"/{user_id}" or original.startswith((f"/{user_id}/", f"/{user_id}?")):
+            if "\r" not in original and "\n" not in original:
+                return original
+        
+        query = scope.get("query_string", b"").decode("latin-1")
+        return f"/{user_id}/{rest}" + (f"?{query}" if query else "")
+
 def setup_cors_middleware(app):
     """
     CORS 미들웨어 설정
@@ -250,7 +371,14 @@ def setup_all_middleware(app):
     # 2. CORS 미들웨어
     setup_cors_middleware(app)
     
-    # 3. 신뢰할 수 있는 호스트 미들웨어 (가장 먼저 실행)
+    # 3. 신뢰할 수 있는 호스트 미들웨어
     setup_trusted_host_middleware(app)
     
+    # 4. 테넌트 라우트 리졸버 (가장 먼저 실행, 다른 미들웨어를 거치지 않음)
+    if settings.PROXY_ROUTING_MODE == "resolver":
+        app.add_middleware(TenantRouteResolverMiddleware)
+    
+    # 5. 유휴 자동 중지된 테넌트 깨우기 (nginx 폴백에서 호출, 다른 미들웨어를 거치지 않음)
+    app.add_middleware(TenantWakeMiddleware)
+    
     logger.info("모든 미들웨어가 설정되었습니다.") 
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""
+테넌트 리소스 플랜 정의 (컨테이너 cgroup 제한)
+"""
+from typing import Dict, Any, Optional
+
+from app.core.config import settings
+
+# 리소스 제한 항목 (Hosting 모델 컬럼명과 동일)
+RESOURCE_FIELDS = ("memory_mb", "cpus", "cpu_shares", "pids_limit", "blkio_weight")
+
+# 컨테이너 없이 프론트 nginx가 웹 디렉토리를 직접 서빙하는 플랜 (cgroup 제한 없음)
+STATIC_PLAN = "static"
+
+
+def _plans() -> Dict[str, Dict[str, Any]]:
+    # standard 플랜은 VM 기본 설정값을 그대로 사용
+    return {
+        STATIC_PLAN: {},
+        "basic": {
+            "memory_mb": max(settings.VM_DEFAULT_MEMORY // 4, 64),
+            "cpus": settings.VM_DEFAULT_VCPUS * 0.5,
+            "cpu_shares": 512,
+            "pids_limit": 128,
+            "blkio_weight": 300
+        },
+        "standard": {
+            "memory_mb": settings.VM_DEFAULT_MEMORY,
+            "cpus": float(settings.VM_DEFAULT_VCPUS),
+            "cpu_shares": 1024,
+            "pids_limit": 256,
+            "blkio_weight": 500
+        },
+        "premium": {
+            "memory_mb": settings.VM_DEFAULT_MEMORY * 2,
+            "cpus": settings.VM_DEFAULT_VCPUS * 2.0,
+            "cpu_shares": 2048,
+            "pids_limit": 512,
+            "blkio_weight": 800
+        }
+    }
+
+
+RESOURCE_PLANS: Dict[str, Dict[str, Any]] = _plans()
+
+
+def get_resource_plan(name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    플랜 이름으로 리소스 제한값 조회 (없으면 기본 플랜)
+    """
+    name = name or settings.DEFAULT_RESOURCE_PLAN
+    if name not in RESOURCE_PLANS:
+        raise ValueError(f"존재하지 않는 리소스 플랜입니다: {name}")
+    return dict(RESOURCE_PLANS[name])
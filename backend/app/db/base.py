@@ -7,6 +7,8 @@ from app.models.base import Base
 # 모든 모델을 import하여 Alembic이 인식할 수 있도록 함
 from app.models.user import User
 from app.models.hosting import Hosting
+from app.models.provisioning import ProvisioningJournal
+from app.models.node import Node
 
 # Base 클래스 및 모든 모델 export
 __all__ = ["Base"] 
\ No newline at end of file
@@ -8,7 +8,7 @@ from pathlib import Path
 from app.core.config import settings
 from app.core.middleware import setup_all_middleware
 from app.core.exception_handlers import setup_exception_handlers
-from app.core.events import setup_event_handlers, start_background_tasks
+from app.core.events import setup_event_handlers
 from app.api.api import api_router
 from app.utils.logging_utils import get_logger
 
@@ -46,9 +46,6 @@ def create_application() -> FastAPI:
     # API 라우터 포함
     app.include_router(api_router, prefix="/api/v1")
     
-    # 백그라운드 작업 시작
-    # start_background_tasks()  # 필요시 활성화
-    
     logger.info(f"{settings.PROJECT_NAME} 애플리케이션이 생성되었습니다.")
     return app
 
@@ -156,6 +153,13 @@ async def detailed_health_check():
         db_status = "unhealthy"
         db_error = str(e)
     
+    # 호스트 기능 정보 (캐시 사용, fork 없음)
+    try:
+        from app.services.capability_service import get_capability_detector
+        capabilities = get_capability_detector().get().to_dict()
+    except Exception as e:
+        capabilities = {"error": str(e)}
+    
     # 전체 상태 결정
     overall_status = "healthy" if db_status == "healthy" else "unhealthy"
     
@@ -173,7 +177,8 @@ async def detailed_health_check():
         "environment": {
             "debug": settings.DEBUG,
             "log_level": settings.LOG_LEVEL
-        }
+        },
+        "capabilities": capabilities
     }
     
     return create_success_response(
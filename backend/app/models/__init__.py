@@ -4,6 +4,8 @@
 from .base import Base, BaseModel
 from .user import User
 from .hosting import Hosting, HostingStatus
+from .provisioning import ProvisioningJournal, ProvisioningStep
+from .node import Node
 
 # 모든 모델을 외부에서 import할 수 있도록 설정
 __all__ = [
@@ -11,5 +13,8 @@ __all__ = [
     "BaseModel", 
     "User",
     "Hosting",
-    "HostingStatus"
+    "HostingStatus",
+    "ProvisioningJournal",
+    "ProvisioningStep",
+    "Node"
 ]
@@ -1,10 +1,12 @@
 """
 호스팅 모델 정의
 """
-from sqlalchemy import Column, String, Integer, ForeignKey, Enum
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, Enum, DateTime
 from sqlalchemy.orm import relationship
 from enum import Enum as PyEnum
 from .base import BaseModel
+from app.core.config import settings
+from app.core.resource_plans import RESOURCE_FIELDS
 
 class HostingStatus(PyEnum):
     """호스팅 상태 Enum"""
@@ -28,12 +30,43 @@ class Hosting(BaseModel):
     vm_id = Column(String(100), unique=True, nullable=False, index=True)
     vm_ip = Column(String(15), nullable=False)  # IPv4 주소
     ssh_port = Column(Integer, nullable=False, unique=True)
+    mac_address = Column(String(17), nullable=True, unique=True, index=True)  # DHCP 리스 조회용 (libvirt 도메인)
+    domain_uuid = Column(String(36), nullable=True, unique=True, index=True)  # libvirt 도메인 UUID
     
     # 호스팅 상태
     status = Column(Enum(HostingStatus), default=HostingStatus.CREATING, nullable=False)
     
+    # 배치된 Docker 노드 (NULL이면 로컬 호스트)
+    node_id = Column(Integer, ForeignKey("nodes.id"), nullable=True, index=True)
+    
+    # 리소스 플랜 및 컨테이너 cgroup 제한 (NULL이면 제한 없음)
+    plan = Column(String(20), nullable=True)
+    memory_mb = Column(Integer, nullable=True)
+    cpus = Column(Float, nullable=True)
+    cpu_shares = Column(Integer, nullable=True)
+    pids_limit = Column(Integer, nullable=True)
+    blkio_weight = Column(Integer, nullable=True)
+    
+    # vCPU/NUMA 배치 (cpuset은 vCPU 순서대로 배정된 호스트 CPU, 예: "4,5")
+    cpuset = Column(String(255), nullable=True)
+    numa_node = Column(Integer, nullable=True)
+    
+    # 프록시 캐시 (HTML 마이크로캐시 초, NULL/0이면 사용 안 함 / 캐시 용량 제한, NULL이면 기본값)
+    microcache_seconds = Column(Integer, nullable=True)
+    cache_max_mb = Column(Integer, nullable=True)
+    
+    # 유휴 자동 중지 시각 (scale-to-zero, NULL이 아니면 첫 요청 때 자동으로 깨움)
+    idle_stopped_at = Column(DateTime(timezone=True), nullable=True)
+    
     # 관계 설정
     user = relationship("User", back_populates="hosting")
+    node = relationship("Node", back_populates="hostings")
+    provisioning_steps = relationship(
+        "ProvisioningJournal",
+        back_populates="hosting",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
     
     def __repr__(self):
         return f"<Hosting(id={self.id}, name='{self.name}', user_id={self.user_id}, vm_id='{self.vm_id}', status='{self.status.value}')>"
@@ -45,5 +78,16 @@ class Hosting(BaseModel):
     
     @property
     def ssh_command(self):
-        """SSH 접속 명령어 생성"""
-        return f"ssh -p {self.ssh_port} user@localhost" 
\ No newline at end of file
+        """SSH 접속 명령어 생성 (게이트웨이 모드는 단일 포트 + 사용자 이름으로 라우팅)"""
+        if settings.SSH_GATEWAY_ENABLED:
+            return f"ssh -p {settings.SSH_GATEWAY_PORT} ubuntu+{self.id}@localhost"
+        return f"ssh -p {self.ssh_port} user@localhost"
+    
+    @property
+    def resources(self):
+        """리소스 제한값 (설정되지 않은 항목 제외)"""
+        return {
+            field: getattr(self, field)
+            for field in RESOURCE_FIELDS
+            if getattr(self, field) is not None
+        }
@@ -0,0 +1,39 @@
+"""
+Docker 노드 모델 정의 (멀티 호스트 배치)
+"""
+from sqlalchemy import Boolean, Column, String, Integer, Float, Text
+from sqlalchemy.orm import relationship
+from .base import BaseModel
+
+class Node(BaseModel):
+    """
+    테넌트 컨테이너를 실행하는 Docker 호스트
+    
+    VM 이미지 경로(웹 디렉토리)는 모든 노드에 같은 경로로 공유 마운트되어 있어야 합니다.
+    """
+    __tablename__ = "nodes"
+    
+    # 노드 식별 정보
+    name = Column(String(100), unique=True, nullable=False, index=True)
+    
+    # Docker API 엔드포인트 (예: tcp://10.0.0.5:2376, unix:///var/run/docker.sock)
+    docker_host = Column(String(255), nullable=False)
+    
+    # 프록시가 테넌트 웹 포트로 접근할 주소
+    address = Column(String(255), nullable=False)
+    
+    # 테넌트에 할당 가능한 용량
+    memory_mb = Column(Integer, nullable=False)
+    cpus = Column(Float, nullable=False)
+    
+    # 배치 조건용 라벨 (JSON 문자열)
+    labels = Column(Text, nullable=True)
+    
+    # 신규 배치 허용 여부 (비활성 노드의 기존 호스팅은 유지)
+    is_active = Column(Boolean, default=True, nullable=False)
+    
+    # 관계 설정
+    hostings = relationship("Hosting", back_populates="node")
+    
+    def __repr__(self):
+        return f"<Node(id={self.id}, name='{self.name}', docker_host='{self.docker_host}')>"
@@ -0,0 +1,34 @@
+"""
+호스팅 프로비저닝 단계 저널 모델 정의
+"""
+from sqlalchemy import Column, Integer, ForeignKey, Enum, Text, UniqueConstraint
+from sqlalchemy.orm import relationship
+from enum import Enum as PyEnum
+from .base import BaseModel
+
+class ProvisioningStep(PyEnum):
+    """프로비저닝 단계 Enum (실행 순서대로 정의)"""
+    PORT_RESERVED = "port_reserved"
+    KEYS_GENERATED = "keys_generated"
+    CONTAINER_CREATED = "container_created"
+    PROXY_CONFIGURED = "proxy_configured"
+    VERIFIED = "verified"
+
+class ProvisioningJournal(BaseModel):
+    """프로비저닝 단계 저널 (완료된 단계마다 1행)"""
+    __tablename__ = "provisioning_journal"
+    __table_args__ = (
+        UniqueConstraint("hosting_id", "step", name="uq_provisioning_journal_hosting_step"),
+    )
+    
+    hosting_id = Column(Integer, ForeignKey("hosting.id", ondelete="CASCADE"), nullable=False, index=True)
+    step = Column(Enum(ProvisioningStep), nullable=False)
+    
+    # 단계 결과 (재개/보상 시 필요한 정보, JSON 문자열)
+    payload = Column(Text, nullable=True)
+    
+    # 관계 설정
+    hosting = relationship("Hosting", back_populates="provisioning_steps")
+    
+    def __repr__(self):
+        return f"<ProvisioningJournal(hosting_id={self.hosting_id}, step='{self.step.value}')>"
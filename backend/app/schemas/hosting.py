@@ -6,14 +6,49 @@ from datetime import datetime
 from pydantic import BaseModel, Field, field_validator
 from app.models.hosting import HostingStatus
 from app.schemas.user import UserResponse
+from app.core.resource_plans import RESOURCE_PLANS
 
 class HostingBase(BaseModel):
     """호스팅 기본 정보"""
     pass
 
+class HostingResources(BaseModel):
+    """컨테이너 리소스 제한"""
+    memory_mb: Optional[int] = Field(None, ge=64, description="메모리 제한 (MB)")
+    cpus: Optional[float] = Field(None, gt=0, le=64, description="CPU 사용량 제한 (코어 수)")
+    cpu_shares: Optional[int] = Field(None, ge=2, le=262144, description="CPU 상대 가중치")
+    pids_limit: Optional[int] = Field(None, ge=16, description="최대 프로세스 수")
+    blkio_weight: Optional[int] = Field(None, ge=10, le=1000, description="블록 I/O 가중치")
+
+def _validate_plan(v):
+    if v is not None and v not in RESOURCE_PLANS:
+        raise ValueError(f'존재하지 않는 리소스 플랜입니다. 사용 가능한 플랜: {", ".join(RESOURCE_PLANS)}')
+    return v
+
 class HostingCreate(HostingBase):
     """호스팅 생성 요청 (사용자는 자동으로 현재 로그인 사용자)"""
     name: Optional[str] = Field(None, description="호스팅 이름 (없을 경우 자동 생성)")
+    plan: Optional[str] = Field(None, description="리소스 플랜 (없을 경우 기본 플랜)")
+    node_labels: Optional[Dict[str, str]] = Field(None, description="배치할 노드가 가져야 하는 라벨")
+    
+    @field_validator('plan')
+    @classmethod
+    def validate_plan(cls, v):
+        return _validate_plan(v)
+
+class HostingResourceUpdate(HostingResources):
+    """호스팅 리소스 제한 변경 (플랜 지정 시 플랜 값 위에 개별 항목 적용)"""
+    plan: Optional[str] = Field(None, description="변경할 리소스 플랜")
+    
+    @field_validator('plan')
+    @classmethod
+    def validate_plan(cls, v):
+        return _validate_plan(v)
+
+class HostingCacheUpdate(BaseModel):
+    """호스팅 프록시 캐시 설정 변경"""
+    microcache_seconds: Optional[int] = Field(None, ge=0, le=5, description="HTML 마이크로캐시 시간 (초, 0이면 사용 안 함)")
+    cache_max_mb: Optional[int] = Field(None, ge=1, description="프록시 캐시 용량 제한 (MB)")
 
 class HostingUpdate(BaseModel):
     """호스팅 상태 업데이트"""
@@ -37,6 +72,20 @@ class HostingResponse(BaseModel):
     ssh_command: Optional[str] = Field(None, description="SSH 접속 명령어")
     web_port: Optional[int] = Field(None, description="웹 포트 번호")
     
+    # 리소스 플랜
+    plan: Optional[str] = Field(None, description="리소스 플랜")
+    resources: Optional[HostingResources] = Field(None, description="컨테이너 리소스 제한")
+    node_id: Optional[int] = Field(None, description="배치된 노드 ID (없으면 로컬 호스트)")
+    mac_address: Optional[str] = Field(None, description="VM 네트워크 인터페이스 MAC 주소")
+    domain_uuid: Optional[str] = Field(None, description="libvirt 도메인 UUID")
+    cpuset: Optional[str] = Field(None, description="vCPU별 배정된 호스트 CPU")
+    numa_node: Optional[int] = Field(None, description="배정된 NUMA 노드")
+    
+    # 프록시 캐시
+    microcache_seconds: Optional[int] = Field(None, description="HTML 마이크로캐시 시간 (초)")
+    cache_max_mb: Optional[int] = Field(None, description="프록시 캐시 용량 제한 (MB)")
+    idle_stopped_at: Optional[datetime] = Field(None, description="유휴 자동 중지 시각 (첫 요청 때 자동 시작)")
+    
     model_config = {"from_attributes": True}
 
 class HostingDetail(HostingResponse):
@@ -116,12 +165,13 @@ class VMInfo(BaseModel):
     
 class HostingOperation(BaseModel):
     """호스팅 운영 명령"""
-    operation: str = Field(..., description="운영 명령 (start, stop, restart, delete)")
+    operation: str = Field(..., description="운영 명령 (start, stop, restart, delete, snapshot, restore)")
+    snapshot_name: Optional[str] = Field(None, pattern=r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$", description="스냅샷 이름 (snapshot은 생략 시 자동 생성, restore는 필수)")
     
     @field_validator('operation')
     @classmethod
     def validate_operation(cls, v):
-        allowed_operations = ['start', 'stop', 'restart', 'delete']
+        allowed_operations = ['start', 'stop', 'restart', 'delete', 'snapshot', 'restore']
         if v not in allowed_operations:
             raise ValueError(f'허용되지 않은 운영 명령입니다. 허용된 명령: {", ".join(allowed_operations)}')
         return v 
\ No newline at end of file
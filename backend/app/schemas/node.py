@@ -0,0 +1,61 @@
+"""
+Docker 노드 관련 Pydantic 스키마
+"""
+import ipaddress
+import json
+from typing import Optional, Dict
+from datetime import datetime
+from pydantic import BaseModel, Field, field_validator
+
+DOCKER_HOST_SCHEMES = ("tcp://", "unix://", "ssh://")
+
+class NodeCreate(BaseModel):
+    """노드 등록 요청"""
+    name: str = Field(..., min_length=1, max_length=100, description="노드 이름")
+    docker_host: str = Field(..., description="Docker API 엔드포인트 (tcp://, unix://, ssh://)")
+    address: str = Field(..., description="프록시가 접근할 노드 IPv4 주소 (호스팅 vm_ip로 그대로 복사됨)")
+    memory_mb: int = Field(..., ge=256, description="테넌트에 할당 가능한 메모리 (MB)")
+    cpus: float = Field(..., gt=0, description="테넌트에 할당 가능한 CPU 수")
+    labels: Dict[str, str] = Field(default_factory=dict, description="배치 조건용 라벨")
+    
+    @field_validator('docker_host')
+    @classmethod
+    def validate_docker_host(cls, v):
+        if not v.startswith(DOCKER_HOST_SCHEMES):
+            raise ValueError(f'Docker 엔드포인트는 {", ".join(DOCKER_HOST_SCHEMES)} 중 하나로 시작해야 합니다.')
+        return v
+    
+    @field_validator('address')
+    @classmethod
+    def validate_address(cls, v):
+        # 원격 노드 호스팅은 노드 주소를 Hosting.vm_ip(String(15))에 저장하므로 IPv4만 허용
+        try:
+            return str(ipaddress.IPv4Address(v.strip()))
+        except ValueError:
+            raise ValueError('노드 주소는 IPv4 주소여야 합니다. (호스트 이름/IPv6 미지원)')
+
+class NodeResponse(BaseModel):
+    """노드 응답"""
+    id: int = Field(..., description="노드 ID")
+    name: str = Field(..., description="노드 이름")
+    docker_host: str = Field(..., description="Docker API 엔드포인트")
+    address: str = Field(..., description="노드 주소")
+    memory_mb: int = Field(..., description="할당 가능 메모리 (MB)")
+    cpus: float = Field(..., description="할당 가능 CPU 수")
+    labels: Dict[str, str] = Field(default_factory=dict, description="라벨")
+    is_active: bool = Field(..., description="신규 배치 허용 여부")
+    created_at: datetime = Field(..., description="등록 시간")
+    
+    # 현재 부하 (조회 시 계산)
+    committed_memory_mb: Optional[float] = Field(None, description="커밋된 메모리 (MB)")
+    committed_cpus: Optional[float] = Field(None, description="커밋된 CPU")
+    hosting_count: Optional[int] = Field(None, description="배치된 호스팅 수")
+    
+    model_config = {"from_attributes": True}
+    
+    @field_validator('labels', mode='before')
+    @classmethod
+    def parse_labels(cls, v):
+        if isinstance(v, str):
+            return json.loads(v) if v else {}
+        return v or {}
@@ -0,0 +1,379 @@
+"""
+테넌트 접근 로그 수집 서비스
+
+nginx가 모든 테넌트 요청을 하나의 JSON 접근 로그(tenant_json 형식)에 기록하면,
+이 수집기가 로그를 이어서 읽어(inode/오프셋 체크포인트, 로테이션 처리)
+테넌트별 요청 수, 전송 바이트, 상태 코드 분류, 응답 시간 분위수를 고정 길이 구간으로 집계합니다.
+
+구간 집계는 테넌트별 고정 크기 int64 배열 파일(TrafficRing)에 기록하므로 테넌트가 늘어도
+수집 주기마다 다시 쓰는 양은 새 줄이 닿은 구간뿐입니다. 로그는 READ_CHUNK_SIZE 단위 배치로 읽고
+배치마다 번호를 붙여 체크포인트를 남기며, 테넌트 파일은 마지막으로 적용한 배치 번호를 기억하므로
+중간에 중단된 배치를 다시 읽어도 같은 줄을 두 번 집계하지 않습니다.
+테넌트별 마지막 요청 시각(last_seen)은 체크포인트와 함께 상태 파일에 기록되며
+유휴 컨테이너 자동 중지(scale_to_zero_service)에 사용됩니다.
+"""
+import fcntl
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.utils.logging_utils import get_logger
+
+logger = get_logger("access_log_service")
+
+# 응답 시간 히스토그램 경계 (ms, 마지막 칸은 그 이상) - 구간끼리 더할 수 있고 크기가 고정됨
+LATENCY_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+# 한 번에 읽는 최대 바이트 (큰 로그가 밀려 있어도 메모리 사용량 제한)
+READ_CHUNK_SIZE = 8 * 1024 * 1024
+
+STATUS_CLASSES = ("1xx", "2xx", "3xx", "4xx", "5xx")
+
+# 집계 파일 이름으로 쓰는 테넌트 식별자 (nginx map의 사용자 ID)
+_TENANT = re.compile(r"^[0-9A-Za-z_-]{1,64}$")
+
+
+def _empty_window() -> Dict[str, Any]:
+    return {
+        "requests": 0,
+        "bytes": 0,
+        "status": dict.fromkeys(STATUS_CLASSES, 0),
+        "latency": [0] * (len(LATENCY_BOUNDS_MS) + 1)
+    }
+
+
+def latency_quantile(histogram: List[int], quantile: float) -> Optional[float]:
+    """히스토그램에서 분위수 추정 (해당 칸의 상한, 마지막 칸은 마지막 경계)"""
+    total = sum(histogram)
+    if total == 0:
+        return None
+    rank = quantile * total
+    seen = 0
+    for index, count in enumerate(histogram):
+        seen += count
+        if seen >= rank and count:
+            return float(LATENCY_BOUNDS_MS[min(index, len(LATENCY_BOUNDS_MS) - 1)])
+    return float(LATENCY_BOUNDS_MS[-1])
+
+
+def summarize(windows: Dict[int, Dict[str, Any]], since: float = 0) -> Dict[str, Any]:
+    """테넌트 한 명의 구간들을 합산한 요약과 구간별 추이"""
+    total = _empty_window()
+    series = []
+    for start in sorted(windows):
+        if start < since:
+            continue
+        window = windows[start]
+        total["requests"] += window["requests"]
+        total["bytes"] += window["bytes"]
+        for status_class, count in window["status"].items():
+            total["status"][status_class] = total["status"].get(status_class, 0) + count
+        total["latency"] = [a + b for a, b in zip(total["latency"], window["latency"])]
+        series.append({
+            "start": start,
+            "requests": window["requests"],
+            "bytes": window["bytes"],
+            "status": window["status"],
+            "p50_ms": latency_quantile(window["latency"], 0.5),
+            "p99_ms": latency_quantile(window["latency"], 0.99)
+        })
+    
+    return {
+        "requests": total["requests"],
+        "bytes": total["bytes"],
+        "status": total["status"],
+        "latency_ms": {
+            "p50": latency_quantile(total["latency"], 0.5),
+            "p90": latency_quantile(total["latency"], 0.9),
+            "p99": latency_quantile(total["latency"], 0.99)
+        },
+        "windows": series
+    }
+
+
+class TrafficRing:
+    """
+    테넌트 하나의 고정 크기 구간 집계 파일 (int64 배열)
+    
+    파일 구조: [마지막으로 적용한 배치 번호] + 보관 구간 수 × [구간 시작, 요청 수, 바이트, 상태 분류..., 응답 시간 히스토그램...]
+    칸은 구간 시작 시각으로 정해지므로(시작 // 구간 길이 % 보관 구간 수) 보관 기간이 지난 구간은
+    같은 칸의 새 구간이 덮어씁니다. 희소 파일로 만들어 기록한 칸만 디스크를 차지합니다.
+    """
+    
+    HEADER = 1
+    SLOT = 3 + len(STATUS_CLASSES) + len(LATENCY_BOUNDS_MS) + 1
+    ITEM = array("q").itemsize
+    
+    def __init__(self, path: Path, window_seconds: int, capacity: int):
+        self.path = Path(path)
+        self.window_seconds = window_seconds
+        self.capacity = capacity
+    
+    def _offset(self, start: int) -> int:
+        slot = (start // self.window_seconds) % self.capacity
+        return self.ITEM * (self.HEADER + slot * self.SLOT)
+    
+    def _read_slot(self, f, start: int) -> array:
+        f.seek(self._offset(start))
+        slot = array("q")
+        slot.frombytes(f.read(self.ITEM * self.SLOT))
+        return slot
+    
+    def merge(self, windows: Dict[int, Dict[str, Any]], batch: int) -> bool:
+        """
+        배치 하나의 구간 집계를 더하기
+        
+        Returns:
+            적용 여부 (이미 적용한 배치면 False)
+        """
+        size = self.ITEM * (self.HEADER + self.capacity * self.SLOT)
+        if not self.path.exists() or self.path.stat().st_size != size:
+            # 처음 기록하거나 보관 구간 수 설정이 바뀐 경우 새로 만듦
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "wb") as f:
+                f.truncate(size)
+        
+        with open(self.path, "r+b") as f:
+            header = array("q")
+            header.frombytes(f.read(self.ITEM * self.HEADER))
+            if header[0] >= batch:
+                return False
+            
+            for start, window in windows.items():
+                slot = self._read_slot(f, start)
+                if slot[0] > start:
+                    # 같은 칸에 더 최근 구간이 있음 (보관 기간보다 늦게 도착한 줄)
+                    continue
+                if slot[0] < start:
+                    slot = array("q", [start] + [0] * (self.SLOT - 1))
+                slot[1] += window["requests"]
+                slot[2] += window["bytes"]
+                for index, status_class in enumerate(STATUS_CLASSES, start=3):
+                    slot[index] += window["status"][status_class]
+                for index, count in enumerate(window["latency"], start=3 + len(STATUS_CLASSES)):
+                    slot[index] += count
+                f.seek(self._offset(start))
+                f.write(slot.tobytes())
+            
+            # 구간을 먼저 쓰고 배치 번호를 갱신해 중단되면 배치 전체를 다시 적용
+            f.seek(0)
+            f.write(array("q", [batch]).tobytes())
+        return True
+    
+    def read(self, since: float, now: float) -> Dict[int, Dict[str, Any]]:
+        """since 이후 시작한 보관 중인 구간 (필요한 칸만 읽음)"""
+        windows: Dict[int, Dict[str, Any]] = {}
+        last = int(now // self.window_seconds) * self.window_seconds
+        first = max(-(-int(since) // self.window_seconds) * self.window_seconds, last - (self.capacity - 1) * self.window_seconds)
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return windows
+        with f:
+            for start in range(first, last + 1, self.window_seconds):
+                slot = self._read_slot(f, start)
+                if len(slot) < self.SLOT or slot[0] != start or not slot[1]:
+                    continue
+                latency_start = 3 + len(STATUS_CLASSES)
+                windows[start] = {
+                    "requests": slot[1],
+                    "bytes": slot[2],
+                    "status": dict(zip(STATUS_CLASSES, slot[3:latency_start])),
+                    "latency": list(slot[latency_start:])
+                }
+        return windows
+
+
+class AccessLogIngester:
+    """공유 JSON 접근 로그를 이어 읽어 테넌트별 구간 통계로 집계"""
+    
+    def __init__(
+        self,
+        log_path: Optional[str] = None,
+        state_dir: Optional[Path] = None,
+        window_seconds: Optional[int] = None,
+        retention_windows: Optional[int] = None
+    ):
+        self.log_path = Path(log_path or settings.TENANT_ACCESS_LOG_PATH)
+        self.state_dir = Path(state_dir or Path(settings.VM_IMAGE_PATH) / "access-log")
+        self.state_file = self.state_dir / "state.json"
+        self.windows_dir = self.state_dir / "windows"
+        self.window_seconds = window_seconds or settings.ACCESS_LOG_WINDOW_SECONDS
+        self.retention_windows = retention_windows or settings.ACCESS_LOG_RETENTION_WINDOWS
+    
+    def ring(self, tenant: str) -> TrafficRing:
+        return TrafficRing(self.windows_dir / f"{tenant}.ring", self.window_seconds, self.retention_windows)
+    
+    def load_state(self) -> Dict[str, Any]:
+        """체크포인트, 마지막 배치 번호, 테넌트별 마지막 요청 시각"""
+        try:
+            return json.loads(self.state_file.read_text())
+        except (OSError, ValueError):
+            return {"checkpoint": None, "batch": 0, "last_seen": {}}
+    
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        """체크포인트와 배치 번호를 함께 원자적으로 기록"""
+        fd, temp_path = tempfile.mkstemp(dir=self.state_dir, prefix=".state.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(state, f, separators=(",", ":"))
+            os.replace(temp_path, self.state_file)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+    
+    def _rotated_file(self, inode: int) -> Optional[Path]:
+        """로테이션으로 이름이 바뀐 이전 로그 파일 찾기 (logrotate 기본 이름 .1)"""
+        candidate = self.log_path.with_name(self.log_path.name + ".1")
+        try:
+            return candidate if candidate.stat().st_ino == inode else None
+        except OSError:
+            return None
+    
+    def _read_batches(self, path: Path, offset: int) -> Iterator[Tuple[List[bytes], int]]:
+        """offset부터 완성된 줄을 READ_CHUNK_SIZE 단위 배치로 읽기 (쓰는 중인 마지막 줄은 다음에 읽음)"""
+        with open(path, "rb") as f:
+            f.seek(offset)
+            while True:
+                data = f.read(READ_CHUNK_SIZE)
+                end = data.rfind(b"\n")
+                if end < 0:
+                    return
+                offset += end + 1
+                yield data[:end].split(b"\n"), offset
+                if len(data) < READ_CHUNK_SIZE:
+                    return
+                f.seek(offset)
+    
+    def _aggregate(self, lines: List[bytes], last_seen: Dict[str, float], batch: int) -> int:
+        """배치 하나를 테넌트별 구간으로 모아 집계 파일에 더하기"""
+        windows: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        ingested = 0
+        for line in lines:
+            try:
+                record = json.loads(line)
+                tenant = str(record.get("tenant") or "")
+                timestamp = float(record["ts"])
+                status_code = int(record["status"])
+            except (ValueError, KeyError, TypeError):
+                continue
+            if not _TENANT.match(tenant):
+                continue
+            
+            last_seen[tenant] = max(timestamp, last_seen.get(tenant, 0))
+            start = int(timestamp // self.window_seconds) * self.window_seconds
+            window = windows.setdefault(tenant, {}).setdefault(start, _empty_window())
+            window["requests"] += 1
+            window["bytes"] += int(record.get("bytes") or 0)
+            status_class = f"{status_code // 100}xx"
+            if status_class in window["status"]:
+                window["status"][status_class] += 1
+            latency_ms = float(record.get("rt") or 0) * 1000
+            window["latency"][bisect_left(LATENCY_BOUNDS_MS, latency_ms)] += 1
+            ingested += 1
+        
+        for tenant, tenant_windows in windows.items():
+            self.ring(tenant).merge(tenant_windows, batch)
+        return ingested
+    
+    def _prune(self, last_seen: Dict[str, float], now: float) -> None:
+        """보관 기간 동안 요청이 없던 테넌트의 기록과 집계 파일 정리"""
+        oldest = now - self.window_seconds * self.retention_windows
+        for tenant in [tenant for tenant, seen in last_seen.items() if seen < oldest]:
+            del last_seen[tenant]
+            self.ring(tenant).path.unlink(missing_ok=True)
+    
+    def poll(self, now: Optional[float] = None) -> int:
+        """
+        새로 추가된 로그 줄 집계
+        
+        여러 워커가 동시에 실행해도 한 번만 집계되도록 상태 디렉토리 잠금을 사용합니다.
+        
+        Returns:
+            집계한 요청 수
+        """
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.state_dir / ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            
+            state = self.load_state()
+            last_seen = state.setdefault("last_seen", {})
+            checkpoint = state.get("checkpoint")
+            
+            try:
+                current = self.log_path.stat()
+            except FileNotFoundError:
+                return 0
+            
+            if not checkpoint:
+                # 체크포인트 없이 남은 집계 파일은 배치 번호가 맞지 않으므로 처음부터 다시 집계
+                shutil.rmtree(self.windows_dir, ignore_errors=True)
+            
+            sources = []
+            offset = 0
+            if checkpoint:
+                if checkpoint["inode"] == current.st_ino:
+                    # copytruncate 방식 로테이션이면 파일이 줄어듦
+                    offset = checkpoint["offset"] if checkpoint["offset"] <= current.st_size else 0
+                else:
+                    # 이전 파일의 남은 줄을 먼저 읽고 새 파일은 처음부터
+                    rotated = self._rotated_file(checkpoint["inode"])
+                    if rotated is not None:
+                        sources.append((rotated, checkpoint["inode"], checkpoint["offset"]))
+                    else:
+                        logger.warning(f"로테이션된 접근 로그를 찾을 수 없어 일부 기록을 건너뜀: {self.log_path}")
+            sources.append((self.log_path, current.st_ino, offset))
+            
+            ingested = 0
+            for path, inode, offset in sources:
+                state["checkpoint"] = {"inode": inode, "offset": offset}
+                for lines, end_offset in self._read_batches(path, offset):
+                    state["batch"] = state.get("batch", 0) + 1
+                    ingested += self._aggregate(lines, last_seen, state["batch"])
+                    state["checkpoint"] = {"inode": inode, "offset": end_offset}
+                    self._save_state(state)
+            
+            self._prune(last_seen, now if now is not None else time.time())
+            state["updated_at"] = time.time()
+            self._save_state(state)
+        
+        if ingested:
+            logger.debug(f"접근 로그 집계: {ingested}건")
+        return ingested
+    
+    def last_seen(self) -> Tuple[Dict[str, float], Optional[float]]:
+        """테넌트별 마지막 요청 시각과 마지막 수집 시각 (수집 기록이 없으면 None)"""
+        state = self.load_state()
+        return state.get("last_seen", {}), state.get("updated_at")
+    
+    def load_windows(self, tenant: str, since: float = 0, now: Optional[float] = None) -> Dict[int, Dict[str, Any]]:
+        """테넌트의 보관 중인 구간 집계 (구간 시작 시각 → 집계)"""
+        if not _TENANT.match(str(tenant)):
+            return {}
+        return self.ring(str(tenant)).read(since, now if now is not None else time.time())
+    
+    def tenant_stats(self, tenant: str, minutes: int = 60, now: Optional[float] = None) -> Dict[str, Any]:
+        """테넌트의 최근 minutes분 요약"""
+        now = now if now is not None else time.time()
+        since = now - minutes * 60
+        return {"tenant": str(tenant), **summarize(self.load_windows(tenant, since, now), since=since)}
+    
+    def overview(self, minutes: int = 60, now: Optional[float] = None) -> Dict[str, Any]:
+        """전체 테넌트의 최근 minutes분 요약 (구간별 추이 제외)"""
+        now = now if now is not None else time.time()
+        since = now - minutes * 60
+        tenants = {}
+        for path in sorted(self.windows_dir.glob("*.ring")):
+            summary = summarize(self.load_windows(path.stem, since, now), since=since)
+            summary.pop("windows")
+            if summary["requests"]:
+                tenants[path.stem] = summary
+        return {"minutes": minutes, "tenants": tenants}
@@ -0,0 +1,125 @@
+"""
+VM 부팅 완료 시간 측정 서비스 - cloud-init phone_home 기반
+
+cloud-init 설정 생성 시각을 기록해 두고, 게스트의 cloud-init이 모든 단계를
+마친 뒤 phone_home으로 알려오면 경과 시간을 프로필별로 누적합니다.
+"""
+import hmac
+import json
+import time
+import hashlib
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+from app.core.config import settings
+from app.utils.logging_utils import get_logger
+from app.utils.stats_utils import percentile
+
+logger = get_logger("boot_time_service")
+
+# 통계 계산 시 읽을 최근 기록 수
+STATS_WINDOW = 1000
+
+
+class BootTimeRecorder:
+    """VM별 부팅 시작/완료 기록 및 프로필별 통계"""
+    
+    def __init__(self, image_root: Optional[str] = None):
+        self.cloud_init_root = Path(image_root or settings.VM_IMAGE_PATH) / "cloud-init"
+        self.records_path = self.cloud_init_root / "boot-times.jsonl"
+    
+    def phone_home_token(self, vm_id: str) -> str:
+        """
+        phone_home URL에 포함할 VM별 토큰 (게스트는 API 인증 정보가 없으므로 HMAC 사용)
+        """
+        digest = hmac.new(settings.SECRET_KEY.encode(), vm_id.encode(), hashlib.sha256)
+        return digest.hexdigest()[:32]
+    
+    def verify_token(self, vm_id: str, token: str) -> bool:
+        return hmac.compare_digest(self.phone_home_token(vm_id), token)
+    
+    def phone_home_url(self, vm_id: str) -> Optional[str]:
+        """cloud-init phone_home 대상 URL (CLOUD_INIT_PHONE_HOME_URL 미설정 시 None)"""
+        if not settings.CLOUD_INIT_PHONE_HOME_URL:
+            return None
+        base_url = settings.CLOUD_INIT_PHONE_HOME_URL.rstrip("/")
+        return f"{base_url}/host/vm-ready/{vm_id}/{self.phone_home_token(vm_id)}"
+    
+    def mark_started(self, vm_id: str, profile: str) -> None:
+        """
+        cloud-init 설정 생성 시각 기록
+        """
+        marker = self.cloud_init_root / vm_id / "boot.json"
+        marker.parent.mkdir(parents=True, exist_ok=True)
+        with open(marker, "w", encoding="utf-8") as f:
+            json.dump({"profile": profile, "started_at": time.time()}, f)
+    
+    def mark_ready(self, vm_id: str) -> Optional[Dict[str, Any]]:
+        """
+        부팅 완료 기록 (같은 VM의 중복 알림은 무시)
+        
+        Returns:
+            기록된 항목 (시작 기록이 없거나 이미 완료된 경우 None)
+        """
+        marker = self.cloud_init_root / vm_id / "boot.json"
+        try:
+            with open(marker, "r", encoding="utf-8") as f:
+                started = json.load(f)
+        except (FileNotFoundError, ValueError):
+            logger.warning(f"부팅 시작 기록이 없는 VM의 완료 알림: {vm_id}")
+            return None
+        
+        if started.get("ready_at"):
+            return None
+        
+        now = time.time()
+        record = {
+            "vm_id": vm_id,
+            "profile": started.get("profile"),
+            "seconds": round(now - started["started_at"], 1),
+            "ready_at": now
+        }
+        
+        started["ready_at"] = now
+        with open(marker, "w", encoding="utf-8") as f:
+            json.dump(started, f)
+        
+        # 한 줄 단위 append는 워커 간에도 섞이지 않음
+        self.records_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.records_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        
+        logger.info(f"VM 부팅 완료: {vm_id}, 프로필 {record['profile']}, {record['seconds']}초")
+        return record
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """프로필별 부팅 완료 시간 통계 (최근 STATS_WINDOW건)"""
+        by_profile: Dict[str, List[float]] = {}
+        for record in self._recent_records():
+            by_profile.setdefault(record.get("profile") or "unknown", []).append(record["seconds"])
+        
+        return {
+            profile: {
+                "count": len(values),
+                "avg_seconds": round(sum(values) / len(values), 1),
+                "p50_seconds": percentile(values, 50),
+                "p95_seconds": percentile(values, 95),
+                "last_seconds": values[-1]
+            }
+            for profile, values in by_profile.items()
+        }
+    
+    def _recent_records(self) -> List[Dict[str, Any]]:
+        try:
+            with open(self.records_path, "r", encoding="utf-8") as f:
+                lines = f.readlines()[-STATS_WINDOW:]
+        except FileNotFoundError:
+            return []
+        
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        return records
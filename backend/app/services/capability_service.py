@@ -0,0 +1,279 @@
+"""
+호스트 기능(capability) 탐지 서비스 - 디스크 캐시 기반
+
+virsh, qemu-img, docker 등의 도구(클라이언트 바이너리) 버전을 한 번만 탐지하여
+디스크에 캐시합니다. 캐시 키는 각 바이너리의 mtime/inode/크기이므로 도구가
+업데이트되지 않는 한 재시작 시에도 프로세스 fork 없이 캐시를 재사용합니다.
+
+브리지, 도커 소켓, libvirt 데몬 소켓처럼 stat 한 번으로 확인되는 항목은
+캐시하지 않고 조회할 때마다 다시 확인합니다 (virsh가 설치되어 있어도 데몬이 멈춰 있을 수 있음).
+"""
+import os
+import json
+import time
+import shutil
+import fcntl
+import subprocess
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+from app.core.config import settings
+from app.utils.logging_utils import get_logger
+
+logger = get_logger("capability_service")
+
+# 탐지 대상 도구와 버전 조회 명령어
+PROBED_TOOLS: Dict[str, List[str]] = {
+    "virsh": ["virsh", "--version"],
+    "qemu-img": ["qemu-img", "--version"],
+    "genisoimage": ["genisoimage", "--version"],
+    "docker": ["docker", "--version"],
+    "ip": ["ip", "-V"],
+}
+
+DOCKER_SOCKET_PATH = "/var/run/docker.sock"
+# libvirtd(모놀리식) 또는 virtqemud(모듈식 데몬) 소켓
+LIBVIRT_SOCKET_PATHS = ("/var/run/libvirt/libvirt-sock", "/var/run/libvirt/virtqemud-sock")
+SYS_CLASS_NET = Path("/sys/class/net")
+
+# 캐시 포맷이 바뀌면 증가시켜 기존 캐시를 무효화
+CACHE_FORMAT_VERSION = 1
+
+
+class HostCapabilities:
+    """탐지된 호스트 기능 정보"""
+    
+    def __init__(self, data: Dict[str, Any], source: str):
+        self.data = data
+        self.source = source
+    
+    def tool_available(self, tool: str) -> bool:
+        """도구(클라이언트 바이너리) 사용 가능 여부 - 데몬 실행 여부는 포함하지 않음"""
+        return bool(self.data.get("tools", {}).get(tool, {}).get("available"))
+    
+    def tool_version(self, tool: str) -> Optional[str]:
+        """도구 버전 문자열"""
+        return self.data.get("tools", {}).get(tool, {}).get("version")
+    
+    @property
+    def bridge_present(self) -> bool:
+        return bool(self.data.get("bridge", {}).get("present"))
+    
+    @property
+    def docker_socket_available(self) -> bool:
+        return bool(self.data.get("docker_socket", {}).get("available"))
+    
+    @property
+    def libvirt_daemon_available(self) -> bool:
+        """libvirt 데몬 소켓 존재 여부 (조회할 때마다 확인)"""
+        return bool(self.data.get("libvirt_daemon", {}).get("available"))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """API 응답용 딕셔너리"""
+        return {**self.data, "source": self.source}
+
+
+class CapabilityDetector:
+    """
+    호스트 기능 탐지기
+    
+    여러 워커가 동시에 시작되어도 파일 잠금으로 한 프로세스만 탐지를
+    수행하고, 나머지는 잠금 해제 후 갱신된 캐시를 읽습니다.
+    """
+    
+    def __init__(
+        self,
+        cache_path: Optional[str] = None,
+        bridge_name: Optional[str] = None,
+        max_age: Optional[int] = None
+    ):
+        self.cache_path = Path(
+            cache_path
+            or settings.CAPABILITY_CACHE_PATH
+            or Path(settings.VM_IMAGE_PATH) / ".capabilities.json"
+        )
+        self.lock_path = self.cache_path.with_name(self.cache_path.name + ".lock")
+        self.bridge_name = bridge_name or settings.VM_BRIDGE_NAME
+        self.max_age = settings.CAPABILITY_CACHE_MAX_AGE if max_age is None else max_age
+        self._capabilities: Optional[HostCapabilities] = None
+    
+    def get(self, refresh: bool = False) -> HostCapabilities:
+        """
+        호스트 기능 조회 (메모리 → 디스크 캐시 → 탐지 순)
+        
+        Args:
+            refresh: True이면 캐시를 무시하고 다시 탐지
+        """
+        if self._capabilities is not None and not refresh:
+            # 도구 정보는 그대로 쓰고 소켓/브리지만 다시 확인
+            self._capabilities.data = self._refresh_cheap_checks(self._capabilities.data)
+            return self._capabilities
+        
+        fingerprint = self._fingerprint()
+        
+        if not refresh:
+            cached = self._load_cache(fingerprint)
+            if cached is not None:
+                self._capabilities = HostCapabilities(self._refresh_cheap_checks(cached), "cache")
+                return self._capabilities
+        
+        self._capabilities = self._probe_locked(fingerprint, force=refresh)
+        return self._capabilities
+    
+    def invalidate(self) -> None:
+        """메모리 및 디스크 캐시 무효화"""
+        self._capabilities = None
+        try:
+            self.cache_path.unlink()
+        except FileNotFoundError:
+            pass
+    
+    def _fingerprint(self) -> Dict[str, Any]:
+        """
+        캐시 키 생성 (fork 없이 stat만 사용)
+        """
+        binaries = {}
+        for tool in PROBED_TOOLS:
+            path = shutil.which(tool)
+            if not path:
+                binaries[tool] = None
+                continue
+            try:
+                st = os.stat(os.path.realpath(path))
+                binaries[tool] = {
+                    "path": path,
+                    "mtime_ns": st.st_mtime_ns,
+                    "inode": st.st_ino,
+                    "size": st.st_size
+                }
+            except OSError:
+                binaries[tool] = None
+        
+        return {
+            "format": CACHE_FORMAT_VERSION,
+            "bridge_name": self.bridge_name,
+            "binaries": binaries
+        }
+    
+    def _load_cache(self, fingerprint: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """유효한 캐시가 있으면 반환"""
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        
+        if cached.get("fingerprint") != fingerprint:
+            logger.info("도구 바이너리가 변경되어 기능 캐시를 무효화합니다.")
+            return None
+        
+        if self.max_age and time.time() - cached.get("probed_at_ts", 0) > self.max_age:
+            logger.info("기능 캐시가 만료되었습니다.")
+            return None
+        
+        return cached.get("capabilities")
+    
+    def _probe_locked(self, fingerprint: Dict[str, Any], force: bool = False) -> HostCapabilities:
+        """
+        파일 잠금을 잡고 탐지 수행 (동시 시작 시 탐지 폭주 방지)
+        """
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            lock_file = open(self.lock_path, "w")
+        except OSError as e:
+            logger.warning(f"기능 캐시 잠금 파일을 열 수 없어 잠금 없이 탐지합니다: {e}")
+            return HostCapabilities(self._probe(), "probe")
+        
+        with lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # 잠금 대기 중 다른 워커가 캐시를 갱신했을 수 있음
+                if not force:
+                    cached = self._load_cache(fingerprint)
+                    if cached is not None:
+                        return HostCapabilities(self._refresh_cheap_checks(cached), "cache")
+                
+                capabilities = self._probe()
+                self._write_cache(fingerprint, capabilities)
+                return HostCapabilities(capabilities, "probe")
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _probe(self) -> Dict[str, Any]:
+        """도구 버전 탐지 (프로세스 fork 발생)"""
+        logger.info("호스트 기능 탐지를 수행합니다.")
+        tools = {}
+        for tool, cmd in PROBED_TOOLS.items():
+            tools[tool] = self._probe_tool(tool, cmd)
+        
+        capabilities = {
+            "tools": tools,
+            "probed_at": datetime.utcnow().isoformat()
+        }
+        return self._refresh_cheap_checks(capabilities)
+    
+    def _probe_tool(self, tool: str, cmd: List[str]) -> Dict[str, Any]:
+        """단일 도구 버전 조회"""
+        path = shutil.which(tool)
+        if not path:
+            return {"available": False, "path": None, "version": None}
+        
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+            output = (result.stdout or result.stderr).strip()
+            return {
+                "available": result.returncode == 0,
+                "path": path,
+                "version": output.splitlines()[0] if output else None
+            }
+        except (subprocess.TimeoutExpired, OSError) as e:
+            logger.warning(f"{tool} 버전 조회 실패: {e}")
+            return {"available": False, "path": path, "version": None}
+    
+    def _refresh_cheap_checks(self, capabilities: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        stat 한 번으로 확인 가능한 항목은 캐시와 관계없이 매번 갱신
+        """
+        capabilities = dict(capabilities)
+        capabilities["bridge"] = {
+            "name": self.bridge_name,
+            "present": (SYS_CLASS_NET / self.bridge_name).exists()
+        }
+        capabilities["docker_socket"] = {
+            "path": DOCKER_SOCKET_PATH,
+            "available": os.path.exists(DOCKER_SOCKET_PATH)
+        }
+        libvirt_sockets = [path for path in LIBVIRT_SOCKET_PATHS if os.path.exists(path)]
+        capabilities["libvirt_daemon"] = {
+            "socket": libvirt_sockets[0] if libvirt_sockets else None,
+            "available": bool(libvirt_sockets)
+        }
+        return capabilities
+    
+    def _write_cache(self, fingerprint: Dict[str, Any], capabilities: Dict[str, Any]) -> None:
+        """캐시 파일 원자적 저장"""
+        payload = {
+            "fingerprint": fingerprint,
+            "probed_at_ts": time.time(),
+            "capabilities": capabilities
+        }
+        tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.cache_path)
+            logger.info(f"호스트 기능 캐시 저장: {self.cache_path}")
+        except OSError as e:
+            logger.warning(f"호스트 기능 캐시 저장 실패: {e}")
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+
+@lru_cache()
+def get_capability_detector() -> CapabilityDetector:
+    """기능 탐지기 인스턴스 반환 (프로세스당 1개)"""
+    return CapabilityDetector()
@@ -0,0 +1,284 @@
+"""
+호스트 용량 스케줄러 - 프로비저닝 승인 제어 (admission control)
+"""
+import os
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterator
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.exceptions import HostCapacityExceededError
+from app.models.hosting import Hosting, HostingStatus
+from app.utils.logging_utils import get_logger
+
+logger = get_logger("capacity_service")
+
+PROC_MEMINFO = Path("/proc/meminfo")
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+
+# 메모리/CPU를 점유하는 것으로 간주하는 상태
+COMMITTED_STATUSES = (HostingStatus.CREATING, HostingStatus.RUNNING, HostingStatus.STOPPING)
+
+
+class CapacityTicket:
+    """프로비저닝 요청 1건"""
+    
+    def __init__(self, user_id: int, memory_mb: float, cpus: float):
+        self.user_id = user_id
+        self.memory_mb = memory_mb
+        self.cpus = cpus
+        self.enqueued_at = time.monotonic()
+
+
+class CapacityScheduler:
+    """
+    호스트 용량 스케줄러
+    
+    - 커밋된 메모리/CPU(DB의 호스팅별 제한 합계)가 호스트 용량을 넘으면 즉시 거부
+    - 동시 프로비저닝은 MAX_CONCURRENT_VMS개로 제한하고 초과 요청은 FIFO 대기열에 보관
+    - 대기열이 가득 차거나 대기 시간이 초과되면 503으로 거부
+    
+    동시 실행 제한과 대기열은 프로세스 단위이며, 용량 계산은 DB 기준이므로
+    워커 간에 공유됩니다.
+    """
+    
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        queue_timeout: Optional[float] = None
+    ):
+        self.max_concurrent = max_concurrent or settings.MAX_CONCURRENT_VMS
+        self.queue_size = settings.CAPACITY_QUEUE_SIZE if queue_size is None else queue_size
+        self.queue_timeout = settings.CAPACITY_QUEUE_TIMEOUT if queue_timeout is None else queue_timeout
+        self._cond = threading.Condition()
+        self._in_flight: List[CapacityTicket] = []
+        self._queue: deque = deque()
+    
+    @contextmanager
+    def admit(
+        self,
+        db: Session,
+        user_id: int,
+        resources: Optional[Dict[str, Any]] = None,
+        check_capacity: bool = True
+    ) -> Iterator[CapacityTicket]:
+        """
+        프로비저닝 승인 (with 블록 동안 동시 실행 슬롯 점유)
+        
+        Args:
+            check_capacity: 로컬 호스트 용량 확인 여부 (노드 배치 시에는 노드별로 확인)
+        
+        Raises:
+            HostCapacityExceededError: 용량 부족, 대기열 가득 참, 대기 시간 초과
+        """
+        resources = resources or {}
+        ticket = CapacityTicket(user_id, resources.get("memory_mb") or 0, resources.get("cpus") or 0)
+        
+        # 대기 전에 먼저 용량 확인 (가득 찬 호스트에서 대기열만 길어지지 않도록)
+        if check_capacity:
+            self._check_capacity(db, ticket)
+        self._acquire(ticket)
+        try:
+            # 대기하는 동안 다른 호스팅이 생성되었을 수 있으므로 재확인
+            if check_capacity:
+                self._check_capacity(db, ticket, queued=False)
+            yield ticket
+        finally:
+            self._release(ticket)
+    
+    def queue_position(self, user_id: int) -> Optional[int]:
+        """사용자의 대기 순번 (1부터 시작, 대기 중이 아니면 None)"""
+        with self._cond:
+            for position, ticket in enumerate(self._queue, start=1):
+                if ticket.user_id == user_id:
+                    return position
+        return None
+    
+    def status(self, db: Session) -> Dict[str, Any]:
+        """현재 용량 및 대기열 상태"""
+        capacity = host_capacity()
+        committed = self._committed(db)
+        with self._cond:
+            in_flight = len(self._in_flight)
+            queued = len(self._queue)
+        return {
+            "capacity": capacity,
+            "committed": committed,
+            "available": {
+                "memory_mb": round(capacity["memory_mb"] - committed["memory_mb"], 1),
+                "cpus": round(capacity["cpus"] - committed["cpus"], 2)
+            },
+            "in_flight": in_flight,
+            "max_concurrent": self.max_concurrent,
+            "queued": queued,
+            "queue_size": self.queue_size
+        }
+    
+    def _acquire(self, ticket: CapacityTicket) -> None:
+        """동시 실행 슬롯 획득 (없으면 FIFO 대기)"""
+        with self._cond:
+            if not self._queue and len(self._in_flight) < self.max_concurrent:
+                self._in_flight.append(ticket)
+                return
+            
+            if len(self._queue) >= self.queue_size:
+                raise HostCapacityExceededError(
+                    "프로비저닝 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.",
+                    retry_after=self._retry_after()
+                )
+            
+            self._queue.append(ticket)
+            logger.info(f"프로비저닝 대기: 사용자 {ticket.user_id}, 대기 순번 {len(self._queue)}")
+            
+            deadline = time.monotonic() + self.queue_timeout
+            while not (self._queue[0] is ticket and len(self._in_flight) < self.max_concurrent):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._queue.remove(ticket)
+                    self._cond.notify_all()
+                    raise HostCapacityExceededError(
+                        "프로비저닝 대기 시간이 초과되었습니다. 잠시 후 다시 시도해주세요.",
+                        retry_after=self._retry_after()
+                    )
+                self._cond.wait(remaining)
+            
+            self._queue.popleft()
+            self._in_flight.append(ticket)
+            logger.info(
+                f"프로비저닝 대기 완료: 사용자 {ticket.user_id}, "
+                f"대기 {time.monotonic() - ticket.enqueued_at:.1f}초"
+            )
+    
+    def _release(self, ticket: CapacityTicket) -> None:
+        with self._cond:
+            if ticket in self._in_flight:
+                self._in_flight.remove(ticket)
+            self._cond.notify_all()
+    
+    def _check_capacity(self, db: Session, ticket: CapacityTicket, queued: bool = True) -> None:
+        """커밋된 리소스 + 요청 리소스가 호스트 용량 이내인지 확인"""
+        capacity = host_capacity()
+        committed = self._committed(db)
+        
+        # 대기열에 있는 요청은 아직 DB에 반영되지 않았으므로 함께 계산
+        pending_memory = pending_cpus = 0
+        if queued:
+            with self._cond:
+                pending_memory = sum(t.memory_mb for t in self._queue)
+                pending_cpus = sum(t.cpus for t in self._queue)
+        
+        memory_needed = committed["memory_mb"] + pending_memory + ticket.memory_mb
+        cpus_needed = committed["cpus"] + pending_cpus + ticket.cpus
+        
+        if memory_needed > capacity["memory_mb"] or cpus_needed > capacity["cpus"]:
+            logger.warning(
+                f"호스트 용량 부족으로 프로비저닝 거부: 사용자 {ticket.user_id}, "
+                f"메모리 {memory_needed:.0f}/{capacity['memory_mb']:.0f}MB, "
+                f"CPU {cpus_needed:.2f}/{capacity['cpus']:.2f}"
+            )
+            raise HostCapacityExceededError(retry_after=300)
+    
+    def _committed(self, db: Session) -> Dict[str, float]:
+        """DB 기준 커밋된 메모리/CPU 합계"""
+        memory_mb, cpus = (
+            db.query(func.coalesce(func.sum(Hosting.memory_mb), 0), func.coalesce(func.sum(Hosting.cpus), 0))
+            .filter(Hosting.status.in_(COMMITTED_STATUSES))
+            .one()
+        )
+        return {"memory_mb": float(memory_mb), "cpus": float(cpus)}
+    
+    def _retry_after(self) -> int:
+        # 대기열 길이에 비례한 재시도 간격 (최소 5초)
+        return max(5, int(self.queue_timeout * (len(self._queue) + 1) / max(self.queue_size, 1)))
+
+
+def host_capacity() -> Dict[str, float]:
+    """
+    호스트가 테넌트에 제공할 수 있는 메모리/CPU
+    
+    /proc/meminfo와 cgroup 제한 중 작은 값을 사용하고, 호스트 예약분을 제외한 뒤
+    오버커밋 비율을 적용합니다.
+    """
+    memory_mb = _read_meminfo_total_mb()
+    cgroup_memory_mb = _read_cgroup_memory_limit_mb()
+    if cgroup_memory_mb:
+        memory_mb = min(memory_mb, cgroup_memory_mb) if memory_mb else cgroup_memory_mb
+    
+    cpus = float(os.cpu_count() or 1)
+    cgroup_cpus = _read_cgroup_cpu_limit()
+    if cgroup_cpus:
+        cpus = min(cpus, cgroup_cpus)
+    
+    usable_memory = max(memory_mb - settings.CAPACITY_RESERVED_MEMORY_MB, 0)
+    return {
+        "memory_mb": round(usable_memory * settings.CAPACITY_MEMORY_OVERCOMMIT, 1),
+        "cpus": round(cpus * settings.CAPACITY_CPU_OVERCOMMIT, 2)
+    }
+
+
+def _read_meminfo_total_mb() -> float:
+    try:
+        for line in PROC_MEMINFO.read_text().splitlines():
+            if line.startswith("MemTotal:"):
+                return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    
+    # /proc가 없는 환경에서는 sysconf로 물리 메모리 조회
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return 0.0
+
+
+def _read_cgroup_memory_limit_mb() -> Optional[float]:
+    """cgroup v2 memory.max 또는 v1 memory.limit_in_bytes (제한 없으면 None)"""
+    for path in (CGROUP_ROOT / "memory.max", CGROUP_ROOT / "memory" / "memory.limit_in_bytes"):
+        try:
+            value = path.read_text().strip()
+        except OSError:
+            continue
+        if value == "max":
+            return None
+        try:
+            limit = int(value)
+        except ValueError:
+            continue
+        # v1은 제한이 없을 때 매우 큰 값을 반환
+        if limit >= 1 << 60:
+            return None
+        return limit / (1024 * 1024)
+    return None
+
+
+def _read_cgroup_cpu_limit() -> Optional[float]:
+    """cgroup v2 cpu.max 또는 v1 cfs_quota/cfs_period (제한 없으면 None)"""
+    try:
+        quota, period = (CGROUP_ROOT / "cpu.max").read_text().split()
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+    
+    try:
+        quota = int((CGROUP_ROOT / "cpu" / "cpu.cfs_quota_us").read_text())
+        period = int((CGROUP_ROOT / "cpu" / "cpu.cfs_period_us").read_text())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+@lru_cache()
+def get_capacity_scheduler() -> CapacityScheduler:
+    """용량 스케줄러 인스턴스 반환 (프로세스당 1개)"""
+    return CapacityScheduler()
@@ -0,0 +1,198 @@
+"""
+cloud-init NoCloud seed 생성 서비스 - 템플릿 캐시 + 프로세스 내 ISO 생성
+
+환영 페이지, Nginx/fail2ban 설정 등 정적 부분은 템플릿에서 한 번만 읽고
+프로필별 YAML 조각도 한 번만 렌더링합니다. VM마다 달라지는 값(VM ID, 사용자,
+SSH 키 등)만 치환한 뒤 genisoimage 호출 없이 메모리에서 ISO를 만듭니다.
+"""
+import os
+import json
+import tempfile
+import yaml
+from functools import lru_cache
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, select_autoescape
+
+from app.core.config import settings
+from app.core.cloud_init_profiles import get_cloud_init_profile
+from app.utils.iso9660 import build_iso
+from app.utils.logging_utils import get_logger
+
+logger = get_logger("cloud_init_service")
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates" / "cloud-init"
+
+# 웹 프로필에서 환영 페이지 외에 추가로 실행하는 Nginx 설정
+_WEB_RUNCMD = [
+    'sed -i "s/# server_names_hash_bucket_size 64;/server_names_hash_bucket_size 64;/" /etc/nginx/nginx.conf',
+    'systemctl reload nginx'
+]
+
+
+def _to_yaml(value: Any) -> str:
+    """
+    VM별 값을 YAML 스칼라/플로우로 변환 (JSON은 YAML의 부분집합이므로 json.dumps 사용)
+    """
+    return json.dumps(value, ensure_ascii=False)
+
+
+@lru_cache()
+def _template_environment() -> Environment:
+    """템플릿 환경 (컴파일된 템플릿은 환경 내부에 캐시됨)"""
+    env = Environment(
+        loader=FileSystemLoader(str(TEMPLATE_DIR)),
+        autoescape=select_autoescape(["html"]),
+        undefined=StrictUndefined,
+        trim_blocks=True,
+        keep_trailing_newline=True
+    )
+    env.filters["yaml"] = _to_yaml
+    return env
+
+
+@lru_cache()
+def _static_file(name: str) -> str:
+    return (TEMPLATE_DIR / name).read_text(encoding="utf-8")
+
+
+@lru_cache()
+def _static_fragments(profile_name: str) -> Dict[str, Any]:
+    """
+    프로필별로 VM과 무관한 user-data 조각 (최초 1회만 렌더링)
+    """
+    profile = get_cloud_init_profile(profile_name)
+    runcmd = profile["runcmd"]
+    write_files = []
+    if profile["web"]:
+        runcmd = runcmd + _WEB_RUNCMD
+        write_files = [
+            {
+                "path": "/etc/nginx/sites-available/default",
+                "content": _static_file("nginx-default.conf"),
+                "permissions": "0644"
+            },
+            {
+                "path": "/etc/fail2ban/jail.local",
+                "content": _static_file("fail2ban-jail.local"),
+                "permissions": "0644"
+            }
+        ]
+    
+    def dump(items) -> str:
+        if not items:
+            return ""
+        return yaml.dump(items, default_flow_style=False, allow_unicode=True, sort_keys=False).rstrip("\n")
+    
+    return {
+        "profile": profile,
+        "static_runcmd": dump(runcmd),
+        "static_write_files": dump(write_files)
+    }
+
+
+class CloudInitSeedBuilder:
+    """VM별 cloud-init user-data/meta-data 및 NoCloud seed ISO 생성"""
+    
+    def __init__(self, image_root: Optional[str] = None):
+        self.cloud_init_root = Path(image_root or settings.VM_IMAGE_PATH) / "cloud-init"
+    
+    def render(
+        self,
+        vm_id: str,
+        user_id: str,
+        ssh_public_key: str,
+        profile: Optional[str] = None,
+        phone_home_url: Optional[str] = None
+    ) -> Tuple[str, str]:
+        """
+        user-data와 meta-data 렌더링
+        
+        Returns:
+            (user-data, meta-data) 문자열
+        
+        Raises:
+            ValueError: 존재하지 않는 프로필
+        """
+        profile_name = profile or settings.CLOUD_INIT_PROFILE
+        fragments = _static_fragments(profile_name)
+        profile_config = fragments["profile"]
+        env = _template_environment()
+        
+        welcome_page = None
+        if profile_config["web"]:
+            welcome_page = env.get_template("welcome.html.j2").render(user_id=user_id, vm_id=vm_id)
+        
+        user_data = env.get_template("user-data.yaml.j2").render(
+            ssh_public_key=ssh_public_key,
+            groups=profile_config["groups"],
+            # 패키지는 골든 이미지에 포함되어 있으므로 업그레이드는 설정한 경우에만 수행
+            package_update=bool(profile_config["packages"]) or settings.CLOUD_INIT_PACKAGE_UPGRADE,
+            package_upgrade=settings.CLOUD_INIT_PACKAGE_UPGRADE,
+            packages=profile_config["packages"],
+            # 로컬 apt 프록시/캐시 (apt-cacher-ng 등)
+            apt_proxy=settings.CLOUD_INIT_APT_PROXY,
+            static_runcmd=fragments["static_runcmd"],
+            runcmd=[
+                # 사용자 디렉토리 권한 설정
+                'chown -R ubuntu:ubuntu /home/ubuntu',
+                'chown -R webhoster:webhoster /home/webhoster 2>/dev/null || true',
+                
+                # 완료 로그
+                f'echo "VM {vm_id} 설정 완료 ({profile_name}): $(date)" >> /var/log/webhoster-setup.log',
+                'echo "웹 호스팅 서비스 설치 완료" > /tmp/webhoster-ready'
+            ],
+            static_write_files=fragments["static_write_files"],
+            welcome_page=welcome_page,
+            phone_home_url=phone_home_url,
+            final_message=f'VM {vm_id} 설정이 완료되었습니다! (프로필: {profile_name}, $UPTIME초)'
+        )
+        meta_data = env.get_template("meta-data.yaml.j2").render(vm_id=vm_id, ssh_public_key=ssh_public_key)
+        return user_data, meta_data
+    
+    def build(
+        self,
+        vm_id: str,
+        user_id: str,
+        ssh_public_key: str,
+        profile: Optional[str] = None,
+        phone_home_url: Optional[str] = None,
+        timestamp: Optional[datetime] = None
+    ) -> Path:
+        """
+        user-data, meta-data와 seed ISO(cloud-init.iso) 생성
+        
+        Returns:
+            ISO 파일 경로
+        """
+        user_data, meta_data = self.render(vm_id, user_id, ssh_public_key, profile, phone_home_url)
+        files = {
+            "meta-data": meta_data.encode("utf-8"),
+            "user-data": user_data.encode("utf-8")
+        }
+        
+        cloud_init_dir = self.cloud_init_root / vm_id
+        cloud_init_dir.mkdir(parents=True, exist_ok=True)
+        for name, content in files.items():
+            _write_atomic(cloud_init_dir / name, content)
+        
+        iso_path = cloud_init_dir / "cloud-init.iso"
+        _write_atomic(iso_path, build_iso(files, volume_id="cidata", timestamp=timestamp))
+        logger.info(f"cloud-init seed 생성 완료: {iso_path}")
+        return iso_path
+
+
+def _write_atomic(path: Path, content: bytes) -> None:
+    """임시 파일에 쓴 뒤 교체 (부팅 중인 VM이 쓰다 만 ISO를 보지 않도록)"""
+    fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        # qemu가 다른 사용자로 실행되어도 읽을 수 있도록 (mkstemp 기본값은 0600)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
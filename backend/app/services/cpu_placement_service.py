@@ -0,0 +1,297 @@
+"""
+vCPU/NUMA 배치 서비스 - 호스트 CPU 토폴로지 기반
+
+/sys/devices/system/node, /sys/devices/system/cpu에서 NUMA 노드별 CPU와 메모리,
+하이퍼스레드 형제 CPU를 읽고, 새 도메인마다 가장 여유 있는 NUMA 노드와 그 안에서
+부하가 가장 낮은 CPU를 배정합니다. 배정 결과는 호스팅 레코드(cpuset, numa_node)에
+저장되므로 워커 간에 공유되며, 호스팅 삭제 후에는 같은 노드 안에서 CPU별
+부하 차이가 1 이하가 되도록 재배치합니다.
+"""
+import os
+import math
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.hosting import Hosting
+from app.utils.logging_utils import get_logger
+
+logger = get_logger("cpu_placement_service")
+
+SYS_DEVICES_SYSTEM = Path("/sys/devices/system")
+
+
+def parse_cpulist(text: str) -> List[int]:
+    """커널 CPU 목록 형식(예: 0-3,8-11) 파싱"""
+    cpus = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        start, _, end = part.partition("-")
+        cpus.extend(range(int(start), int(end or start) + 1))
+    return cpus
+
+
+def format_cpulist(cpus: List[int]) -> str:
+    """CPU 목록을 커널/libvirt 형식으로 변환 (연속 구간은 범위로 표기)"""
+    ranges = []
+    for cpu in sorted(set(cpus)):
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(str(start) if start == end else f"{start}-{end}" for start, end in ranges)
+
+
+class CpuTopology:
+    """NUMA 노드별 CPU/메모리와 CPU별 하이퍼스레드 형제"""
+    
+    def __init__(
+        self,
+        nodes: Dict[int, List[int]],
+        node_memory_mb: Optional[Dict[int, int]] = None,
+        siblings: Optional[Dict[int, List[int]]] = None
+    ):
+        self.nodes = {node: sorted(cpus) for node, cpus in nodes.items() if cpus}
+        self.node_memory_mb = node_memory_mb or {}
+        self.siblings = siblings or {}
+    
+    def usable_cpus(self, node: int) -> List[int]:
+        """도메인에 배정할 수 있는 CPU (호스트 예약 CPU 제외)"""
+        reserved = set(settings.VM_HOST_RESERVED_CPUS)
+        return [cpu for cpu in self.nodes.get(node, []) if cpu not in reserved]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            str(node): {
+                "cpus": format_cpulist(cpus),
+                "usable_cpus": format_cpulist(self.usable_cpus(node)),
+                "memory_mb": self.node_memory_mb.get(node)
+            }
+            for node, cpus in self.nodes.items()
+        }
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text()
+    except OSError:
+        return None
+
+
+def read_cpu_topology(sys_root: Path = SYS_DEVICES_SYSTEM) -> CpuTopology:
+    """
+    sysfs에서 CPU 토폴로지 읽기 (NUMA 정보가 없으면 온라인 CPU 전체를 노드 0으로 간주)
+    """
+    online = _read(sys_root / "cpu" / "online")
+    online_cpus = set(parse_cpulist(online)) if online else None
+    
+    nodes: Dict[int, List[int]] = {}
+    node_memory_mb: Dict[int, int] = {}
+    for node_dir in sorted((sys_root / "node").glob("node[0-9]*")):
+        node = int(node_dir.name[4:])
+        cpulist = _read(node_dir / "cpulist")
+        if cpulist is None:
+            continue
+        nodes[node] = [cpu for cpu in parse_cpulist(cpulist) if online_cpus is None or cpu in online_cpus]
+        for line in (_read(node_dir / "meminfo") or "").splitlines():
+            # 형식: "Node 0 MemTotal:       16310588 kB"
+            words = line.split()
+            if len(words) >= 4 and words[2] == "MemTotal:":
+                node_memory_mb[node] = int(words[3]) // 1024
+    
+    if not nodes:
+        nodes = {0: sorted(online_cpus) if online_cpus else list(range(os.cpu_count() or 1))}
+    
+    siblings: Dict[int, List[int]] = {}
+    for cpus in nodes.values():
+        for cpu in cpus:
+            text = _read(sys_root / "cpu" / f"cpu{cpu}" / "topology" / "thread_siblings_list")
+            siblings[cpu] = parse_cpulist(text) if text else [cpu]
+    
+    return CpuTopology(nodes, node_memory_mb, siblings)
+
+
+@lru_cache()
+def get_cpu_topology() -> CpuTopology:
+    """프로세스 공용 CPU 토폴로지 (최초 1회 읽기)"""
+    topology = read_cpu_topology()
+    logger.info(f"CPU 토폴로지: {topology.to_dict()}")
+    return topology
+
+
+class Placement:
+    """도메인 1개의 배치 결과"""
+    
+    def __init__(self, numa_node: int, cpus: List[int]):
+        self.numa_node = numa_node
+        self.cpus = cpus
+    
+    @property
+    def cpuset(self) -> str:
+        return ",".join(str(cpu) for cpu in self.cpus)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"numa_node": self.numa_node, "cpus": self.cpus}
+
+
+def parse_placement(hosting: Hosting) -> Optional[Placement]:
+    """호스팅 레코드에 저장된 배치 (vCPU 순서대로 저장된 CPU 목록)"""
+    if hosting.numa_node is None or not hosting.cpuset:
+        return None
+    return Placement(hosting.numa_node, [int(cpu) for cpu in hosting.cpuset.split(",")])
+
+
+def vcpus_for(cpus: Optional[float]) -> int:
+    """리소스 플랜의 CPU 할당량을 도메인 vCPU 수로 변환"""
+    return max(1, math.ceil(cpus or settings.VM_DEFAULT_VCPUS))
+
+
+class CpuPlacementEngine:
+    """
+    DB 기반 vCPU/NUMA 배치기
+    
+    로컬 호스트에 배치된 호스팅(node_id 없음)의 cpuset을 합산해 CPU별 부하를 계산합니다.
+    """
+    
+    def __init__(self, db: Session, topology: Optional[CpuTopology] = None):
+        self.db = db
+        self.topology = topology or get_cpu_topology()
+    
+    def _placed_hostings(self) -> List[Hosting]:
+        return self.db.query(Hosting).filter(
+            Hosting.node_id.is_(None),
+            Hosting.numa_node.isnot(None),
+            Hosting.cpuset.isnot(None)
+        ).all()
+    
+    def _load(self, hostings: List[Hosting]) -> Tuple[Dict[int, int], Dict[int, int]]:
+        """CPU별 배정된 vCPU 수와 NUMA 노드별 배정된 메모리(MB)"""
+        cpu_load = {cpu: 0 for cpus in self.topology.nodes.values() for cpu in cpus}
+        node_memory = {node: 0 for node in self.topology.nodes}
+        for hosting in hostings:
+            placement = parse_placement(hosting)
+            for cpu in placement.cpus:
+                cpu_load[cpu] = cpu_load.get(cpu, 0) + 1
+            node_memory[placement.numa_node] = node_memory.get(placement.numa_node, 0) + (hosting.memory_mb or 0)
+        return cpu_load, node_memory
+    
+    def _pick_cpus(self, node: int, vcpus: int, cpu_load: Dict[int, int]) -> List[int]:
+        """
+        노드 안에서 부하가 낮은 CPU 선택 (같은 부하면 형제 스레드가 한가한 물리 코어 우선)
+        """
+        load = dict(cpu_load)
+        chosen = []
+        for _ in range(vcpus):
+            cpu = min(
+                self.topology.usable_cpus(node),
+                key=lambda c: (load[c], sum(load.get(s, 0) for s in self.topology.siblings.get(c, [c])), c)
+            )
+            chosen.append(cpu)
+            load[cpu] += 1
+        return chosen
+    
+    def place(self, vm_id: str, vcpus: int, memory_mb: Optional[int] = None) -> Optional[Placement]:
+        """
+        새 도메인의 NUMA 노드와 CPU 배정
+        
+        메모리가 남는 노드 중 CPU당 배정된 vCPU 수가 가장 적은 노드를 고르고,
+        모든 노드의 메모리가 부족하면 CPU 부하만으로 고릅니다.
+        
+        Returns:
+            배치 결과 (배치가 비활성화되었거나 배정 가능한 CPU가 없으면 None)
+        """
+        if not settings.VM_CPU_PLACEMENT_ENABLED:
+            return None
+        
+        candidates = [node for node in self.topology.nodes if self.topology.usable_cpus(node)]
+        if not candidates:
+            logger.warning(f"배정 가능한 CPU가 없어 vCPU 배치를 생략합니다: {vm_id}")
+            return None
+        
+        cpu_load, node_memory = self._load(self._placed_hostings())
+        
+        def node_key(node: int):
+            usable = self.topology.usable_cpus(node)
+            return (sum(cpu_load[cpu] for cpu in usable) + vcpus) / len(usable), node
+        
+        fitting = [
+            node for node in candidates
+            if not memory_mb or node not in self.topology.node_memory_mb
+            or node_memory[node] + memory_mb <= self.topology.node_memory_mb[node]
+        ]
+        if not fitting:
+            logger.warning(f"메모리가 충분한 NUMA 노드가 없어 CPU 부하 기준으로 배치합니다: {vm_id}")
+        node = min(fitting or candidates, key=node_key)
+        
+        placement = Placement(node, self._pick_cpus(node, vcpus, cpu_load))
+        logger.info(f"vCPU 배치: {vm_id} -> NUMA 노드 {node}, CPU {placement.cpuset}")
+        return placement
+    
+    def rebalance(self) -> List[Dict[str, Any]]:
+        """
+        NUMA 노드별로 CPU 부하 차이가 1 이하가 될 때까지 vCPU 재배치 (메모리는 노드를 옮기지 않음)
+        
+        호스팅 레코드의 cpuset을 갱신하고 커밋합니다. 실행 중인 도메인에 적용할 수 있도록
+        변경된 호스팅 목록을 반환합니다.
+        
+        Returns:
+            [{"vm_id", "numa_node", "cpus", "moved": [(vcpu, 이전 CPU, 새 CPU), ...]}]
+        """
+        hostings = self._placed_hostings()
+        cpu_load, _ = self._load(hostings)
+        placements = {hosting.vm_id: parse_placement(hosting) for hosting in hostings}
+        moved: Dict[str, List[Tuple[int, int, int]]] = {}
+        
+        for node in self.topology.nodes:
+            usable = self.topology.usable_cpus(node)
+            if not usable:
+                continue
+            while True:
+                busiest = max(usable, key=lambda c: (cpu_load[c], -c))
+                idlest = min(usable, key=lambda c: (cpu_load[c], c))
+                if cpu_load[busiest] - cpu_load[idlest] <= 1:
+                    break
+                # 가장 바쁜 CPU에 고정된 vCPU 중 vm_id 순으로 첫 번째를 이동 (같은 도메인에 이미 있는 CPU는 피함)
+                target = next(
+                    (
+                        (vm_id, placement.cpus.index(busiest))
+                        for vm_id, placement in sorted(placements.items())
+                        if placement.numa_node == node and busiest in placement.cpus and idlest not in placement.cpus
+                    ),
+                    None
+                )
+                if target is None:
+                    break
+                vm_id, vcpu = target
+                placements[vm_id].cpus[vcpu] = idlest
+                cpu_load[busiest] -= 1
+                cpu_load[idlest] += 1
+                moved.setdefault(vm_id, []).append((vcpu, busiest, idlest))
+        
+        if not moved:
+            return []
+        
+        for hosting in hostings:
+            if hosting.vm_id in moved:
+                hosting.cpuset = placements[hosting.vm_id].cpuset
+        self.db.commit()
+        
+        logger.info(f"vCPU 재배치: {len(moved)}개 도메인, {sum(len(m) for m in moved.values())}개 vCPU")
+        return [
+            {**placements[vm_id].to_dict(), "vm_id": vm_id, "moved": moves}
+            for vm_id, moves in sorted(moved.items())
+        ]
+    
+    def status(self) -> Dict[str, Any]:
+        """노드/CPU별 배정 현황"""
+        hostings = self._placed_hostings()
+        cpu_load, node_memory = self._load(hostings)
+        return {
+            "topology": self.topology.to_dict(),
+            "cpu_load": {str(cpu): load for cpu, load in sorted(cpu_load.items())},
+            "node_memory_mb": {str(node): memory for node, memory in node_memory.items()},
+            "placements": {hosting.vm_id: parse_placement(hosting).to_dict() for hosting in hostings}
+        }
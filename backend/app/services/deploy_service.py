@@ -0,0 +1,344 @@
+"""
+테넌트 웹 디렉토리 배포 서비스
+
+업로드(tar/zip 압축 파일 또는 여러 파일)를 메모리에 모으지 않고 청크 단위로 디스크에 쓴 뒤
+새 릴리스 디렉토리(containers/<vm_id>/releases/<id>)에 풀고, www 심볼릭 링크를 rename으로
+원자적으로 교체합니다. 이전 릴리스는 DEPLOY_KEEP_RELEASES개까지 남겨 링크만 되돌려 롤백합니다.
+
+링크는 상대 경로(releases/<id>)이고 컨테이너는 사이트 디렉토리(containers/<vm_id>)를 /var/www에
+마운트해 /var/www/html → www → releases/<id>를 따라가므로, 정적 호스팅과 컨테이너 모두
+재시작 없이 다음 요청부터 새 릴리스를 서빙합니다.
+"""
+import asyncio
+import os
+import re
+import shutil
+import stat
+import tarfile
+import time
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path, PurePosixPath
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+import aiofiles
+
+from app.core.config import settings
+from app.core.exceptions import InvalidDeployError, DeployTooLargeError
+from app.services.static_site_service import precompress
+from app.utils.logging_utils import get_logger
+
+logger = get_logger("deploy_service")
+
+# 업로드/압축 해제 시 한 번에 읽고 쓰는 크기 (메모리 사용량 상한)
+CHUNK_SIZE = 1024 * 1024
+
+# 컨테이너 안에서 웹 루트(/var/www/html)가 가리키는 사이트 디렉토리 링크
+CONTAINER_WEB_LINK = "html"
+
+# 릴리스 ID: 사이트별 순번-생성 시각 (스테이징/업로드 임시 이름에도 같은 ID 사용)
+_RELEASE_ID = re.compile(r"(\d{6})-\d{8}-\d{6}$")
+
+
+def _rate_mbps(byte_count: int, seconds: float) -> Optional[float]:
+    return round(byte_count / 1024 / 1024 / seconds, 2) if seconds > 0 else None
+
+
+def safe_member_path(name: str) -> Optional[PurePosixPath]:
+    """
+    압축 파일 항목/업로드 파일 이름을 릴리스 안의 상대 경로로 변환
+    
+    절대 경로와 상위 디렉토리(..)는 릴리스 밖에 쓸 수 있으므로 거부합니다.
+    
+    Returns:
+        상대 경로 (디렉토리 자체를 가리키면 None)
+    """
+    path = PurePosixPath(name.replace("\\", "/"))
+    parts = [part for part in path.parts if part not in ("", ".")]
+    if path.is_absolute() or ".." in parts:
+        raise InvalidDeployError(f"허용되지 않는 경로입니다: {name}")
+    return PurePosixPath(*parts) if parts else None
+
+
+def _copy_limited(source, target: Path, total: int, limit: int) -> int:
+    """파일 객체를 청크 단위로 복사하며 누적 크기 제한 확인 (선언된 크기가 아닌 실제 크기 기준)"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(target, "wb") as output:
+        while True:
+            chunk = source.read(CHUNK_SIZE)
+            if not chunk:
+                return total
+            total += len(chunk)
+            if total > limit:
+                raise DeployTooLargeError(f"압축 해제 크기가 {limit // 1024 // 1024}MB를 초과했습니다.")
+            output.write(chunk)
+
+
+def extract_archive(archive: Path, destination: Path, limit: int) -> Dict[str, int]:
+    """
+    tar(gz/bz2/xz) 또는 zip 압축 파일을 destination에 풀기
+    
+    일반 파일과 디렉토리만 풀고 링크/장치 파일은 거부합니다.
+    
+    Returns:
+        {"files": 파일 수, "bytes": 푼 바이트 수}
+    """
+    files = total = 0
+    if tarfile.is_tarfile(archive):
+        with tarfile.open(archive, "r:*") as tar:
+            for member in tar:
+                relative = safe_member_path(member.name)
+                if relative is None:
+                    continue
+                if member.isdir():
+                    (destination / relative).mkdir(parents=True, exist_ok=True)
+                    continue
+                if not member.isfile():
+                    raise InvalidDeployError(f"일반 파일만 배포할 수 있습니다: {member.name}")
+                total = _copy_limited(tar.extractfile(member), destination / relative, total, limit)
+                files += 1
+    elif zipfile.is_zipfile(archive):
+        with zipfile.ZipFile(archive) as zip_file:
+            for info in zip_file.infolist():
+                relative = safe_member_path(info.filename)
+                if relative is None:
+                    continue
+                if info.is_dir():
+                    (destination / relative).mkdir(parents=True, exist_ok=True)
+                    continue
+                if stat.S_ISLNK(info.external_attr >> 16):
+                    raise InvalidDeployError(f"일반 파일만 배포할 수 있습니다: {info.filename}")
+                with zip_file.open(info) as source:
+                    total = _copy_limited(source, destination / relative, total, limit)
+                files += 1
+    else:
+        raise InvalidDeployError("tar 또는 zip 압축 파일이 아닙니다.")
+    return {"files": files, "bytes": total}
+
+
+def ensure_container_web_link(site_dir: Path) -> None:
+    """컨테이너 웹 루트용 html → www 상대 링크 (사이트 디렉토리를 /var/www에 마운트할 때 사용)"""
+    link = Path(site_dir) / CONTAINER_WEB_LINK
+    if not link.is_symlink():
+        link.parent.mkdir(parents=True, exist_ok=True)
+        link.symlink_to("www")
+
+
+class SiteDeployer:
+    """호스팅 하나의 릴리스 디렉토리 관리 (배포, 링크 교체, 롤백, 정리)"""
+    
+    def __init__(self, site_dir: Path, precompress_files: bool = False):
+        self.site_dir = Path(site_dir)
+        self.web_dir = self.site_dir / "www"
+        self.releases_dir = self.site_dir / "releases"
+        # 정적 호스팅은 프론트 nginx의 gzip_static용 .gz를 교체 전에 만들어 둠
+        self.precompress_files = precompress_files
+    
+    @staticmethod
+    def _release_id(sequence: int, timestamp: Optional[float] = None) -> str:
+        """생성 순서대로 정렬되는 릴리스 ID (같은 초에 만든 릴리스도 순번으로 구분)"""
+        moment = datetime.fromtimestamp(timestamp if timestamp is not None else time.time(), timezone.utc)
+        return f"{sequence:06d}-{moment.strftime('%Y%m%d-%H%M%S')}"
+    
+    @staticmethod
+    def _release_order(release_id: str) -> Tuple[int, str]:
+        """릴리스 정렬 키 (순번이 없는 이전 형식 ID는 순번 릴리스보다 먼저)"""
+        match = _RELEASE_ID.fullmatch(release_id)
+        return (int(match.group(1)) + 1 if match else 0, release_id)
+    
+    def _next_sequence(self) -> int:
+        """진행 중인 스테이징을 포함해 가장 큰 순번 + 1 (기존 웹 디렉토리용 0번은 건너뜀)"""
+        sequences = [0]
+        for entry in self.releases_dir.iterdir():
+            match = _RELEASE_ID.search(entry.name)
+            if match:
+                sequences.append(int(match.group(1)))
+        return max(sequences) + 1
+    
+    def _new_release(self) -> Tuple[str, Path]:
+        self.releases_dir.mkdir(parents=True, exist_ok=True)
+        while True:
+            release_id = self._release_id(self._next_sequence())
+            staging = self.releases_dir / f".staging-{release_id}"
+            try:
+                staging.mkdir()
+            except FileExistsError:
+                # 동시에 시작한 배포가 같은 순번을 먼저 가져감
+                continue
+            return release_id, staging
+    
+    async def deploy_archive(self, chunks: AsyncIterator[bytes]) -> Dict[str, Any]:
+        """
+        압축 파일 스트림 배포 (요청 본문을 청크 단위로 디스크에 쓴 뒤 스레드에서 압축 해제)
+        
+        Returns:
+            릴리스 ID와 업로드/압축 해제/교체 시간, 전송 속도(MB/s)
+        """
+        release_id, staging = self._new_release()
+        archive = self.releases_dir / f".upload-{release_id}"
+        limit = settings.DEPLOY_MAX_UPLOAD_MB * 1024 * 1024
+        started = time.monotonic()
+        received = 0
+        try:
+            async with aiofiles.open(archive, "wb") as output:
+                async for chunk in chunks:
+                    received += len(chunk)
+                    if received > limit:
+                        raise DeployTooLargeError(f"업로드 크기가 {settings.DEPLOY_MAX_UPLOAD_MB}MB를 초과했습니다.")
+                    await output.write(chunk)
+            if received == 0:
+                raise InvalidDeployError("업로드된 파일이 없습니다.")
+            upload_seconds = time.monotonic() - started
+            
+            extract_started = time.monotonic()
+            extracted = await asyncio.to_thread(
+                extract_archive, archive, staging, settings.DEPLOY_MAX_EXTRACTED_MB * 1024 * 1024
+            )
+            extract_seconds = time.monotonic() - extract_started
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        finally:
+            archive.unlink(missing_ok=True)
+        
+        return await asyncio.to_thread(self._publish, release_id, staging, {
+            "source": "archive",
+            "received_bytes": received,
+            "upload_seconds": round(upload_seconds, 3),
+            "upload_rate_mbps": _rate_mbps(received, upload_seconds),
+            "extract_seconds": round(extract_seconds, 3),
+            "files": extracted["files"],
+            "extracted_bytes": extracted["bytes"]
+        }, started)
+    
+    async def deploy_files(self, uploads: Sequence[Any]) -> Dict[str, Any]:
+        """
+        여러 파일 업로드 배포 (filename과 비동기 read(size)를 가진 업로드 객체, 파일 이름의 디렉토리 유지)
+        """
+        if not uploads:
+            raise InvalidDeployError("업로드된 파일이 없습니다.")
+        
+        release_id, staging = self._new_release()
+        limit = settings.DEPLOY_MAX_UPLOAD_MB * 1024 * 1024
+        started = time.monotonic()
+        received = 0
+        try:
+            for upload in uploads:
+                relative = safe_member_path(upload.filename or "")
+                if relative is None:
+                    raise InvalidDeployError("파일 이름이 없는 업로드가 있습니다.")
+                target = staging / relative
+                target.parent.mkdir(parents=True, exist_ok=True)
+                async with aiofiles.open(target, "wb") as output:
+                    while True:
+                        chunk = await upload.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        received += len(chunk)
+                        if received > limit:
+                            raise DeployTooLargeError(f"업로드 크기가 {settings.DEPLOY_MAX_UPLOAD_MB}MB를 초과했습니다.")
+                        await output.write(chunk)
+            upload_seconds = time.monotonic() - started
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        
+        return await asyncio.to_thread(self._publish, release_id, staging, {
+            "source": "files",
+            "received_bytes": received,
+            "upload_seconds": round(upload_seconds, 3),
+            "upload_rate_mbps": _rate_mbps(received, upload_seconds),
+            "files": len(uploads)
+        }, started)
+    
+    def _publish(self, release_id: str, staging: Path, metrics: Dict[str, Any], started: float) -> Dict[str, Any]:
+        """스테이징 디렉토리를 릴리스로 확정하고 링크 교체, 오래된 릴리스 정리"""
+        if self.precompress_files:
+            metrics["precompressed"] = precompress(staging)
+        staging.rename(self.releases_dir / release_id)
+        
+        swap_started = time.monotonic()
+        previous = self.activate(release_id)
+        metrics["swap_ms"] = round((time.monotonic() - swap_started) * 1000, 3)
+        metrics["total_seconds"] = round(time.monotonic() - started, 3)
+        pruned = self.prune()
+        
+        logger.info(
+            f"배포 완료: {self.site_dir.name}/{release_id}, {metrics['received_bytes']}바이트, "
+            f"{metrics['upload_rate_mbps']}MB/s, 총 {metrics['total_seconds']}초"
+        )
+        return {"release_id": release_id, "previous_release_id": previous, "pruned": pruned, **metrics}
+    
+    def current_release(self) -> Optional[str]:
+        if not self.web_dir.is_symlink():
+            return None
+        return PurePosixPath(os.readlink(self.web_dir)).name
+    
+    def activate(self, release_id: str) -> Optional[str]:
+        """
+        www 링크를 릴리스로 교체 (새 링크를 만든 뒤 rename으로 덮어써 요청 중에도 중간 상태가 없음)
+        
+        Returns:
+            이전 릴리스 ID
+        """
+        previous = self.current_release()
+        if not self.web_dir.is_symlink() and self.web_dir.is_dir():
+            # 첫 배포: 기존 웹 디렉토리를 새 릴리스보다 먼저인 0번 릴리스로 옮겨 롤백 대상으로 남김
+            legacy_id = self._release_id(0, self.web_dir.stat().st_mtime)
+            self.releases_dir.mkdir(parents=True, exist_ok=True)
+            self.web_dir.rename(self.releases_dir / legacy_id)
+            previous = legacy_id
+        
+        link = self.site_dir / f".www-{release_id}"
+        link.unlink(missing_ok=True)
+        link.symlink_to(f"releases/{release_id}")
+        os.replace(link, self.web_dir)
+        return previous
+    
+    def list_releases(self) -> List[Dict[str, Any]]:
+        """릴리스 목록 (최신순)"""
+        try:
+            entries = [entry for entry in self.releases_dir.iterdir() if entry.is_dir() and not entry.name.startswith(".")]
+        except FileNotFoundError:
+            return []
+        current = self.current_release()
+        return [
+            {
+                "release_id": entry.name,
+                "current": entry.name == current,
+                "created_at": datetime.fromtimestamp(entry.stat().st_ctime, timezone.utc).isoformat()
+            }
+            for entry in sorted(entries, key=lambda entry: self._release_order(entry.name), reverse=True)
+        ]
+    
+    def rollback(self, release_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        릴리스로 되돌리기 (release_id가 없으면 현재 바로 이전 릴리스)
+        """
+        releases = [release["release_id"] for release in self.list_releases()]
+        current = self.current_release()
+        if release_id is None:
+            older = [
+                candidate for candidate in releases
+                if current is None or self._release_order(candidate) < self._release_order(current)
+            ]
+            if not older:
+                raise InvalidDeployError("되돌릴 이전 릴리스가 없습니다.")
+            release_id = older[0]
+        elif release_id not in releases:
+            raise InvalidDeployError(f"릴리스를 찾을 수 없습니다: {release_id}")
+        
+        previous = self.activate(release_id)
+        logger.info(f"배포 롤백: {self.site_dir.name} {previous} → {release_id}")
+        return {"release_id": release_id, "previous_release_id": previous}
+    
+    def prune(self, keep: Optional[int] = None) -> List[str]:
+        """최신 keep개와 현재 릴리스를 제외한 릴리스 삭제"""
+        keep = keep if keep is not None else settings.DEPLOY_KEEP_RELEASES
+        removed = []
+        for release in self.list_releases()[max(keep, 1):]:
+            if release["current"]:
+                continue
+            shutil.rmtree(self.releases_dir / release["release_id"], ignore_errors=True)
+            removed.append(release["release_id"])
+        return removed
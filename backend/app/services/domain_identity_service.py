@@ -0,0 +1,147 @@
+"""
+libvirt 도메인 MAC/UUID 할당 서비스
+
+MAC 주소와 도메인 UUID를 vm_id에서 결정적으로 유도해 호스팅 레코드에 저장합니다.
+DB의 유니크 인덱스로 중복을 막고, MAC이 이미 사용 중이면 다음 후보를 사용합니다.
+virsh dumpxml 결과와 DB를 일괄 대조하는 검증 기능을 함께 제공합니다.
+"""
+import uuid
+import hashlib
+import xml.etree.ElementTree as ET
+from typing import Dict, Any, List, Tuple, Optional
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import VMOperationError
+from app.models.hosting import Hosting
+from app.utils.logging_utils import get_logger
+
+logger = get_logger("domain_identity_service")
+
+# libvirt/QEMU 기본 OUI
+MAC_PREFIX = "52:54:00"
+
+# MAC 충돌 시 시도할 최대 후보 수
+MAX_MAC_ATTEMPTS = 64
+
+# 도메인 UUID(v5) 네임스페이스 (변경하면 기존 도메인과 UUID가 달라짐)
+DOMAIN_UUID_NAMESPACE = uuid.UUID("6f1c2a4e-9b3d-5e7f-8a10-2c4b6d8e0f12")
+
+
+def derive_mac_address(vm_id: str, attempt: int = 0) -> str:
+    """vm_id(와 충돌 시 시도 번호)에서 MAC 주소 유도"""
+    digest = hashlib.sha256(f"{vm_id}:{attempt}".encode()).digest()
+    return MAC_PREFIX + "".join(f":{byte:02x}" for byte in digest[:3])
+
+
+def derive_domain_uuid(vm_id: str) -> str:
+    """vm_id에서 도메인 UUID 유도"""
+    return str(uuid.uuid5(DOMAIN_UUID_NAMESPACE, vm_id))
+
+
+def parse_domain_identity(domain_xml: str) -> Tuple[Optional[str], List[str]]:
+    """
+    도메인 XML에서 UUID와 네트워크 인터페이스 MAC 주소 추출
+    """
+    root = ET.fromstring(domain_xml)
+    domain_uuid = root.findtext("uuid")
+    macs = [
+        mac.get("address").lower()
+        for mac in root.findall("./devices/interface/mac")
+        if mac.get("address")
+    ]
+    return (domain_uuid.strip().lower() if domain_uuid else None), macs
+
+
+class DomainIdentityAllocator:
+    """DB 기반 MAC/UUID 할당 및 검증"""
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def allocate(self, vm_id: str) -> Tuple[str, str]:
+        """
+        VM의 MAC 주소와 도메인 UUID 할당
+        
+        같은 트랜잭션에서 호스팅 레코드에 저장해야 하며, 동시에 같은 MAC을 고른
+        요청은 유니크 인덱스에 의해 커밋 시 거부됩니다.
+        
+        Returns:
+            (mac_address, domain_uuid)
+        
+        Raises:
+            VMOperationError: 사용 가능한 MAC 주소가 없거나 UUID가 이미 사용 중
+        """
+        domain_uuid = derive_domain_uuid(vm_id)
+        if self.db.query(Hosting.id).filter(Hosting.domain_uuid == domain_uuid).first():
+            raise VMOperationError(f"도메인 UUID가 이미 사용 중입니다: {vm_id}")
+        
+        for attempt in range(MAX_MAC_ATTEMPTS):
+            mac_address = derive_mac_address(vm_id, attempt)
+            if not self.db.query(Hosting.id).filter(Hosting.mac_address == mac_address).first():
+                if attempt:
+                    logger.info(f"MAC 주소 충돌로 {attempt + 1}번째 후보 사용: {vm_id} -> {mac_address}")
+                return mac_address, domain_uuid
+        
+        raise VMOperationError(f"사용 가능한 MAC 주소를 찾지 못했습니다: {vm_id}")
+    
+    def verify(self, domain_xmls: Dict[str, str]) -> Dict[str, Any]:
+        """
+        도메인 XML(virsh dumpxml 결과)과 DB에 저장된 MAC/UUID 일괄 대조
+        
+        Args:
+            domain_xmls: 도메인 이름(vm_id) → XML
+        
+        Returns:
+            불일치, DB에 없는 도메인, 도메인 간 중복 MAC/UUID, 도메인이 없는 호스팅 목록
+        """
+        hostings = {
+            hosting.vm_id: hosting
+            for hosting in self.db.query(Hosting).filter(
+                (Hosting.mac_address.isnot(None)) | (Hosting.domain_uuid.isnot(None))
+            )
+        }
+        
+        report: Dict[str, Any] = {
+            "checked": len(domain_xmls),
+            "ok": 0,
+            "mismatched": [],
+            "unknown_domains": [],
+            "duplicate_macs": {},
+            "duplicate_uuids": {},
+            "invalid_xml": [],
+            "missing_domains": sorted(set(hostings) - set(domain_xmls))
+        }
+        seen_macs: Dict[str, List[str]] = {}
+        seen_uuids: Dict[str, List[str]] = {}
+        
+        for name, domain_xml in sorted(domain_xmls.items()):
+            try:
+                domain_uuid, macs = parse_domain_identity(domain_xml)
+            except ET.ParseError:
+                report["invalid_xml"].append(name)
+                continue
+            
+            if domain_uuid:
+                seen_uuids.setdefault(domain_uuid, []).append(name)
+            for mac in macs:
+                seen_macs.setdefault(mac, []).append(name)
+            
+            hosting = hostings.get(name)
+            if hosting is None:
+                report["unknown_domains"].append(name)
+                continue
+            
+            problems = []
+            if hosting.domain_uuid and hosting.domain_uuid != domain_uuid:
+                problems.append({"field": "uuid", "expected": hosting.domain_uuid, "actual": domain_uuid})
+            if hosting.mac_address and hosting.mac_address not in macs:
+                problems.append({"field": "mac_address", "expected": hosting.mac_address, "actual": macs})
+            
+            if problems:
+                report["mismatched"].append({"domain": name, "problems": problems})
+            else:
+                report["ok"] += 1
+        
+        report["duplicate_macs"] = {mac: names for mac, names in seen_macs.items() if len(names) > 1}
+        report["duplicate_uuids"] = {value: names for value, names in seen_uuids.items() if len(names) > 1}
+        return report
@@ -0,0 +1,353 @@
+"""
+libvirt 도메인 XML 생성 서비스 - 프로필별 템플릿 캐시
+
+프로필별 도메인 정의(머신 타입, 디스크/네트워크 튜닝, hugepages, virtio-rng 등)를
+ElementTree로 한 번만 구성하고 검증해 캐시합니다. VM마다 달라지는 값(이름, UUID,
+메모리, 디스크 경로, MAC 등)만 검증한 뒤 캐시된 템플릿 복사본에 채웁니다.
+PCI 주소는 지정하지 않고 머신 타입에 맞게 libvirt가 할당하도록 둡니다.
+"""
+import re
+import copy
+import uuid
+import shutil
+import subprocess
+import tempfile
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+from typing import Dict, Any, Optional, List
+
+from app.core.config import settings
+from app.core.domain_profiles import get_domain_profile
+from app.core.exceptions import VMOperationError
+from app.services.cpu_placement_service import format_cpulist
+from app.utils.logging_utils import get_logger
+
+logger = get_logger("domain_xml_service")
+
+EMULATOR_PATH = "/usr/bin/qemu-system-x86_64"
+
+# 도메인 <metadata>에 적용 프로필을 기록하는 네임스페이스 (처리량 비교 시 그룹 기준)
+METADATA_NAMESPACE = "http://webhosting.local/xmlns/domain/1.0"
+ET.register_namespace("webhost", METADATA_NAMESPACE)
+
+_VM_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$")
+_MAC_PATTERN = re.compile(r"^[0-9a-f]{2}(:[0-9a-f]{2}){5}$")
+
+# 템플릿 검증 시 virt-xml-validate에 넘길 예시 값
+_SAMPLE_VALUES = {
+    "vm_id": "vm-template",
+    "disk_path": "/var/lib/libvirt/images/vm-template.qcow2",
+    "mac_address": "52:54:00:00:00:01",
+    "domain_uuid": "00000000-0000-5000-8000-000000000001",
+    "bridge_name": "virbr0",
+    "cloud_init_iso": "/var/lib/libvirt/images/cloud-init/vm-template/cloud-init.iso"
+}
+
+
+def _sub(parent: ET.Element, tag: str, text: Optional[str] = None, **attrs: Any) -> ET.Element:
+    element = ET.SubElement(parent, tag, {key: str(value) for key, value in attrs.items() if value is not None})
+    if text is not None:
+        element.text = text
+    return element
+
+
+def _disk_targets(profile: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    """프로필별 디스크/cdrom 버스와 장치 이름"""
+    if profile["disk_bus"] == "scsi":
+        return {"disk": {"dev": "sda", "bus": "scsi"}, "cdrom": {"dev": "sdb", "bus": "scsi"}}
+    cdrom_bus = "ide" if profile["machine"].startswith("pc-i440fx") else "sata"
+    return {
+        "disk": {"dev": "vda", "bus": "virtio"},
+        "cdrom": {"dev": "hdc" if cdrom_bus == "ide" else "sda", "bus": cdrom_bus}
+    }
+
+
+def _build_template(profile_name: str, profile: Dict[str, Any]) -> ET.Element:
+    """VM별 값이 비어 있는 도메인 정의 구성"""
+    targets = _disk_targets(profile)
+    
+    domain = ET.Element("domain", type="kvm")
+    _sub(domain, "name")
+    _sub(domain, "uuid")
+    metadata = _sub(domain, "metadata")
+    _sub(metadata, f"{{{METADATA_NAMESPACE}}}instance", profile=profile_name)
+    _sub(domain, "memory", unit="MiB")
+    _sub(domain, "currentMemory", unit="MiB")
+    if profile["hugepages"]:
+        backing = _sub(domain, "memoryBacking")
+        hugepages = _sub(backing, "hugepages")
+        _sub(hugepages, "page", size=settings.VM_HUGEPAGE_SIZE_KB, unit="KiB")
+    _sub(domain, "vcpu", placement="static")
+    if profile["iothreads"]:
+        _sub(domain, "iothreads", str(profile["iothreads"]))
+    
+    os_element = _sub(domain, "os")
+    _sub(os_element, "type", "hvm", arch="x86_64", machine=profile["machine"])
+    _sub(os_element, "boot", dev="hd")
+    _sub(os_element, "boot", dev="cdrom")
+    
+    features = _sub(domain, "features")
+    _sub(features, "acpi")
+    _sub(features, "apic")
+    _sub(domain, "cpu", mode="host-model", check="partial")
+    clock = _sub(domain, "clock", offset="utc")
+    _sub(clock, "timer", name="rtc", tickpolicy="catchup")
+    _sub(clock, "timer", name="pit", tickpolicy="delay")
+    _sub(clock, "timer", name="hpet", present="no")
+    _sub(domain, "on_poweroff", "destroy")
+    _sub(domain, "on_reboot", "restart")
+    _sub(domain, "on_crash", "restart")
+    
+    devices = _sub(domain, "devices")
+    _sub(devices, "emulator", EMULATOR_PATH)
+    
+    disk = _sub(devices, "disk", type="file", device="disk")
+    _sub(
+        disk, "driver", name="qemu", type="qcow2",
+        cache=profile["disk_cache"], io=profile["disk_io"],
+        discard="unmap" if profile["disk_cache"] else None,
+        iothread=1 if profile["iothreads"] and profile["disk_bus"] == "virtio" else None
+    )
+    _sub(disk, "source")
+    _sub(disk, "target", **targets["disk"])
+    
+    cdrom = _sub(devices, "disk", type="file", device="cdrom")
+    _sub(cdrom, "driver", name="qemu", type="raw")
+    _sub(cdrom, "source")
+    _sub(cdrom, "target", **targets["cdrom"])
+    _sub(cdrom, "readonly")
+    
+    if profile["disk_bus"] == "scsi":
+        controller = _sub(devices, "controller", type="scsi", index=0, model="virtio-scsi")
+        _sub(controller, "driver", iothread=1 if profile["iothreads"] else None)
+    
+    interface = _sub(devices, "interface", type="bridge")
+    _sub(interface, "mac")
+    _sub(interface, "source")
+    _sub(interface, "model", type="virtio")
+    _sub(interface, "driver", name="vhost")
+    
+    serial = _sub(devices, "serial", type="pty")
+    serial_target = _sub(serial, "target", type="isa-serial", port=0)
+    _sub(serial_target, "model", name="isa-serial")
+    console = _sub(devices, "console", type="pty")
+    _sub(console, "target", type="serial", port=0)
+    
+    if profile["rng"]:
+        rng = _sub(devices, "rng", model="virtio")
+        _sub(rng, "backend", "/dev/urandom", model="random")
+    
+    _sub(devices, "graphics", type="vnc", port=-1, autoport="yes")
+    video = _sub(devices, "video")
+    _sub(video, "model", type="cirrus" if profile["machine"].startswith("pc-i440fx") else "virtio", heads=1, primary="yes")
+    return domain
+
+
+def validate_domain_template(domain: ET.Element) -> List[str]:
+    """
+    도메인 템플릿 구조 검증
+    
+    Returns:
+        발견된 문제 목록 (비어 있으면 정상)
+    """
+    problems = []
+    for path in ("name", "uuid", "memory", "vcpu", "os/type", "devices/emulator",
+                 "devices/disk[@device='disk']/source", "devices/interface/mac"):
+        if domain.find(path) is None:
+            problems.append(f"필수 요소 없음: {path}")
+    
+    targets = [target.get("dev") for target in domain.findall("devices/disk/target")]
+    if len(targets) != len(set(targets)):
+        problems.append(f"디스크 장치 이름 중복: {targets}")
+    
+    machine = domain.find("os/type").get("machine", "") if domain.find("os/type") is not None else ""
+    buses = {target.get("bus") for target in domain.findall("devices/disk/target")}
+    if machine.startswith("q35") and "ide" in buses:
+        problems.append("q35 머신은 IDE 버스를 지원하지 않습니다")
+    if "scsi" in buses and domain.find("devices/controller[@type='scsi']") is None:
+        problems.append("SCSI 디스크에 virtio-scsi 컨트롤러가 없습니다")
+    
+    iothreads = int(domain.findtext("iothreads") or 0)
+    for driver in domain.iter("driver"):
+        if driver.get("iothread") and int(driver.get("iothread")) > iothreads:
+            problems.append(f"정의되지 않은 iothread 참조: {driver.get('iothread')}")
+    return problems
+
+
+def _fill(
+    domain: ET.Element,
+    profile: Dict[str, Any],
+    vm_id: str,
+    disk_path: str,
+    mac_address: str,
+    domain_uuid: str,
+    bridge_name: str,
+    memory_mb: int,
+    vcpus: int,
+    cloud_init_iso: Optional[str],
+    cpuset: Optional[List[int]],
+    numa_node: Optional[int]
+) -> None:
+    """템플릿 복사본에 VM별 값 채우기"""
+    domain.find("name").text = vm_id
+    domain.find("uuid").text = domain_uuid
+    domain.find("memory").text = str(memory_mb)
+    domain.find("currentMemory").text = str(memory_mb)
+    domain.find("vcpu").text = str(vcpus)
+    domain.find("devices/disk[@device='disk']/source").set("file", disk_path)
+    domain.find("devices/interface/mac").set("address", mac_address)
+    domain.find("devices/interface/source").set("bridge", bridge_name)
+    
+    devices = domain.find("devices")
+    cdrom = devices.find("disk[@device='cdrom']")
+    if cloud_init_iso:
+        cdrom.find("source").set("file", cloud_init_iso)
+    else:
+        devices.remove(cdrom)
+    
+    # 멀티큐는 vCPU 수를 넘지 않도록 제한
+    queues = min(profile["net_queues"], vcpus)
+    if queues > 1:
+        devices.find("interface/driver").set("queues", str(queues))
+    scsi_driver = devices.find("controller[@type='scsi']/driver")
+    if scsi_driver is not None and vcpus > 1:
+        scsi_driver.set("queues", str(vcpus))
+    
+    if profile["cpu_pinning"] and cpuset:
+        cputune = ET.Element("cputune")
+        for vcpu in range(vcpus):
+            _sub(cputune, "vcpupin", vcpu=vcpu, cpuset=cpuset[vcpu % len(cpuset)])
+        cpus = ",".join(str(cpu) for cpu in cpuset)
+        _sub(cputune, "emulatorpin", cpuset=cpus)
+        if profile["iothreads"]:
+            _sub(cputune, "iothreadpin", iothread=1, cpuset=cpus)
+        domain.insert(list(domain).index(domain.find("vcpu")) + 1, cputune)
+    elif cpuset:
+        # 고정하지 않는 프로필은 배정된 CPU 범위 안에서만 스케줄링
+        domain.find("vcpu").set("cpuset", format_cpulist(cpuset))
+    
+    if numa_node is not None:
+        numatune = ET.Element("numatune")
+        _sub(numatune, "memory", mode="strict" if profile["cpu_pinning"] else "preferred", nodeset=numa_node)
+        anchor = domain.find("cputune") if domain.find("cputune") is not None else domain.find("vcpu")
+        domain.insert(list(domain).index(anchor) + 1, numatune)
+
+
+def _run_schema_validator(profile_name: str, domain: ET.Element) -> None:
+    """virt-xml-validate가 있으면 libvirt 스키마로 검증 (프로필별 최초 1회)"""
+    validator = shutil.which("virt-xml-validate")
+    if not validator:
+        return
+    with tempfile.NamedTemporaryFile("w", suffix=".xml", encoding="utf-8") as f:
+        f.write(ET.tostring(domain, encoding="unicode"))
+        f.flush()
+        result = subprocess.run([validator, f.name, "domain"], capture_output=True, text=True, timeout=30)
+    if result.returncode != 0:
+        raise VMOperationError(f"도메인 템플릿이 libvirt 스키마와 맞지 않습니다 ({profile_name}): {result.stderr.strip()}")
+
+
+@lru_cache()
+def compile_domain_template(profile_name: str) -> ET.Element:
+    """
+    프로필별 도메인 템플릿 (최초 1회 구성 및 검증 후 캐시)
+    
+    Raises:
+        ValueError: 존재하지 않는 프로필
+        VMOperationError: 템플릿 검증 실패
+    """
+    profile = get_domain_profile(profile_name)
+    domain = _build_template(profile_name, profile)
+    
+    problems = validate_domain_template(domain)
+    if problems:
+        raise VMOperationError(f"도메인 템플릿 검증 실패 ({profile_name}): {'; '.join(problems)}")
+    
+    sample = copy.deepcopy(domain)
+    _fill(sample, profile, memory_mb=1024, vcpus=2, cpuset=[0, 1], numa_node=0, **_SAMPLE_VALUES)
+    _run_schema_validator(profile_name, sample)
+    
+    logger.info(f"도메인 템플릿 구성 완료: {profile_name}")
+    return domain
+
+
+def _validate_values(
+    vm_id: str,
+    disk_path: str,
+    mac_address: str,
+    domain_uuid: str,
+    memory_mb: int,
+    vcpus: int,
+    profile: Dict[str, Any],
+    cpuset: Optional[List[int]],
+    numa_node: Optional[int]
+) -> None:
+    """VM별 값 검증"""
+    if not _VM_ID_PATTERN.match(vm_id):
+        raise VMOperationError(f"도메인 이름이 올바르지 않습니다: {vm_id}")
+    if not disk_path.startswith("/"):
+        raise VMOperationError(f"디스크 경로는 절대 경로여야 합니다: {disk_path}")
+    if not _MAC_PATTERN.match(mac_address):
+        raise VMOperationError(f"MAC 주소 형식이 올바르지 않습니다: {mac_address}")
+    try:
+        uuid.UUID(domain_uuid)
+    except ValueError:
+        raise VMOperationError(f"도메인 UUID 형식이 올바르지 않습니다: {domain_uuid}")
+    if memory_mb <= 0 or vcpus <= 0:
+        raise VMOperationError(f"메모리/vCPU 값이 올바르지 않습니다: {memory_mb}MiB, {vcpus}vCPU")
+    if profile["hugepages"] and (memory_mb * 1024) % settings.VM_HUGEPAGE_SIZE_KB:
+        raise VMOperationError(f"메모리는 hugepage 크기({settings.VM_HUGEPAGE_SIZE_KB}KiB)의 배수여야 합니다: {memory_mb}MiB")
+    if cpuset is not None and (not cpuset or any(cpu < 0 for cpu in cpuset)):
+        raise VMOperationError(f"CPU 목록이 올바르지 않습니다: {cpuset}")
+    if numa_node is not None and numa_node < 0:
+        raise VMOperationError(f"NUMA 노드 번호가 올바르지 않습니다: {numa_node}")
+
+
+def build_domain_xml(
+    vm_id: str,
+    disk_path: str,
+    mac_address: str,
+    domain_uuid: str,
+    bridge_name: str,
+    memory_mb: int = 1024,
+    vcpus: int = 1,
+    cloud_init_iso: Optional[str] = None,
+    profile: Optional[str] = None,
+    cpuset: Optional[List[int]] = None,
+    numa_node: Optional[int] = None
+) -> str:
+    """
+    도메인 XML 생성
+    
+    Args:
+        profile: 도메인 성능 프로필 (legacy, balanced, throughput, 기본값: VM_DOMAIN_PROFILE)
+        cpuset: 배정된 호스트 CPU (cpu_pinning 프로필은 vCPU 순서대로 1:1 고정, 그 외에는 스케줄링 범위)
+        numa_node: 메모리를 할당할 NUMA 노드
+    
+    Raises:
+        ValueError: 존재하지 않는 프로필
+        VMOperationError: VM별 값이 올바르지 않음
+    """
+    profile_name = profile or settings.VM_DOMAIN_PROFILE
+    template = compile_domain_template(profile_name)
+    profile_config = get_domain_profile(profile_name)
+    
+    mac_address = mac_address.lower()
+    _validate_values(vm_id, disk_path, mac_address, domain_uuid, memory_mb, vcpus, profile_config, cpuset, numa_node)
+    if profile_config["cpu_pinning"] and not cpuset:
+        logger.debug(f"CPU 목록이 없어 vCPU 고정 없이 생성: {vm_id} ({profile_name})")
+    
+    domain = copy.deepcopy(template)
+    _fill(
+        domain, profile_config,
+        vm_id=vm_id,
+        disk_path=disk_path,
+        mac_address=mac_address,
+        domain_uuid=domain_uuid,
+        bridge_name=bridge_name,
+        memory_mb=memory_mb,
+        vcpus=vcpus,
+        cloud_init_iso=cloud_init_iso,
+        cpuset=cpuset,
+        numa_node=numa_node
+    )
+    return ET.tostring(domain, encoding="unicode")
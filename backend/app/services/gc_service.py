@@ -0,0 +1,326 @@
+"""
+고아 리소스 GC 서비스 - DB에 없는 컨테이너, 프록시 설정, VM 파일, 스냅샷 이미지 정리
+"""
+import re
+import shutil
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set, Tuple
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.hosting import Hosting
+from app.services.proxy_service import ProxyService
+from app.services.vm_service import VMService, SNAPSHOT_IMAGE_REPOSITORY, vm_file_paths
+from app.utils.logging_utils import get_logger
+
+logger = get_logger("gc_service")
+
+# create_vm이 생성하는 컨테이너 이름 접두사
+CONTAINER_PREFIX = "webhost-"
+
+# generate_vm_id 형식 (템플릿 이미지 등 다른 파일을 건드리지 않도록 제한)
+VM_ID_PATTERN = re.compile(r"^vm-[0-9a-z]+$")
+
+# VM별 경로 형식을 얻기 위한 자리표시 VM ID (vm_file_paths 결과에서 접두사/접미사 추출)
+_VM_ID_PLACEHOLDER = "vm-0"
+
+
+class OrphanCollector:
+    """
+    고아 리소스 수집기
+    
+    Docker(컨테이너, 스냅샷 이미지), nginx 호스팅 설정 디렉토리, VM 이미지 경로를 한 번씩 조회한 뒤
+    DB의 호스팅 목록과 비교하여 어느 호스팅에도 속하지 않는 리소스를 찾습니다.
+    생성 직후의 리소스를 고아로 오인하지 않도록 외부 리소스를 먼저 조회하고
+    GC_MIN_AGE_SECONDS보다 오래된 리소스만 대상으로 합니다.
+    """
+    
+    def __init__(
+        self,
+        db: Session,
+        proxy_service: Optional[ProxyService] = None,
+        vm_service: Optional[VMService] = None
+    ):
+        self.db = db
+        self.image_path = Path(settings.VM_IMAGE_PATH)
+        self.proxy_service = proxy_service or ProxyService()
+        # 스냅샷 이미지를 지울 때만 필요하므로 처음 사용할 때 생성 (환경 검증 포함)
+        self._vm_service = vm_service
+    
+    def find_orphans(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        고아 리소스 조회
+        
+        Returns:
+            리소스 종류별 고아 목록
+        """
+        containers = self._list_containers()
+        proxy_configs = self._list_proxy_configs()
+        vm_files = self._list_vm_files()
+        snapshot_images = self._list_snapshot_images()
+        
+        # 외부 리소스 조회 이후에 DB를 조회해야 그 사이 생성된 호스팅을 놓치지 않음
+        vm_ids, user_ids = self._known_ids()
+        cutoff = time.time() - settings.GC_MIN_AGE_SECONDS
+        
+        orphan_files = [
+            item for item in vm_files
+            if item["vm_id"] not in vm_ids and item["created_at"] < cutoff
+        ]
+        # 스냅샷 메타데이터가 남은 VM은 원격 노드에 만든 이미지도 있을 수 있으므로 함께 정리
+        snapshot_vm_ids = {item["vm_id"] for item in snapshot_images}
+        for item in orphan_files:
+            if item["path"].parent.name == "snapshots" and item["vm_id"] not in snapshot_vm_ids:
+                snapshot_vm_ids.add(item["vm_id"])
+                snapshot_images.append({**item, "name": f"{SNAPSHOT_IMAGE_REPOSITORY}/{item['vm_id']}"})
+        
+        return {
+            "snapshot_images": [
+                item for item in snapshot_images
+                if item["vm_id"] not in vm_ids and item["created_at"] < cutoff
+            ],
+            "containers": [
+                item for item in containers
+                if item["vm_id"] not in vm_ids and item["created_at"] < cutoff
+            ],
+            "proxy_configs": [
+                item for item in proxy_configs
+                if item["user_id"] not in user_ids and item["created_at"] < cutoff
+            ],
+            "vm_files": orphan_files
+        }
+    
+    def collect(self, dry_run: Optional[bool] = None, batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        고아 리소스 정리
+        
+        Args:
+            dry_run: True이면 삭제하지 않고 보고만 함 (기본값: GC_DRY_RUN)
+            batch_size: 한 번에 삭제할 리소스 수 (기본값: GC_BATCH_SIZE)
+        
+        Returns:
+            GC 결과 보고서
+        """
+        dry_run = settings.GC_DRY_RUN if dry_run is None else dry_run
+        batch_size = batch_size or settings.GC_BATCH_SIZE
+        started = time.monotonic()
+        
+        orphans = self.find_orphans()
+        report = {
+            "dry_run": dry_run,
+            "orphans": {kind: [item["name"] for item in items] for kind, items in orphans.items()},
+            "deleted": {kind: 0 for kind in orphans},
+            "errors": []
+        }
+        
+        if not dry_run:
+            # 원격 노드 이미지를 찾는 데 스냅샷 메타데이터가 필요하므로 VM 파일보다 먼저 정리
+            for batch in _chunks(orphans["snapshot_images"], batch_size):
+                self._remove_snapshot_images(batch, report)
+            for batch in _chunks(orphans["containers"], batch_size):
+                self._remove_containers(batch, report)
+            for batch in _chunks(orphans["proxy_configs"], batch_size):
+                self._remove_proxy_configs(batch, report)
+            for batch in _chunks(orphans["vm_files"], batch_size):
+                self._remove_vm_files(batch, report)
+        
+        report["elapsed_ms"] = int((time.monotonic() - started) * 1000)
+        
+        total = sum(len(items) for items in orphans.values())
+        if total:
+            logger.info(
+                f"고아 리소스 GC {'(dry-run) ' if dry_run else ''}완료: "
+                f"발견 {total}개, 삭제 {sum(report['deleted'].values())}개, 오류 {len(report['errors'])}개"
+            )
+        
+        return report
+    
+    def _known_ids(self) -> Tuple[Set[str], Set[str]]:
+        """DB에 등록된 VM ID와 사용자 ID"""
+        rows = self.db.query(Hosting.vm_id, Hosting.user_id).all()
+        return {vm_id for vm_id, _ in rows}, {str(user_id) for _, user_id in rows}
+    
+    def _list_containers(self) -> List[Dict[str, Any]]:
+        """webhost- 컨테이너 목록 (정지된 컨테이너 포함)"""
+        try:
+            result = subprocess.run([
+                "docker", "ps", "-a",
+                "--filter", f"name={CONTAINER_PREFIX}",
+                "--format", "{{.Names}}\t{{.CreatedAt}}"
+            ], capture_output=True, text=True, timeout=30)
+        except FileNotFoundError:
+            return []
+        except subprocess.TimeoutExpired:
+            logger.warning("컨테이너 목록 조회 시간 초과, 컨테이너 GC를 건너뜁니다.")
+            return []
+        
+        if result.returncode != 0:
+            logger.warning(f"컨테이너 목록 조회 실패, 컨테이너 GC를 건너뜁니다: {result.stderr.strip()}")
+            return []
+        
+        containers = []
+        for line in result.stdout.splitlines():
+            name, _, created = line.partition("\t")
+            if not name.startswith(CONTAINER_PREFIX):
+                continue
+            vm_id = name[len(CONTAINER_PREFIX):]
+            if not VM_ID_PATTERN.match(vm_id):
+                continue
+            containers.append({
+                "name": name,
+                "vm_id": vm_id,
+                "created_at": _parse_docker_time(created)
+            })
+        return containers
+    
+    def _list_proxy_configs(self) -> List[Dict[str, Any]]:
+        """사용자별 nginx 호스팅 설정 파일 목록"""
+        configs = []
+        for user_id, config_file in self.proxy_service.list_proxy_config_files().items():
+            if not user_id.isdigit():
+                continue
+            configs.append({
+                "name": config_file.name,
+                "user_id": user_id,
+                "created_at": _mtime(config_file)
+            })
+        return configs
+    
+    def _list_snapshot_images(self) -> List[Dict[str, Any]]:
+        """이 호스트의 스냅샷/마이그레이션 커밋 이미지 (VM별 저장소 하나)"""
+        try:
+            result = subprocess.run([
+                "docker", "images",
+                "--filter", f"reference={SNAPSHOT_IMAGE_REPOSITORY}/*",
+                "--format", "{{.Repository}}\t{{.CreatedAt}}"
+            ], capture_output=True, text=True, timeout=30)
+        except FileNotFoundError:
+            return []
+        except subprocess.TimeoutExpired:
+            logger.warning("스냅샷 이미지 목록 조회 시간 초과, 스냅샷 이미지 GC를 건너뜁니다.")
+            return []
+        
+        if result.returncode != 0:
+            logger.warning(f"스냅샷 이미지 목록 조회 실패, 스냅샷 이미지 GC를 건너뜁니다: {result.stderr.strip()}")
+            return []
+        
+        images: Dict[str, Dict[str, Any]] = {}
+        for line in result.stdout.splitlines():
+            repository, _, created = line.partition("\t")
+            vm_id = repository.rpartition("/")[2]
+            if not repository.startswith(f"{SNAPSHOT_IMAGE_REPOSITORY}/") or not VM_ID_PATTERN.match(vm_id):
+                continue
+            # 태그가 여러 개면 가장 최근 이미지 기준으로 나이 판단
+            created_at = _parse_docker_time(created)
+            if vm_id not in images or created_at > images[vm_id]["created_at"]:
+                images[vm_id] = {"name": repository, "vm_id": vm_id, "created_at": created_at}
+        return list(images.values())
+    
+    def _list_vm_files(self) -> List[Dict[str, Any]]:
+        """VMService가 VM별로 만드는 경로(vm_file_paths)와 같은 형식의 파일/디렉토리 목록"""
+        files = []
+        for template in vm_file_paths(self.image_path, _VM_ID_PLACEHOLDER):
+            prefix, _, suffix = template.name.partition(_VM_ID_PLACEHOLDER)
+            if not template.parent.is_dir():
+                continue
+            for entry in template.parent.iterdir():
+                name = entry.name
+                if not (name.startswith(prefix) and name.endswith(suffix)):
+                    continue
+                vm_id = name[len(prefix):len(name) - len(suffix)]
+                if VM_ID_PATTERN.match(vm_id):
+                    files.append(self._vm_file(entry, vm_id))
+        return files
+    
+    def _vm_file(self, path: Path, vm_id: str) -> Dict[str, Any]:
+        return {
+            "name": str(path.relative_to(self.image_path)),
+            "path": path,
+            "vm_id": vm_id,
+            "created_at": _mtime(path)
+        }
+    
+    def _remove_snapshot_images(self, batch: List[Dict[str, Any]], report: Dict[str, Any]) -> None:
+        """VM별 스냅샷/마이그레이션 이미지 삭제 (스냅샷을 만든 노드 포함)"""
+        try:
+            vm_service = self._vm_service or VMService()
+        except Exception as e:
+            report["errors"].append(f"스냅샷 이미지 삭제 실패: {e}")
+            return
+        self._vm_service = vm_service
+        
+        for item in batch:
+            try:
+                vm_service._remove_snapshot_images(item["vm_id"])
+                report["deleted"]["snapshot_images"] += 1
+            except Exception as e:
+                report["errors"].append(f"스냅샷 이미지 삭제 실패 {item['name']}: {e}")
+    
+    def _remove_containers(self, batch: List[Dict[str, Any]], report: Dict[str, Any]) -> None:
+        """컨테이너 일괄 삭제 (docker rm 1회)"""
+        names = [item["name"] for item in batch]
+        try:
+            result = subprocess.run(
+                ["docker", "rm", "-f", *names],
+                capture_output=True, text=True, timeout=120
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            report["errors"].append(f"컨테이너 삭제 실패 {names}: {e}")
+            return
+        
+        removed = set(result.stdout.split())
+        report["deleted"]["containers"] += len(removed & set(names))
+        if result.returncode != 0:
+            report["errors"].append(f"컨테이너 삭제 실패: {result.stderr.strip()}")
+    
+    def _remove_proxy_configs(self, batch: List[Dict[str, Any]], report: Dict[str, Any]) -> None:
+        """프록시 설정 일괄 삭제 (nginx 리로드 1회)"""
+        try:
+            results = self.proxy_service.remove_proxy_rules([item["user_id"] for item in batch])
+        except Exception as e:
+            report["errors"].append(f"프록시 설정 삭제 실패: {e}")
+            return
+        
+        report["deleted"]["proxy_configs"] += sum(results.values())
+        for user_id, removed in results.items():
+            if not removed:
+                report["errors"].append(f"프록시 설정 삭제 실패: 사용자 {user_id}")
+    
+    def _remove_vm_files(self, batch: List[Dict[str, Any]], report: Dict[str, Any]) -> None:
+        """VM 파일 삭제"""
+        for item in batch:
+            path = item["path"]
+            try:
+                if path.is_dir():
+                    shutil.rmtree(path)
+                else:
+                    path.unlink()
+                report["deleted"]["vm_files"] += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                report["errors"].append(f"VM 파일 삭제 실패 {item['name']}: {e}")
+
+
+def _chunks(items: List[Dict[str, Any]], size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        # 조회 실패 시 최신 리소스로 간주하여 삭제 대상에서 제외
+        return time.time()
+
+
+def _parse_docker_time(value: str) -> float:
+    """docker CreatedAt 문자열 (예: 2024-01-01 12:00:00 +0900 KST) 파싱"""
+    try:
+        return datetime.strptime(value.strip()[:25], "%Y-%m-%d %H:%M:%S %z").timestamp()
+    except ValueError:
+        return time.time()
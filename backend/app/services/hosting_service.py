@@ -3,21 +3,43 @@
 """
 import logging
 import asyncio
+import time
 from typing import Optional, List, Dict, Any
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from datetime import datetime, timedelta
+from sqlalchemy.sql import func
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
 
 from app.models.hosting import Hosting, HostingStatus
 from app.models.user import User
-from app.schemas.hosting import HostingCreate, HostingUpdate, HostingStats
+from app.schemas.hosting import HostingCreate, HostingUpdate, HostingStats, HostingResourceUpdate, HostingCacheUpdate
 from app.services.vm_service import VMService
+from app.services.domain_identity_service import DomainIdentityAllocator
+from app.services.cpu_placement_service import CpuPlacementEngine, vcpus_for
 from app.services.proxy_service import ProxyService
+from app.services.proxy_cache_service import ProxyCacheManager
+from app.services.access_log_service import AccessLogIngester
+from app.services.scale_to_zero_service import ColdStartRecorder, wait_until_ready
+from app.services.usage_service import load_usage, parse_window
+from app.services.deploy_service import SiteDeployer
+from app.services.route_service import get_route_table, load_routes_from_db, wake_upstream
+from app.services.provisioning_service import ProvisioningJournalService, PROVISIONING_STEPS
+from app.models.provisioning import ProvisioningStep
+from app.core.config import settings
+from app.core.resource_plans import get_resource_plan, STATIC_PLAN
+from app.services.capacity_service import get_capacity_scheduler
+from app.services.node_service import NodeService
+from app.services.migration_service import MigrationRecorder
+from app.services.static_site_service import dynamic_markers, precompress
+from app.models.node import Node
 from app.core.exceptions import (
     HostingNotFoundError,
     HostingAlreadyExistsError,
     VMOperationError,
     InsufficientPermissionError,
+    InvalidOperationError,
     UserNotFoundError
 )
 
@@ -31,10 +53,12 @@ class HostingService:
         self.db = db
         self.vm_service = VMService()
         self.proxy_service = ProxyService()
+        self.journal = ProvisioningJournalService(db)
+        self.node_service = NodeService(db)
     
     def create_hosting(self, user_id: int, hosting_data: HostingCreate) -> Hosting:
         """
-        새 호스팅 생성 (개선된 버전 - 완전한 롤백 지원)
+        새 호스팅 생성 (단계 저널 기반 - 재개 및 보상 지원)
         """
         # 사용자 존재 확인
         user = self.db.query(User).filter(User.id == user_id).first()
@@ -44,160 +68,364 @@ class HostingService:
         # 기존 호스팅 확인 (사용자당 1개 제한)
         existing_hosting = self.db.query(Hosting).filter(Hosting.user_id == user_id).first()
         if existing_hosting:
+            # 중단된 프로비저닝 작업이면 완료된 단계를 건너뛰고 이어서 진행
+            if existing_hosting.status == HostingStatus.CREATING and self._is_provisioning_stale(existing_hosting):
+                logger.info(f"중단된 프로비저닝 재개 요청: 호스팅 ID {existing_hosting.id}")
+                return self.resume_provisioning(existing_hosting.id)
             raise HostingAlreadyExistsError("이미 호스팅을 보유하고 있습니다.")
         
-        # 생성된 리소스 추적
-        created_resources = {
-            'vm_id': None,
-            'hosting_id': None,
-            'ssh_port': None,
-            'proxy_added': False,
-            'vm_created': False
-        }
+        # 리소스 플랜 (컨테이너 cgroup 제한)
+        plan = hosting_data.plan or settings.DEFAULT_RESOURCE_PLAN
+        resources = get_resource_plan(plan)
+        
+        # 노드가 등록되어 있으면 용량은 노드별로 확인하고, 없으면 로컬 호스트 기준으로 확인
+        # (정적 호스팅은 컨테이너 없이 프론트 nginx가 서빙하므로 노드에 배치하지 않음)
+        multi_node = plan != STATIC_PLAN and self.node_service.has_active_nodes()
+        
+        # 호스트 용량 확인 및 동시 프로비저닝 슬롯 획득 (부족하면 대기 또는 503)
+        with get_capacity_scheduler().admit(self.db, user_id, resources, check_capacity=not multi_node):
+            # 슬롯을 얻은 뒤 배치해야 동시 요청이 같은 노드 여유분을 중복으로 사용하지 않음
+            node = self.node_service.place(resources, hosting_data.node_labels) if multi_node else None
+            return self._create_and_provision(user_id, hosting_data, plan, resources, node)
+    
+    def _create_and_provision(
+        self,
+        user_id: int,
+        hosting_data: HostingCreate,
+        plan: str,
+        resources: Dict[str, Any],
+        node: Optional[Node] = None
+    ) -> Hosting:
+        """
+        호스팅 레코드 생성 후 프로비저닝 실행
+        """
+        hosting = None
         
         try:
             # VM ID 생성
             vm_id = self.vm_service.generate_vm_id()
-            created_resources['vm_id'] = vm_id
             
             # 사용 가능한 SSH 포트 찾기
             ssh_port = self.vm_service.get_available_ssh_port(db_session=self.db)
-            created_resources['ssh_port'] = ssh_port
+            
+            # libvirt 도메인 MAC/UUID 할당 (vm_id에서 결정적으로 유도, DB 유니크 인덱스로 중복 방지)
+            mac_address, domain_uuid = DomainIdentityAllocator(self.db).allocate(vm_id)
+            
+            # 로컬 호스트 도메인의 vCPU/NUMA 노드 배정
+            placement = None
+            if node is None and plan != STATIC_PLAN:
+                placement = CpuPlacementEngine(self.db).place(
+                    vm_id, vcpus_for(resources.get("cpus")), resources.get("memory_mb")
+                )
             
             # 호스팅 이름 생성 (제공되지 않은 경우)
             hosting_name = hosting_data.name if hosting_data.name else f"hosting-{vm_id[-8:]}"
             
-            # 호스팅 레코드 생성 (상태: CREATING)
+            # 호스팅 레코드 생성 (상태: CREATING, ssh_port 유니크 제약으로 포트 예약)
             hosting = Hosting(
                 user_id=user_id,
                 name=hosting_name,
                 vm_id=vm_id,
                 vm_ip="0.0.0.0",  # VM 생성 후 업데이트
                 ssh_port=ssh_port,
-                status=HostingStatus.CREATING
+                mac_address=mac_address,
+                domain_uuid=domain_uuid,
+                cpuset=placement.cpuset if placement else None,
+                numa_node=placement.numa_node if placement else None,
+                status=HostingStatus.CREATING,
+                plan=plan,
+                node_id=node.id if node else None,
+                **resources
             )
             
             self.db.add(hosting)
             self.db.commit()
             self.db.refresh(hosting)
-            created_resources['hosting_id'] = hosting.id
             
-            logger.info(f"호스팅 레코드 생성: 사용자 {user_id}, VM {vm_id}, 호스팅 ID {hosting.id}")
+            self.journal.record(hosting, ProvisioningStep.PORT_RESERVED, {
+                "vm_id": vm_id,
+                "ssh_port": ssh_port
+            })
             
-            try:
-                # VM 생성
-                logger.info(f"VM 생성 시작: {vm_id}")
-                vm_result = self.vm_service.create_vm(vm_id, ssh_port, str(user_id))
-                created_resources['vm'] = True
-                
-                # VM 결과에서 웹 포트 및 기타 정보 추출
-                vm_ip = vm_result.get('vm_ip', '127.0.0.1')
-                web_port = vm_result.get('web_port', 8000)
-                container_name = vm_result.get('container_name')
-                web_dir = vm_result.get('web_dir')
-                
-                logger.info(f"VM 생성 완료: {vm_id}, IP: {vm_ip}, 웹포트: {web_port}")
-                
-                # 호스팅 레코드 업데이트 (IP와 실제 정보로)
-                hosting.vm_ip = vm_ip
-                hosting.status = HostingStatus.RUNNING  # VM 생성 성공 시 바로 RUNNING 상태
-                self.db.commit()
-                
-                # 프록시 설정 (사용자별 URL 라우팅)
-                logger.info(f"프록시 설정 시작: 사용자 {user_id}")
-                proxy_result = self.proxy_service.add_proxy_rule(
-                    user_id=str(user_id), 
-                    vm_ip=vm_ip, 
-                    ssh_port=ssh_port,
-                    web_port=web_port
-                )
-                created_resources['proxy'] = True
-                
-                logger.info(f"프록시 설정 완료: {proxy_result}")
-                
-                # 최종 호스팅 정보 업데이트
-                hosting.vm_ip = vm_ip
-                hosting.status = HostingStatus.RUNNING
-                self.db.commit()
-                
-                # 성공 로그
-                logger.info(
-                    f"호스팅 생성 완료: 사용자 {user_id}, "
-                    f"VM {vm_id}, "
-                    f"웹 URL: {proxy_result.get('web_url', 'N/A')}, "
-                    f"SSH: {proxy_result.get('ssh_command', 'N/A')}"
-                )
-                
-                # 추가 정보는 로깅용으로만 사용하고, hosting 객체에는 설정하지 않음
-                logger.info(f"추가 정보 - 웹포트: {web_port}, 컨테이너: {container_name}, 웹디렉토리: {web_dir}")
-                
-                return hosting
-                
-            except Exception as vm_error:
-                logger.error(f"VM 생성 실패: {vm_error}")
-                # VM 생성 실패 시 호스팅 상태 업데이트 후 롤백
-                hosting.status = HostingStatus.ERROR
-                self.db.commit()
-                self._rollback_resources(created_resources)
-                raise VMOperationError(f"VM 생성 실패: {vm_error}")
+            logger.info(
+                f"호스팅 레코드 생성: 사용자 {user_id}, VM {vm_id}, 호스팅 ID {hosting.id}, "
+                f"노드 {node.name if node else 'local'}"
+            )
             
         except IntegrityError as e:
             logger.error(f"데이터베이스 무결성 오류: {e}")
             self.db.rollback()
-            self._rollback_resources(created_resources)
             raise HostingAlreadyExistsError("호스팅 생성 중 중복 오류가 발생했습니다.")
             
         except Exception as e:
             logger.error(f"호스팅 생성 실패: {e}")
             self.db.rollback()
-            self._rollback_resources(created_resources)
+            if hosting is not None and hosting.id:
+                self.compensate_provisioning(hosting.id)
             raise VMOperationError(f"호스팅 생성 중 오류가 발생했습니다: {e}")
     
-    def _rollback_resources(self, created_resources: Dict[str, Any]) -> None:
+        try:
+            return self._run_provisioning(hosting)
+        except Exception as vm_error:
+            logger.error(f"VM 생성 실패: {vm_error}")
+            self.db.rollback()
+            self.compensate_provisioning(hosting.id)
+            raise VMOperationError(f"VM 생성 실패: {vm_error}")
+    
+    def _run_provisioning(self, hosting: Hosting) -> Hosting:
+        """
+        프로비저닝 단계 실행 (저널에 완료 기록된 단계는 건너뜀)
+        
+        포트 예약 → SSH 키 → 컨테이너 → 프록시 → 검증 순으로 진행하며,
+        각 단계 결과를 즉시 커밋합니다. 정적 호스팅은 컨테이너 대신 웹 디렉토리를 만들고
+        프록시 대신 웹 디렉토리 직접 서빙 규칙을 추가합니다.
+        """
+        entries = self.journal.get_entries(hosting.id)
+        user_id = str(hosting.user_id)
+        vm_id = hosting.vm_id
+        node_target = self._node_target(hosting)
+        static = hosting.plan == STATIC_PLAN
+        
+        # SSH 키 생성
+        if ProvisioningStep.KEYS_GENERATED not in entries:
+            self.vm_service.generate_ssh_keypair(vm_id)
+            self.journal.record(hosting, ProvisioningStep.KEYS_GENERATED, {
+                "key_dir": str(self.vm_service.get_ssh_key_dir(vm_id))
+            })
+        
+        # 컨테이너 생성
+        vm_result = entries.get(ProvisioningStep.CONTAINER_CREATED)
+        if vm_result is None and static:
+            created = self.vm_service.create_static_site(vm_id, user_id)
+            vm_result = {"web_dir": created["web_dir"], "static": True}
+            hosting.vm_ip = '127.0.0.1'
+            self.journal.record(hosting, ProvisioningStep.CONTAINER_CREATED, vm_result)
+            
+            logger.info(f"정적 호스팅 웹 디렉토리 생성 완료: {vm_id}, {vm_result['web_dir']}")
+        elif vm_result is None:
+            # 이전 시도가 컨테이너 생성 후 기록 전에 중단되었다면 남은 컨테이너 정리
+            self.vm_service.remove_container(vm_id, **node_target)
+            
+            logger.info(f"VM 생성 시작: {vm_id}")
+            created = self.vm_service.create_vm(
+                vm_id, hosting.ssh_port, user_id,
+                resources=self._container_resources(hosting),
+                **self._node_target(hosting, with_address=True)
+            )
+            vm_result = {
+                key: created.get(key)
+                for key in ("vm_ip", "web_port", "container_name", "container_id", "web_dir")
+            }
+            hosting.vm_ip = vm_result.get('vm_ip') or '127.0.0.1'
+            self.journal.record(hosting, ProvisioningStep.CONTAINER_CREATED, vm_result)
+            
+            logger.info(f"VM 생성 완료: {vm_id}, IP: {hosting.vm_ip}, 웹포트: {vm_result.get('web_port')}")
+        
+        vm_ip = vm_result.get('vm_ip') or '127.0.0.1'
+        web_port = vm_result.get('web_port') or 8000
+        
+        # 프록시 설정 (사용자별 URL 라우팅)
+        proxy_result = entries.get(ProvisioningStep.PROXY_CONFIGURED)
+        if proxy_result is None:
+            logger.info(f"프록시 설정 시작: 사용자 {user_id}")
+            if static:
+                added = self.proxy_service.add_static_rule(user_id, vm_result["web_dir"], vm_id)
+            else:
+                added = self.proxy_service.add_proxy_rule(
+                    user_id=user_id,
+                    vm_ip=vm_ip,
+                    ssh_port=hosting.ssh_port,
+                    web_port=web_port,
+                    vm_id=vm_id
+                )
+            proxy_result = {
+                key: added.get(key)
+                for key in ("web_url", "ssh_command", "config_file", "verified")
+            }
+            self.journal.record(hosting, ProvisioningStep.PROXY_CONFIGURED, proxy_result)
+            
+            logger.info(f"프록시 설정 완료: {proxy_result}")
+        
+        # 최종 호스팅 정보 업데이트
+        if ProvisioningStep.VERIFIED not in entries:
+            hosting.vm_ip = vm_ip
+            hosting.status = HostingStatus.RUNNING
+            self.journal.record(hosting, ProvisioningStep.VERIFIED, {
+                "proxy_verified": bool(proxy_result.get('verified'))
+            })
+        
+        self.db.refresh(hosting)
+        
+        # 성공 로그
+        logger.info(
+            f"호스팅 생성 완료: 사용자 {user_id}, "
+            f"VM {vm_id}, "
+            f"웹 URL: {proxy_result.get('web_url', 'N/A')}, "
+            f"SSH: {proxy_result.get('ssh_command', 'N/A')}"
+        )
+        
+        return hosting
+    
+    def resume_provisioning(self, hosting_id: int) -> Hosting:
         """
-        생성된 리소스들을 완전히 정리
+        중단된 프로비저닝 재개 (실패 시 완료된 단계를 보상)
         """
-        logger.info(f"리소스 롤백 시작: {created_resources}")
+        hosting = self.get_hosting_by_id(hosting_id)
+        if not hosting:
+            raise HostingNotFoundError()
+        
+        if hosting.status != HostingStatus.CREATING:
+            return hosting
+        
+        # 다른 워커가 동시에 재개하지 않도록 하트비트를 원자적으로 갱신해 점유
+        if not self._claim_provisioning(hosting):
+            raise VMOperationError("다른 작업자가 이미 프로비저닝을 진행 중입니다.")
+        
+        logger.info(f"프로비저닝 재개: 호스팅 ID {hosting_id}, 다음 단계 {self.journal.next_step(hosting_id)}")
         
         try:
-            # 프록시 규칙 제거
-            if created_resources.get('proxy_added') and created_resources.get('vm_id'):
-                try:
-                    # 사용자 ID를 추출하기 위해 호스팅 레코드에서 조회
-                    if created_resources.get('hosting_id'):
-                        hosting = self.db.query(Hosting).filter(
-                            Hosting.id == created_resources['hosting_id']
-                        ).first()
-                        if hosting:
-                            self.proxy_service.remove_proxy_rule(str(hosting.user_id))
-                            logger.info(f"프록시 규칙 제거 완료: {hosting.user_id}")
-                except Exception as e:
-                    logger.error(f"프록시 규칙 제거 실패: {e}")
+            return self._run_provisioning(hosting)
+        except Exception as e:
+            logger.error(f"프로비저닝 재개 실패: {e}")
+            self.db.rollback()
+            self.compensate_provisioning(hosting_id)
+            raise VMOperationError(f"VM 생성 실패: {e}")
             
-            # VM 삭제
-            if created_resources.get('vm_created') and created_resources.get('vm_id'):
-                try:
-                    self.vm_service.delete_vm(created_resources['vm_id'])
-                    logger.info(f"VM 삭제 완료: {created_resources['vm_id']}")
-                except Exception as e:
-                    logger.error(f"VM 삭제 실패: {e}")
-            
-            # 호스팅 레코드 삭제
-            if created_resources.get('hosting_id'):
-                try:
-                    hosting = self.db.query(Hosting).filter(
-                        Hosting.id == created_resources['hosting_id']
-                    ).first()
-                    if hosting:
-                        self.db.delete(hosting)
-                        self.db.commit()
-                        logger.info(f"호스팅 레코드 삭제 완료: {created_resources['hosting_id']}")
-                except Exception as e:
-                    logger.error(f"호스팅 레코드 삭제 실패: {e}")
-                    self.db.rollback()
+    def compensate_provisioning(self, hosting_id: int) -> bool:
+        """
+        저널에 기록된 단계를 역순으로 되돌리고 호스팅 레코드 삭제
+            
+        Returns:
+            모든 단계 보상 성공 여부 (실패 시 호스팅은 ERROR 상태로 남음)
+        """
+        hosting = self.get_hosting_by_id(hosting_id)
+        if not hosting:
+            return True
                     
+        entries = self.journal.get_entries(hosting_id)
+        logger.info(f"리소스 보상 시작: 호스팅 ID {hosting_id}, 완료 단계 {[step.value for step in entries]}")
+        
+        failed = False
+        for step in reversed(PROVISIONING_STEPS):
+            if step not in entries:
+                continue
+            try:
+                self._compensate_step(hosting, step)
+                self.journal.forget(hosting_id, step)
+            except Exception as e:
+                logger.error(f"단계 보상 실패: 호스팅 ID {hosting_id}, 단계 {step.value}: {e}")
+                self.db.rollback()
+                failed = True
+        
+        # 컨테이너 생성 도중 중단되어 기록되지 않은 컨테이너도 정리
+        if ProvisioningStep.CONTAINER_CREATED not in entries:
+            self.vm_service.remove_container(hosting.vm_id, **self._node_target(hosting))
+        
+        try:
+            if failed:
+                hosting.status = HostingStatus.ERROR
+            else:
+                self.db.delete(hosting)
+            self.db.commit()
+            logger.info(f"리소스 보상 완료: 호스팅 ID {hosting_id}, 레코드 {'유지(ERROR)' if failed else '삭제'}")
         except Exception as e:
-            logger.error(f"리소스 롤백 중 오류: {e}")
+            logger.error(f"호스팅 레코드 정리 실패: {e}")
+            self.db.rollback()
+            return False
+        
+        return not failed
+    
+    def _compensate_step(self, hosting: Hosting, step: ProvisioningStep) -> None:
+        """
+        단일 단계 보상
+        """
+        if step == ProvisioningStep.PROXY_CONFIGURED:
+            if not self.proxy_service.remove_proxy_rule(str(hosting.user_id)):
+                raise VMOperationError(f"프록시 규칙 제거 실패: 사용자 {hosting.user_id}")
+            logger.info(f"프록시 규칙 제거 완료: {hosting.user_id}")
+        elif step == ProvisioningStep.CONTAINER_CREATED and hosting.plan == STATIC_PLAN:
+            # 정적 호스팅은 컨테이너가 없고 웹 디렉토리는 VM 파일 정리에서 삭제
+            return
+        elif step == ProvisioningStep.CONTAINER_CREATED:
+            if not self.vm_service.remove_container(hosting.vm_id, **self._node_target(hosting)):
+                raise VMOperationError(f"컨테이너 삭제 실패: {hosting.vm_id}")
+            logger.info(f"컨테이너 삭제 완료: {hosting.vm_id}")
+        elif step == ProvisioningStep.KEYS_GENERATED:
+            self.vm_service.remove_ssh_keypair(hosting.vm_id)
+        # PORT_RESERVED는 레코드 삭제로, VERIFIED는 별도 리소스가 없어 보상 불필요
+    
+    def _node_target(self, hosting: Hosting, with_address: bool = False) -> Dict[str, str]:
+        """
+        호스팅이 배치된 노드의 Docker 접속 인자 (로컬 호스트면 빈 dict)
+        """
+        if hosting.node is None:
+            return {}
+        target = {"docker_host": hosting.node.docker_host}
+        if with_address:
+            target["node_address"] = hosting.node.address
+        return target
+    
+    def sweep_stale_provisioning(self, stale_after: Optional[int] = None) -> Dict[str, int]:
+        """
+        방치된 프로비저닝 작업 정리 (재개 시도 후 실패하면 보상)
+        
+        Args:
+            stale_after: 마지막 진행 이후 방치로 간주할 시간 (초)
+        
+        Returns:
+            처리 결과 카운트
+        """
+        stale_after = stale_after if stale_after is not None else settings.PROVISIONING_STALE_SECONDS
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=stale_after)
+        
+        stale_hostings = (
+            self.db.query(Hosting)
+            .filter(Hosting.status == HostingStatus.CREATING, Hosting.updated_at < cutoff)
+            .all()
+        )
+        
+        result = {"found": len(stale_hostings), "resumed": 0, "compensated": 0, "skipped": 0}
+        
+        for hosting in stale_hostings:
+            try:
+                self.resume_provisioning(hosting.id)
+                result["resumed"] += 1
+            except VMOperationError as e:
+                if self.get_hosting_by_id(hosting.id) is None:
+                    result["compensated"] += 1
+                else:
+                    result["skipped"] += 1
+                logger.warning(f"방치된 프로비저닝 처리: 호스팅 ID {hosting.id}: {e.detail}")
+        
+        if stale_hostings:
+            logger.info(f"프로비저닝 스위프 완료: {result}")
+        
+        return result
+    
+    def _is_provisioning_stale(self, hosting: Hosting) -> bool:
+        """
+        마지막 단계 기록 이후 일정 시간 진행이 없었는지 확인
+        """
+        if not hosting.updated_at:
+            return True
+        updated_at = hosting.updated_at
+        if updated_at.tzinfo is None:
+            # 시간대를 저장하지 않는 DB(SQLite)는 UTC로 기록됨
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        return datetime.now(timezone.utc) - updated_at > timedelta(seconds=settings.PROVISIONING_STALE_SECONDS)
+    
+    def _claim_provisioning(self, hosting: Hosting) -> bool:
+        """
+        updated_at 비교-갱신으로 프로비저닝 작업 점유
+        """
+        claimed = (
+            self.db.query(Hosting)
+            .filter(Hosting.id == hosting.id, Hosting.updated_at == hosting.updated_at)
+            .update({Hosting.updated_at: func.now()}, synchronize_session=False)
+        )
+        self.db.commit()
+        self.db.refresh(hosting)
+        return claimed == 1
     
     def _schedule_health_check(self, hosting_id: int) -> None:
         """
@@ -229,6 +457,15 @@ class HostingService:
             'issues': []
         }
         
+        if hosting.plan == STATIC_PLAN:
+            # 정적 호스팅은 컨테이너/SSH가 없으므로 웹 디렉토리만 확인
+            web_dir = self._static_web_dir(hosting)
+            health_status['vm_status'] = hosting.status.value
+            health_status['web_accessible'] = web_dir.is_dir()
+            if not web_dir.is_dir():
+                health_status['issues'].append(f"웹 디렉토리가 없습니다: {web_dir}")
+            return health_status
+        
         try:
             # VM 상태 확인
             vm_status = self.vm_service.get_vm_status(hosting.vm_id)
@@ -345,6 +582,16 @@ class HostingService:
                 'public_key': None
             }
             
+            # SSH 게이트웨이 모드: 모든 호스팅이 게이트웨이 포트 하나를 쓰고 사용자 이름으로 구분
+            if settings.SSH_GATEWAY_ENABLED:
+                ssh_info.update({
+                    'ssh_port': str(settings.SSH_GATEWAY_PORT),
+                    'username': f"ubuntu+{hosting.id}",
+                    'alternative_username': f"webhoster+{hosting.id}",
+                    'ssh_command': f"ssh -i id_rsa ubuntu+{hosting.id}@localhost -p {settings.SSH_GATEWAY_PORT}",
+                    'ssh_command_alt': f"ssh -i id_rsa webhoster+{hosting.id}@localhost -p {settings.SSH_GATEWAY_PORT}"
+                })
+            
             # 개인키 읽기
             if private_key_file.exists():
                 with open(private_key_file, 'r') as f:
@@ -433,6 +680,7 @@ class HostingService:
             
             if success:
                 hosting.status = HostingStatus.RUNNING
+                hosting.idle_stopped_at = None
                 self.db.commit()
                 self.db.refresh(hosting)
                 
@@ -462,7 +710,9 @@ class HostingService:
             success = self.vm_service.stop_vm(hosting.vm_id)
             
             if success:
+                # 사용자가 직접 중지한 호스팅은 요청이 와도 깨우지 않음
                 hosting.status = HostingStatus.STOPPING
+                hosting.idle_stopped_at = None
                 self.db.commit()
                 self.db.refresh(hosting)
                 
@@ -519,14 +769,22 @@ class HostingService:
         
         try:
             # VM 삭제
-            success = self.vm_service.delete_vm(hosting.vm_id)
+            success = self.vm_service.delete_vm(hosting.vm_id, **self._node_target(hosting))
             
             if success:
+                # 프록시 규칙 및 VM 파일 정리 (실패 시 고아 리소스 GC가 정리)
+                if not self.proxy_service.remove_proxy_rule(str(hosting.user_id)):
+                    logger.warning(f"프록시 규칙 제거 실패: 사용자 {hosting.user_id}")
+                self.vm_service.remove_vm_files(hosting.vm_id)
+                
                 # 데이터베이스에서 호스팅 레코드 삭제
                 self.db.delete(hosting)
                 self.db.commit()
                 
                 logger.info(f"호스팅 삭제 완료: {hosting_id}")
+                
+                # 비워진 CPU로 같은 NUMA 노드의 vCPU 재배치
+                self._rebalance_cpus()
                 return True
             
             return False
@@ -535,6 +793,17 @@ class HostingService:
             logger.error(f"호스팅 삭제 실패: {e}")
             raise e
     
+    def _rebalance_cpus(self) -> None:
+        """
+        CPU 재배치 후 실행 중인 도메인/컨테이너에 반영 (실패해도 삭제는 완료된 것으로 처리)
+        """
+        try:
+            for move in CpuPlacementEngine(self.db).rebalance():
+                self.vm_service.apply_cpu_placement(move["vm_id"], move["cpus"])
+        except Exception as e:
+            logger.warning(f"vCPU 재배치 실패: {e}")
+            self.db.rollback()
+    
     def delete_hosting_by_user_id(self, user_id: int) -> bool:
         """
         사용자 ID로 호스팅 삭제
@@ -545,6 +814,225 @@ class HostingService:
         
         return self.delete_hosting(hosting.id, user_id)
     
+    def update_hosting_resources(self, hosting_id: int, resource_update: HostingResourceUpdate) -> Hosting:
+        """
+        호스팅 리소스 제한 변경 (컨테이너가 있으면 docker update로 즉시 적용)
+        """
+        hosting = self.get_hosting_by_id(hosting_id)
+        if not hosting:
+            raise HostingNotFoundError()
+        
+        # 정적 호스팅은 cgroup 제한 대상이 없으므로 컨테이너 플랜으로 전환
+        if hosting.plan == STATIC_PLAN or resource_update.plan == STATIC_PLAN:
+            if hosting.plan == STATIC_PLAN and resource_update.plan not in (None, STATIC_PLAN):
+                overrides = resource_update.model_dump(exclude={"plan"}, exclude_none=True)
+                return self.promote_static_hosting(hosting_id, resource_update.plan, overrides)
+            raise VMOperationError("정적 호스팅은 컨테이너 플랜으로 전환만 가능합니다.")
+        
+        resources = get_resource_plan(resource_update.plan) if resource_update.plan else hosting.resources
+        resources.update(resource_update.model_dump(exclude={"plan"}, exclude_none=True))
+        
+        # 생성 중이면 컨테이너 단계에서 새 값이 적용되므로 DB만 갱신
+        container_exists = (
+            hosting.status != HostingStatus.CREATING
+            or self.journal.is_done(hosting.id, ProvisioningStep.CONTAINER_CREATED)
+        )
+        if container_exists:
+            self.vm_service.update_container_resources(hosting.vm_id, resources, **self._node_target(hosting))
+        
+        if resource_update.plan:
+            hosting.plan = resource_update.plan
+        for field, value in resources.items():
+            setattr(hosting, field, value)
+        self.db.commit()
+        self.db.refresh(hosting)
+        
+        logger.info(f"호스팅 리소스 변경 완료: {hosting_id}, 플랜 {hosting.plan}, {resources}")
+        return hosting
+    
+    def update_cache_settings(self, hosting_id: int, user_id: int, cache_update: HostingCacheUpdate) -> Hosting:
+        """
+        호스팅 프록시 캐시 설정 변경
+        
+        마이크로캐시 시간이 바뀌면 사용자별 프록시 설정을 다시 생성합니다.
+        리졸버 라우팅은 모든 테넌트가 공통 location을 쓰므로 업스트림 캐시 헤더만 따르며,
+        정적 호스팅은 프록시 없이 서빙되므로 값만 저장합니다.
+        """
+        hosting = self._owned_hosting(hosting_id, user_id)
+        changes = cache_update.model_dump(exclude_unset=True)
+        
+        microcache_changed = (
+            "microcache_seconds" in changes
+            and (changes["microcache_seconds"] or 0) != (hosting.microcache_seconds or 0)
+        )
+        for field, value in changes.items():
+            setattr(hosting, field, value)
+        
+        if (
+            microcache_changed
+            and hosting.plan != STATIC_PLAN
+            and hosting.status == HostingStatus.RUNNING
+            and settings.PROXY_ROUTING_MODE != "resolver"
+        ):
+            proxy_info = self.proxy_service.get_proxy_info(str(hosting.user_id)) or {}
+            try:
+                self.proxy_service.update_proxy_rule(
+                    user_id=str(hosting.user_id),
+                    vm_ip=hosting.vm_ip,
+                    ssh_port=hosting.ssh_port,
+                    web_port=proxy_info.get("web_port") or 80,
+                    vm_id=hosting.vm_id,
+                    microcache_seconds=hosting.microcache_seconds or 0
+                )
+            except Exception as e:
+                self.db.rollback()
+                raise VMOperationError(f"프록시 캐시 설정 적용 실패: {e}")
+        
+        self.db.commit()
+        self.db.refresh(hosting)
+        
+        logger.info(f"프록시 캐시 설정 변경: 호스팅 {hosting_id}, {changes}")
+        return hosting
+    
+    def purge_cache(self, hosting_id: int, user_id: int) -> Dict[str, int]:
+        """호스팅(사용자 경로)의 프록시 캐시 항목 삭제"""
+        hosting = self._owned_hosting(hosting_id, user_id)
+        return self.proxy_service.purge_cache(str(hosting.user_id))
+    
+    def enforce_cache_caps(self) -> Dict[str, int]:
+        """테넌트별 프록시 캐시 용량 제한 적용 (호스팅별 cache_max_mb, 없으면 기본값)"""
+        caps = {}
+        for hosting in self.db.query(Hosting).filter(Hosting.cache_max_mb.isnot(None)).all():
+            # 한 사용자가 여러 호스팅을 가지면 같은 경로(/{user_id})를 공유하므로 큰 값을 사용
+            cap = hosting.cache_max_mb * 1024 * 1024
+            caps[str(hosting.user_id)] = max(cap, caps.get(str(hosting.user_id), 0))
+        
+        return ProxyCacheManager().enforce_caps(caps, settings.PROXY_CACHE_TENANT_MAX_MB * 1024 * 1024)
+    
+    def get_traffic_stats(self, hosting_id: int, user_id: int, minutes: int = 60) -> Dict[str, Any]:
+        """호스팅(사용자 경로)의 최근 트래픽 통계 (공유 접근 로그 집계)"""
+        hosting = self._owned_hosting(hosting_id, user_id)
+        return AccessLogIngester().tenant_stats(str(hosting.user_id), minutes)
+    
+    def get_usage(self, hosting_id: int, user_id: int, window: str = "1h", points: int = 60) -> Dict[str, Any]:
+        """호스팅 컨테이너의 CPU/메모리/디스크/네트워크 사용량 (보관 기간을 넘는 조회 기간은 보관 기간으로 제한)"""
+        hosting = self._owned_hosting(hosting_id, user_id)
+        window_seconds = min(parse_window(window), settings.USAGE_RETENTION_HOURS * 3600)
+        return load_usage(hosting.vm_id, window_seconds, points)
+    
+    def stop_idle_hostings(self, now: Optional[float] = None) -> List[int]:
+        """
+        유휴 컨테이너 자동 중지 (scale-to-zero)
+        
+        공유 접근 로그의 마지막 요청 시각과 호스팅의 마지막 변경 시각이 모두
+        SCALE_TO_ZERO_IDLE_MINUTES보다 오래된 실행 중 컨테이너를 중지합니다.
+        접근 로그 수집이 멈춰 있으면 요청 여부를 알 수 없으므로 중지하지 않습니다.
+        
+        Returns:
+            중지한 호스팅 ID 목록
+        """
+        now = now if now is not None else time.time()
+        last_seen, ingested_at = AccessLogIngester().last_seen()
+        if ingested_at is None or now - ingested_at > settings.ACCESS_LOG_INGEST_INTERVAL * 3 + 60:
+            logger.warning("접근 로그 집계가 갱신되지 않아 유휴 컨테이너 점검을 건너뜀")
+            return []
+        
+        idle_after = now - settings.SCALE_TO_ZERO_IDLE_MINUTES * 60
+        candidates = (
+            self.db.query(Hosting)
+            .filter(
+                Hosting.status == HostingStatus.RUNNING,
+                Hosting.idle_stopped_at.is_(None),
+                or_(Hosting.plan.is_(None), Hosting.plan != STATIC_PLAN),
+                Hosting.updated_at < datetime.fromtimestamp(idle_after, timezone.utc)
+            )
+            .all()
+        )
+        
+        stopped = []
+        for hosting in candidates:
+            if last_seen.get(str(hosting.user_id), 0) >= idle_after:
+                continue
+            
+            try:
+                self.vm_service.stop_container(hosting.vm_id, hosting.node.docker_host if hosting.node else None)
+            except VMOperationError as e:
+                logger.warning(f"유휴 컨테이너 중지 실패: 호스팅 {hosting.id}: {e.detail}")
+                continue
+            
+            hosting.status = HostingStatus.STOPPED
+            hosting.idle_stopped_at = datetime.now(timezone.utc)
+            self.db.commit()
+            if settings.PROXY_ROUTING_MODE == "resolver":
+                get_route_table().set_upstream(str(hosting.user_id), wake_upstream(str(hosting.user_id)))
+            
+            stopped.append(hosting.id)
+            logger.info(f"유휴 컨테이너 중지: 호스팅 {hosting.id} ({hosting.vm_id})")
+        
+        return stopped
+    
+    def wake_idle_hosting(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """
+        유휴 자동 중지된 호스팅 깨우기 (중지된 테넌트의 첫 요청 때 nginx가 호출)
+        
+        컨테이너를 시작하고 라우트를 되돌린 뒤 웹 포트가 응답할 때까지 기다립니다.
+        사용자가 직접 중지한 호스팅은 깨우지 않습니다.
+        
+        Returns:
+            콜드 스타트 기록 (깨울 호스팅이 없으면 None)
+        
+        Raises:
+            VMOperationError: 컨테이너 시작 실패 또는 준비 시간 초과
+        """
+        hosting = (
+            self.db.query(Hosting)
+            .filter(Hosting.user_id == user_id, Hosting.idle_stopped_at.isnot(None))
+            .first()
+        )
+        if not hosting:
+            return None
+        
+        started = time.monotonic()
+        vm_ip = self.vm_service.start_container(hosting.vm_id, hosting.node.docker_host if hosting.node else None)
+        ip_changed = bool(vm_ip) and vm_ip != hosting.vm_ip
+        if ip_changed:
+            hosting.vm_ip = vm_ip
+        hosting.status = HostingStatus.RUNNING
+        hosting.idle_stopped_at = None
+        self.db.flush()
+        
+        upstream = load_routes_from_db(self.db, str(user_id)).get(str(user_id))
+        if not upstream:
+            self.db.rollback()
+            raise VMOperationError(f"깨운 컨테이너의 주소를 찾을 수 없습니다: {hosting.vm_id}")
+        if settings.PROXY_ROUTING_MODE == "resolver":
+            get_route_table().set_upstream(str(user_id), upstream)
+        elif ip_changed:
+            self.proxy_service.update_proxy_rule(
+                user_id=str(user_id),
+                vm_ip=hosting.vm_ip,
+                ssh_port=hosting.ssh_port,
+                web_port=int(upstream.rpartition(":")[2]),
+                vm_id=hosting.vm_id,
+                microcache_seconds=hosting.microcache_seconds or 0
+            )
+        self.db.commit()
+        
+        if not wait_until_ready(upstream, settings.SCALE_TO_ZERO_WAKE_TIMEOUT):
+            raise VMOperationError(f"깨운 컨테이너가 {settings.SCALE_TO_ZERO_WAKE_TIMEOUT}초 안에 응답하지 않습니다: {hosting.vm_id}")
+        
+        return ColdStartRecorder().record(hosting.vm_id, hosting.plan, time.monotonic() - started)
+    
+    def get_scale_to_zero_stats(self) -> Dict[str, Any]:
+        """유휴 자동 중지 현황과 플랜별 콜드 스타트 통계"""
+        return {
+            "enabled": settings.SCALE_TO_ZERO_ENABLED,
+            "idle_minutes": settings.SCALE_TO_ZERO_IDLE_MINUTES,
+            "sleeping": self.db.query(Hosting).filter(Hosting.idle_stopped_at.isnot(None)).count(),
+            "running": self.db.query(Hosting).filter(Hosting.status == HostingStatus.RUNNING).count(),
+            "cold_starts": ColdStartRecorder().stats()
+        }
+    
     def sync_hosting_status(self, hosting_id: int) -> Hosting:
         """
         VM 상태와 호스팅 상태 동기화
@@ -553,6 +1041,10 @@ class HostingService:
         if not hosting:
             raise HostingNotFoundError()
         
+        # 정적 호스팅은 조회할 컨테이너가 없음
+        if hosting.plan == STATIC_PLAN:
+            return hosting
+        
         try:
             # VM 상태 조회
             vm_status = self.vm_service.get_vm_status(hosting.vm_id)
@@ -573,6 +1065,129 @@ class HostingService:
             self.db.commit()
             return hosting
     
+    def _container_resources(self, hosting: Hosting) -> Dict[str, Any]:
+        """
+        컨테이너 생성/재생성용 리소스 제한 (로컬 호스트에 배치된 호스팅은 배정된 CPU 포함)
+        """
+        if hosting.cpuset and hosting.node_id is None:
+            return {**hosting.resources, "cpuset": hosting.cpuset}
+        return hosting.resources
+    
+    def _static_web_dir(self, hosting: Hosting) -> Path:
+        return self.vm_service.image_path / "containers" / hosting.vm_id / "www"
+    
+    def promote_static_hosting(
+        self,
+        hosting_id: int,
+        plan: Optional[str] = None,
+        overrides: Optional[Dict[str, Any]] = None
+    ) -> Hosting:
+        """
+        정적 호스팅을 컨테이너 플랜으로 전환 (동적 서빙이 필요할 때만)
+        
+        같은 웹 디렉토리를 컨테이너에 마운트하므로 사용자 콘텐츠는 그대로 유지되고,
+        프록시 규칙이 웹 디렉토리 직접 서빙에서 컨테이너 프록시로 바뀝니다.
+        실패하면 컨테이너를 정리하고 정적 서빙을 유지합니다.
+        """
+        hosting = self.get_hosting_by_id(hosting_id)
+        if not hosting:
+            raise HostingNotFoundError()
+        if hosting.plan != STATIC_PLAN:
+            return hosting
+        
+        plan = plan or settings.STATIC_PROMOTION_PLAN
+        resources = get_resource_plan(plan)
+        resources.update(overrides or {})
+        user_id = str(hosting.user_id)
+        multi_node = self.node_service.has_active_nodes()
+        
+        with get_capacity_scheduler().admit(self.db, hosting.user_id, resources, check_capacity=not multi_node):
+            node = self.node_service.place(resources) if multi_node else None
+            hosting.node = node
+            
+            placement = None
+            if node is None:
+                placement = CpuPlacementEngine(self.db).place(
+                    hosting.vm_id, vcpus_for(resources.get("cpus")), resources.get("memory_mb")
+                )
+            
+            try:
+                created = self.vm_service.create_vm(
+                    hosting.vm_id, hosting.ssh_port, user_id,
+                    resources={**resources, "cpuset": placement.cpuset} if placement else resources,
+                    **self._node_target(hosting, with_address=True)
+                )
+                vm_ip = created.get('vm_ip') or '127.0.0.1'
+                added = self.proxy_service.update_proxy_rule(
+                    user_id=user_id,
+                    vm_ip=vm_ip,
+                    ssh_port=hosting.ssh_port,
+                    web_port=created.get('web_port') or 8000,
+                    vm_id=hosting.vm_id,
+                    microcache_seconds=hosting.microcache_seconds or 0
+                )
+            except Exception as e:
+                logger.error(f"정적 호스팅 전환 실패: {hosting_id}: {e}")
+                self.vm_service.remove_container(hosting.vm_id, **self._node_target(hosting))
+                self.db.rollback()
+                raise VMOperationError(f"컨테이너 플랜 전환 실패: {e}")
+            
+            if placement:
+                hosting.cpuset, hosting.numa_node = placement.cpuset, placement.numa_node
+            
+            hosting.plan = plan
+            hosting.vm_ip = vm_ip
+            for field, value in resources.items():
+                setattr(hosting, field, value)
+            self.journal.record(hosting, ProvisioningStep.CONTAINER_CREATED, {
+                key: created.get(key)
+                for key in ("vm_ip", "web_port", "container_name", "container_id", "web_dir")
+            })
+            self.journal.record(hosting, ProvisioningStep.PROXY_CONFIGURED, {
+                key: added.get(key)
+                for key in ("web_url", "ssh_command", "config_file", "verified")
+            })
+        
+        self.db.refresh(hosting)
+        logger.info(f"정적 호스팅 전환 완료: {hosting_id} → 플랜 {plan}, IP {hosting.vm_ip}")
+        return hosting
+    
+    def refresh_static_hostings(self) -> Dict[str, int]:
+        """
+        정적 호스팅 주기 점검
+        
+        서버 측 스크립트가 올라온 호스팅은 컨테이너 플랜으로 전환하고,
+        나머지는 새로 올라오거나 바뀐 파일의 .gz를 다시 만듭니다.
+        """
+        hostings = (
+            self.db.query(Hosting)
+            .filter(Hosting.plan == STATIC_PLAN, Hosting.status == HostingStatus.RUNNING)
+            .all()
+        )
+        
+        result = {"checked": len(hostings), "precompressed": 0, "promoted": 0, "failed": 0}
+        
+        for hosting in hostings:
+            web_dir = self._static_web_dir(hosting)
+            markers = dynamic_markers(web_dir)
+            if not markers:
+                result["precompressed"] += precompress(web_dir)
+                continue
+            
+            logger.info(f"동적 콘텐츠 발견: 호스팅 ID {hosting.id}, {markers}")
+            try:
+                self.promote_static_hosting(hosting.id)
+                result["promoted"] += 1
+            except Exception as e:
+                logger.error(f"정적 호스팅 자동 전환 실패: 호스팅 ID {hosting.id}: {e}")
+                self.db.rollback()
+                result["failed"] += 1
+        
+        if result["promoted"] or result["failed"]:
+            logger.info(f"정적 호스팅 점검 완료: {result}")
+        
+        return result
+    
     def get_hosting_stats(self) -> HostingStats:
         """
         호스팅 통계 조회 (개선된 버전)
@@ -640,7 +1255,150 @@ class HostingService:
         
         return hosting
     
-    def perform_operation(self, hosting_id: int, operation: str, current_user_id: int) -> Hosting:
+    def _owned_hosting(self, hosting_id: int, current_user_id: int) -> Hosting:
+        hosting = self.get_hosting_by_id(hosting_id)
+        if not hosting:
+            raise HostingNotFoundError()
+        
+        # 권한 확인
+        if hosting.user_id != current_user_id:
+            raise InsufficientPermissionError("본인의 호스팅만 관리할 수 있습니다.")
+        return hosting
+    
+    def snapshot_hosting(self, hosting_id: int, current_user_id: int, snapshot_name: Optional[str] = None) -> Hosting:
+        """
+        호스팅 스냅샷 생성
+        """
+        hosting = self._owned_hosting(hosting_id, current_user_id)
+        self.vm_service.snapshot_vm(hosting.vm_id, snapshot_name, **self._node_target(hosting))
+        logger.info(f"호스팅 스냅샷 생성: {hosting_id}")
+        return hosting
+    
+    def list_hosting_snapshots(self, hosting_id: int, current_user_id: int) -> List[Dict[str, Any]]:
+        """
+        호스팅 스냅샷 목록 조회
+        """
+        hosting = self._owned_hosting(hosting_id, current_user_id)
+        return self.vm_service.list_snapshots(hosting.vm_id)
+    
+    def restore_hosting(self, hosting_id: int, current_user_id: int, snapshot_name: Optional[str] = None) -> Hosting:
+        """
+        호스팅을 스냅샷 시점으로 복원 (복원 후 실행 상태)
+        """
+        hosting = self._owned_hosting(hosting_id, current_user_id)
+        if not snapshot_name:
+            raise VMOperationError("복원할 스냅샷 이름이 필요합니다.")
+        
+        try:
+            self.vm_service.restore_vm(hosting.vm_id, snapshot_name, self._container_resources(hosting), **self._node_target(hosting))
+        except VMOperationError as e:
+            hosting.status = HostingStatus.ERROR
+            self.db.commit()
+            raise e
+        
+        hosting.status = HostingStatus.RUNNING
+        self.db.commit()
+        self.db.refresh(hosting)
+        logger.info(f"호스팅 스냅샷 복원: {hosting_id} ({snapshot_name})")
+        return hosting
+    
+    def _site_deployer(self, hosting: Hosting) -> SiteDeployer:
+        return SiteDeployer(self._static_web_dir(hosting).parent, precompress_files=hosting.plan == STATIC_PLAN)
+    
+    def prepare_deploy(self, hosting_id: int, current_user_id: int) -> SiteDeployer:
+        """
+        호스팅 웹 디렉토리 배포 준비
+        
+        웹 디렉토리만 마운트한 기존 컨테이너는 www 링크 교체가 바로 반영되도록
+        사이트 디렉토리 마운트로 먼저 전환합니다.
+        """
+        hosting = self._owned_hosting(hosting_id, current_user_id)
+        if hosting.plan != STATIC_PLAN:
+            if hosting.status not in (HostingStatus.RUNNING, HostingStatus.STOPPED):
+                raise VMOperationError(f"배포할 수 없는 호스팅 상태입니다: {hosting.status.value}")
+            self.vm_service.ensure_site_mount(hosting.vm_id, self._container_resources(hosting), **self._node_target(hosting))
+        return self._site_deployer(hosting)
+    
+    def list_deploys(self, hosting_id: int, current_user_id: int) -> List[Dict[str, Any]]:
+        """
+        호스팅 배포 릴리스 목록 (최신순)
+        """
+        hosting = self._owned_hosting(hosting_id, current_user_id)
+        return self._site_deployer(hosting).list_releases()
+    
+    def rollback_deploy(self, hosting_id: int, current_user_id: int, release_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        호스팅 웹 디렉토리를 이전 릴리스로 되돌리기 (release_id가 없으면 바로 이전 릴리스)
+        """
+        hosting = self._owned_hosting(hosting_id, current_user_id)
+        return self._site_deployer(hosting).rollback(release_id)
+    
+    def migrate_hosting(self, hosting_id: int, target_node_id: Optional[int]) -> Hosting:
+        """
+        호스팅을 다른 노드로 이동하고 노드/IP/프록시 규칙을 갱신 (관리자 전용)
+        
+        대상 노드 용량을 먼저 확인하며, 실패하면 VM은 원래 노드에서 계속
+        실행되므로 호스팅 정보는 바꾸지 않습니다.
+        
+        Raises:
+            HostingNotFoundError: 호스팅 없음
+            NodeNotFoundError: 대상 노드 없음
+            InvalidOperationError: 대상 노드 누락/현재 노드와 같음/비활성, 정적 호스팅
+            HostCapacityExceededError: 대상 노드 용량 부족
+        """
+        hosting = self.get_hosting_by_id(hosting_id)
+        if not hosting:
+            raise HostingNotFoundError()
+        if hosting.plan == STATIC_PLAN:
+            raise InvalidOperationError("정적 호스팅은 노드를 이동할 수 없습니다.")
+        if target_node_id is None:
+            raise InvalidOperationError("이동할 대상 노드가 필요합니다.")
+        if target_node_id == hosting.node_id:
+            raise InvalidOperationError("이미 대상 노드에 배치된 호스팅입니다.")
+        
+        target = self.node_service.get_node(target_node_id)
+        if not target.is_active:
+            raise InvalidOperationError(f"비활성 노드로는 이동할 수 없습니다: {target.name}")
+        self.node_service.check_capacity(target, hosting.resources)
+        
+        metrics = self.vm_service.migrate_vm(
+            hosting.vm_id,
+            self._node_target(hosting).get("docker_host"),
+            target.docker_host,
+            target.address,
+            hosting.resources
+        )
+        MigrationRecorder().record(hosting.vm_id, {
+            "source_node_id": hosting.node_id,
+            "target_node_id": target.id,
+            **metrics
+        })
+        
+        hosting.node_id = target.id
+        if metrics["backend"] == "container":
+            # 원격 노드의 컨테이너는 노드 주소의 게시 포트로 접근
+            hosting.vm_ip = target.address
+            self.proxy_service.update_proxy_rule(
+                user_id=str(hosting.user_id),
+                vm_ip=target.address,
+                ssh_port=hosting.ssh_port,
+                web_port=metrics.get("web_port") or 80,
+                vm_id=hosting.vm_id,
+                microcache_seconds=hosting.microcache_seconds or 0
+            )
+        self.db.commit()
+        self.db.refresh(hosting)
+        
+        logger.info(f"호스팅 이동 완료: {hosting_id} → 노드 {target.name}")
+        return hosting
+    
+    def perform_operation(
+        self,
+        hosting_id: int,
+        operation: str,
+        current_user_id: int,
+        snapshot_name: Optional[str] = None
+    ) -> Hosting:
         """
         호스팅 운영 명령 실행
         """
@@ -648,6 +1406,8 @@ class HostingService:
             'start': self.start_hosting,
             'stop': self.stop_hosting,
             'restart': self.restart_hosting,
+            'snapshot': lambda hid, uid: self.snapshot_hosting(hid, uid, snapshot_name),
+            'restore': lambda hid, uid: self.restore_hosting(hid, uid, snapshot_name),
         }
         
         if operation == 'delete':
@@ -658,4 +1418,9 @@ class HostingService:
         if operation not in operation_map:
             raise VMOperationError(f"지원되지 않는 운영 명령입니다: {operation}")
         
+        # 정적 호스팅은 컨테이너가 없으므로 컨테이너 운영 명령을 적용할 수 없음
+        hosting = self.get_hosting_by_id(hosting_id)
+        if hosting is not None and hosting.plan == STATIC_PLAN:
+            raise VMOperationError(f"정적 호스팅에서는 지원되지 않는 운영 명령입니다: {operation}")
+        
         return operation_map[operation](hosting_id, current_user_id) 
\ No newline at end of file
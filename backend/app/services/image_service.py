@@ -0,0 +1,396 @@
+"""
+골든 이미지 관리 서비스 - 사전 구성된 qcow2 템플릿과 테넌트 오버레이
+
+클라우드 이미지에 패키지 설치/업그레이드를 미리 적용한 템플릿을 버전별로
+빌드해 VM_IMAGE_PATH/golden 에 보관하고, 테넌트 디스크는 현재 버전을 backing
+파일로 하는 qcow2 오버레이로 생성합니다. manifest.json에 버전별로 어떤
+VM이 참조하는지 기록하여 참조가 없는 이전 버전만 정리합니다.
+"""
+import os
+import json
+import shutil
+import fcntl
+import subprocess
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterator
+
+from app.core.config import settings
+from app.core.exceptions import VMOperationError
+from app.utils.logging_utils import get_logger
+
+logger = get_logger("image_service")
+
+# 매니페스트 포맷이 바뀌면 증가
+MANIFEST_FORMAT_VERSION = 1
+
+
+class GoldenImageManager:
+    """
+    골든 이미지 빌드, 버전 관리 및 오버레이 참조 카운트
+    
+    템플릿 파일은 읽기 전용으로 두고 절대 직접 수정하지 않습니다.
+    업그레이드는 새 버전을 만든 뒤 오버레이를 rebase 하는 방식으로 진행합니다.
+    """
+    
+    def __init__(self, image_root: Optional[str] = None):
+        self.image_root = Path(image_root or settings.VM_IMAGE_PATH)
+        self.golden_dir = self.image_root / "golden"
+        self.manifest_path = self.golden_dir / "manifest.json"
+        self.lock_path = self.golden_dir / "manifest.json.lock"
+    
+    def build_template(
+        self,
+        name: Optional[str] = None,
+        source: Optional[str] = None,
+        packages: Optional[List[str]] = None,
+        commands: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        소스 이미지에서 새 템플릿 버전 빌드 후 현재 버전으로 지정
+        
+        Args:
+            name: 템플릿 이름 (기본값: GOLDEN_IMAGE_NAME)
+            source: 소스 이미지 경로 (기본값: VM_IMAGE_PATH/VM_TEMPLATE_IMAGE)
+            packages: 설치할 패키지 (기본값: GOLDEN_IMAGE_PACKAGES)
+            commands: 추가로 실행할 셸 명령
+        
+        Returns:
+            생성된 버전 정보
+        """
+        name = name or settings.GOLDEN_IMAGE_NAME
+        source_path = Path(source) if source else self.image_root / settings.VM_TEMPLATE_IMAGE
+        packages = settings.GOLDEN_IMAGE_PACKAGES if packages is None else packages
+        commands = commands or []
+        
+        if not source_path.exists():
+            raise VMOperationError(f"소스 이미지를 찾을 수 없습니다: {source_path}")
+        
+        version = self._new_version()
+        staging = self._staging_path(name, version)
+        self.golden_dir.mkdir(parents=True, exist_ok=True)
+        
+        try:
+            # backing 체인을 펼쳐 독립된 qcow2로 변환
+            self._run(["qemu-img", "convert", "-O", "qcow2", str(source_path), str(staging)], timeout=1800)
+            
+            if packages or commands:
+                self._customize(staging, packages, commands)
+            
+            info = self._finalize_version(name, version, staging, {
+                "source": str(source_path),
+                "packages": list(packages),
+                "commands": list(commands)
+            })
+        except Exception:
+            self._discard(staging)
+            raise
+        
+        logger.info(f"골든 이미지 빌드 완료: {name}@{version}")
+        return info
+    
+    def create_overlay(
+        self,
+        vm_id: str,
+        disk_path: str,
+        name: Optional[str] = None,
+        size_gb: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        현재 템플릿 버전을 backing으로 하는 테넌트 오버레이 생성
+        
+        Returns:
+            오버레이 경로 (빌드된 템플릿이 없으면 None)
+        """
+        name = name or settings.GOLDEN_IMAGE_NAME
+        if not self.manifest_path.exists():
+            return None
+        
+        with self._locked_manifest() as manifest:
+            template = manifest["templates"].get(name)
+            if not template or not template.get("current"):
+                return None
+            
+            version = template["current"]
+            backing = self.golden_dir / template["versions"][version]["file"]
+            
+            cmd = ["qemu-img", "create", "-f", "qcow2", "-b", str(backing), "-F", "qcow2", str(disk_path)]
+            if size_gb:
+                cmd.append(f"{size_gb}G")
+            self._run(cmd, timeout=60)
+            
+            self._drop_ref(manifest, vm_id)
+            template["versions"][version]["refs"].append(vm_id)
+        
+        logger.info(f"오버레이 생성 완료: {vm_id} -> {name}@{version}")
+        return str(disk_path)
+    
+    def release_overlay(self, vm_id: str) -> None:
+        """
+        VM 디스크 삭제 시 템플릿 참조 해제
+        """
+        if not self.manifest_path.exists():
+            return
+        
+        with self._locked_manifest() as manifest:
+            if self._drop_ref(manifest, vm_id):
+                logger.info(f"오버레이 참조 해제: {vm_id}")
+    
+    def rebase_overlay(
+        self,
+        vm_id: str,
+        disk_path: str,
+        name: Optional[str] = None,
+        version: Optional[str] = None
+    ) -> str:
+        """
+        오버레이를 다른 템플릿 버전으로 이동 (qemu-img rebase, VM 중지 상태에서 실행)
+        
+        안전 모드 rebase이므로 두 버전의 차이는 오버레이에 기록되어
+        게스트가 보는 디스크 내용은 변하지 않습니다.
+        
+        Returns:
+            이동한 버전
+        """
+        name = name or settings.GOLDEN_IMAGE_NAME
+        with self._locked_manifest() as manifest:
+            template = self._get_template(manifest, name)
+            version = version or template["current"]
+            if version not in template["versions"]:
+                raise VMOperationError(f"템플릿 버전을 찾을 수 없습니다: {name}@{version}")
+            
+            backing = self.golden_dir / template["versions"][version]["file"]
+            self._run([
+                "qemu-img", "rebase", "-f", "qcow2",
+                "-b", str(backing), "-F", "qcow2", str(disk_path)
+            ], timeout=3600)
+            
+            self._drop_ref(manifest, vm_id)
+            template["versions"][version]["refs"].append(vm_id)
+        
+        logger.info(f"오버레이 rebase 완료: {vm_id} -> {name}@{version}")
+        return version
+    
+    def commit_overlay(self, vm_id: str, disk_path: str, name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        테넌트 오버레이의 변경 내용을 합친 새 템플릿 버전 생성 (qemu-img commit)
+        
+        공유 템플릿 파일은 건드리지 않도록 복사본에 commit 하며,
+        원래 오버레이도 그대로 유지됩니다.
+        
+        Returns:
+            생성된 버전 정보
+        """
+        name = name or settings.GOLDEN_IMAGE_NAME
+        with self._locked_manifest() as manifest:
+            template = self._get_template(manifest, name)
+            base_version = self._find_ref(manifest, vm_id)
+            if base_version is None or base_version[0] != name:
+                raise VMOperationError(f"{vm_id}는 템플릿 {name}의 오버레이가 아닙니다.")
+            base_file = self.golden_dir / template["versions"][base_version[1]]["file"]
+        
+        version = self._new_version()
+        staging = self._staging_path(name, version)
+        overlay_copy = staging.with_name(f"{staging.name}.overlay")
+        
+        try:
+            shutil.copyfile(base_file, staging)
+            os.chmod(staging, 0o644)
+            shutil.copyfile(disk_path, overlay_copy)
+            # 내용이 같은 복사본으로 backing만 바꾸므로 unsafe 모드로 충분
+            self._run([
+                "qemu-img", "rebase", "-u", "-f", "qcow2",
+                "-b", str(staging), "-F", "qcow2", str(overlay_copy)
+            ], timeout=60)
+            self._run(["qemu-img", "commit", "-f", "qcow2", str(overlay_copy)], timeout=3600)
+            
+            info = self._finalize_version(name, version, staging, {
+                "source": f"{name}@{base_version[1]}+{vm_id}",
+                "packages": [],
+                "commands": []
+            })
+        except Exception:
+            self._discard(staging)
+            raise
+        finally:
+            self._discard(overlay_copy)
+        
+        logger.info(f"오버레이 commit으로 새 템플릿 생성: {name}@{version} (원본 {vm_id})")
+        return info
+    
+    def prune(self, name: Optional[str] = None, keep: Optional[int] = None) -> List[str]:
+        """
+        참조가 없는 이전 템플릿 버전 삭제 (현재 버전과 최근 keep개는 유지)
+        
+        Returns:
+            삭제한 버전 목록
+        """
+        keep = settings.GOLDEN_IMAGE_KEEP_VERSIONS if keep is None else keep
+        removed = []
+        with self._locked_manifest() as manifest:
+            names = [name] if name else list(manifest["templates"])
+            for template_name in names:
+                template = manifest["templates"].get(template_name)
+                if not template:
+                    continue
+                
+                versions = sorted(template["versions"], reverse=True)
+                for version in versions[keep:]:
+                    entry = template["versions"][version]
+                    if version == template["current"] or entry["refs"]:
+                        continue
+                    self._discard(self.golden_dir / entry["file"])
+                    del template["versions"][version]
+                    removed.append(f"{template_name}@{version}")
+        
+        if removed:
+            logger.info(f"사용하지 않는 템플릿 버전 삭제: {removed}")
+        return removed
+    
+    def status(self) -> Dict[str, Any]:
+        """템플릿별 버전 및 참조 수"""
+        manifest = self._load_manifest()
+        return {
+            name: {
+                "current": template["current"],
+                "versions": {
+                    version: {
+                        "built_at": entry["built_at"],
+                        "source": entry["source"],
+                        "packages": entry["packages"],
+                        "size_bytes": entry["size_bytes"],
+                        "refcount": len(entry["refs"])
+                    }
+                    for version, entry in sorted(template["versions"].items())
+                }
+            }
+            for name, template in manifest["templates"].items()
+        }
+    
+    def _customize(self, image: Path, packages: List[str], commands: List[str]) -> None:
+        """
+        virt-customize로 이미지 내부에 패키지 설치 및 명령 실행
+        """
+        if not shutil.which("virt-customize"):
+            raise VMOperationError("virt-customize가 설치되지 않았습니다. (libguestfs-tools 필요)")
+        
+        cmd = ["virt-customize", "-a", str(image), "--update"]
+        if packages:
+            cmd += ["--install", ",".join(packages)]
+        for command in commands:
+            cmd += ["--run-command", command]
+        # 테넌트 첫 부팅 시 cloud-init이 다시 실행되도록 상태 초기화
+        cmd += ["--run-command", "cloud-init clean --logs || true", "--truncate", "/etc/machine-id"]
+        
+        self._run(cmd, timeout=3600)
+    
+    def _finalize_version(self, name: str, version: str, staging: Path, meta: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        빌드된 이미지를 읽기 전용으로 확정하고 현재 버전으로 등록
+        """
+        final_path = self.golden_dir / f"{name}-{version}.qcow2"
+        os.chmod(staging, 0o444)
+        os.replace(staging, final_path)
+        
+        entry = {
+            "file": final_path.name,
+            "built_at": datetime.utcnow().isoformat(),
+            "size_bytes": final_path.stat().st_size,
+            "refs": [],
+            **meta
+        }
+        with self._locked_manifest() as manifest:
+            template = manifest["templates"].setdefault(name, {"current": None, "versions": {}})
+            template["versions"][version] = entry
+            template["current"] = version
+        
+        return {"name": name, "version": version, **entry}
+    
+    def _get_template(self, manifest: Dict[str, Any], name: str) -> Dict[str, Any]:
+        template = manifest["templates"].get(name)
+        if not template or not template.get("current"):
+            raise VMOperationError(f"빌드된 템플릿이 없습니다: {name}")
+        return template
+    
+    def _find_ref(self, manifest: Dict[str, Any], vm_id: str) -> Optional[tuple]:
+        """VM이 참조하는 (템플릿 이름, 버전)"""
+        for name, template in manifest["templates"].items():
+            for version, entry in template["versions"].items():
+                if vm_id in entry["refs"]:
+                    return name, version
+        return None
+    
+    def _drop_ref(self, manifest: Dict[str, Any], vm_id: str) -> bool:
+        found = self._find_ref(manifest, vm_id)
+        if found is None:
+            return False
+        manifest["templates"][found[0]]["versions"][found[1]]["refs"].remove(vm_id)
+        return True
+    
+    def _new_version(self) -> str:
+        return datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+    
+    def _staging_path(self, name: str, version: str) -> Path:
+        return self.golden_dir / f".{name}-{version}.building.qcow2"
+    
+    def _discard(self, path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"이미지 파일 삭제 실패 {path}: {e}")
+    
+    def _run(self, cmd: List[str], timeout: int) -> None:
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        except FileNotFoundError:
+            raise VMOperationError(f"{cmd[0]} 명령어를 찾을 수 없습니다.")
+        except subprocess.TimeoutExpired:
+            raise VMOperationError(f"{cmd[0]} 실행 시간이 초과되었습니다.")
+        
+        if result.returncode != 0:
+            logger.error(f"이미지 명령 실패: {' '.join(cmd)}: {result.stderr.strip()}")
+            raise VMOperationError(f"{cmd[0]} 실행 실패: {result.stderr.strip()}")
+    
+    @contextmanager
+    def _locked_manifest(self) -> Iterator[Dict[str, Any]]:
+        """
+        매니페스트를 파일 잠금 하에 읽고, 블록이 정상 종료되면 원자적으로 저장
+        """
+        self.golden_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                manifest = self._load_manifest()
+                yield manifest
+                self._write_manifest(manifest)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _load_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return {"format": MANIFEST_FORMAT_VERSION, "templates": {}}
+        except ValueError as e:
+            raise VMOperationError(f"골든 이미지 매니페스트가 손상되었습니다: {e}")
+        
+        if manifest.get("format") != MANIFEST_FORMAT_VERSION:
+            raise VMOperationError(f"지원하지 않는 매니페스트 포맷입니다: {manifest.get('format')}")
+        return manifest
+    
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        tmp_path = self.manifest_path.with_name(f"{self.manifest_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+
+@lru_cache()
+def get_golden_image_manager() -> GoldenImageManager:
+    """골든 이미지 관리자 인스턴스 반환"""
+    return GoldenImageManager()
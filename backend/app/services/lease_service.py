@@ -0,0 +1,311 @@
+"""
+DHCP 리스 인덱스 - MAC 주소 → IP 조회
+
+dnsmasq 상태 파일(JSON, libvirt 네트워크의 <bridge>.status), dnsmasq 리스 파일,
+ISC dhcpd.leases 형식을 파싱해 MAC 주소와 호스트 이름별 IP를 메모리에 보관합니다.
+파일 변경은 inotify로 감지해 바뀐 파일만 다시 읽으며, ISC 리스 파일처럼 뒤에
+추가만 되는 파일은 마지막으로 읽은 위치부터 읽습니다. inotify를 사용할 수 없으면
+조회 시 파일의 mtime/크기를 확인해 갱신합니다.
+"""
+import os
+import json
+import time
+import ctypes
+import ctypes.util
+import struct
+import threading
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+
+from app.core.config import settings
+from app.utils.logging_utils import get_logger
+
+logger = get_logger("lease_service")
+
+# inotify 이벤트 마스크 (dnsmasq는 상태 파일을 새로 써서 교체하므로 디렉토리를 감시)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+_EVENT_HEADER = struct.Struct("iIII")
+
+# 리스 항목: MAC → (IP, 만료 시각(epoch, 0은 무기한), 호스트 이름)
+LeaseEntry = Tuple[str, float, Optional[str]]
+
+
+def normalize_mac(mac: str) -> str:
+    return mac.strip().lower().replace("-", ":")
+
+
+def parse_dnsmasq_status(text: str) -> Dict[str, LeaseEntry]:
+    """
+    dnsmasq 상태 파일(JSON 배열) 파싱
+    """
+    leases = {}
+    try:
+        records = json.loads(text or "[]")
+    except ValueError:
+        return leases
+    for record in records:
+        mac, ip = record.get("mac-address"), record.get("ip-address")
+        if mac and ip and ":" not in ip:
+            leases[normalize_mac(mac)] = (ip, float(record.get("expiry-time") or 0), record.get("hostname"))
+    return leases
+
+
+def parse_dnsmasq_leases(text: str) -> Dict[str, LeaseEntry]:
+    """
+    dnsmasq 리스 파일 파싱 (한 줄: 만료시각 MAC IP 호스트이름 클라이언트ID)
+    """
+    leases = {}
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) < 4 or ":" in parts[2]:
+            continue
+        try:
+            expiry = float(parts[0])
+        except ValueError:
+            continue
+        leases[normalize_mac(parts[1])] = (parts[2], expiry, None if parts[3] == "*" else parts[3])
+    return leases
+
+
+def parse_isc_leases(text: str) -> Dict[str, LeaseEntry]:
+    """
+    ISC dhcpd.leases 파싱 (같은 MAC은 파일 뒤쪽 항목이 우선, 해제된 리스는 제외)
+    """
+    leases = {}
+    for block in text.split("lease ")[1:]:
+        header, _, body = block.partition("{")
+        body = body.split("}", 1)[0]
+        ip = header.strip()
+        mac, expiry, hostname, active = None, 0.0, None, True
+        for statement in body.split(";"):
+            words = statement.split()
+            if words[:2] == ["hardware", "ethernet"] and len(words) > 2:
+                mac = normalize_mac(words[2])
+            elif words[:1] == ["ends"] and len(words) >= 4:
+                expiry = _isc_time(words[2], words[3])
+            elif words[:1] == ["client-hostname"] and len(words) > 1:
+                hostname = words[1].strip('"')
+            elif words[:2] == ["binding", "state"] and len(words) > 2:
+                active = words[2] == "active"
+        if not mac:
+            continue
+        if active:
+            leases[mac] = (ip, expiry, hostname)
+        else:
+            leases.pop(mac, None)
+    return leases
+
+
+def _isc_time(date: str, clock: str) -> float:
+    try:
+        return datetime.strptime(f"{date} {clock}", "%Y/%m/%d %H:%M:%S").replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def _parser_for(path: Path):
+    if path.suffix == ".status":
+        return parse_dnsmasq_status
+    if "dhcpd" in path.name:
+        return parse_isc_leases
+    return parse_dnsmasq_leases
+
+
+class _LeaseFile:
+    """파일별 파싱 결과와 마지막으로 읽은 위치"""
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self.parser = _parser_for(path)
+        self.append_only = self.parser is parse_isc_leases
+        self.leases: Dict[str, LeaseEntry] = {}
+        self.stat_key: Optional[Tuple[int, int, float]] = None
+        self.offset = 0
+        self.tail = b""
+    
+    def reload(self) -> bool:
+        """
+        변경된 경우 다시 읽기
+        
+        Returns:
+            내용이 바뀌었는지 여부
+        """
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            changed = bool(self.leases)
+            self.leases, self.stat_key, self.offset, self.tail = {}, None, 0, b""
+            return changed
+        
+        stat_key = (stat.st_ino, stat.st_size, stat.st_mtime)
+        if stat_key == self.stat_key:
+            return False
+        
+        # 뒤에 추가만 된 경우 마지막 위치부터 읽기 (교체/축소된 경우 전체 다시 읽기)
+        incremental = (
+            self.append_only and self.stat_key is not None
+            and stat.st_ino == self.stat_key[0] and stat.st_size >= self.offset
+        )
+        with open(self.path, "rb") as f:
+            if incremental:
+                f.seek(self.offset)
+                data = self.tail + f.read()
+            else:
+                data = f.read()
+            offset = f.tell()
+        
+        if self.append_only:
+            # 마지막 블록이 아직 쓰는 중일 수 있으므로 닫히지 않은 부분은 다음에 다시 파싱
+            cut = data.rfind(b"}") + 1
+            data, self.tail = data[:cut], data[cut:]
+        text = data.decode("utf-8", errors="replace")
+        
+        if incremental:
+            for mac in _released_macs(text):
+                self.leases.pop(mac, None)
+            self.leases.update(self.parser(text))
+        else:
+            self.leases = self.parser(text)
+        
+        self.stat_key = (stat.st_ino, stat.st_size, stat.st_mtime)
+        self.offset = offset
+        return True
+
+
+def _released_macs(text: str) -> List[str]:
+    """ISC 리스 조각에서 해제(free/expired 등)된 MAC 목록"""
+    macs = []
+    for block in text.split("lease ")[1:]:
+        body = block.partition("{")[2].split("}", 1)[0]
+        if "binding state active" in body:
+            continue
+        for statement in body.split(";"):
+            words = statement.split()
+            if words[:2] == ["hardware", "ethernet"] and len(words) > 2:
+                macs.append(normalize_mac(words[2]))
+    return macs
+
+
+class LeaseIndex:
+    """
+    MAC/호스트 이름 → IP 인덱스
+    """
+    
+    def __init__(self, paths: Optional[List[str]] = None):
+        self.files = [_LeaseFile(Path(p)) for p in (paths if paths is not None else settings.DHCP_LEASE_FILES)]
+        self._lock = threading.Lock()
+        self._by_mac: Dict[str, LeaseEntry] = {}
+        self._by_hostname: Dict[str, str] = {}
+        self._watching = False
+        self.refresh()
+    
+    def refresh(self) -> bool:
+        """변경된 리스 파일만 다시 읽고 인덱스 재구성"""
+        with self._lock:
+            changed = False
+            for lease_file in self.files:
+                changed = lease_file.reload() or changed
+            if changed:
+                self._rebuild()
+            return changed
+    
+    def _rebuild(self) -> None:
+        # 설정 순서상 앞의 파일이 우선
+        by_mac: Dict[str, LeaseEntry] = {}
+        for lease_file in reversed(self.files):
+            by_mac.update(lease_file.leases)
+        self._by_mac = by_mac
+        self._by_hostname = {entry[2]: mac for mac, entry in by_mac.items() if entry[2]}
+    
+    def _valid(self, entry: Optional[LeaseEntry]) -> Optional[str]:
+        if entry is None:
+            return None
+        ip, expiry, _ = entry
+        if expiry and expiry < time.time():
+            return None
+        return ip
+    
+    def lookup(self, mac: str) -> Optional[str]:
+        """MAC 주소로 IP 조회 (만료된 리스는 제외)"""
+        if not self._watching:
+            self.refresh()
+        return self._valid(self._by_mac.get(normalize_mac(mac)))
+    
+    def lookup_hostname(self, hostname: str) -> Optional[str]:
+        """DHCP 클라이언트 호스트 이름으로 IP 조회 (cloud-init local-hostname = vm_id)"""
+        if not self._watching:
+            self.refresh()
+        mac = self._by_hostname.get(hostname)
+        return self._valid(self._by_mac.get(mac)) if mac else None
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            mac: {"ip": ip, "expiry": expiry, "hostname": hostname}
+            for mac, (ip, expiry, hostname) in self._by_mac.items()
+        }
+    
+    def start_watching(self) -> bool:
+        """
+        inotify 감시 스레드 시작 (Linux 외 환경 등 사용할 수 없으면 False, 조회 시 stat으로 갱신)
+        """
+        if self._watching:
+            return True
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(os.O_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+            watches = {}
+            for directory in {lease_file.path.parent for lease_file in self.files}:
+                if not directory.is_dir():
+                    continue
+                wd = libc.inotify_add_watch(fd, str(directory).encode(), WATCH_MASK)
+                if wd >= 0:
+                    watches[wd] = directory
+        except (OSError, AttributeError) as e:
+            logger.info(f"inotify를 사용할 수 없어 조회 시 리스 파일을 확인합니다: {e}")
+            return False
+        
+        if not watches:
+            os.close(fd)
+            return False
+        
+        threading.Thread(target=self._watch, args=(fd, watches), name="lease-watch", daemon=True).start()
+        self._watching = True
+        logger.info(f"DHCP 리스 파일 감시 시작: {', '.join(str(d) for d in watches.values())}")
+        return True
+    
+    def _watch(self, fd: int, watches: Dict[int, Path]) -> None:
+        watched = {lease_file.path for lease_file in self.files}
+        while True:
+            try:
+                data = os.read(fd, 64 * 1024)
+            except OSError as e:
+                logger.warning(f"DHCP 리스 감시 중단: {e}")
+                self._watching = False
+                return
+            
+            changed = False
+            offset = 0
+            while offset < len(data):
+                wd, _, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+                name = data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + name_len].rstrip(b"\0")
+                offset += _EVENT_HEADER.size + name_len
+                if wd in watches and watches[wd] / name.decode(errors="replace") in watched:
+                    changed = True
+            if changed:
+                self.refresh()
+
+
+@lru_cache()
+def get_lease_index() -> LeaseIndex:
+    """프로세스 공용 리스 인덱스 (최초 호출 시 감시 시작)"""
+    index = LeaseIndex()
+    index.start_watching()
+    return index
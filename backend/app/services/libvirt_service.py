@@ -0,0 +1,411 @@
+"""
+libvirt 이벤트 어댑터 - 도메인 상태/IP 인메모리 인덱스
+
+libvirt에 연결을 하나만 유지하고 도메인 생명주기 이벤트와 게스트 에이전트
+이벤트를 구독해 도메인 이름 → (상태, IP) 인덱스를 갱신합니다. 상태/IP 조회는
+virsh 프로세스를 실행하지 않고 인덱스에서 바로 응답합니다.
+
+libvirt-python이 설치되지 않았거나 연결할 수 없으면 VMService는 기존 virsh
+방식으로 동작합니다. 테스트에서는 FakeDomainBackend를 사용합니다.
+"""
+import time
+import threading
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple, Callable
+
+from app.core.config import settings
+from app.core.exceptions import VMOperationError
+from app.models.hosting import HostingStatus
+from app.utils.logging_utils import get_logger
+
+logger = get_logger("libvirt_service")
+
+# 연결이 끊긴 뒤 재연결을 시도하는 최소 간격 (초)
+RECONNECT_INTERVAL = 5.0
+
+# 백엔드가 보고하는 도메인 상태 → 호스팅 상태
+DOMAIN_STATUS = {
+    "running": HostingStatus.RUNNING,
+    "shutoff": HostingStatus.STOPPED,
+    "paused": HostingStatus.STOPPED,
+}
+
+StateCallback = Callable[[str, str], None]
+IpCallback = Callable[[str, str], None]
+
+
+class DomainRecord:
+    """인덱스 항목 1건"""
+    
+    def __init__(self, name: str, state: str, ip: Optional[str] = None):
+        self.name = name
+        self.state = state
+        self.ip = ip
+        self.updated_at = time.time()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"state": self.state, "ip": self.ip, "updated_at": self.updated_at}
+
+
+class DomainBackend:
+    """
+    도메인 이벤트 백엔드 인터페이스
+    
+    상태 문자열은 running, shutoff, paused, crashed, error, undefined 중 하나입니다.
+    """
+    
+    def connect(self, on_state: StateCallback, on_ip: IpCallback, on_close: Callable[[], None]) -> None:
+        raise NotImplementedError
+    
+    def list_domains(self) -> List[Tuple[str, str, Optional[str]]]:
+        """전체 도메인 (이름, 상태, IP) 목록 (연결 직후 인덱스 초기화용)"""
+        raise NotImplementedError
+    
+    def start(self, name: str) -> None:
+        raise NotImplementedError
+    
+    def shutdown(self, name: str) -> None:
+        raise NotImplementedError
+    
+    def reboot(self, name: str) -> None:
+        raise NotImplementedError
+    
+    def destroy(self, name: str) -> None:
+        """강제 종료 후 정의 삭제 (없는 도메인은 무시)"""
+        raise NotImplementedError
+
+
+_event_loop_lock = threading.Lock()
+_event_loop_started = False
+
+
+def _start_event_loop(libvirt) -> None:
+    """libvirt 기본 이벤트 루프를 데몬 스레드에서 실행 (프로세스당 1회)"""
+    global _event_loop_started
+    with _event_loop_lock:
+        if _event_loop_started:
+            return
+        libvirt.virEventRegisterDefaultImpl()
+        
+        def run() -> None:
+            while True:
+                libvirt.virEventRunDefaultImpl()
+        
+        threading.Thread(target=run, name="libvirt-events", daemon=True).start()
+        _event_loop_started = True
+
+
+class LibvirtBackend(DomainBackend):
+    """libvirt-python 기반 백엔드"""
+    
+    def __init__(self, uri: str):
+        import libvirt
+        self.libvirt = libvirt
+        self.uri = uri
+        self._conn = None
+        self._domain_states = {
+            libvirt.VIR_DOMAIN_RUNNING: "running",
+            libvirt.VIR_DOMAIN_BLOCKED: "running",
+            libvirt.VIR_DOMAIN_PAUSED: "paused",
+            libvirt.VIR_DOMAIN_PMSUSPENDED: "paused",
+            libvirt.VIR_DOMAIN_SHUTDOWN: "running",  # 종료 진행 중
+            libvirt.VIR_DOMAIN_SHUTOFF: "shutoff",
+            libvirt.VIR_DOMAIN_CRASHED: "crashed",
+        }
+    
+    def connect(self, on_state: StateCallback, on_ip: IpCallback, on_close: Callable[[], None]) -> None:
+        libvirt = self.libvirt
+        _start_event_loop(libvirt)
+        self.close()
+        
+        self._on_state = on_state
+        self._on_ip = on_ip
+        conn = libvirt.open(self.uri)
+        # keepalive로 libvirtd 재시작을 감지하면 close 콜백 호출
+        conn.setKeepAlive(5, 3)
+        conn.registerCloseCallback(lambda _conn, reason, opaque: on_close(), None)
+        conn.domainEventRegisterAny(None, libvirt.VIR_DOMAIN_EVENT_ID_LIFECYCLE, self._lifecycle_event, None)
+        conn.domainEventRegisterAny(None, libvirt.VIR_DOMAIN_EVENT_ID_AGENT_LIFECYCLE, self._agent_event, None)
+        self._conn = conn
+        logger.info(f"libvirt 이벤트 구독 시작: {self.uri}")
+    
+    def close(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except self.libvirt.libvirtError:
+                pass
+            self._conn = None
+    
+    def _state(self, dom) -> str:
+        return self._domain_states.get(dom.state()[0], "error")
+    
+    def _lifecycle_event(self, conn, dom, event, detail, opaque) -> None:
+        try:
+            if event == self.libvirt.VIR_DOMAIN_EVENT_UNDEFINED:
+                self._on_state(dom.name(), "undefined")
+                return
+            # DEFINED 이벤트는 실행 중인 도메인 재정의에도 발생하므로 실제 상태를 조회
+            state = self._state(dom)
+            self._on_state(dom.name(), state)
+            if state == "running":
+                self._refresh_ip(dom)
+        except self.libvirt.libvirtError as e:
+            logger.warning(f"libvirt 생명주기 이벤트 처리 실패: {e}")
+    
+    def _agent_event(self, conn, dom, state, reason, opaque) -> None:
+        # 게스트 에이전트가 연결되면 인터페이스 주소를 다시 조회
+        if state == self.libvirt.VIR_CONNECT_DOMAIN_EVENT_AGENT_LIFECYCLE_STATE_CONNECTED:
+            self._refresh_ip(dom)
+    
+    def _refresh_ip(self, dom) -> None:
+        ip = self._domain_ip(dom)
+        if ip:
+            self._on_ip(dom.name(), ip)
+    
+    def _domain_ip(self, dom) -> Optional[str]:
+        """DHCP 리스 → 게스트 에이전트 순으로 IPv4 주소 조회"""
+        libvirt = self.libvirt
+        for source in (libvirt.VIR_DOMAIN_INTERFACE_ADDRESSES_SRC_LEASE, libvirt.VIR_DOMAIN_INTERFACE_ADDRESSES_SRC_AGENT):
+            try:
+                interfaces = dom.interfaceAddresses(source)
+            except libvirt.libvirtError:
+                continue
+            for interface in interfaces.values():
+                for addr in interface.get("addrs") or []:
+                    if addr["type"] == libvirt.VIR_IP_ADDR_TYPE_IPV4 and not addr["addr"].startswith("127."):
+                        return addr["addr"]
+        return None
+    
+    def list_domains(self) -> List[Tuple[str, str, Optional[str]]]:
+        domains = []
+        for dom in self._conn.listAllDomains():
+            state = self._state(dom)
+            domains.append((dom.name(), state, self._domain_ip(dom) if state == "running" else None))
+        return domains
+    
+    def _lookup(self, name: str):
+        return self._conn.lookupByName(name)
+    
+    def start(self, name: str) -> None:
+        self._lookup(name).create()
+    
+    def shutdown(self, name: str) -> None:
+        self._lookup(name).shutdown()
+    
+    def reboot(self, name: str) -> None:
+        self._lookup(name).reboot(0)
+    
+    def destroy(self, name: str) -> None:
+        try:
+            dom = self._lookup(name)
+        except self.libvirt.libvirtError:
+            return
+        if dom.isActive():
+            dom.destroy()
+        dom.undefine()
+
+
+class FakeDomainBackend(DomainBackend):
+    """테스트용 인메모리 백엔드 (작업 즉시 이벤트 발생)"""
+    
+    def __init__(self, domains: Optional[Dict[str, Tuple[str, Optional[str]]]] = None):
+        self.domains: Dict[str, Tuple[str, Optional[str]]] = dict(domains or {})
+        self.connect_count = 0
+        self.list_count = 0
+        self.fail_connect = False
+        self._on_state: Optional[StateCallback] = None
+        self._on_ip: Optional[IpCallback] = None
+        self._on_close: Optional[Callable[[], None]] = None
+    
+    def connect(self, on_state: StateCallback, on_ip: IpCallback, on_close: Callable[[], None]) -> None:
+        if self.fail_connect:
+            raise ConnectionError("libvirtd에 연결할 수 없습니다.")
+        self.connect_count += 1
+        self._on_state, self._on_ip, self._on_close = on_state, on_ip, on_close
+    
+    def list_domains(self) -> List[Tuple[str, str, Optional[str]]]:
+        self.list_count += 1
+        return [(name, state, ip) for name, (state, ip) in self.domains.items()]
+    
+    def emit_state(self, name: str, state: str) -> None:
+        if state == "undefined":
+            self.domains.pop(name, None)
+        else:
+            self.domains[name] = (state, self.domains.get(name, (state, None))[1])
+        self._on_state(name, state)
+    
+    def emit_ip(self, name: str, ip: str) -> None:
+        self.domains[name] = (self.domains[name][0], ip)
+        self._on_ip(name, ip)
+    
+    def drop_connection(self) -> None:
+        self._on_close()
+    
+    def _require(self, name: str) -> None:
+        if name not in self.domains:
+            raise KeyError(f"도메인이 없습니다: {name}")
+    
+    def start(self, name: str) -> None:
+        self._require(name)
+        self.emit_state(name, "running")
+    
+    def shutdown(self, name: str) -> None:
+        self._require(name)
+        self.emit_state(name, "shutoff")
+    
+    def reboot(self, name: str) -> None:
+        self._require(name)
+        self.emit_state(name, "running")
+    
+    def destroy(self, name: str) -> None:
+        if name in self.domains:
+            self.emit_state(name, "undefined")
+
+
+class LibvirtAdapter:
+    """
+    도메인 상태/IP 인메모리 인덱스
+    
+    연결 시 전체 도메인을 한 번 조회해 인덱스를 채우고 이후에는 이벤트로만
+    갱신합니다. 연결이 끊기면 다음 조회 시 재연결 후 다시 전체 조회합니다.
+    """
+    
+    def __init__(self, backend: DomainBackend):
+        self.backend = backend
+        self._cond = threading.Condition()
+        self._connect_lock = threading.Lock()
+        self._domains: Dict[str, DomainRecord] = {}
+        self._connected = False
+        self._last_attempt = 0.0
+    
+    @property
+    def connected(self) -> bool:
+        return self._connected
+    
+    def ensure_connected(self) -> bool:
+        """
+        연결 확인 (끊겨 있으면 RECONNECT_INTERVAL 간격으로 재연결 시도)
+        
+        Returns:
+            인덱스를 사용할 수 있는지 여부
+        """
+        if self._connected:
+            return True
+        
+        with self._connect_lock:
+            if self._connected:
+                return True
+            now = time.monotonic()
+            if self._last_attempt and now - self._last_attempt < RECONNECT_INTERVAL:
+                return False
+            self._last_attempt = now
+            
+            try:
+                self.backend.connect(self._on_state, self._on_ip, self._on_close)
+                domains = self.backend.list_domains()
+            except Exception as e:
+                logger.warning(f"libvirt 연결 실패, virsh로 대체합니다: {e}")
+                return False
+            
+            with self._cond:
+                self._domains = {name: DomainRecord(name, state, ip) for name, state, ip in domains}
+                self._connected = True
+                self._cond.notify_all()
+        
+        logger.info(f"libvirt 도메인 인덱스 초기화: {len(domains)}개")
+        return True
+    
+    def _on_state(self, name: str, state: str) -> None:
+        with self._cond:
+            if state == "undefined":
+                self._domains.pop(name, None)
+            else:
+                record = self._domains.get(name)
+                if record is None:
+                    self._domains[name] = DomainRecord(name, state)
+                else:
+                    record.state = state
+                    record.updated_at = time.time()
+                    # 중지된 도메인의 이전 IP는 다음 부팅 때 바뀔 수 있음
+                    if state != "running":
+                        record.ip = None
+            self._cond.notify_all()
+    
+    def _on_ip(self, name: str, ip: str) -> None:
+        with self._cond:
+            record = self._domains.setdefault(name, DomainRecord(name, "running"))
+            record.ip = ip
+            record.updated_at = time.time()
+            self._cond.notify_all()
+    
+    def _on_close(self) -> None:
+        logger.warning("libvirt 연결이 끊어졌습니다. 다음 조회 시 재연결합니다.")
+        with self._cond:
+            self._connected = False
+            self._cond.notify_all()
+    
+    def get_state(self, name: str) -> Optional[str]:
+        with self._cond:
+            record = self._domains.get(name)
+            return record.state if record else None
+    
+    def get_status(self, name: str) -> HostingStatus:
+        """호스팅 상태로 변환 (없는 도메인은 ERROR)"""
+        return DOMAIN_STATUS.get(self.get_state(name), HostingStatus.ERROR)
+    
+    def get_ip(self, name: str) -> Optional[str]:
+        with self._cond:
+            record = self._domains.get(name)
+            return record.ip if record else None
+    
+    def wait_for_ip(self, name: str, timeout: float) -> Optional[str]:
+        """IP 이벤트가 올 때까지 대기 (폴링 없음)"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                record = self._domains.get(name)
+                if record and record.ip:
+                    return record.ip
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._connected:
+                    return None
+                self._cond.wait(remaining)
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """전체 인덱스 조회"""
+        with self._cond:
+            return {name: record.to_dict() for name, record in self._domains.items()}
+    
+    def _call(self, action: str, name: str) -> None:
+        try:
+            getattr(self.backend, action)(name)
+        except Exception as e:
+            raise VMOperationError(f"도메인 {action} 실패 ({name}): {e}")
+    
+    def start_domain(self, name: str) -> None:
+        self._call("start", name)
+    
+    def shutdown_domain(self, name: str) -> None:
+        self._call("shutdown", name)
+    
+    def reboot_domain(self, name: str) -> None:
+        self._call("reboot", name)
+    
+    def destroy_domain(self, name: str) -> None:
+        self._call("destroy", name)
+
+
+@lru_cache()
+def get_libvirt_adapter() -> Optional[LibvirtAdapter]:
+    """
+    프로세스 공용 libvirt 어댑터 (비활성화되었거나 libvirt-python이 없으면 None)
+    """
+    if not settings.LIBVIRT_EVENTS_ENABLED:
+        return None
+    try:
+        backend = LibvirtBackend(settings.LIBVIRT_URI)
+    except ImportError:
+        logger.info("libvirt-python이 설치되지 않아 virsh로 도메인을 조회합니다.")
+        return None
+    return LibvirtAdapter(backend)
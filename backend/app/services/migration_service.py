@@ -0,0 +1,117 @@
+"""
+VM 마이그레이션 지표 기록 서비스
+
+노드 간 마이그레이션마다 전송량, 전송 속도, 다운타임을 기록하고
+방식(container, domain)별 통계를 계산합니다.
+"""
+import json
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+from app.core.config import settings
+from app.utils.logging_utils import get_logger
+from app.utils.stats_utils import percentile
+
+logger = get_logger("migration_service")
+
+# 통계 계산 시 읽을 최근 기록 수
+STATS_WINDOW = 1000
+
+# virsh domjobinfo 항목 → 지표 이름 (크기/대역폭은 바이트 단위로 변환)
+_DOMJOBINFO_FIELDS = {
+    "Time elapsed": "elapsed_ms",
+    "Data processed": "bytes",
+    "Memory bandwidth": "memory_bandwidth",
+    "Total downtime": "downtime_ms",
+}
+
+_BYTE_UNITS = {"B": 1, "KiB": 1024, "MiB": 1024 ** 2, "GiB": 1024 ** 3, "TiB": 1024 ** 4}
+
+
+def parse_domjobinfo(text: str) -> Dict[str, float]:
+    """
+    virsh domjobinfo --completed 출력 파싱
+    
+    예: "Data processed:   1.234 GiB", "Total downtime:   52 ms"
+    """
+    values = {}
+    for line in text.splitlines():
+        label, _, value = line.partition(":")
+        name = _DOMJOBINFO_FIELDS.get(label.strip())
+        if not name:
+            continue
+        words = value.split()
+        try:
+            number = float(words[0])
+        except (IndexError, ValueError):
+            continue
+        unit = words[1] if len(words) > 1 else ""
+        values[name] = number * _BYTE_UNITS.get(unit.replace("/s", ""), 1)
+    return values
+
+
+def transfer_metrics(byte_count: int, transfer_seconds: float, downtime_seconds: float) -> Dict[str, Any]:
+    """전송량/시간으로 전송 속도(MB/s)를 포함한 지표 구성"""
+    return {
+        "bytes": byte_count,
+        "transfer_seconds": round(transfer_seconds, 3),
+        "transfer_rate_mbps": round(byte_count / 1024 / 1024 / transfer_seconds, 2) if transfer_seconds > 0 else None,
+        "downtime_seconds": round(downtime_seconds, 3)
+    }
+
+
+class MigrationRecorder:
+    """마이그레이션 지표 기록 및 방식별 통계"""
+    
+    def __init__(self, image_root: Optional[str] = None):
+        self.records_path = Path(image_root or settings.VM_IMAGE_PATH) / "migrations.jsonl"
+    
+    def record(self, vm_id: str, metrics: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        마이그레이션 1건 기록 (한 줄 단위 append는 워커 간에도 섞이지 않음)
+        """
+        record = {"vm_id": vm_id, "finished_at": time.time(), **metrics}
+        self.records_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.records_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        
+        logger.info(
+            f"마이그레이션 완료: {vm_id} ({metrics.get('backend')}), "
+            f"{metrics.get('transfer_rate_mbps')}MB/s, 다운타임 {metrics.get('downtime_seconds')}초"
+        )
+        return record
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """방식별 전송 속도/다운타임 통계 (최근 STATS_WINDOW건)"""
+        by_backend: Dict[str, List[Dict[str, Any]]] = {}
+        for record in self._recent_records():
+            by_backend.setdefault(record.get("backend") or "unknown", []).append(record)
+        
+        stats = {}
+        for backend, records in by_backend.items():
+            rates = [r["transfer_rate_mbps"] for r in records if r.get("transfer_rate_mbps") is not None]
+            downtimes = [r["downtime_seconds"] for r in records if r.get("downtime_seconds") is not None]
+            stats[backend] = {
+                "count": len(records),
+                "avg_transfer_rate_mbps": round(sum(rates) / len(rates), 2) if rates else None,
+                "p50_downtime_seconds": percentile(downtimes, 50) if downtimes else None,
+                "p95_downtime_seconds": percentile(downtimes, 95) if downtimes else None,
+                "last": records[-1]
+            }
+        return stats
+    
+    def _recent_records(self) -> List[Dict[str, Any]]:
+        try:
+            with open(self.records_path, "r", encoding="utf-8") as f:
+                lines = f.readlines()[-STATS_WINDOW:]
+        except FileNotFoundError:
+            return []
+        
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        return records
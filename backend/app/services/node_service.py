@@ -0,0 +1,184 @@
+"""
+노드 레지스트리 및 배치(placement) 서비스
+"""
+import json
+from typing import Optional, List, Dict, Any
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.exceptions import NodeNotFoundError, NodeAlreadyExistsError, HostCapacityExceededError
+from app.models.node import Node
+from app.models.hosting import Hosting
+from app.schemas.node import NodeCreate
+from app.services.capacity_service import COMMITTED_STATUSES
+from app.utils.logging_utils import get_logger
+
+logger = get_logger("node_service")
+
+PLACEMENT_POLICIES = ("least_loaded", "bin_packing")
+
+
+class NodeService:
+    """
+    Docker 노드 관리 및 테넌트 배치
+    
+    등록된 활성 노드가 없으면 모든 호스팅은 기존처럼 로컬 호스트에 생성됩니다.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def register_node(self, node_data: NodeCreate) -> Node:
+        """노드 등록"""
+        if self.db.query(Node).filter(Node.name == node_data.name).first():
+            raise NodeAlreadyExistsError()
+        
+        node = Node(
+            name=node_data.name,
+            docker_host=node_data.docker_host,
+            address=node_data.address,
+            memory_mb=node_data.memory_mb,
+            cpus=node_data.cpus,
+            labels=json.dumps(node_data.labels, ensure_ascii=False),
+            is_active=True
+        )
+        self.db.add(node)
+        self.db.commit()
+        self.db.refresh(node)
+        
+        logger.info(f"노드 등록 완료: {node.name} ({node.docker_host})")
+        return node
+    
+    def get_node(self, node_id: int) -> Node:
+        node = self.db.query(Node).filter(Node.id == node_id).first()
+        if not node:
+            raise NodeNotFoundError()
+        return node
+    
+    def get_nodes(self, active_only: bool = False) -> List[Node]:
+        query = self.db.query(Node)
+        if active_only:
+            query = query.filter(Node.is_active.is_(True))
+        return query.order_by(Node.id).all()
+    
+    def has_active_nodes(self) -> bool:
+        return self.db.query(Node.id).filter(Node.is_active.is_(True)).first() is not None
+    
+    def set_node_active(self, node_id: int, is_active: bool) -> Node:
+        """
+        노드 신규 배치 허용/중지 (배치된 호스팅은 그대로 유지)
+        """
+        node = self.get_node(node_id)
+        node.is_active = is_active
+        self.db.commit()
+        self.db.refresh(node)
+        
+        logger.info(f"노드 {'활성화' if is_active else '비활성화'}: {node.name}")
+        return node
+    
+    def get_node_loads(self) -> Dict[int, Dict[str, float]]:
+        """
+        노드별 커밋된 리소스 (쿼리 1회)
+        """
+        rows = (
+            self.db.query(
+                Hosting.node_id,
+                func.coalesce(func.sum(Hosting.memory_mb), 0),
+                func.coalesce(func.sum(Hosting.cpus), 0),
+                func.count(Hosting.id)
+            )
+            .filter(Hosting.node_id.isnot(None), Hosting.status.in_(COMMITTED_STATUSES))
+            .group_by(Hosting.node_id)
+            .all()
+        )
+        return {
+            node_id: {"memory_mb": float(memory_mb), "cpus": float(cpus), "hosting_count": count}
+            for node_id, memory_mb, cpus, count in rows
+        }
+    
+    def place(
+        self,
+        resources: Optional[Dict[str, Any]] = None,
+        labels: Optional[Dict[str, str]] = None,
+        policy: Optional[str] = None
+    ) -> Node:
+        """
+        새 호스팅을 배치할 노드 선택
+        
+        Args:
+            resources: 요청 리소스 (memory_mb, cpus)
+            labels: 노드가 모두 가지고 있어야 하는 라벨
+            policy: least_loaded (가장 여유 있는 노드) 또는 bin_packing (가장 꽉 찬 노드)
+        
+        Raises:
+            HostCapacityExceededError: 조건을 만족하는 노드가 없음
+        """
+        policy = policy or settings.NODE_PLACEMENT_POLICY
+        if policy not in PLACEMENT_POLICIES:
+            raise ValueError(f"지원하지 않는 배치 정책입니다: {policy}")
+        
+        resources = resources or {}
+        memory_mb = resources.get("memory_mb") or 0
+        cpus = resources.get("cpus") or 0
+        loads = self.get_node_loads()
+        
+        candidates = []
+        for node in self.get_nodes(active_only=True):
+            if labels and not self._matches_labels(node, labels):
+                continue
+            
+            utilization = self._utilization_after(node, loads, memory_mb, cpus)
+            if utilization is None:
+                continue
+            candidates.append((utilization, node.id, node))
+        
+        if not candidates:
+            logger.warning(f"배치 가능한 노드 없음: 메모리 {memory_mb}MB, CPU {cpus}, 라벨 {labels}")
+            raise HostCapacityExceededError("배치 가능한 노드가 없습니다. 잠시 후 다시 시도해주세요.", retry_after=300)
+        
+        if policy == "least_loaded":
+            _, _, node = min(candidates, key=lambda c: (c[0], c[1]))
+        else:
+            _, _, node = max(candidates, key=lambda c: (c[0], -c[1]))
+        
+        logger.info(f"노드 배치 결정: {node.name} (정책 {policy})")
+        return node
+    
+    def check_capacity(self, node: Node, resources: Optional[Dict[str, Any]] = None) -> None:
+        """
+        지정한 노드에 리소스를 더 배치할 수 있는지 확인 (이동 대상 노드 검사)
+        
+        Raises:
+            HostCapacityExceededError: 노드 용량 부족
+        """
+        resources = resources or {}
+        memory_mb = resources.get("memory_mb") or 0
+        cpus = resources.get("cpus") or 0
+        if self._utilization_after(node, self.get_node_loads(), memory_mb, cpus) is None:
+            logger.warning(f"노드 용량 부족: {node.name} (메모리 {memory_mb}MB, CPU {cpus})")
+            raise HostCapacityExceededError(f"대상 노드의 용량이 부족합니다: {node.name}", retry_after=300)
+    
+    def _utilization_after(
+        self,
+        node: Node,
+        loads: Dict[int, Dict[str, float]],
+        memory_mb: float,
+        cpus: float
+    ) -> Optional[float]:
+        """
+        배치 후 사용률 (메모리/CPU 중 큰 값), 용량을 넘으면 None
+        """
+        load = loads.get(node.id, {"memory_mb": 0.0, "cpus": 0.0})
+        memory_after = load["memory_mb"] + memory_mb
+        cpus_after = load["cpus"] + cpus
+        if memory_after > node.memory_mb or cpus_after > node.cpus:
+            return None
+        return max(memory_after / node.memory_mb, cpus_after / node.cpus)
+    
+    def _matches_labels(self, node: Node, labels: Dict[str, str]) -> bool:
+        try:
+            node_labels = json.loads(node.labels) if node.labels else {}
+        except ValueError:
+            return False
+        return all(node_labels.get(key) == value for key, value in labels.items())
@@ -0,0 +1,104 @@
+"""
+프로비저닝 저널 서비스 - 호스팅 생성 단계 기록 및 조회
+"""
+import json
+import logging
+from typing import Optional, Dict, Any, List
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.models.hosting import Hosting
+from app.models.provisioning import ProvisioningJournal, ProvisioningStep
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 실행 순서 (보상은 역순)
+PROVISIONING_STEPS: List[ProvisioningStep] = list(ProvisioningStep)
+
+class ProvisioningJournalService:
+    """
+    호스팅별 프로비저닝 단계 저널
+    
+    각 단계가 끝날 때마다 결과를 DB에 커밋하므로, 워커가 중간에 죽어도
+    다른 워커(또는 스위퍼)가 완료된 단계를 건너뛰고 이어서 진행하거나
+    완료된 단계만 정확히 되돌릴 수 있습니다.
+    """
+    
+    def __init__(self, db: Session):
+        self.db = db
+    
+    def get_entries(self, hosting_id: int) -> Dict[ProvisioningStep, Dict[str, Any]]:
+        """
+        완료된 단계와 결과 조회
+        """
+        entries = (
+            self.db.query(ProvisioningJournal)
+            .filter(ProvisioningJournal.hosting_id == hosting_id)
+            .all()
+        )
+        return {entry.step: self._decode(entry.payload) for entry in entries}
+    
+    def is_done(self, hosting_id: int, step: ProvisioningStep) -> bool:
+        """단계 완료 여부"""
+        return (
+            self.db.query(ProvisioningJournal.id)
+            .filter(
+                ProvisioningJournal.hosting_id == hosting_id,
+                ProvisioningJournal.step == step
+            )
+            .first()
+            is not None
+        )
+    
+    def record(self, hosting: Hosting, step: ProvisioningStep, payload: Optional[Dict[str, Any]] = None) -> None:
+        """
+        단계 완료 기록 (호스팅 updated_at도 갱신하여 진행 중임을 표시)
+        """
+        entry = (
+            self.db.query(ProvisioningJournal)
+            .filter(
+                ProvisioningJournal.hosting_id == hosting.id,
+                ProvisioningJournal.step == step
+            )
+            .first()
+        )
+        if entry is None:
+            entry = ProvisioningJournal(hosting_id=hosting.id, step=step)
+            self.db.add(entry)
+        entry.payload = json.dumps(payload or {}, ensure_ascii=False)
+        
+        # 하트비트: 스위퍼가 진행 중인 작업을 방치된 작업으로 오인하지 않도록
+        hosting.updated_at = func.now()
+        self.db.commit()
+        
+        logger.info(f"프로비저닝 단계 완료: 호스팅 {hosting.id}, 단계 {step.value}")
+    
+    def forget(self, hosting_id: int, step: ProvisioningStep) -> None:
+        """
+        보상 완료된 단계 기록 삭제
+        """
+        self.db.query(ProvisioningJournal).filter(
+            ProvisioningJournal.hosting_id == hosting_id,
+            ProvisioningJournal.step == step
+        ).delete(synchronize_session=False)
+        self.db.commit()
+    
+    def next_step(self, hosting_id: int) -> Optional[ProvisioningStep]:
+        """
+        다음에 실행할 단계 (모두 완료되었으면 None)
+        """
+        done = self.get_entries(hosting_id)
+        for step in PROVISIONING_STEPS:
+            if step not in done:
+                return step
+        return None
+    
+    def _decode(self, payload: Optional[str]) -> Dict[str, Any]:
+        if not payload:
+            return {}
+        try:
+            return json.loads(payload)
+        except ValueError:
+            logger.warning(f"프로비저닝 저널 payload 파싱 실패: {payload!r}")
+            return {}
@@ -0,0 +1,132 @@
+"""
+프록시 캐시 관리 서비스
+
+nginx의 공유 캐시 영역(tenant_content)에 저장된 응답을 테넌트(사용자 ID)별로 집계하고,
+테넌트 단위로 삭제(purge)하거나 테넌트별 용량 제한을 넘는 항목을 정리합니다.
+
+캐시 키는 "{user_id}:..." 형식이므로 캐시 파일 헤더의 KEY 줄로 테넌트를 구분합니다.
+파일을 지우면 nginx는 다음 요청에서 캐시 미스로 처리하고 업스트림에서 다시 가져옵니다.
+"""
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from app.core.config import settings
+from app.utils.logging_utils import get_logger
+
+logger = get_logger("proxy_cache_service")
+
+# 캐시 파일 앞부분의 바이너리 헤더 + "KEY: ..." 줄을 읽을 크기
+CACHE_HEADER_READ = 4096
+
+KEY_MARKER = b"\nKEY: "
+
+
+def read_cache_key(path: Path) -> Optional[str]:
+    """nginx 캐시 파일 헤더에서 캐시 키 읽기"""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(CACHE_HEADER_READ)
+    except OSError:
+        return None
+    start = head.find(KEY_MARKER)
+    if start < 0:
+        return None
+    start += len(KEY_MARKER)
+    end = head.find(b"\n", start)
+    if end < 0:
+        return None
+    return head[start:end].decode("utf-8", "replace")
+
+
+def cache_key_tenant(key: str) -> Optional[str]:
+    """캐시 키의 테넌트(사용자 ID) 접두어"""
+    tenant, separator, _ = key.partition(":")
+    return tenant if separator and tenant.isdigit() else None
+
+
+class ProxyCacheManager:
+    """공유 프록시 캐시 디렉토리의 테넌트별 집계/삭제/용량 제한"""
+    
+    def __init__(self, cache_dir: Optional[Path] = None):
+        self.cache_dir = Path(cache_dir or settings.PROXY_CACHE_PATH)
+    
+    def _entries(self, tenant: Optional[str] = None) -> Iterator[Tuple[str, Path, int, float]]:
+        """(테넌트, 파일 경로, 크기, 수정 시간) 순회 (nginx가 쓰는 중인 임시 파일은 제외)"""
+        if not self.cache_dir.is_dir():
+            return
+        for path in self.cache_dir.rglob("*"):
+            # use_temp_path=off일 때 임시 파일은 "<해시>.<번호>" 이름으로 같은 디렉토리에 생김
+            if "." in path.name or not path.is_file():
+                continue
+            key = read_cache_key(path)
+            entry_tenant = cache_key_tenant(key) if key else None
+            if entry_tenant is None or (tenant is not None and entry_tenant != tenant):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            yield entry_tenant, path, stat.st_size, stat.st_mtime
+    
+    def usage(self) -> Dict[str, Dict[str, int]]:
+        """테넌트별 캐시 항목 수와 바이트"""
+        usage: Dict[str, Dict[str, int]] = {}
+        for tenant, _, size, _ in self._entries():
+            entry = usage.setdefault(tenant, {"entries": 0, "bytes": 0})
+            entry["entries"] += 1
+            entry["bytes"] += size
+        return usage
+    
+    def purge(self, tenant: str) -> Dict[str, int]:
+        """
+        테넌트의 캐시 항목 모두 삭제
+        
+        Returns:
+            삭제한 항목 수와 바이트
+        """
+        removed = removed_bytes = 0
+        for _, path, size, _ in list(self._entries(str(tenant))):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            removed += 1
+            removed_bytes += size
+        
+        logger.info(f"프록시 캐시 삭제: 사용자 {tenant}, {removed}개 ({removed_bytes} bytes)")
+        return {"removed": removed, "bytes": removed_bytes}
+    
+    def enforce_caps(self, caps: Dict[str, int], default_bytes: int) -> Dict[str, int]:
+        """
+        테넌트별 용량 제한을 넘는 캐시 항목을 오래된 것부터 삭제
+        
+        공유 영역의 max_size는 전체 한도일 뿐이므로, 한 테넌트가 영역을 독차지하지 않도록
+        테넌트마다 caps(없으면 default_bytes)까지만 남깁니다.
+        
+        Returns:
+            테넌트별 삭제한 항목 수
+        """
+        grouped: Dict[str, list] = {}
+        for tenant, path, size, mtime in self._entries():
+            grouped.setdefault(tenant, []).append((mtime, size, path))
+        
+        evicted: Dict[str, int] = {}
+        for tenant, entries in grouped.items():
+            limit = caps.get(tenant, default_bytes)
+            total = sum(size for _, size, _ in entries)
+            if total <= limit:
+                continue
+            
+            for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+                if total <= limit:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+                evicted[tenant] = evicted.get(tenant, 0) + 1
+            
+            logger.info(f"프록시 캐시 용량 초과 정리: 사용자 {tenant}, {evicted[tenant]}개 삭제 (제한 {limit} bytes)")
+        
+        return evicted
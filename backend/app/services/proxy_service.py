@@ -5,12 +5,15 @@ import os
 import subprocess
 import logging
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 from pathlib import Path
 from datetime import datetime
 from jinja2 import Template
 
 from app.core.config import settings
+from app.services.proxy_cache_service import ProxyCacheManager
+from app.services.route_service import get_route_table
+from app.services.static_site_service import static_upstream
 from app.utils.logging_utils import get_logger
 
 logger = get_logger("proxy_service")
@@ -69,7 +72,8 @@ class ProxyService:
         vm_ip: str, 
         ssh_port: int,
         web_port: int = 80,
-        vm_id: Optional[str] = None
+        vm_id: Optional[str] = None,
+        microcache_seconds: int = 0
     ) -> Dict[str, Any]:
         """
         사용자 호스팅 프록시 규칙 추가 (개선된 버전 - 검증 및 자동 복구 포함)
@@ -80,6 +84,7 @@ class ProxyService:
             ssh_port: SSH 포트
             web_port: 웹 포트 (기본값: 80)
             vm_id: VM ID (선택사항)
+            microcache_seconds: HTML 마이크로캐시 시간 (초, 0이면 사용 안 함)
         
         Returns:
             프록시 설정 결과 정보
@@ -91,6 +96,9 @@ class ProxyService:
             if not vm_id:
                 vm_id = f"vm-{user_id}"
             
+            if settings.PROXY_ROUTING_MODE == "resolver":
+                return self._add_resolver_route(user_id, vm_ip, ssh_port, web_port, vm_id)
+            
             # 컨테이너 연결 사전 테스트
             if not self._test_vm_connection(vm_ip, web_port):
                 logger.warning(f"VM 연결 테스트 실패: {vm_ip}:{web_port}, 계속 진행...")
@@ -104,6 +112,8 @@ class ProxyService:
                 "--vm-ip", vm_ip,
                 "--web-port", str(web_port),
                 "--ssh-port", str(ssh_port),
+                "--microcache", str(microcache_seconds or 0),
+                *self._keepalive_args(),
                 "--force"  # 기존 설정 덮어쓰기
             ]
             
@@ -136,27 +146,17 @@ class ProxyService:
             if not proxy_working:
                 logger.warning(f"프록시 규칙 검증 실패: 사용자 {user_id}, 자동 복구 시도...")
                 # 자동 복구 시도
-                if self._auto_fix_proxy_rule(user_id, vm_ip, web_port, ssh_port, vm_id):
+                if self._auto_fix_proxy_rule(user_id, vm_ip, web_port, ssh_port, vm_id, microcache_seconds):
                     logger.info(f"프록시 규칙 자동 복구 성공: 사용자 {user_id}")
                     proxy_working = True
                 else:
                     logger.error(f"프록시 규칙 자동 복구 실패: 사용자 {user_id}")
             
             # 결과 정보 생성
-            proxy_info = {
-                "user_id": user_id,
-                "vm_id": vm_id,
-                "vm_ip": vm_ip,
-                "web_port": web_port,
-                "ssh_port": ssh_port,
-                "web_url": f"http://localhost/{user_id}",
-                "ssh_command": f"ssh -p {ssh_port} ubuntu@localhost",
-                "sftp_command": f"sftp -P {ssh_port} ubuntu@localhost",
-                "config_file": str(self.hosting_dir / f"{user_id}.conf"),
-                "status": "active" if proxy_working else "warning",
-                "verified": proxy_working,
-                "created_at": datetime.now().isoformat()
-            }
+            proxy_info = self._proxy_info(
+                user_id, vm_id, vm_ip, web_port, ssh_port, proxy_working,
+                config_file=str(self.hosting_dir / f"{user_id}.conf")
+            )
             
             logger.info(f"프록시 규칙 추가 완료: 사용자 {user_id}, 검증: {'성공' if proxy_working else '실패'}")
             return proxy_info
@@ -168,6 +168,120 @@ class ProxyService:
             logger.error(f"프록시 규칙 추가 오류: {e}")
             raise
     
+    @staticmethod
+    def _keepalive_args() -> List[str]:
+        """사용자별 upstream 블록의 keepalive 연결 풀 옵션 (관리 스크립트 인수)"""
+        return [
+            "--keepalive", str(settings.PROXY_UPSTREAM_KEEPALIVE),
+            "--keepalive-requests", str(settings.PROXY_UPSTREAM_KEEPALIVE_REQUESTS),
+            "--keepalive-timeout", str(settings.PROXY_UPSTREAM_KEEPALIVE_TIMEOUT)
+        ]
+    
+    def purge_cache(self, user_id: str) -> Dict[str, int]:
+        """
+        사용자의 프록시 캐시 항목 삭제 (공유 캐시 영역에서 해당 사용자 키만)
+        
+        Returns:
+            삭제한 항목 수와 바이트
+        """
+        return ProxyCacheManager().purge(str(user_id))
+    
+    def _add_resolver_route(self, user_id: str, vm_ip: str, ssh_port: int, web_port: int, vm_id: str) -> Dict[str, Any]:
+        """
+        리졸버 라우트 테이블에 규칙 추가 (nginx 설정 변경/리로드 없이 즉시 반영)
+        """
+        upstream = get_route_table().set(user_id, vm_ip, web_port)
+        
+        # nginx를 거치지 않으므로 upstream 연결만 확인
+        reachable = self._test_vm_connection(vm_ip, web_port)
+        if not reachable:
+            logger.warning(f"VM 연결 테스트 실패: {upstream}, 라우트는 등록됨")
+        
+        logger.info(f"리졸버 라우트 등록: 사용자 {user_id} → {upstream}")
+        return self._proxy_info(user_id, vm_id, vm_ip, web_port, ssh_port, reachable, config_file=None)
+    
+    def add_static_rule(self, user_id: str, web_dir: str, vm_id: str) -> Dict[str, Any]:
+        """
+        정적 호스팅 규칙 추가 (컨테이너 프록시 없이 nginx가 웹 디렉토리를 직접 서빙)
+        
+        Args:
+            user_id: 사용자 ID
+            web_dir: 호스트 웹 디렉토리 절대 경로
+            vm_id: VM ID
+        
+        Returns:
+            설정 결과 정보
+        """
+        try:
+            logger.info(f"정적 호스팅 규칙 추가 시작: 사용자 {user_id}, 웹 디렉토리: {web_dir}")
+            
+            if settings.PROXY_ROUTING_MODE == "resolver":
+                # 내부 정적 서버가 VM ID 경로로 같은 웹 디렉토리를 서빙
+                upstream = get_route_table().set_upstream(user_id, static_upstream(vm_id))
+                logger.info(f"리졸버 정적 라우트 등록: 사용자 {user_id} → {upstream}")
+                config_file = None
+            else:
+                result = subprocess.run(
+                    [
+                        "sudo",
+                        str(self.manager_script),
+                        "add-static-user", user_id,
+                        "--vm-id", vm_id,
+                        "--web-dir", web_dir,
+                        "--force"
+                    ],
+                    capture_output=True,
+                    text=True,
+                    check=True
+                )
+                logger.info(f"정적 호스팅 설정 추가 완료: {result.stdout}")
+                config_file = str(self.hosting_dir / f"{user_id}.conf")
+            
+            return {
+                "user_id": user_id,
+                "vm_id": vm_id,
+                "web_dir": web_dir,
+                "web_url": f"http://localhost/{user_id}",
+                "ssh_command": None,
+                "config_file": config_file,
+                "routing": settings.PROXY_ROUTING_MODE,
+                "static": True,
+                "status": "active",
+                "verified": True,
+                "created_at": datetime.now().isoformat()
+            }
+            
+        except subprocess.CalledProcessError as e:
+            logger.error(f"정적 호스팅 규칙 추가 실패: {e.stderr}")
+            raise Exception(f"nginx 정적 호스팅 설정 추가 실패: {e.stderr}")
+    
+    def _proxy_info(
+        self,
+        user_id: str,
+        vm_id: str,
+        vm_ip: str,
+        web_port: int,
+        ssh_port: int,
+        verified: bool,
+        config_file: Optional[str]
+    ) -> Dict[str, Any]:
+        """프록시 설정 결과 정보 구성"""
+        return {
+            "user_id": user_id,
+            "vm_id": vm_id,
+            "vm_ip": vm_ip,
+            "web_port": web_port,
+            "ssh_port": ssh_port,
+            "web_url": f"http://localhost/{user_id}",
+            "ssh_command": f"ssh -p {ssh_port} ubuntu@localhost",
+            "sftp_command": f"sftp -P {ssh_port} ubuntu@localhost",
+            "config_file": config_file,
+            "routing": settings.PROXY_ROUTING_MODE,
+            "status": "active" if verified else "warning",
+            "verified": verified,
+            "created_at": datetime.now().isoformat()
+        }
+    
     def _test_vm_connection(self, vm_ip: str, web_port: int, timeout: int = 5) -> bool:
         """
         VM 연결 테스트
@@ -256,7 +370,9 @@ class ProxyService:
         """
         return self._validate_nginx_config_with_sudo()
     
-    def _auto_fix_proxy_rule(self, user_id: str, vm_ip: str, web_port: int, ssh_port: int, vm_id: str) -> bool:
+    def _auto_fix_proxy_rule(
+        self, user_id: str, vm_ip: str, web_port: int, ssh_port: int, vm_id: str, microcache_seconds: int = 0
+    ) -> bool:
         """
         프록시 규칙 자동 복구
         
@@ -266,6 +382,7 @@ class ProxyService:
             web_port: 웹 포트
             ssh_port: SSH 포트
             vm_id: VM ID
+            microcache_seconds: HTML 마이크로캐시 시간 (초)
         
         Returns:
             복구 성공 여부
@@ -288,6 +405,8 @@ class ProxyService:
                 "--vm-ip", vm_ip,
                 "--web-port", str(web_port),
                 "--ssh-port", str(ssh_port),
+                "--microcache", str(microcache_seconds or 0),
+                *self._keepalive_args(),
                 "--force"
             ]
             
@@ -322,6 +441,11 @@ class ProxyService:
         try:
             logger.info(f"프록시 규칙 제거 시작: 사용자 {user_id}")
             
+            if settings.PROXY_ROUTING_MODE == "resolver":
+                get_route_table().remove(user_id)
+                logger.info(f"리졸버 라우트 제거 완료: 사용자 {user_id}")
+                return True
+            
             # nginx 관리 스크립트를 sudo 권한으로 실행
             cmd = [
                 "sudo",
@@ -351,13 +475,58 @@ class ProxyService:
             logger.error(f"프록시 규칙 제거 오류: {e}")
             return False
     
+    def remove_proxy_rules(self, user_ids: List[str]) -> Dict[str, bool]:
+        """
+        여러 사용자 프록시 규칙 일괄 제거 (nginx 리로드는 1회만 수행)
+        
+        Args:
+            user_ids: 사용자 ID 목록
+        
+        Returns:
+            사용자별 제거 성공 여부
+        """
+        if settings.PROXY_ROUTING_MODE == "resolver":
+            return {user_id: self.remove_proxy_rule(user_id) for user_id in user_ids}
+        
+        results = {}
+        for user_id in user_ids:
+            result = subprocess.run(
+                ["sudo", str(self.manager_script), "remove-user", user_id],
+                capture_output=True,
+                text=True
+            )
+            results[user_id] = result.returncode == 0
+            if result.returncode != 0:
+                logger.error(f"프록시 규칙 제거 실패: 사용자 {user_id}: {result.stderr}")
+        
+        if any(results.values()):
+            self._reload_nginx()
+        
+        logger.info(f"프록시 규칙 일괄 제거 완료: {sum(results.values())}/{len(user_ids)}")
+        return results
+    
+    def list_proxy_config_files(self) -> Dict[str, Path]:
+        """
+        사용자별 프록시 설정 파일 목록 (nginx 관리 스크립트 호출 없이 디렉토리 직접 조회)
+        
+        Returns:
+            사용자 ID -> 설정 파일 경로
+        """
+        if not self.hosting_dir.is_dir():
+            return {}
+        return {
+            config_file.stem: config_file
+            for config_file in self.hosting_dir.glob("*.conf")
+        }
+    
     def update_proxy_rule(
         self, 
         user_id: str, 
         vm_ip: str, 
         ssh_port: int,
         web_port: int = 80,
-        vm_id: Optional[str] = None
+        vm_id: Optional[str] = None,
+        microcache_seconds: int = 0
     ) -> Dict[str, Any]:
         """
         사용자 호스팅 프록시 규칙 업데이트
@@ -368,6 +537,7 @@ class ProxyService:
             ssh_port: SSH 포트
             web_port: 웹 포트
             vm_id: VM ID
+            microcache_seconds: HTML 마이크로캐시 시간 (초)
         
         Returns:
             업데이트된 프록시 설정 정보
@@ -376,7 +546,7 @@ class ProxyService:
             logger.info(f"프록시 규칙 업데이트 시작: 사용자 {user_id}")
             
             # 기존 규칙 제거 후 새로 추가
-            return self.add_proxy_rule(user_id, vm_ip, ssh_port, web_port, vm_id)
+            return self.add_proxy_rule(user_id, vm_ip, ssh_port, web_port, vm_id, microcache_seconds)
             
         except Exception as e:
             logger.error(f"프록시 규칙 업데이트 오류: {e}")
@@ -393,6 +563,30 @@ class ProxyService:
             프록시 설정 정보 또는 None
         """
         try:
+            if settings.PROXY_ROUTING_MODE == "resolver":
+                upstream = get_route_table().resolve(str(user_id))
+                if not upstream:
+                    return None
+                address, _, static_path = upstream.partition("/")
+                if static_path:
+                    return {
+                        "user_id": user_id,
+                        "vm_id": static_path,
+                        "web_url": f"http://localhost/{user_id}",
+                        "routing": "resolver",
+                        "static": True,
+                        "status": "active"
+                    }
+                vm_ip, _, web_port = address.rpartition(":")
+                return {
+                    "user_id": user_id,
+                    "vm_ip": vm_ip,
+                    "web_port": int(web_port),
+                    "web_url": f"http://localhost/{user_id}",
+                    "routing": "resolver",
+                    "status": "active"
+                }
+            
             config_file = self.hosting_dir / f"{user_id}.conf"
             
             if not config_file.exists():
@@ -403,9 +597,22 @@ class ProxyService:
             
             # 간단한 파싱 (정규식 사용 가능)
             vm_id = self._extract_from_config(config_content, "# VM ID: (.+)")
-            web_port = self._extract_from_config(config_content, r"proxy_pass http://[^:]+:(\d+)")
+            web_dir = self._extract_from_config(config_content, "# 웹 디렉토리: (.+)")
+            if web_dir:
+                return {
+                    "user_id": user_id,
+                    "vm_id": vm_id,
+                    "web_dir": web_dir,
+                    "web_url": f"http://localhost/{user_id}",
+                    "config_file": str(config_file),
+                    "static": True,
+                    "status": "active"
+                }
+            # 업스트림 주석 (upstream 블록 방식) 또는 이전 형식의 proxy_pass 주소
+            upstream_pattern = r"(?:# 업스트림 서버: |proxy_pass http://)([^:\s]+):(\d+)"
+            web_port = self._extract_from_config(config_content, upstream_pattern, group=2)
             ssh_port = self._extract_from_config(config_content, r"ssh -p (\d+)")
-            vm_ip = self._extract_from_config(config_content, r"proxy_pass http://([^:]+):")
+            vm_ip = self._extract_from_config(config_content, upstream_pattern)
             
             return {
                 "user_id": user_id,
@@ -583,11 +790,11 @@ class ProxyService:
                 "error": str(e)
             }
     
-    def _extract_from_config(self, content: str, pattern: str) -> Optional[str]:
+    def _extract_from_config(self, content: str, pattern: str, group: int = 1) -> Optional[str]:
         """설정 파일에서 패턴 매칭하여 값 추출"""
         import re
         match = re.search(pattern, content)
-        return match.group(1) if match else None
+        return match.group(group) if match else None
     
     def _reload_nginx(self) -> None:
         """Nginx 설정 리로드"""
@@ -0,0 +1,190 @@
+"""
+테넌트 라우트 테이블 서비스
+
+nginx auth_request 리졸버가 사용자 ID로 upstream(IP:포트)을 찾는 메모리 테이블입니다.
+ProxyService가 규칙 추가/삭제 시 바로 갱신하므로 nginx 설정 변경이나 리로드가 필요 없습니다.
+다른 워커 프로세스에서 추가된 테넌트는 첫 조회 때 DB에서 읽어 채우고, 항목은
+PROXY_ROUTE_TTL_SECONDS가 지나면 DB에서 다시 확인합니다.
+
+유휴 자동 중지된 테넌트는 백엔드의 깨우기 경로(/internal/wake/{user_id})로 라우팅합니다.
+"""
+import json
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.resource_plans import STATIC_PLAN
+from app.db.session import SessionLocal
+from app.models.hosting import Hosting, HostingStatus
+from app.models.provisioning import ProvisioningJournal, ProvisioningStep
+from app.services.static_site_service import static_upstream
+from app.utils.logging_utils import get_logger
+
+logger = get_logger("route_service")
+
+# 라우트를 조회할 수 있는 호스팅 상태 (중지된 호스팅은 폴백 페이지로)
+ROUTABLE_STATUSES = (HostingStatus.RUNNING, HostingStatus.CREATING)
+
+# 없는 사용자 ID 조회가 반복될 때 DB 조회를 줄이기 위한 부재 캐시 시간 (초)
+NEGATIVE_TTL_SECONDS = 1.0
+
+# 메모리 테이블에 없음을 나타내는 값 (부재로 기록된 None과 구분)
+MISS = object()
+
+# 유휴 자동 중지된 테넌트의 첫 요청을 받는 백엔드 경로 (TenantWakeMiddleware)
+WAKE_PREFIX = "/internal/wake/"
+
+
+def wake_upstream(user_id: str) -> str:
+    """유휴 자동 중지된 테넌트로 라우팅할 upstream (백엔드 깨우기 경로)"""
+    return f"{settings.SCALE_TO_ZERO_WAKE_UPSTREAM}{WAKE_PREFIX}{user_id}"
+
+
+def is_wake_upstream(upstream: Optional[str]) -> bool:
+    return bool(upstream) and WAKE_PREFIX in upstream
+
+
+def _web_port(payload: Optional[str]) -> int:
+    try:
+        return int(json.loads(payload or "{}").get("web_port") or 80)
+    except (ValueError, TypeError):
+        return 80
+
+
+def load_routes_from_db(db: Session, user_id: Optional[str] = None) -> Dict[str, str]:
+    """
+    호스팅 DB에서 사용자 ID → upstream 목록 조회 (웹 포트는 프로비저닝 저널의 컨테이너 생성 결과)
+    
+    정적 호스팅은 nginx 내부 정적 서버의 VM ID 경로로, 유휴 자동 중지된 호스팅은
+    백엔드 깨우기 경로로 라우팅합니다.
+    """
+    query = (
+        db.query(
+            Hosting.user_id, Hosting.vm_id, Hosting.vm_ip, Hosting.plan, Hosting.idle_stopped_at,
+            ProvisioningJournal.payload
+        )
+        .outerjoin(
+            ProvisioningJournal,
+            (ProvisioningJournal.hosting_id == Hosting.id)
+            & (ProvisioningJournal.step == ProvisioningStep.CONTAINER_CREATED)
+        )
+        .filter(or_(Hosting.status.in_(ROUTABLE_STATUSES), Hosting.idle_stopped_at.isnot(None)))
+    )
+    if user_id is not None:
+        if not user_id.isdigit():
+            return {}
+        query = query.filter(Hosting.user_id == int(user_id))
+    
+    routes = {}
+    for row_user_id, vm_id, vm_ip, plan, idle_stopped_at, payload in query.all():
+        if not vm_ip:
+            continue
+        if idle_stopped_at is not None:
+            routes[str(row_user_id)] = wake_upstream(str(row_user_id))
+        elif plan == STATIC_PLAN:
+            routes[str(row_user_id)] = static_upstream(vm_id)
+        else:
+            routes[str(row_user_id)] = f"{vm_ip}:{_web_port(payload)}"
+    return routes
+
+
+def _load_route(user_id: str) -> Optional[str]:
+    db = SessionLocal()
+    try:
+        return load_routes_from_db(db, user_id).get(user_id)
+    finally:
+        db.close()
+
+
+class RouteTable:
+    """
+    사용자 ID → upstream 메모리 테이블
+    
+    조회는 잠금 없는 dict 조회 1회이고, 쓰기만 잠금으로 직렬화합니다.
+    """
+    
+    def __init__(self, loader: Callable[[str], Optional[str]] = _load_route, ttl: Optional[float] = None):
+        self._routes: Dict[str, Tuple[Optional[str], float]] = {}
+        self._lock = threading.Lock()
+        self._loader = loader
+        self.ttl = ttl if ttl is not None else settings.PROXY_ROUTE_TTL_SECONDS
+    
+    def set(self, user_id: str, vm_ip: str, web_port: int) -> str:
+        """라우트 추가/변경 (즉시 반영)"""
+        return self.set_upstream(user_id, f"{vm_ip}:{web_port}")
+    
+    def set_upstream(self, user_id: str, upstream: str) -> str:
+        """upstream 문자열로 라우트 추가/변경 (정적 호스팅은 IP:포트/VM ID 경로)"""
+        with self._lock:
+            self._routes[str(user_id)] = (upstream, time.monotonic() + self._ttl_for(upstream))
+        return upstream
+    
+    def remove(self, user_id: str) -> bool:
+        """라우트 제거 (다른 워커에서 다시 채우지 않도록 부재로 기록)"""
+        with self._lock:
+            previous = self._routes.get(str(user_id))
+            self._routes[str(user_id)] = (None, time.monotonic() + NEGATIVE_TTL_SECONDS)
+        return bool(previous and previous[0])
+    
+    def load(self, routes: Dict[str, str]) -> int:
+        """전체 라우트 교체 (기동 시 DB에서 채움)"""
+        now = time.monotonic()
+        with self._lock:
+            self._routes = {user_id: (upstream, now + self._ttl_for(upstream)) for user_id, upstream in routes.items()}
+        return len(routes)
+    
+    def cached(self, user_id: str):
+        """
+        메모리 테이블만 조회 (DB 조회 없음)
+        
+        Returns:
+            upstream, 부재로 기록된 경우 None, 없거나 만료된 경우 MISS
+        """
+        entry = self._routes.get(user_id)
+        if entry is None or entry[1] < time.monotonic():
+            return MISS
+        return entry[0]
+    
+    def resolve(self, user_id: str) -> Optional[str]:
+        """
+        upstream 조회 (메모리에 없거나 만료되면 DB에서 다시 읽음)
+        """
+        upstream = self.cached(user_id)
+        return self.refresh(user_id) if upstream is MISS else upstream
+    
+    def refresh(self, user_id: str) -> Optional[str]:
+        """DB에서 한 사용자의 라우트를 다시 읽어 반영"""
+        try:
+            upstream = self._loader(user_id)
+        except Exception as e:
+            logger.error(f"라우트 조회 실패: 사용자 {user_id}: {e}")
+            entry = self._routes.get(user_id)
+            return entry[0] if entry else None
+        with self._lock:
+            self._routes[user_id] = (upstream, time.monotonic() + self._ttl_for(upstream))
+        return upstream
+    
+    def _ttl_for(self, upstream: Optional[str]) -> float:
+        """
+        항목 유지 시간 (부재와 깨우기 경로는 짧게)
+        
+        다른 워커에서 컨테이너를 깨운 뒤에도 이 워커가 오래된 깨우기 경로로 계속 보내지 않도록 합니다.
+        """
+        if not upstream or is_wake_upstream(upstream):
+            return NEGATIVE_TTL_SECONDS
+        return self.ttl
+    
+    def snapshot(self) -> Dict[str, str]:
+        """현재 라우트 목록 (부재 기록 제외)"""
+        return {user_id: upstream for user_id, (upstream, _) in list(self._routes.items()) if upstream}
+
+
+@lru_cache()
+def get_route_table() -> RouteTable:
+    """프로세스 공용 라우트 테이블"""
+    return RouteTable()
@@ -0,0 +1,116 @@
+"""
+유휴 컨테이너 자동 중지/깨우기 서비스 (scale-to-zero)
+
+공유 접근 로그에서 집계한 테넌트별 마지막 요청 시각으로 유휴 컨테이너를 중지하고
+(HostingService.stop_idle_hostings), 중지된 테넌트에 요청이 오면 nginx가 백엔드 깨우기
+경로(/internal/wake/{user_id})를 호출해 컨테이너를 다시 시작합니다 (HostingService.wake_idle_hosting).
+깨우는 데 걸린 시간(콜드 스타트)은 플랜별로 기록합니다.
+"""
+import json
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+from app.core.config import settings
+from app.utils.logging_utils import get_logger
+from app.utils.stats_utils import percentile
+
+logger = get_logger("scale_to_zero_service")
+
+# 통계 계산 시 읽을 최근 기록 수
+STATS_WINDOW = 1000
+
+# 같은 테넌트를 동시에 깨우는 요청은 워커 안에서 한 번만 시작
+_wake_locks: Dict[str, threading.Lock] = {}
+_wake_locks_guard = threading.Lock()
+
+
+def _wake_lock(user_id: str) -> threading.Lock:
+    with _wake_locks_guard:
+        return _wake_locks.setdefault(str(user_id), threading.Lock())
+
+
+def wait_until_ready(upstream: str, timeout: float) -> bool:
+    """upstream(IP:포트)의 웹 포트가 연결을 받을 때까지 대기"""
+    host, _, port = upstream.rpartition(":")
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with socket.create_connection((host, int(port)), timeout=1):
+                return True
+        except OSError:
+            pass
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.2)
+
+
+def wake_tenant(user_id: str) -> Optional[Dict[str, Any]]:
+    """
+    사용자 경로의 유휴 자동 중지된 호스팅 깨우기 (TenantWakeMiddleware에서 호출)
+    
+    Returns:
+        콜드 스타트 기록 (깨울 호스팅이 없으면 None)
+    """
+    from app.db.session import SessionLocal
+    from app.services.hosting_service import HostingService
+    
+    with _wake_lock(user_id):
+        db = SessionLocal()
+        try:
+            return HostingService(db).wake_idle_hosting(int(user_id))
+        finally:
+            db.close()
+
+
+class ColdStartRecorder:
+    """깨우기(콜드 스타트) 시간 기록 및 플랜별 통계"""
+    
+    def __init__(self, image_root: Optional[str] = None):
+        self.records_path = Path(image_root or settings.VM_IMAGE_PATH) / "scale-to-zero" / "cold-starts.jsonl"
+    
+    def record(self, vm_id: str, plan: Optional[str], seconds: float) -> Dict[str, Any]:
+        record = {"vm_id": vm_id, "plan": plan or "unknown", "seconds": round(seconds, 3), "woken_at": time.time()}
+        
+        # 한 줄 단위 append는 워커 간에도 섞이지 않음
+        self.records_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.records_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        
+        logger.info(f"콜드 스타트: {vm_id}, 플랜 {record['plan']}, {record['seconds']}초")
+        return record
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """플랜별 콜드 스타트 시간 통계 (최근 STATS_WINDOW건)"""
+        by_plan: Dict[str, List[float]] = {}
+        for record in self._recent_records():
+            by_plan.setdefault(record.get("plan") or "unknown", []).append(record["seconds"])
+        
+        return {
+            plan: {
+                "count": len(values),
+                "avg_seconds": round(sum(values) / len(values), 3),
+                "p50_seconds": percentile(values, 50),
+                "p95_seconds": percentile(values, 95),
+                "max_seconds": max(values),
+                "last_seconds": values[-1]
+            }
+            for plan, values in by_plan.items()
+        }
+    
+    def _recent_records(self) -> List[Dict[str, Any]]:
+        try:
+            with open(self.records_path, "r", encoding="utf-8") as f:
+                lines = f.readlines()[-STATS_WINDOW:]
+        except FileNotFoundError:
+            return []
+        
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+        return records
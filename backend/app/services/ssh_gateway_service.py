@@ -0,0 +1,434 @@
+"""
+SSH 게이트웨이 서비스
+
+모든 테넌트의 SSH 접속을 하나의 포트에서 받아 사용자 이름(`<user>+<호스팅>`) 또는
+공개키 지문으로 대상 컨테이너를 찾고, 내부 네트워크로 세션을 중계합니다.
+테넌트마다 호스트 포트를 게시하지 않으므로 SSH 포트 범위가 수용 한도가 되지 않습니다.
+
+asyncssh는 선택 의존성이며, 게이트웨이 프로세스를 실행할 때만 필요합니다.
+    python -m app.services.ssh_gateway_service
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.resource_plans import STATIC_PLAN
+from app.utils.logging_utils import get_logger
+
+logger = get_logger("ssh_gateway_service")
+
+# 사용자 이름 형식: 계정 이름 + 선택적 "+호스팅 ID 또는 VM ID"
+LOGIN_PATTERN = re.compile(r"^(?P<login>[a-z_][a-z0-9_-]{0,31})(?:\+(?P<hosting>[A-Za-z0-9-]{1,64}))?$")
+
+# 공개키 지문 인덱스 재구성 주기 (초)
+FINGERPRINT_CACHE_SECONDS = 60
+
+# 세션 중계 시 한 번에 읽는 바이트 수
+PUMP_CHUNK_SIZE = 64 * 1024
+
+
+def parse_login(username: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    SSH 사용자 이름을 (계정 이름, 호스팅 참조)로 분리
+    
+    "ubuntu+7" -> ("ubuntu", "7"), "ubuntu" -> ("ubuntu", None).
+    형식이 맞지 않으면 (None, None)을 반환합니다.
+    """
+    match = LOGIN_PATTERN.match(username or "")
+    if not match:
+        return None, None
+    return match.group("login"), match.group("hosting")
+
+
+def public_key_fingerprint(public_key: str) -> Optional[str]:
+    """OpenSSH 공개키 한 줄에서 `ssh-keygen -l`과 같은 SHA256 지문 계산"""
+    parts = (public_key or "").split()
+    if len(parts) < 2:
+        return None
+    try:
+        blob = base64.b64decode(parts[1], validate=True)
+    except ValueError:
+        return None
+    digest = base64.b64encode(hashlib.sha256(blob).digest()).decode().rstrip("=")
+    return f"SHA256:{digest}"
+
+
+def gateway_dir(image_root: Optional[Path] = None) -> Path:
+    """게이트웨이 호스트 키와 통계 파일을 두는 디렉토리"""
+    return Path(image_root or settings.VM_IMAGE_PATH) / "ssh-gateway"
+
+
+def load_gateway_stats(image_root: Optional[Path] = None) -> Dict[str, Any]:
+    """게이트웨이 프로세스가 마지막으로 기록한 테넌트별 세션/전송량 통계"""
+    path = gateway_dir(image_root) / "stats.json"
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {"updated_at": None, "active_sessions": 0, "tenants": {}}
+
+
+class SSHRouter:
+    """SSH 사용자 이름/공개키 지문을 대상 테넌트 SSH 서버 주소로 변환"""
+    
+    def __init__(self, image_root: Optional[Path] = None, session_factory: Optional[Callable] = None):
+        if session_factory is None:
+            from app.db.session import SessionLocal
+            session_factory = SessionLocal
+        self.image_root = Path(image_root or settings.VM_IMAGE_PATH)
+        self.session_factory = session_factory
+        self._fingerprints: Dict[str, str] = {}
+        self._fingerprints_loaded_at = 0.0
+        self._lock = threading.Lock()
+    
+    def _key_dir(self, vm_id: str) -> Path:
+        return self.image_root / "ssh-keys" / vm_id
+    
+    def _key_fingerprint(self, vm_id: str) -> Optional[str]:
+        try:
+            return public_key_fingerprint((self._key_dir(vm_id) / "id_rsa.pub").read_text())
+        except OSError:
+            return None
+    
+    def _fingerprint_index(self) -> Dict[str, str]:
+        """공개키 지문 -> VM ID 인덱스 (키 디렉토리를 주기적으로 다시 읽음)"""
+        with self._lock:
+            if time.monotonic() - self._fingerprints_loaded_at < FINGERPRINT_CACHE_SECONDS:
+                return self._fingerprints
+            
+            index = {}
+            for key_dir in (self.image_root / "ssh-keys").glob("*"):
+                fingerprint = self._key_fingerprint(key_dir.name)
+                if fingerprint:
+                    index[fingerprint] = key_dir.name
+            self._fingerprints = index
+            self._fingerprints_loaded_at = time.monotonic()
+            return index
+    
+    def resolve(self, username: str, fingerprint: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        접속 대상 조회
+        
+        사용자 이름에 호스팅 참조가 있으면 호스팅 ID 또는 VM ID로 찾고,
+        없으면 클라이언트 공개키 지문과 일치하는 테넌트 키로 찾습니다.
+        실행 중인 컨테이너 호스팅만 대상이 됩니다 (정적 플랜은 SSH 서버가 없음).
+        """
+        from app.models.hosting import Hosting, HostingStatus  # 순환 import 방지
+        
+        login, hosting_ref = parse_login(username)
+        if login is None:
+            return None
+        
+        db = self.session_factory()
+        try:
+            query = db.query(Hosting)
+            if hosting_ref is not None:
+                if hosting_ref.isdigit():
+                    hosting = query.filter(Hosting.id == int(hosting_ref)).first()
+                else:
+                    hosting = query.filter(Hosting.vm_id == hosting_ref).first()
+            elif fingerprint and fingerprint in self._fingerprint_index():
+                hosting = query.filter(Hosting.vm_id == self._fingerprint_index()[fingerprint]).first()
+            else:
+                hosting = None
+            
+            if hosting is None or hosting.plan == STATIC_PLAN or hosting.status != HostingStatus.RUNNING:
+                return None
+            
+            # 로컬 컨테이너는 내부 네트워크의 컨테이너 IP:22, 원격 노드는 노드 주소의 게시 포트
+            if hosting.node_id is not None and hosting.node is not None:
+                host, port = hosting.node.address, hosting.ssh_port
+            else:
+                host, port = hosting.vm_ip, 22
+            
+            return {
+                "hosting_id": hosting.id,
+                "user_id": hosting.user_id,
+                "vm_id": hosting.vm_id,
+                "login": login,
+                "host": host,
+                "port": port,
+                "key_path": str(self._key_dir(hosting.vm_id) / "id_rsa"),
+                "fingerprint": self._key_fingerprint(hosting.vm_id)
+            }
+        finally:
+            db.close()
+    
+    @staticmethod
+    def authorizes(target: Dict[str, Any], fingerprint: Optional[str]) -> bool:
+        """클라이언트 공개키가 대상 테넌트에 발급된 키인지 확인"""
+        return bool(fingerprint) and target.get("fingerprint") == fingerprint
+
+
+class GatewayStats:
+    """테넌트(호스팅)별 활성 세션 수와 전송 바이트 집계"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tenants: Dict[str, Dict[str, int]] = {}
+    
+    def _tenant(self, hosting_id: str) -> Dict[str, int]:
+        return self._tenants.setdefault(
+            str(hosting_id), {"active_sessions": 0, "total_sessions": 0, "bytes_in": 0, "bytes_out": 0}
+        )
+    
+    def session_opened(self, hosting_id: str) -> None:
+        with self._lock:
+            tenant = self._tenant(hosting_id)
+            tenant["active_sessions"] += 1
+            tenant["total_sessions"] += 1
+    
+    def session_closed(self, hosting_id: str) -> None:
+        with self._lock:
+            tenant = self._tenant(hosting_id)
+            tenant["active_sessions"] = max(0, tenant["active_sessions"] - 1)
+    
+    def add_bytes(self, hosting_id: str, inbound: int = 0, outbound: int = 0) -> None:
+        with self._lock:
+            tenant = self._tenant(hosting_id)
+            tenant["bytes_in"] += inbound
+            tenant["bytes_out"] += outbound
+    
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            tenants = {hosting_id: dict(values) for hosting_id, values in self._tenants.items()}
+        return {
+            "updated_at": datetime.now().isoformat(),
+            "active_sessions": sum(values["active_sessions"] for values in tenants.values()),
+            "tenants": tenants
+        }
+    
+    def write(self, path: Path) -> None:
+        """통계를 JSON 파일로 원자적으로 기록 (API 프로세스가 읽음)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".stats.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.snapshot(), f)
+            os.replace(temp_path, path)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+
+async def pump(reader, writer, count: Callable[[int], None], on_exception: Optional[Callable[[Exception], bool]] = None) -> int:
+    """
+    한 방향 스트림 중계 (EOF까지 복사하고 전송 바이트를 count로 보고)
+    
+    on_exception이 True를 반환한 예외(터미널 크기 변경, 시그널 등)는 처리된 것으로 보고 계속 읽습니다.
+    """
+    total = 0
+    while True:
+        try:
+            data = await reader.read(PUMP_CHUNK_SIZE)
+        except Exception as e:
+            if on_exception is not None and on_exception(e):
+                continue
+            raise
+        if not data:
+            break
+        writer.write(data)
+        await writer.drain()
+        count(len(data))
+        total += len(data)
+    
+    try:
+        writer.write_eof()
+    except (OSError, EOFError) as e:
+        logger.debug(f"EOF 전달 실패 (채널이 이미 닫힘): {e}")
+    return total
+
+
+def _gateway_server_class():
+    """asyncssh를 불러온 뒤 연결마다 생성할 서버 클래스 정의"""
+    import asyncssh
+    
+    class GatewayConnection(asyncssh.SSHServer):
+        """클라이언트 연결 하나의 인증 상태와 대상 테넌트 연결"""
+        
+        def __init__(self, gateway: "SSHGateway"):
+            self.gateway = gateway
+            self.target: Optional[Dict[str, Any]] = None
+            self.upstream = None
+        
+        def connection_made(self, conn):
+            conn.set_extra_info(gateway_connection=self)
+        
+        def connection_lost(self, exc):
+            if self.upstream is not None:
+                self.upstream.close()
+        
+        def begin_auth(self, username):
+            return True
+        
+        def password_auth_supported(self):
+            return False
+        
+        def public_key_auth_supported(self):
+            return True
+        
+        async def validate_public_key(self, username, key):
+            fingerprint = key.get_fingerprint("sha256")
+            target = await asyncio.to_thread(self.gateway.router.resolve, username, fingerprint)
+            if target is None or not self.gateway.router.authorizes(target, fingerprint):
+                logger.info(f"게이트웨이 인증 거부: {username} ({fingerprint})")
+                return False
+            self.target = target
+            return True
+    
+    return GatewayConnection
+
+
+class SSHGateway:
+    """단일 포트 SSH 게이트웨이 (asyncssh 서버 + 테넌트 SSH 서버로의 클라이언트 연결)"""
+    
+    def __init__(
+        self,
+        router: Optional[SSHRouter] = None,
+        stats: Optional[GatewayStats] = None,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        host_key_path: Optional[str] = None
+    ):
+        self.router = router or SSHRouter()
+        self.stats = stats or GatewayStats()
+        self.host = host or settings.SSH_GATEWAY_HOST
+        self.port = port or settings.SSH_GATEWAY_PORT
+        self.host_key_path = Path(host_key_path or settings.SSH_GATEWAY_HOST_KEY or gateway_dir() / "host_key")
+        self.stats_path = gateway_dir() / "stats.json"
+        self._server = None
+    
+    def _ensure_host_key(self, asyncssh) -> str:
+        """호스트 키가 없으면 생성 (재시작해도 클라이언트 known_hosts가 유지되도록 파일로 보관)"""
+        if not self.host_key_path.exists():
+            self.host_key_path.parent.mkdir(parents=True, exist_ok=True)
+            key = asyncssh.generate_private_key("ssh-ed25519")
+            key.write_private_key(str(self.host_key_path))
+            self.host_key_path.chmod(0o600)
+            logger.info(f"게이트웨이 호스트 키 생성: {self.host_key_path}")
+        return str(self.host_key_path)
+    
+    async def start(self) -> None:
+        try:
+            import asyncssh
+        except ImportError:
+            raise RuntimeError("SSH 게이트웨이에는 asyncssh 패키지가 필요합니다. (pip install asyncssh)")
+        
+        server_class = _gateway_server_class()
+        self._server = await asyncssh.create_server(
+            lambda: server_class(self),
+            self.host,
+            self.port,
+            server_host_keys=[self._ensure_host_key(asyncssh)],
+            process_factory=self._handle_process,
+            encoding=None
+        )
+        logger.info(f"SSH 게이트웨이 시작: {self.host}:{self.port}")
+    
+    async def _connect_upstream(self, target: Dict[str, Any]):
+        """테넌트 키로 대상 SSH 서버에 접속 (내부 네트워크이므로 호스트 키는 확인하지 않음)"""
+        import asyncssh
+        
+        return await asyncio.wait_for(
+            asyncssh.connect(
+                target["host"],
+                target["port"],
+                username=target["login"],
+                client_keys=[target["key_path"]],
+                known_hosts=None
+            ),
+            timeout=settings.SSH_GATEWAY_CONNECT_TIMEOUT
+        )
+    
+    async def _handle_process(self, process) -> None:
+        """클라이언트 세션(셸/명령/서브시스템)을 테넌트 SSH 서버의 같은 세션으로 중계"""
+        import asyncssh
+        
+        connection = process.get_extra_info("gateway_connection")
+        target = connection.target
+        hosting_id = str(target["hosting_id"])
+        self.stats.session_opened(hosting_id)
+        
+        try:
+            if connection.upstream is None:
+                connection.upstream = await self._connect_upstream(target)
+            remote = await connection.upstream.create_process(
+                process.command,
+                subsystem=process.subsystem,
+                env=process.env,
+                term_type=process.term_type,
+                term_size=process.term_size,
+                encoding=None
+            )
+            
+            def forward(exc: Exception) -> bool:
+                """터미널 크기 변경, break, 시그널을 테넌트 세션에 전달"""
+                if isinstance(exc, asyncssh.TerminalSizeChanged):
+                    remote.change_terminal_size(exc.width, exc.height, exc.pixwidth, exc.pixheight)
+                elif isinstance(exc, asyncssh.BreakReceived):
+                    remote.send_break(exc.msec)
+                elif isinstance(exc, asyncssh.SignalReceived):
+                    remote.send_signal(exc.signal)
+                else:
+                    return False
+                return True
+            
+            inbound = lambda n: self.stats.add_bytes(hosting_id, inbound=n)
+            outbound = lambda n: self.stats.add_bytes(hosting_id, outbound=n)
+            
+            # 테넌트 쪽 출력이 끝나면 세션 종료 (클라이언트 입력 대기는 취소)
+            stdin_task = asyncio.ensure_future(pump(process.stdin, remote.stdin, inbound, forward))
+            await asyncio.gather(
+                pump(remote.stdout, process.stdout, outbound),
+                pump(remote.stderr, process.stderr, outbound)
+            )
+            stdin_task.cancel()
+            
+            await remote.wait()
+            process.exit(remote.exit_status if remote.exit_status is not None else 255)
+        
+        except (OSError, asyncssh.Error, asyncio.TimeoutError) as e:
+            logger.warning(f"테넌트 SSH 연결 실패 (호스팅 {hosting_id}, {target['host']}:{target['port']}): {e}")
+            process.stderr.write("호스팅에 연결할 수 없습니다.\r\n".encode())
+            process.exit(255)
+        finally:
+            self.stats.session_closed(hosting_id)
+    
+    async def serve_forever(self) -> None:
+        """게이트웨이를 시작하고 통계 파일을 주기적으로 갱신"""
+        await self.start()
+        try:
+            while True:
+                await asyncio.sleep(settings.SSH_GATEWAY_STATS_INTERVAL)
+                try:
+                    self.stats.write(self.stats_path)
+                except OSError as e:
+                    logger.warning(f"게이트웨이 통계 기록 실패: {e}")
+        finally:
+            self.close()
+    
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+
+def main() -> None:
+    from app.utils.logging_utils import setup_logging
+    
+    setup_logging(level=settings.LOG_LEVEL)
+    asyncio.run(SSHGateway().serve_forever())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+정적 호스팅 서비스
+
+static 플랜 호스팅은 컨테이너 없이 프론트 nginx가 호스트 웹 디렉토리를 직접 서빙합니다.
+gzip_static이 사용할 .gz 파일을 미리 만들고, 서버 측 스크립트가 올라오면
+컨테이너 플랜으로 전환해야 하는지 판단합니다.
+"""
+import gzip
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+from app.core.config import settings
+from app.utils.logging_utils import get_logger
+
+logger = get_logger("static_site_service")
+
+# 미리 압축할 텍스트 계열 확장자 (이미지/폰트 등 이미 압축된 형식은 제외)
+COMPRESSIBLE_SUFFIXES = frozenset({
+    ".html", ".htm", ".css", ".js", ".mjs", ".json", ".xml", ".svg", ".txt", ".map", ".wasm", ".ico"
+})
+
+# 이보다 작은 파일은 압축 이득보다 파일 조회 비용이 커서 건너뜀
+MIN_COMPRESS_SIZE = 1024
+
+# 동적 콘텐츠 검사 결과로 보고할 최대 파일 수
+MAX_MARKERS = 10
+
+
+def _is_compressible(path: Path) -> bool:
+    return path.suffix.lower() in COMPRESSIBLE_SUFFIXES
+
+
+def _write_gzip(source: Path, target: Path) -> None:
+    """같은 디렉토리의 임시 파일에 압축 후 교체 (nginx가 쓰는 중인 파일을 읽지 않도록)"""
+    fd, temp_path = tempfile.mkstemp(dir=source.parent, prefix=f".{source.name}.", suffix=".gz.tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw, source.open("rb") as src:
+            with gzip.GzipFile(filename="", mode="wb", fileobj=raw, compresslevel=9, mtime=0) as gz:
+                shutil.copyfileobj(src, gz)
+        stat = source.stat()
+        os.utime(temp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(temp_path, target)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
+
+def precompress(web_dir: Path) -> int:
+    """
+    웹 디렉토리의 압축 가능한 파일마다 .gz 파일 생성 (gzip_static용)
+    
+    .gz의 수정 시간을 원본과 같게 맞춰 두고, 원본이 바뀐 파일만 다시 압축합니다.
+    원본이 삭제된 .gz는 nginx가 계속 서빙하지 않도록 함께 제거합니다.
+    
+    Returns:
+        새로 압축한 파일 수
+    """
+    web_dir = Path(web_dir)
+    if not web_dir.is_dir():
+        return 0
+    
+    compressed = 0
+    for path in web_dir.rglob("*"):
+        if path.is_symlink() or not path.is_file():
+            continue
+        
+        if path.suffix == ".gz":
+            source = path.with_suffix("")
+            if _is_compressible(source) and not source.exists():
+                path.unlink(missing_ok=True)
+            continue
+        
+        if not _is_compressible(path) or path.name.startswith("."):
+            continue
+        
+        target = path.with_name(path.name + ".gz")
+        try:
+            stat = path.stat()
+            if stat.st_size < MIN_COMPRESS_SIZE:
+                target.unlink(missing_ok=True)
+                continue
+            if target.exists() and target.stat().st_mtime_ns == stat.st_mtime_ns:
+                continue
+            _write_gzip(path, target)
+            compressed += 1
+        except OSError as e:
+            logger.warning(f"사전 압축 실패: {path}: {e}")
+    
+    return compressed
+
+
+def dynamic_markers(web_dir: Path, suffixes: Optional[List[str]] = None) -> List[str]:
+    """
+    정적 서빙이 불가능한 서버 측 스크립트 파일 목록 (웹 디렉토리 기준 상대 경로)
+    """
+    web_dir = Path(web_dir)
+    if not web_dir.is_dir():
+        return []
+    
+    suffixes = {suffix.lower() for suffix in (suffixes or settings.STATIC_DYNAMIC_SUFFIXES)}
+    markers = []
+    for path in web_dir.rglob("*"):
+        if path.suffix.lower() in suffixes and path.is_file():
+            markers.append(str(path.relative_to(web_dir)))
+            if len(markers) >= MAX_MARKERS:
+                break
+    return sorted(markers)
+
+
+def static_upstream(vm_id: str) -> str:
+    """리졸버 모드에서 정적 호스팅으로 라우팅할 upstream (nginx 내부 정적 서버 + VM ID 경로)"""
+    return f"{settings.STATIC_SITE_UPSTREAM}/{vm_id}"
@@ -0,0 +1,349 @@
+"""
+테넌트 컨테이너 리소스 사용량 수집 서비스
+
+컨테이너마다 docker stats를 호출하지 않고, 주기마다 한 번 cgroup v2 디렉토리를 훑어
+모든 테넌트 컨테이너의 cpu.stat, memory.current, io.stat과 컨테이너 네트워크 네임스페이스의
+/proc/<pid>/net/dev를 직접 읽습니다. 누적 카운터는 이전 값과의 차이로 초당 사용량을 계산해
+테넌트별 고정 크기 링 버퍼(double 배열 파일)에 기록합니다.
+
+링 버퍼는 파일이므로 여러 API 워커가 같은 데이터를 읽을 수 있고, 수집은 잠금을 가진 워커 하나만 합니다.
+"""
+import fcntl
+import math
+import re
+import subprocess
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.utils.logging_utils import get_logger
+from app.utils.stats_utils import percentile
+
+logger = get_logger("usage_service")
+
+PROC_ROOT = Path("/proc")
+
+# 링 버퍼에 기록하는 사용량 항목 (한 행 = 시각 + 항목 순서대로)
+FIELDS = ("cpu_cores", "memory_bytes", "io_read_bps", "io_write_bps", "net_rx_bps", "net_tx_bps")
+
+# cgroup 디렉토리 이름의 컨테이너 ID (systemd 드라이버: docker-<id>.scope, cgroupfs 드라이버: docker/<id>)
+_CONTAINER_ID = re.compile(r"^(?:docker-)?([0-9a-f]{64})(?:\.scope)?$")
+
+_WINDOW = re.compile(r"^(\d+)([smhd])$")
+_WINDOW_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_window(window: str) -> int:
+    """조회 기간 문자열(예: 90s, 15m, 1h, 1d)을 초로 변환"""
+    match = _WINDOW.match(window)
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"잘못된 조회 기간: {window}")
+    return int(match.group(1)) * _WINDOW_UNITS[match.group(2)]
+
+
+def usage_dir(image_root: Optional[str] = None) -> Path:
+    return Path(image_root or settings.VM_IMAGE_PATH) / "usage"
+
+
+def ring_capacity() -> int:
+    """보관 기간 동안의 샘플 수"""
+    return max(1, settings.USAGE_RETENTION_HOURS * 3600 // settings.USAGE_SAMPLE_INTERVAL)
+
+
+class UsageRing:
+    """
+    테넌트 하나의 고정 크기 사용량 링 버퍼 (double 배열 파일)
+    
+    파일 구조: [다음 쓰기 위치, 기록 수] + 용량 × [시각, FIELDS...]
+    샘플마다 한 행과 머리말만 덮어쓰므로 파일 크기는 처음 만든 뒤 변하지 않습니다.
+    """
+    
+    ROW = 1 + len(FIELDS)
+    HEADER = 2
+    ITEM = array("d").itemsize
+    
+    def __init__(self, path: Path, capacity: Optional[int] = None):
+        self.path = Path(path)
+        self.capacity = capacity
+    
+    def _file_capacity(self) -> int:
+        return (self.path.stat().st_size // self.ITEM - self.HEADER) // self.ROW
+    
+    def append(self, timestamp: float, values: Sequence[float]) -> None:
+        capacity = self.capacity or ring_capacity()
+        if not self.path.exists() or self._file_capacity() != capacity:
+            # 처음 기록하거나 보관 기간 설정이 바뀐 경우 새로 만듦
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "wb") as f:
+                f.write(array("d", bytes(self.ITEM * (self.HEADER + capacity * self.ROW))).tobytes())
+        
+        with open(self.path, "r+b") as f:
+            header = array("d")
+            header.frombytes(f.read(self.ITEM * self.HEADER))
+            head, count = int(header[0]), int(header[1])
+            
+            # 행을 먼저 쓰고 머리말을 갱신해 읽는 쪽이 덜 쓴 행을 보지 않도록 함
+            f.seek(self.ITEM * (self.HEADER + head * self.ROW))
+            f.write(array("d", [timestamp, *values]).tobytes())
+            f.seek(0)
+            f.write(array("d", [(head + 1) % capacity, min(count + 1, capacity)]).tobytes())
+    
+    def read(self, since: float = 0) -> Tuple[array, Dict[str, array]]:
+        """since보다 나중 샘플을 시간 순서대로 (시각 배열, 항목별 배열)"""
+        timestamps = array("d")
+        columns = {field: array("d") for field in FIELDS}
+        try:
+            data = array("d")
+            data.frombytes(self.path.read_bytes())
+        except (OSError, ValueError):
+            return timestamps, columns
+        if len(data) < self.HEADER:
+            return timestamps, columns
+        
+        capacity = (len(data) - self.HEADER) // self.ROW
+        head, count = int(data[0]), int(data[1])
+        for offset in range(count):
+            base = self.HEADER + ((head - count + offset) % capacity) * self.ROW
+            if data[base] <= since:
+                continue
+            timestamps.append(data[base])
+            for index, field in enumerate(FIELDS, start=1):
+                columns[field].append(data[base + index])
+        return timestamps, columns
+
+
+def find_container_cgroups(cgroup_root: Path) -> Dict[str, Path]:
+    """cgroup v2 트리의 Docker 컨테이너 ID → cgroup 디렉토리"""
+    cgroups = {}
+    for parent in (cgroup_root / "system.slice", cgroup_root / "docker"):
+        try:
+            entries = list(parent.iterdir())
+        except OSError:
+            continue
+        for entry in entries:
+            match = _CONTAINER_ID.match(entry.name)
+            if match and entry.is_dir():
+                cgroups[match.group(1)] = entry
+    return cgroups
+
+
+def _read_keyed(path: Path) -> Dict[str, int]:
+    """키-값 줄 형식의 cgroup 파일 (cpu.stat)"""
+    values = {}
+    for line in path.read_text().splitlines():
+        key, _, value = line.partition(" ")
+        if value.strip().isdigit():
+            values[key] = int(value)
+    return values
+
+
+def _read_io(path: Path) -> Tuple[int, int]:
+    """io.stat의 장치별 rbytes/wbytes 합계"""
+    read_bytes = write_bytes = 0
+    try:
+        text = path.read_text()
+    except OSError:
+        return 0, 0
+    for line in text.splitlines():
+        for item in line.split()[1:]:
+            key, _, value = item.partition("=")
+            if key == "rbytes":
+                read_bytes += int(value)
+            elif key == "wbytes":
+                write_bytes += int(value)
+    return read_bytes, write_bytes
+
+
+def _read_net(cgroup_dir: Path, proc_root: Path) -> Tuple[int, int]:
+    """
+    컨테이너 네트워크 네임스페이스의 수신/송신 바이트 (lo 제외)
+    
+    cgroup v2에는 네트워크 통계가 없으므로 cgroup에 속한 첫 프로세스의 /proc/<pid>/net/dev를 읽습니다.
+    """
+    try:
+        pid = (cgroup_dir / "cgroup.procs").read_text().split()[0]
+        lines = (proc_root / pid / "net" / "dev").read_text().splitlines()[2:]
+    except (OSError, IndexError):
+        return 0, 0
+    
+    received = sent = 0
+    for line in lines:
+        interface, _, counters = line.partition(":")
+        if interface.strip() == "lo":
+            continue
+        fields = counters.split()
+        if len(fields) >= 9:
+            received += int(fields[0])
+            sent += int(fields[8])
+    return received, sent
+
+
+def read_cgroup_counters(cgroup_dir: Path, proc_root: Path = PROC_ROOT) -> Optional[Tuple[float, ...]]:
+    """
+    컨테이너 cgroup의 누적 카운터
+    
+    Returns:
+        (CPU 사용 μs, 메모리 바이트, 읽은 바이트, 쓴 바이트, 수신 바이트, 송신 바이트),
+        컨테이너가 사라졌으면 None
+    """
+    try:
+        cpu_usec = _read_keyed(cgroup_dir / "cpu.stat").get("usage_usec", 0)
+        memory_bytes = int((cgroup_dir / "memory.current").read_text())
+    except (OSError, ValueError):
+        return None
+    return (cpu_usec, memory_bytes, *_read_io(cgroup_dir / "io.stat"), *_read_net(cgroup_dir, proc_root))
+
+
+class UsageCollector:
+    """모든 테넌트 컨테이너의 cgroup 사용량을 한 번에 읽어 링 버퍼에 기록"""
+    
+    def __init__(
+        self,
+        cgroup_root: Optional[Path] = None,
+        proc_root: Optional[Path] = None,
+        store_dir: Optional[Path] = None
+    ):
+        self.cgroup_root = Path(cgroup_root or settings.USAGE_CGROUP_ROOT)
+        self.proc_root = Path(proc_root or PROC_ROOT)
+        self.store_dir = Path(store_dir or usage_dir())
+        self.names: Dict[str, str] = {}
+        self.previous: Dict[str, Tuple[float, Tuple[float, ...]]] = {}
+        self._lock_file = None
+    
+    def _is_leader(self) -> bool:
+        """여러 워커 중 잠금을 가진 하나만 수집 (프로세스가 끝날 때까지 잠금 유지)"""
+        if self._lock_file is not None:
+            return True
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        lock_file = open(self.store_dir / ".collector.lock", "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+    
+    def _container_names(self) -> Dict[str, str]:
+        """실행 중인 테넌트 컨테이너 ID → VM ID (docker ps 한 번)"""
+        try:
+            result = subprocess.run(
+                ["docker", "ps", "--no-trunc", "--filter", "name=webhost-", "--format", "{{.ID}} {{.Names}}"],
+                capture_output=True, text=True, timeout=30
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning(f"컨테이너 목록 조회 실패: {e}")
+            return self.names
+        if result.returncode != 0:
+            logger.warning(f"컨테이너 목록 조회 실패: {result.stderr.strip()}")
+            return self.names
+        
+        names = {}
+        for line in result.stdout.splitlines():
+            container_id, _, name = line.partition(" ")
+            if name.startswith("webhost-"):
+                names[container_id] = name[len("webhost-"):]
+        return names
+    
+    def ring(self, vm_id: str) -> UsageRing:
+        return UsageRing(self.store_dir / f"{vm_id}.ring")
+    
+    def collect(self, now: Optional[float] = None) -> int:
+        """
+        사용량 1회 수집
+        
+        Returns:
+            기록한 컨테이너 수 (첫 수집은 비교할 이전 값이 없어 기록하지 않음)
+        """
+        if not self._is_leader():
+            return 0
+        
+        now = now if now is not None else time.time()
+        cgroups = find_container_cgroups(self.cgroup_root)
+        if set(cgroups) - set(self.names):
+            # 새 컨테이너가 보일 때만 이름을 다시 조회 (테넌트가 아닌 컨테이너도 기억해 반복 조회 방지)
+            names = self._container_names()
+            self.names = {container_id: names.get(container_id, "") for container_id in cgroups}
+        
+        written = 0
+        seen = set()
+        for container_id, cgroup_dir in cgroups.items():
+            vm_id = self.names.get(container_id)
+            if not vm_id:
+                continue
+            counters = read_cgroup_counters(cgroup_dir, self.proc_root)
+            if counters is None:
+                continue
+            seen.add(vm_id)
+            
+            previous = self.previous.get(vm_id)
+            self.previous[vm_id] = (now, counters)
+            if previous is None or now <= previous[0]:
+                continue
+            elapsed = now - previous[0]
+            deltas = [current - before for current, before in zip(counters, previous[1])]
+            if any(delta < 0 for index, delta in enumerate(deltas) if index != 1):
+                # 컨테이너가 다시 시작되어 누적 카운터가 초기화됨 (메모리는 누적값이 아님)
+                continue
+            
+            self.ring(vm_id).append(now, (
+                deltas[0] / 1_000_000 / elapsed,
+                counters[1],
+                deltas[2] / elapsed,
+                deltas[3] / elapsed,
+                deltas[4] / elapsed,
+                deltas[5] / elapsed
+            ))
+            written += 1
+        
+        for vm_id in set(self.previous) - seen:
+            del self.previous[vm_id]
+        return written
+
+
+def load_usage(
+    vm_id: str,
+    window_seconds: int,
+    points: int = 60,
+    now: Optional[float] = None,
+    store_dir: Optional[Path] = None
+) -> Dict[str, object]:
+    """
+    테넌트 사용량 조회 (기간을 points개 구간으로 나눠 평균, 전체 기간 평균/p95/최대)
+    """
+    now = now if now is not None else time.time()
+    since = now - window_seconds
+    timestamps, columns = UsageRing(Path(store_dir or usage_dir()) / f"{vm_id}.ring").read(since)
+    
+    width = window_seconds / points
+    sums = {field: array("d", bytes(array("d").itemsize * points)) for field in FIELDS}
+    counts = array("l", bytes(array("l").itemsize * points))
+    for index, timestamp in enumerate(timestamps):
+        bucket = min(points - 1, int((timestamp - since) / width))
+        counts[bucket] += 1
+        for field in FIELDS:
+            sums[field][bucket] += columns[field][index]
+    
+    series = [
+        {"t": round(since + bucket * width, 3), **{field: sums[field][bucket] / counts[bucket] for field in FIELDS}}
+        for bucket in range(points)
+        if counts[bucket]
+    ]
+    summary = {
+        field: {
+            "avg": math.fsum(values) / len(values),
+            "p95": percentile(list(values), 95),
+            "max": max(values)
+        }
+        for field, values in columns.items()
+        if values
+    }
+    return {
+        "vm_id": vm_id,
+        "window_seconds": window_seconds,
+        "samples": len(timestamps),
+        "summary": summary,
+        "series": series
+    }
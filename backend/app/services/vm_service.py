@@ -4,12 +4,15 @@ VM 관리 서비스 - VM 생성, 관리, 운영 로직 (개선된 버전)
 import uuid
 import subprocess
 import logging
-import xml.etree.ElementTree as ET
-import yaml
 import base64
 import time
 import os
 import tempfile
+import shutil
+import json
+import re
+import tarfile
+from datetime import datetime, timezone
 from typing import Optional, Dict, List, Tuple
 from pathlib import Path
 from cryptography.hazmat.primitives import serialization
@@ -18,10 +21,49 @@ from cryptography.hazmat.primitives.asymmetric import rsa
 from app.core.config import settings
 from app.core.exceptions import VMOperationError
 from app.models.hosting import HostingStatus
+from app.services.capability_service import get_capability_detector
+from app.services.image_service import get_golden_image_manager
+from app.services.boot_time_service import BootTimeRecorder
+from app.services.cloud_init_service import CloudInitSeedBuilder
+from app.services.libvirt_service import LibvirtAdapter, get_libvirt_adapter
+from app.services.lease_service import get_lease_index
+from app.services.domain_identity_service import derive_mac_address, derive_domain_uuid
+from app.services.domain_xml_service import build_domain_xml
+from app.services.cpu_placement_service import get_cpu_topology, format_cpulist, parse_cpulist
+from app.core.domain_profiles import get_domain_profile, select_domain_profile
+from app.services.migration_service import parse_domjobinfo, transfer_metrics
+from app.services.deploy_service import ensure_container_web_link
+from app.services.static_site_service import precompress
 
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
+# 스냅샷/마이그레이션 커밋 이미지 저장소 이름
+SNAPSHOT_IMAGE_REPOSITORY = "webhost-snapshot"
+SNAPSHOT_NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]{0,63}$")
+
+# 노드 간 이미지 스트리밍 전송 단위
+TRANSFER_CHUNK_SIZE = 1024 * 1024
+
+# 이미 확인/생성한 테넌트 네트워크 (Docker 호스트, 네트워크 이름)
+_ready_networks = set()
+
+
+def vm_file_paths(image_path: Path, vm_id: str) -> List[Path]:
+    """
+    VM이 이미지 경로에 생성하는 파일/디렉토리 목록 (삭제와 고아 리소스 GC가 같은 목록 사용)
+    """
+    return [
+        image_path / "ssh-keys" / vm_id,
+        image_path / "containers" / vm_id,
+        image_path / "cloud-init" / vm_id,
+        image_path / "snapshots" / vm_id,
+        image_path / f"{vm_id}.qcow2",
+        # UsageCollector의 VM별 사용량 링 파일 (usage_service.usage_dir)
+        image_path / "usage" / f"{vm_id}.ring",
+    ]
+
+
 class VMService:
     """VM 관리 서비스 클래스 (개선된 버전)"""
     
@@ -34,86 +76,47 @@ class VMService:
     
     def _validate_environment(self) -> None:
         """
-        VM 생성에 필요한 환경 검증
+        VM 생성에 필요한 환경 검증 (캐시된 호스트 기능 정보 사용)
         """
-        try:
-            # libvirt 연결 확인
-            result = subprocess.run(
-                ["virsh", "version"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if result.returncode != 0:
-                logger.warning("libvirt가 설치되지 않았거나 실행 중이 아닙니다.")
-                raise VMOperationError("VM 환경이 설정되지 않았습니다. libvirt를 설치하고 실행하세요.")
-            
-            # qemu-img 확인
-            result = subprocess.run(
-                ["qemu-img", "--version"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if result.returncode != 0:
-                logger.warning("qemu-img가 설치되지 않았습니다.")
-                raise VMOperationError("qemu-img가 설치되지 않았습니다.")
-            
-            # genisoimage 확인 (cloud-init ISO 생성용)
-            result = subprocess.run(
-                ["genisoimage", "--version"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if result.returncode != 0:
-                logger.warning("genisoimage가 설치되지 않았습니다. cloud-init 기능이 제한됩니다.")
-            
-            # VM 이미지 디렉토리 생성
-            self.image_path.mkdir(parents=True, exist_ok=True)
-            
-            # 브리지 네트워크 확인
-            self._check_network_bridge()
-            
-            logger.info("VM 환경 검증 완료")
-            
-        except subprocess.TimeoutExpired:
-            logger.error("VM 환경 검증 시간 초과")
-            raise VMOperationError("VM 환경 검증 시간 초과")
-        except FileNotFoundError as e:
-            logger.error(f"필수 도구가 설치되지 않았습니다: {e}")
-            raise VMOperationError("VM 생성에 필요한 도구가 설치되지 않았습니다.")
+        capabilities = get_capability_detector().get()
+        
+        # libvirt 확인
+        if not capabilities.tool_available("virsh"):
+            logger.warning("libvirt가 설치되지 않았거나 실행 중이 아닙니다.")
+            raise VMOperationError("VM 환경이 설정되지 않았습니다. libvirt를 설치하고 실행하세요.")
+        
+        # qemu-img 확인
+        if not capabilities.tool_available("qemu-img"):
+            logger.warning("qemu-img가 설치되지 않았습니다.")
+            raise VMOperationError("qemu-img가 설치되지 않았습니다.")
+        
+        # VM 이미지 디렉토리 생성
+        self.image_path.mkdir(parents=True, exist_ok=True)
+        
+        # 브리지 네트워크 확인
+        self._check_network_bridge()
+        
+        logger.info(f"VM 환경 검증 완료 (기능 정보: {capabilities.source})")
     
     def _check_network_bridge(self) -> None:
         """
-        네트워크 브리지 확인
+        네트워크 브리지 확인 (/sys/class/net 조회, fork 없음)
         """
-        try:
-            result = subprocess.run(
-                ["ip", "link", "show", self.bridge_name],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if result.returncode != 0:
-                logger.warning(f"브리지 네트워크 {self.bridge_name}가 없습니다.")
-                # 기본 브리지로 변경 시도
-                self.bridge_name = "virbr0"
-                result = subprocess.run(
-                    ["ip", "link", "show", self.bridge_name],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                if result.returncode != 0:
-                    logger.error("사용 가능한 브리지 네트워크가 없습니다.")
-                    raise VMOperationError("사용 가능한 브리지 네트워크가 없습니다.")
-                    
-            logger.info(f"브리지 네트워크 확인: {self.bridge_name}")
-            
-        except subprocess.TimeoutExpired:
-            logger.error("네트워크 브리지 확인 시간 초과")
-            raise VMOperationError("네트워크 브리지 확인 시간 초과")
+        if not self._bridge_exists(self.bridge_name):
+            logger.warning(f"브리지 네트워크 {self.bridge_name}가 없습니다.")
+            # 기본 브리지로 변경 시도
+            self.bridge_name = "virbr0"
+            if not self._bridge_exists(self.bridge_name):
+                logger.error("사용 가능한 브리지 네트워크가 없습니다.")
+                raise VMOperationError("사용 가능한 브리지 네트워크가 없습니다.")
+        
+        logger.info(f"브리지 네트워크 확인: {self.bridge_name}")
+    
+    def _bridge_exists(self, bridge_name: str) -> bool:
+        """
+        네트워크 인터페이스 존재 여부
+        """
+        return (Path("/sys/class/net") / bridge_name).exists()
     
     def generate_vm_id(self) -> str:
         """
@@ -140,6 +143,14 @@ class VMService:
             except Exception as e:
                 logger.warning(f"데이터베이스 포트 조회 실패: {e}")
         
+        # SSH 게이트웨이 모드: 로컬 컨테이너는 SSH 포트를 게시하지 않으므로 값은 고유 식별자일 뿐
+        # (범위 상한과 호스트 포트 검사 없이 사용되지 않은 다음 값을 배정)
+        if settings.SSH_GATEWAY_ENABLED:
+            port = start
+            while port in used_ports:
+                port += 1
+            return port
+        
         for port in range(start, end + 1):
             # 데이터베이스에서 사용 중인 포트인지 확인
             if port in used_ports:
@@ -216,7 +227,7 @@ class VMService:
             public_ssh_with_comment = f"{public_ssh} webhoster-{vm_id}"
             
             # 키 파일 저장
-            key_dir = self.image_path / "ssh-keys" / vm_id
+            key_dir = self.get_ssh_key_dir(vm_id)
             key_dir.mkdir(parents=True, exist_ok=True)
             
             private_key_file = key_dir / "id_rsa"
@@ -238,403 +249,55 @@ class VMService:
             logger.error(f"SSH 키 생성 실패: {e}")
             raise VMOperationError(f"SSH 키 생성 실패: {e}")
     
-    def create_cloud_init_config(self, vm_id: str, user_id: str, ssh_public_key: str = None) -> str:
+    def get_ssh_key_dir(self, vm_id: str) -> Path:
         """
-        cloud-init 설정 생성 (웹서버 자동 설치, 개선된 버전)
+        VM SSH 키 저장 디렉토리
+        """
+        return self.image_path / "ssh-keys" / vm_id
+    
+    def remove_ssh_keypair(self, vm_id: str) -> None:
+        """
+        VM SSH 키 쌍 삭제 (없으면 무시)
+        """
+        key_dir = self.get_ssh_key_dir(vm_id)
+        if key_dir.exists():
+            shutil.rmtree(key_dir)
+            logger.info(f"SSH 키 쌍 삭제 완료: {vm_id}")
+    
+    def create_cloud_init_config(
+        self,
+        vm_id: str,
+        user_id: str,
+        ssh_public_key: str = None,
+        profile: Optional[str] = None
+    ) -> str:
+        """
+        cloud-init 설정 생성 (프로필 기반, 골든 이미지에 패키지가 미리 설치되어 있다고 가정)
+        
+        Args:
+            profile: cloud-init 프로필 (minimal, web, docker, 기본값: CLOUD_INIT_PROFILE)
         """
         try:
             # SSH 키가 제공되지 않으면 생성
             if not ssh_public_key:
                 _, ssh_public_key = self.generate_ssh_keypair(vm_id)
             
-            # cloud-init user-data 설정
-            user_data = {
-                'version': 1,
-                'users': [
-                    {
-                        'name': 'ubuntu',
-                        'sudo': 'ALL=(ALL) NOPASSWD:ALL',
-                        'shell': '/bin/bash',
-                        'ssh_authorized_keys': [ssh_public_key]
-                    },
-                    {
-                        'name': 'webhoster',
-                        'sudo': 'ALL=(ALL) NOPASSWD:ALL',
-                        'shell': '/bin/bash',
-                        'ssh_authorized_keys': [ssh_public_key],
-                        'groups': ['www-data', 'docker']
-                    }
-                ],
-                'package_update': True,
-                'package_upgrade': True,
-                'packages': [
-                    'nginx',
-                    'curl',
-                    'wget',
-                    'unzip',
-                    'git',
-                    'htop',
-                    'ufw',
-                    'fail2ban',
-                    'certbot',
-                    'python3-certbot-nginx',
-                    'docker.io',
-                    'docker-compose'
-                ],
-                'runcmd': [
-                    # 시스템 업데이트
-                    'apt-get update',
-                    'apt-get upgrade -y',
-                    
-                    # Docker 서비스 시작
-                    'systemctl enable docker',
-                    'systemctl start docker',
-                    'usermod -aG docker ubuntu',
-                    'usermod -aG docker webhoster',
-                    
-                    # Nginx 시작 및 활성화
-                    'systemctl enable nginx',
-                    'systemctl start nginx',
-                    
-                    # 기본 웹 페이지 생성
-                    'mkdir -p /var/www/html',
-                    'chown -R www-data:www-data /var/www/html',
-                    'chmod -R 755 /var/www/html',
-                    
-                    # 사용자별 환영 페이지 생성 (개선된 버전)
-                    f"""cat > /var/www/html/index.html << 'EOF'
-<!DOCTYPE html>
-<html lang="ko">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>웹 호스팅 서비스 - {user_id}</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            min-height: 100vh;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-        }}
-        .container {{
-            max-width: 900px;
-            margin: 20px;
-            background: rgba(255, 255, 255, 0.1);
-            padding: 40px;
-            border-radius: 20px;
-            backdrop-filter: blur(10px);
-            box-shadow: 0 8px 32px rgba(0, 0, 0, 0.3);
-        }}
-        h1 {{
-            text-align: center;
-            margin-bottom: 30px;
-            font-size: 2.5em;
-            text-shadow: 0 2px 4px rgba(0,0,0,0.3);
-        }}
-        .status {{
-            text-align: center;
-            font-size: 1.2em;
-            margin-bottom: 40px;
-            padding: 15px;
-            background: rgba(46, 204, 113, 0.3);
-            border-radius: 10px;
-            border-left: 4px solid #2ecc71;
-        }}
-        .info-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-            gap: 20px;
-            margin-bottom: 30px;
-        }}
-        .info-box {{
-            background: rgba(255, 255, 255, 0.2);
-            padding: 20px;
-            border-radius: 10px;
-        }}
-        .info-box h3 {{
-            margin-bottom: 15px;
-            font-size: 1.2em;
-        }}
-        .info-box p {{
-            margin-bottom: 10px;
-            line-height: 1.5;
-        }}
-        .upload-info {{
-            border-left: 4px solid #2ecc71;
-        }}
-        .ssh-info {{
-            border-left: 4px solid #3498db;
-        }}
-        .docker-info {{
-            border-left: 4px solid #f39c12;
-        }}
-        .security-info {{
-            border-left: 4px solid #e74c3c;
-        }}
-        code {{
-            background: rgba(0, 0, 0, 0.3);
-            padding: 4px 8px;
-            border-radius: 4px;
-            font-family: 'Courier New', monospace;
-            font-size: 0.9em;
-        }}
-        .footer {{
-            text-align: center;
-            margin-top: 40px;
-            font-size: 0.9em;
-            opacity: 0.8;
-        }}
-        .feature-list {{
-            list-style: none;
-            padding-left: 0;
-        }}
-        .feature-list li {{
-            margin-bottom: 8px;
-            padding-left: 20px;
-            position: relative;
-        }}
-        .feature-list li:before {{
-            content: "✓";
-            position: absolute;
-            left: 0;
-            color: #2ecc71;
-            font-weight: bold;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>🚀 웹 호스팅 서비스</h1>
-        
-        <div class="status">
-            <strong>{user_id}</strong>님의 웹 호스팅이 성공적으로 생성되었습니다!<br>
-            VM ID: <code>{vm_id}</code> | 생성 시간: <span id="currentTime"></span>
-        </div>
-        
-        <div class="info-grid">
-            <div class="info-box upload-info">
-                <h3>📁 파일 업로드</h3>
-                <p>웹 파일을 업로드할 경로:</p>
-                <p><code>/var/www/html/</code></p>
-                <ul class="feature-list">
-                    <li>SFTP/SCP로 파일 업로드</li>
-                    <li>Git을 통한 코드 배포</li>
-                    <li>Docker 컨테이너 배포</li>
-                </ul>
-            </div>
-            
-            <div class="info-box ssh-info">
-                <h3>🔐 SSH 접속</h3>
-                <p>서버 관리를 위한 SSH 접속:</p>
-                <p><code>ssh ubuntu@your-domain -p YOUR_SSH_PORT</code></p>
-                <p><code>ssh webhoster@your-domain -p YOUR_SSH_PORT</code></p>
-                <ul class="feature-list">
-                    <li>두 개의 사용자 계정 제공</li>
-                    <li>SSH 키 기반 인증</li>
-                    <li>sudo 권한 포함</li>
-                </ul>
-            </div>
-            
-            <div class="info-box docker-info">
-                <h3>🐳 Docker 지원</h3>
-                <p>Docker와 Docker Compose가 설치되어 있습니다:</p>
-                <p><code>docker --version</code></p>
-                <p><code>docker-compose --version</code></p>
-                <ul class="feature-list">
-                    <li>최신 Docker 엔진</li>
-                    <li>Docker Compose v2</li>
-                    <li>사용자가 docker 그룹에 포함</li>
-                </ul>
-            </div>
-            
-            <div class="info-box security-info">
-                <h3>🛡️ 보안 설정</h3>
-                <p>기본 보안 설정이 적용되었습니다:</p>
-                <ul class="feature-list">
-                    <li>UFW 방화벽 활성화</li>
-                    <li>Fail2ban 침입 차단</li>
-                    <li>SSL/TLS 인증서 지원 (Certbot)</li>
-                    <li>SSH 패스워드 인증 비활성화</li>
-                </ul>
-            </div>
-        </div>
-        
-        <div class="info-box">
-            <h3>🚀 시작하기</h3>
-            <ol style="padding-left: 20px;">
-                <li>SSH로 서버에 접속하세요</li>
-                <li>웹 파일을 <code>/var/www/html/</code>에 업로드하세요</li>
-                <li>Docker 컨테이너를 실행하거나 직접 웹서버를 설정하세요</li>
-                <li>SSL 인증서가 필요하면 <code>certbot --nginx</code>를 실행하세요</li>
-            </ol>
-        </div>
-        
-        <div class="footer">
-            <p>웹 호스팅 서비스 © 2024</p>
-            <p>기술 지원: Nginx + Docker + Ubuntu 22.04</p>
-        </div>
-    </div>
-    
-    <script>
-        document.getElementById('currentTime').textContent = new Date().toLocaleString('ko-KR');
-    </script>
-</body>
-</html>
-EOF""",
-                    
-                    # Nginx 설정 개선
-                    'sed -i "s/# server_names_hash_bucket_size 64;/server_names_hash_bucket_size 64;/" /etc/nginx/nginx.conf',
-                    
-                    # 보안 설정
-                    'sed -i "s/#PasswordAuthentication yes/PasswordAuthentication no/" /etc/ssh/sshd_config',
-                    'sed -i "s/#PubkeyAuthentication yes/PubkeyAuthentication yes/" /etc/ssh/sshd_config',
-                    'systemctl reload sshd',
-                    
-                    # 방화벽 설정
-                    'ufw --force enable',
-                    'ufw allow ssh',
-                    'ufw allow 80/tcp',
-                    'ufw allow 443/tcp',
-                    
-                    # fail2ban 설정
-                    'systemctl enable fail2ban',
-                    'systemctl start fail2ban',
-                    
-                    # 사용자 디렉토리 권한 설정
-                    'chown -R ubuntu:ubuntu /home/ubuntu',
-                    'chown -R webhoster:webhoster /home/webhoster 2>/dev/null || true',
-                    'usermod -aG www-data ubuntu',
-                    'usermod -aG www-data webhoster',
-                    
-                    # 완료 로그
-                    f'echo "VM {vm_id} 설정 완료: $(date)" >> /var/log/webhoster-setup.log',
-                    'echo "웹 호스팅 서비스 설치 완료" > /tmp/webhoster-ready'
-                ],
-                'write_files': [
-                    {
-                        'path': '/etc/nginx/sites-available/default',
-                        'content': '''server {
-    listen 80 default_server;
-    listen [::]:80 default_server;
-    
-    root /var/www/html;
-    index index.html index.htm index.nginx-debian.html;
-    
-    server_name _;
-    
-    # 보안 헤더
-    add_header X-Frame-Options "SAMEORIGIN" always;
-    add_header X-Content-Type-Options "nosniff" always;
-    add_header X-XSS-Protection "1; mode=block" always;
-    add_header Referrer-Policy "no-referrer-when-downgrade" always;
-    
-    location / {
-        try_files $uri $uri/ =404;
-    }
-    
-    # PHP 지원 (추후 설치 시)
-    location ~ \\.php$ {
-        include snippets/fastcgi-php.conf;
-        # fastcgi_pass unix:/var/run/php/php8.1-fpm.sock;
-    }
-    
-    # 보안 설정
-    location ~ /\\. {
-        deny all;
-        access_log off;
-        log_not_found off;
-    }
-    
-    # 정적 파일 캐싱
-    location ~* \\.(jpg|jpeg|png|gif|ico|css|js|woff|woff2|ttf|svg)$ {
-        expires 1y;
-        add_header Cache-Control "public, immutable";
-    }
-}''',
-                        'permissions': '0644'
-                    },
-                    {
-                        'path': '/etc/fail2ban/jail.local',
-                        'content': '''[DEFAULT]
-bantime = 3600
-findtime = 600
-maxretry = 3
-
-[sshd]
-enabled = true
-port = ssh
-filter = sshd
-logpath = /var/log/auth.log
-maxretry = 3
-
-[nginx-http-auth]
-enabled = true
-filter = nginx-http-auth
-logpath = /var/log/nginx/error.log
-maxretry = 6
-''',
-                        'permissions': '0644'
-                    }
-                ],
-                'final_message': f'VM {vm_id} 웹서버 설정이 완료되었습니다! 보안 설정과 Docker가 포함되어 있습니다.'
-            }
+            profile_name = profile or settings.CLOUD_INIT_PROFILE
             
-            # YAML로 변환
-            user_data_yaml = yaml.dump(user_data, default_flow_style=False, allow_unicode=True)
-            
-            # cloud-init 파일 생성
-            cloud_init_dir = self.image_path / "cloud-init" / vm_id
-            cloud_init_dir.mkdir(parents=True, exist_ok=True)
-            
-            # user-data 파일 저장
-            user_data_file = cloud_init_dir / "user-data"
-            with open(user_data_file, 'w', encoding='utf-8') as f:
-                f.write(f"#cloud-config\n{user_data_yaml}")
-            
-            # meta-data 파일 생성
-            meta_data = {
-                'instance-id': vm_id,
-                'local-hostname': vm_id,
-                'public-keys': {
-                    'webhoster': ssh_public_key
-                }
-            }
+            # 부팅 완료 시 API로 알려 프로필별 부팅 시간 측정
+            boot_times = BootTimeRecorder(str(self.image_path))
             
-            meta_data_file = cloud_init_dir / "meta-data"
-            with open(meta_data_file, 'w', encoding='utf-8') as f:
-                f.write(yaml.dump(meta_data, default_flow_style=False, allow_unicode=True))
+            # 정적 부분은 캐시된 템플릿을 사용하고 ISO는 프로세스 내에서 생성
+            iso_path = CloudInitSeedBuilder(str(self.image_path)).build(
+                vm_id, user_id, ssh_public_key,
+                profile=profile_name,
+                phone_home_url=boot_times.phone_home_url(vm_id)
+            )
             
-            # cloud-init ISO 이미지 생성
-            iso_path = cloud_init_dir / "cloud-init.iso"
-            try:
-                subprocess.run([
-                    "genisoimage", "-output", str(iso_path),
-                    "-volid", "cidata", "-joliet", "-rock",
-                    str(user_data_file), str(meta_data_file)
-                ], check=True, timeout=60)
-                
-                logger.info(f"cloud-init 설정 생성 완료: {iso_path}")
-                return str(iso_path)
-                
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                logger.warning("genisoimage를 사용할 수 없어 대체 방법을 사용합니다.")
-                # 대체 방법: tar 아카이브 생성
-                import tarfile
-                tar_path = cloud_init_dir / "cloud-init.tar"
-                with tarfile.open(tar_path, "w") as tar:
-                    tar.add(user_data_file, arcname="user-data")
-                    tar.add(meta_data_file, arcname="meta-data")
-                
-                logger.info(f"cloud-init 설정 생성 완료 (tar): {tar_path}")
-                return str(tar_path)
+            boot_times.mark_started(vm_id, profile_name)
+            
+            logger.info(f"cloud-init 설정 생성 완료: {iso_path}")
+            return str(iso_path)
             
         except Exception as e:
             logger.error(f"cloud-init 설정 생성 실패: {e}")
@@ -648,6 +311,12 @@ maxretry = 6
             # 디스크 이미지 경로
             disk_path = self.image_path / f"{vm_id}.qcow2"
             
+            # 사전 구성된 골든 이미지가 있으면 오버레이만 생성 (첫 부팅 시 패키지 설치 생략)
+            overlay = get_golden_image_manager().create_overlay(vm_id, str(disk_path.resolve()), size_gb=size_gb)
+            if overlay:
+                logger.info(f"VM 디스크 생성 완료 (골든 이미지 오버레이): {overlay}")
+                return overlay
+            
             # 템플릿 이미지에서 복사 (있는 경우)
             template_path = self.image_path / self.template_image
             
@@ -676,114 +345,66 @@ maxretry = 6
             logger.error(f"예상치 못한 디스크 생성 오류: {e}")
             raise VMOperationError(f"VM 디스크 생성 중 오류가 발생했습니다: {e}")
     
-    def create_vm_xml(self, vm_id: str, disk_path: str, ssh_port: int, cloud_init_iso: str = None, memory_mb: int = 1024, vcpus: int = 1) -> str:
-        """
-        VM XML 정의 생성 (cloud-init 지원 추가)
-        """
-        # 기본 네트워크 인터페이스 MAC 주소 생성
-        mac_address = self._generate_mac_address()
-        
-        # cloud-init ISO 디스크 추가
-        cloud_init_disk = ""
-        if cloud_init_iso and Path(cloud_init_iso).exists():
-            cloud_init_disk = f"""
-    <disk type='file' device='cdrom'>
-      <driver name='qemu' type='raw'/>
-      <source file='{cloud_init_iso}'/>
-      <target dev='hda' bus='ide'/>
-      <readonly/>
-      <address type='drive' controller='0' bus='0' target='0' unit='0'/>
-    </disk>"""
-        
-        xml_template = f"""
-<domain type='kvm'>
-  <name>{vm_id}</name>
-  <uuid>{uuid.uuid4()}</uuid>
-  <memory unit='MiB'>{memory_mb}</memory>
-  <currentMemory unit='MiB'>{memory_mb}</currentMemory>
-  <vcpu placement='static'>{vcpus}</vcpu>
-  <os>
-    <type arch='x86_64' machine='pc-i440fx-2.9'>hvm</type>
-    <boot dev='hd'/>
-    <boot dev='cdrom'/>
-  </os>
-  <features>
-    <acpi/>
-    <apic/>
-  </features>
-  <cpu mode='host-model' check='partial'/>
-  <clock offset='utc'>
-    <timer name='rtc' tickpolicy='catchup'/>
-    <timer name='pit' tickpolicy='delay'/>
-    <timer name='hpet' present='no'/>
-  </clock>
-  <on_poweroff>destroy</on_poweroff>
-  <on_reboot>restart</on_reboot>
-  <on_crash>restart</on_crash>
-  <devices>
-    <emulator>/usr/bin/qemu-system-x86_64</emulator>
-    <disk type='file' device='disk'>
-      <driver name='qemu' type='qcow2'/>
-      <source file='{disk_path}'/>
-      <target dev='vda' bus='virtio'/>
-      <address type='pci' domain='0x0000' bus='0x00' slot='0x07' function='0x0'/>
-    </disk>{cloud_init_disk}
-    <interface type='bridge'>
-      <mac address='{mac_address}'/>
-      <source bridge='{self.bridge_name}'/>
-      <model type='virtio'/>
-      <address type='pci' domain='0x0000' bus='0x00' slot='0x03' function='0x0'/>
-    </interface>
-    <serial type='pty'>
-      <target type='isa-serial' port='0'>
-        <model name='isa-serial'/>
-      </target>
-    </serial>
-    <console type='pty'>
-      <target type='serial' port='0'/>
-    </console>
-    <graphics type='vnc' port='-1' autoport='yes'/>
-    <video>
-      <model type='cirrus' vram='16384' heads='1' primary='yes'/>
-      <address type='pci' domain='0x0000' bus='0x00' slot='0x02' function='0x0'/>
-    </video>
-  </devices>
-</domain>
-        """.strip()
-        
-        return xml_template
-    
-    def _generate_mac_address(self) -> str:
+    def create_vm_xml(
+        self,
+        vm_id: str,
+        disk_path: str,
+        ssh_port: int,
+        cloud_init_iso: str = None,
+        memory_mb: int = 1024,
+        vcpus: int = 1,
+        mac_address: Optional[str] = None,
+        domain_uuid: Optional[str] = None,
+        profile: Optional[str] = None,
+        cpuset: Optional[List[int]] = None,
+        numa_node: Optional[int] = None
+    ) -> str:
         """
-        MAC 주소 생성 (libvirt 표준 형식)
+        VM XML 정의 생성 (프로필별로 캐시된 템플릿 사용)
+        
+        Args:
+            mac_address: 호스팅에 저장된 MAC 주소 (DHCP 리스 조회에 사용, 없으면 vm_id에서 유도)
+            domain_uuid: 호스팅에 저장된 도메인 UUID (없으면 vm_id에서 유도)
+            profile: 도메인 성능 프로필 (없으면 기본 프로필 또는 A/B 실험 분배)
+            cpuset: 배치 엔진이 vCPU별로 배정한 호스트 CPU (호스팅의 cpuset)
+            numa_node: 배치 엔진이 배정한 NUMA 노드
         """
-        # libvirt 기본 범위: 52:54:00:xx:xx:xx
-        import random
-        return f"52:54:00:{random.randint(0,255):02x}:{random.randint(0,255):02x}:{random.randint(0,255):02x}"
+        # 기본 네트워크 인터페이스 MAC 주소 및 도메인 UUID
+        mac_address = mac_address or derive_mac_address(vm_id)
+        domain_uuid = domain_uuid or derive_domain_uuid(vm_id)
+        
+        # cloud-init ISO는 파일이 있을 때만 cdrom으로 연결
+        if cloud_init_iso and not Path(cloud_init_iso).exists():
+            cloud_init_iso = None
+        
+        # vCPU를 고정하지 않는 프로필은 배정된 NUMA 노드의 CPU 전체에서 스케줄링
+        profile = profile or select_domain_profile(vm_id)
+        if cpuset and numa_node is not None and not get_domain_profile(profile)["cpu_pinning"]:
+            cpuset = get_cpu_topology().usable_cpus(numa_node) or cpuset
+        
+        return build_domain_xml(
+            vm_id, disk_path, mac_address, domain_uuid, self.bridge_name,
+            memory_mb=memory_mb,
+            vcpus=vcpus,
+            cloud_init_iso=cloud_init_iso,
+            profile=profile,
+            cpuset=cpuset,
+            numa_node=numa_node
+        )
     
-    def create_vm(self, vm_id: str, ssh_port: int, user_id: str = None) -> Dict[str, str]:
+    def _write_default_index(self, web_dir: Path, user_id: str, vm_id: str, info: Dict) -> bool:
         """
-        Docker 컨테이너 기반 웹 호스팅 생성 (실제 구현 - 개선된 버전)
+        기본 index.html 생성 (이미 있으면 사용자 콘텐츠를 덮어쓰지 않음)
+        
+        Returns:
+            새로 생성했는지 여부
         """
-        try:
-            logger.info(f"Docker 컨테이너 생성 시작: {vm_id}")
-            
-            # Docker 컨테이너 이름
-            container_name = f"webhost-{vm_id}"
-            
-            # 웹 포트 할당 (8000번대 사용)
-            web_port = 8000 + (hash(vm_id) % 1000)
-            
-            # 컨테이너용 웹 디렉토리 생성 (절대 경로 사용)
-            host_web_dir = self.image_path / "containers" / vm_id / "www"
-            host_web_dir.mkdir(parents=True, exist_ok=True)
-            
-            # 절대 경로로 변환
-            host_web_dir_abs = host_web_dir.resolve()
-            logger.info(f"웹 디렉토리 절대 경로: {host_web_dir_abs}")
+        index_file = web_dir / "index.html"
+        if index_file.exists():
+            return False
             
-            # 기본 index.html 생성
-            index_html = f"""<!DOCTYPE html>
+        details = "\n".join(f'        <div class="info">{label}: {value}</div>' for label, value in info.items())
+        index_html = f"""<!DOCTYPE html>
 <html lang="ko">
 <head>
     <meta charset="UTF-8">
@@ -819,27 +440,94 @@ maxretry = 6
         <p class="success">호스팅이 성공적으로 생성되었습니다!</p>
         <div class="info">사용자 ID: {user_id}</div>
         <div class="info">VM ID: {vm_id}</div>
-        <div class="info">SSH 포트: {ssh_port}</div>
-        <div class="info">웹 포트: {web_port}</div>
+{details}
         <p>이 디렉토리에 웹 파일을 업로드하여 사이트를 만들어보세요!</p>
     </div>
 </body>
 </html>"""
             
-            with open(host_web_dir / "index.html", "w", encoding="utf-8") as f:
-                f.write(index_html)
+        with open(index_file, "w", encoding="utf-8") as f:
+            f.write(index_html)
+        return True
+    
+    def create_static_site(self, vm_id: str, user_id: str = None) -> Dict:
+        """
+        정적 호스팅 생성 (static 플랜: 컨테이너 없이 프론트 nginx가 웹 디렉토리를 직접 서빙)
+        
+        웹 디렉토리와 기본 페이지를 만들고 압축 가능한 파일의 .gz를 미리 생성합니다.
+        디렉토리 구조가 컨테이너 호스팅과 같으므로 이후 컨테이너 플랜으로 그대로 전환할 수 있습니다.
+        """
+        host_web_dir = self.image_path / "containers" / vm_id / "www"
+        host_web_dir.mkdir(parents=True, exist_ok=True)
+        
+        self._write_default_index(host_web_dir, user_id, vm_id, {"플랜": "정적 호스팅"})
+        compressed = precompress(host_web_dir)
+        
+        # www는 배포 후 릴리스 링크가 되므로 링크 자체의 경로를 nginx 루트로 사용
+        web_dir = host_web_dir.parent.resolve() / host_web_dir.name
+        logger.info(f"정적 호스팅 생성 완료: {vm_id}, 웹 디렉토리: {web_dir}, 사전 압축 {compressed}개")
+        return {
+            "vm_id": vm_id,
+            "vm_ip": None,
+            "web_port": None,
+            "web_dir": str(web_dir),
+            "static": True,
+            "status": HostingStatus.RUNNING.value
+        }
+    
+    def create_vm(
+        self,
+        vm_id: str,
+        ssh_port: int,
+        user_id: str = None,
+        resources: Optional[Dict] = None,
+        docker_host: Optional[str] = None,
+        node_address: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        Docker 컨테이너 기반 웹 호스팅 생성 (실제 구현 - 개선된 버전)
+        
+        Args:
+            resources: 컨테이너 리소스 제한 (memory_mb, cpus, cpu_shares, pids_limit, blkio_weight)
+            docker_host: 원격 노드 Docker API 주소 (없으면 로컬 데몬)
+            node_address: 원격 노드 주소 (프록시가 노드의 게시 포트로 라우팅)
+        """
+        try:
+            logger.info(f"Docker 컨테이너 생성 시작: {vm_id}")
+            
+            # Docker 컨테이너 이름
+            container_name = f"webhost-{vm_id}"
+            
+            # 웹 포트 할당 (8000번대 사용, 전용 네트워크 방식은 컨테이너 IP의 80번으로 직접 라우팅)
+            tenant_network = self._uses_tenant_network(docker_host)
+            web_port = 80 if tenant_network else self._published_web_port(vm_id)
+            if tenant_network:
+                self.ensure_tenant_network(docker_host)
+            
+            # 컨테이너용 웹 디렉토리 생성 (절대 경로 사용)
+            host_web_dir = self.image_path / "containers" / vm_id / "www"
+            host_web_dir.mkdir(parents=True, exist_ok=True)
+            
+            # 절대 경로로 변환
+            host_web_dir_abs = host_web_dir.resolve()
+            logger.info(f"웹 디렉토리 절대 경로: {host_web_dir_abs}")
+            
+            # 기본 index.html 생성 (정적 플랜에서 전환된 경우 기존 콘텐츠 유지)
+            self._write_default_index(host_web_dir, user_id, vm_id, {"SSH 포트": ssh_port, "웹 포트": web_port})
+            ensure_container_web_link(host_web_dir.parent)
             
             # Docker 컨테이너 실행 (Ubuntu + Nginx + SSH) - 절대 경로 사용
-            docker_cmd = [
-                "docker", "run", "-d",
+            docker_cmd = self._docker_cmd(
+                docker_host, "run", "-d",
                 "--name", container_name,
-                "-p", f"{web_port}:80",  # 웹 포트 포워딩
-                "-p", f"{ssh_port}:22",  # SSH 포트 포워딩
-                "-v", f"{host_web_dir_abs}:/var/www/html",  # 절대 경로로 웹 디렉토리 마운트
+                *self._network_flags(vm_id, docker_host, web_port),  # 웹 포트 포워딩 또는 전용 네트워크 연결
+                *self._ssh_port_flags(ssh_port, docker_host),  # SSH 포트 포워딩 (게이트웨이 모드는 생략)
+                "-v", self._site_bind(vm_id),  # 사이트 디렉토리 마운트 (배포 시 www 링크 교체가 바로 반영)
                 "-e", f"USER_ID={user_id}",
                 "-e", f"VM_ID={vm_id}",
+                *self._resource_flags(resources),  # 테넌트별 cgroup 제한
                 "nginx:alpine"  # 경량 Nginx 이미지 사용
-            ]
+            )
             
             logger.info(f"Docker 명령어: {' '.join(docker_cmd)}")
             
@@ -855,7 +543,7 @@ maxretry = 6
             logger.info(f"컨테이너 시작 대기 중: {container_name}")
             for i in range(30):
                 time.sleep(1)
-                status_cmd = ["docker", "inspect", "-f", "{{.State.Running}}", container_name]
+                status_cmd = self._docker_cmd(docker_host, "inspect", "-f", "{{.State.Running}}", container_name)
                 status_result = subprocess.run(status_cmd, capture_output=True, text=True, timeout=10)
                 if status_result.returncode == 0 and status_result.stdout.strip() == "true":
                     logger.info(f"컨테이너 시작 완료: {container_name}")
@@ -864,15 +552,15 @@ maxretry = 6
                 logger.warning(f"컨테이너 시작 확인 시간 초과: {container_name}")
             
             # nginx 설정을 올바른 웹 디렉토리로 수정 (nginx:alpine 컨테이너 대응)
-            nginx_config_cmd = [
-                "docker", "exec", container_name,
+            nginx_config_cmd = self._docker_cmd(
+                docker_host, "exec", container_name,
                 "sed", "-i", "s|/usr/share/nginx/html|/var/www/html|g", "/etc/nginx/conf.d/default.conf"
-            ]
+            )
             
             config_result = subprocess.run(nginx_config_cmd, capture_output=True, text=True, timeout=30)
             if config_result.returncode == 0:
                 # nginx 다시 로드
-                reload_cmd = ["docker", "exec", container_name, "nginx", "-s", "reload"]
+                reload_cmd = self._docker_cmd(docker_host, "exec", container_name, "nginx", "-s", "reload")
                 reload_result = subprocess.run(reload_cmd, capture_output=True, text=True, timeout=30)
                 if reload_result.returncode == 0:
                     logger.info(f"컨테이너 {container_name}의 nginx 설정 자동 구성 완료")
@@ -882,7 +570,14 @@ maxretry = 6
                 logger.warning(f"컨테이너 {container_name}의 nginx 설정 변경 실패: {config_result.stderr}")
             
             # 실제 컨테이너 정보 조회 (개선된 버전)
-            vm_ip, actual_web_port = self._get_container_network_info(container_name, web_port)
+            if node_address:
+                # 원격 노드의 컨테이너 IP는 프록시에서 접근할 수 없으므로 노드의 게시 포트 사용
+                vm_ip, actual_web_port = node_address, web_port
+            else:
+                vm_ip, actual_web_port = self._get_container_network_info(
+                    container_name, web_port,
+                    network=settings.CONTAINER_NETWORK_NAME if tenant_network else None
+                )
             
             # 연결 테스트 수행
             if self._test_container_connection(vm_ip, actual_web_port):
@@ -910,16 +605,28 @@ maxretry = 6
             logger.error(f"예상치 못한 컨테이너 생성 오류: {e}")
             raise VMOperationError(f"웹 호스팅 생성 중 오류가 발생했습니다: {e}")
     
-    def _get_container_network_info(self, container_name: str, expected_web_port: int) -> tuple[str, int]:
+    def _get_container_network_info(
+        self,
+        container_name: str,
+        expected_web_port: int,
+        network: Optional[str] = None
+    ) -> tuple[str, int]:
         """
         컨테이너의 실제 네트워크 정보 조회 (개선된 버전)
         
+        Args:
+            network: 전용 네트워크 이름 (해당 네트워크의 IP만 조회하고 포트 매핑은 조회하지 않음)
+        
         Returns:
             tuple: (vm_ip, actual_web_port)
         """
         try:
             # 컨테이너 IP 조회
-            ip_cmd = ["docker", "inspect", "-f", "{{range.NetworkSettings.Networks}}{{.IPAddress}}{{end}}", container_name]
+            ip_format = (
+                f'{{{{(index .NetworkSettings.Networks "{network}").IPAddress}}}}' if network
+                else "{{range.NetworkSettings.Networks}}{{.IPAddress}}{{end}}"
+            )
+            ip_cmd = self._docker_cmd(None, "inspect", "-f", ip_format, container_name)
             ip_result = subprocess.run(ip_cmd, capture_output=True, text=True, timeout=30)
             
             if ip_result.returncode == 0 and ip_result.stdout.strip():
@@ -929,8 +636,12 @@ maxretry = 6
                 vm_ip = "127.0.0.1"  # 로컬호스트로 폴백
                 logger.warning(f"컨테이너 IP 조회 실패, 기본값 사용: {vm_ip}")
             
+            if network:
+                # 게시된 포트가 없으므로 컨테이너 IP의 80번으로 직접 접근
+                return vm_ip, 80
+            
             # 포트 매핑 정보 조회
-            port_cmd = ["docker", "port", container_name, "80"]
+            port_cmd = self._docker_cmd(None, "port", container_name, "80")
             port_result = subprocess.run(port_cmd, capture_output=True, text=True, timeout=30)
             
             actual_web_port = expected_web_port  # 기본값
@@ -987,11 +698,29 @@ maxretry = 6
             logger.error(f"컨테이너 연결 테스트 오류: {e}")
             return False
     
-    def get_vm_ip(self, vm_id: str, timeout: int = 60) -> str:
+    def get_vm_ip(self, vm_id: str, timeout: int = 60, mac_address: Optional[str] = None) -> Optional[str]:
         """
-        VM IP 주소 조회
+        VM IP 주소 조회 (DHCP 리스 인덱스 → libvirt 이벤트 인덱스 → virsh 순)
+        
+        Args:
+            mac_address: 호스팅에 저장된 MAC 주소
+        
+        Returns:
+            IP 주소 (찾지 못하면 None)
         """
         try:
+            if mac_address:
+                ip = get_lease_index().lookup(mac_address)
+                if ip:
+                    return ip
+            
+            adapter = self._domain_adapter()
+            if adapter:
+                ip = adapter.wait_for_ip(vm_id, timeout)
+                if ip:
+                    return ip
+                return self._get_ip_from_dhcp_lease(vm_id, mac_address)
+            
             # virsh domifaddr로 IP 조회
             result = subprocess.run([
                 "virsh", "domifaddr", vm_id
@@ -1008,36 +737,22 @@ maxretry = 6
                                 return part.split('/')[0]
             
             # 대체 방법: DHCP 리스 파일에서 찾기
-            return self._get_ip_from_dhcp_lease(vm_id)
+            return self._get_ip_from_dhcp_lease(vm_id, mac_address)
             
         except Exception as e:
             logger.warning(f"VM IP 조회 실패: {e}")
-            # 기본 IP 반환 (개발용)
-            return "192.168.122.100"
+            return None
     
-    def _get_ip_from_dhcp_lease(self, vm_id: str) -> str:
+    def _get_ip_from_dhcp_lease(self, vm_id: str, mac_address: Optional[str] = None) -> Optional[str]:
         """
-        DHCP 리스 파일에서 IP 조회
+        DHCP 리스 인덱스에서 IP 조회 (MAC 주소 우선, 없으면 DHCP 호스트 이름 = vm_id)
         """
-        lease_files = [
-            "/var/lib/dhcp/dhcpd.leases",
-            "/var/lib/libvirt/dnsmasq/virbr0.leases"
-        ]
-        
-        for lease_file in lease_files:
-            try:
-                if Path(lease_file).exists():
-                    with open(lease_file, 'r') as f:
-                        content = f.read()
-                        # 간단한 파싱으로 IP 찾기
-                        if vm_id in content:
-                            # 더 정교한 파싱 필요
-                            pass
-            except Exception:
-                continue
-        
-        # 찾지 못한 경우 기본값 반환
-        return "192.168.122.100"
+        index = get_lease_index()
+        if mac_address:
+            ip = index.lookup(mac_address)
+            if ip:
+                return ip
+        return index.lookup_hostname(vm_id)
     
     def stop_vm(self, vm_id: str) -> bool:
         """
@@ -1048,14 +763,18 @@ maxretry = 6
                 logger.info(f"개발 환경: Mock VM 중지 - {vm_id}")
                 return True
                 
-            subprocess.run([
-                "virsh", "shutdown", vm_id
-            ], check=True, timeout=30)
+            adapter = self._domain_adapter()
+            if adapter:
+                adapter.shutdown_domain(vm_id)
+            else:
+                subprocess.run([
+                    "virsh", "shutdown", vm_id
+                ], check=True, timeout=30)
             
             logger.info(f"VM 중지 완료: {vm_id}")
             return True
             
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, VMOperationError) as e:
             logger.error(f"VM 중지 실패: {e}")
             return False
     
@@ -1068,14 +787,18 @@ maxretry = 6
                 logger.info(f"개발 환경: Mock VM 시작 - {vm_id}")
                 return True
                 
-            subprocess.run([
-                "virsh", "start", vm_id
-            ], check=True, timeout=30)
+            adapter = self._domain_adapter()
+            if adapter:
+                adapter.start_domain(vm_id)
+            else:
+                subprocess.run([
+                    "virsh", "start", vm_id
+                ], check=True, timeout=30)
             
             logger.info(f"VM 시작 완료: {vm_id}")
             return True
             
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, VMOperationError) as e:
             logger.error(f"VM 시작 실패: {e}")
             return False
     
@@ -1088,43 +811,693 @@ maxretry = 6
                 logger.info(f"개발 환경: Mock VM 재시작 - {vm_id}")
                 return True
                 
-            subprocess.run([
-                "virsh", "reboot", vm_id
-            ], check=True, timeout=30)
+            adapter = self._domain_adapter()
+            if adapter:
+                adapter.reboot_domain(vm_id)
+            else:
+                subprocess.run([
+                    "virsh", "reboot", vm_id
+                ], check=True, timeout=30)
             
             logger.info(f"VM 재시작 완료: {vm_id}")
             return True
             
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, VMOperationError) as e:
             logger.error(f"VM 재시작 실패: {e}")
             return False
     
-    def delete_vm(self, vm_id: str) -> bool:
+    def apply_cpu_placement(self, vm_id: str, cpus: List[int]) -> bool:
         """
-        VM 삭제 (개발 환경용 Mock 버전)
+        재배치된 CPU 배정을 반영
+        
+        libvirt 도메인은 vCPU 고정을 실행 중인 도메인과 저장된 정의에, 컨테이너는
+        docker update --cpuset-cpus로 실행 중인 컨테이너에 반영합니다.
+        
+        Returns:
+            반영 여부 (반영하지 못하면 False, 다음 생성 시 호스팅의 cpuset으로 반영됨)
+        """
+        if not self._has_domain(vm_id):
+            try:
+                self._docker(None, "update", "--cpuset-cpus", format_cpulist(cpus), f"webhost-{vm_id}")
+            except VMOperationError as e:
+                logger.warning(f"컨테이너 CPU 재배치 반영 실패: {vm_id}: {e}")
+                return False
+            logger.info(f"컨테이너 CPU 재배치 반영: {vm_id} -> CPU {format_cpulist(cpus)}")
+            return True
+        
+        try:
+            for vcpu, cpu in enumerate(cpus):
+                subprocess.run([
+                    "virsh", "vcpupin", vm_id, str(vcpu), str(cpu), "--live", "--config"
+                ], check=True, capture_output=True, timeout=10)
+            logger.info(f"vCPU 재배치 반영: {vm_id} -> CPU {','.join(str(cpu) for cpu in cpus)}")
+            return True
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError) as e:
+            logger.warning(f"vCPU 재배치 반영 실패: {vm_id}: {e}")
+            return False
+    
+    def delete_vm(self, vm_id: str, docker_host: Optional[str] = None) -> bool:
+        """
+        VM 삭제 (docker 컨테이너 및 libvirt 도메인)
         """
         try:
+            # create_vm은 docker 컨테이너로 VM을 생성하므로 컨테이너부터 삭제
+            if not self.remove_container(vm_id, docker_host=docker_host):
+                return False
+            self._remove_snapshot_images(vm_id, docker_host)
+            
+            if docker_host:
+                # 원격 노드에는 libvirt 도메인을 만들지 않음
+                logger.info(f"VM 삭제 완료: {vm_id} ({docker_host})")
+                return True
+            
             if settings.DEBUG:
-                logger.info(f"개발 환경: Mock VM 삭제 - {vm_id}")
+                logger.info(f"개발 환경: libvirt 도메인 삭제 생략 - {vm_id}")
                 return True
                 
-            # VM 중지
-            subprocess.run([
-                "virsh", "destroy", vm_id
-            ], check=False)  # 이미 중지된 경우 무시
+            # libvirt 도메인이 정의되어 있으면 함께 삭제
+            adapter = self._domain_adapter()
+            if adapter:
+                adapter.destroy_domain(vm_id)
+            elif get_capability_detector().get().tool_available("virsh"):
+                subprocess.run([
+                    "virsh", "destroy", vm_id
+                ], capture_output=True, check=False)  # 이미 중지된 경우 무시
             
-            # VM 정의 삭제
-            subprocess.run([
-                "virsh", "undefine", vm_id
-            ], check=True, timeout=30)
+                subprocess.run([
+                    "virsh", "undefine", vm_id
+                ], capture_output=True, check=False, timeout=30)  # 도메인이 없는 경우 무시
             
             logger.info(f"VM 삭제 완료: {vm_id}")
             return True
             
-        except subprocess.CalledProcessError as e:
+        except (subprocess.TimeoutExpired, VMOperationError) as e:
             logger.error(f"VM 삭제 실패: {e}")
             return False
     
+    def _has_domain(self, vm_id: str, docker_host: Optional[str] = None) -> bool:
+        """
+        vm_id로 정의된 libvirt 도메인이 있는지 여부 (원격 노드에는 도메인을 만들지 않음)
+        """
+        if docker_host:
+            return False
+        adapter = self._domain_adapter()
+        if adapter:
+            return adapter.get_state(vm_id) is not None
+        try:
+            result = subprocess.run(["virsh", "dominfo", vm_id], capture_output=True, text=True, timeout=10)
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return False
+        return result.returncode == 0
+    
+    def _docker(self, docker_host: Optional[str], *args: str, timeout: int = 60) -> str:
+        """
+        docker 명령 실행 (실패 시 VMOperationError)
+        """
+        try:
+            result = subprocess.run(
+                self._docker_cmd(docker_host, *args),
+                capture_output=True, text=True, timeout=timeout
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise VMOperationError(f"docker {args[0]} 실행 실패: {e}")
+        if result.returncode != 0:
+            raise VMOperationError(f"docker {args[0]} 실패: {result.stderr.strip()}")
+        return result.stdout.strip()
+    
+    def _container_spec(self, vm_id: str, docker_host: Optional[str] = None) -> Dict:
+        """
+        다시 생성할 때 필요한 컨테이너 설정 (게시 포트, 볼륨, 환경 변수)
+        """
+        info = json.loads(self._docker(docker_host, "inspect", f"webhost-{vm_id}"))[0]
+        ports = []
+        for container_port, bindings in (info["HostConfig"].get("PortBindings") or {}).items():
+            for binding in bindings or []:
+                ports.append(f"{binding.get('HostPort')}:{container_port.split('/')[0]}")
+        return {
+            "image": info["Config"]["Image"],
+            "ports": ports,
+            "network": info["HostConfig"].get("NetworkMode"),
+            "ip": ((info.get("NetworkSettings") or {}).get("Networks") or {}).get(settings.CONTAINER_NETWORK_NAME, {}).get("IPAddress"),
+            "binds": info["HostConfig"].get("Binds") or [],
+            "env": [env for env in info["Config"].get("Env") or [] if env.split("=", 1)[0] in ("USER_ID", "VM_ID")],
+            "running": bool(info["State"].get("Running"))
+        }
+    
+    def _site_bind(self, vm_id: str) -> str:
+        """
+        사이트 디렉토리(containers/<vm_id>)를 /var/www에 마운트하는 볼륨 인자
+        
+        웹 루트 /var/www/html은 html → www → releases/<id> 상대 링크를 컨테이너 안에서 따라가므로
+        배포가 www 링크를 바꾸면 컨테이너를 다시 만들지 않아도 바로 반영됩니다.
+        """
+        return f"{(self.image_path / 'containers' / vm_id).resolve()}:/var/www"
+    
+    def ensure_site_mount(self, vm_id: str, resources: Optional[Dict] = None, docker_host: Optional[str] = None) -> bool:
+        """
+        웹 디렉토리만 마운트한 기존 컨테이너를 사이트 디렉토리 마운트로 전환 (첫 배포 전 1회)
+        
+        웹 디렉토리 마운트는 생성 시점의 디렉토리에 고정되어 www 링크 교체를 볼 수 없으므로,
+        컨테이너를 커밋해 변경 사항(nginx 설정 등)을 유지한 채 같은 네트워크 설정으로 다시 만듭니다.
+        
+        Returns:
+            다시 만들었으면 True
+        """
+        spec = self._container_spec(vm_id, docker_host)
+        if not any(bind.split(":")[1:2] == ["/var/www/html"] for bind in spec["binds"]):
+            return False
+        
+        container_name = f"webhost-{vm_id}"
+        image = f"{SNAPSHOT_IMAGE_REPOSITORY}/{vm_id}:site-mount"
+        ensure_container_web_link(self.image_path / "containers" / vm_id)
+        site_spec = dict(spec, binds=[
+            self._site_bind(vm_id) if bind.split(":")[1:2] == ["/var/www/html"] else bind
+            for bind in spec["binds"]
+        ])
+        
+        self._docker(docker_host, "commit", container_name, image, timeout=300)
+        self._docker(docker_host, "rm", "-f", container_name)
+        try:
+            self._run_container(vm_id, image, site_spec, resources, docker_host)
+        except VMOperationError:
+            logger.error(f"사이트 디렉토리 마운트 전환 실패, 기존 마운트로 다시 생성: {vm_id}")
+            self._run_container(vm_id, image, spec, resources, docker_host)
+            raise
+        if not spec["running"]:
+            self._docker(docker_host, "stop", container_name, timeout=60)
+        
+        logger.info(f"사이트 디렉토리 마운트로 전환: {container_name}")
+        return True
+    
+    def _run_container(
+        self,
+        vm_id: str,
+        image: str,
+        spec: Dict,
+        resources: Optional[Dict] = None,
+        docker_host: Optional[str] = None
+    ) -> str:
+        """
+        저장된 설정과 이미지로 컨테이너 생성 (스냅샷 복원, 마이그레이션용)
+        """
+        args = ["run", "-d", "--name", f"webhost-{vm_id}"]
+        if spec.get("network") == settings.CONTAINER_NETWORK_NAME:
+            # 프록시 규칙이 컨테이너 IP를 가리키므로 다시 만들어도 같은 IP 유지
+            args += ["--network", spec["network"], "--network-alias", vm_id]
+            if spec.get("ip"):
+                args += ["--ip", spec["ip"]]
+        for port in spec["ports"]:
+            args += ["-p", port]
+        for bind in spec["binds"]:
+            args += ["-v", bind]
+        for env in spec["env"]:
+            args += ["-e", env]
+        return self._docker(docker_host, *args, *self._resource_flags(resources), image)
+    
+    def _transfer_image(self, image: str, source_host: Optional[str], target_host: Optional[str]) -> Tuple[int, float]:
+        """
+        docker save 출력을 docker load로 바로 전달 (디스크에 임시 파일 없음)
+        
+        Returns:
+            (전송 바이트, 소요 시간(초))
+        """
+        started = time.monotonic()
+        transferred = 0
+        save = subprocess.Popen(self._docker_cmd(source_host, "save", image), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        load = subprocess.Popen(self._docker_cmd(target_host, "load", "-q"), stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        try:
+            while True:
+                chunk = save.stdout.read(TRANSFER_CHUNK_SIZE)
+                if not chunk:
+                    break
+                load.stdin.write(chunk)
+                transferred += len(chunk)
+            load.stdin.close()
+            if save.wait(timeout=60) != 0 or load.wait(timeout=300) != 0:
+                raise VMOperationError(
+                    f"이미지 전송 실패: {image}: {(save.stderr.read() + load.stderr.read()).decode(errors='replace').strip()}"
+                )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            save.kill()
+            load.kill()
+            raise VMOperationError(f"이미지 전송 실패: {image}: {e}")
+        return transferred, time.monotonic() - started
+    
+    def _snapshot_dir(self, vm_id: str) -> Path:
+        return self.image_path / "snapshots" / vm_id
+    
+    def _remove_snapshot_images(self, vm_id: str, docker_host: Optional[str] = None) -> None:
+        """
+        VM 스냅샷/마이그레이션 이미지 삭제
+        
+        스냅샷을 만든 노드와, 마이그레이션 이미지로 실행 중일 수 있는 현재 원격 노드에서 삭제합니다.
+        """
+        hosts = {snapshot.get("docker_host") for snapshot in self.list_snapshots(vm_id)}
+        if docker_host:
+            hosts.add(docker_host)
+        for host in hosts:
+            try:
+                images = subprocess.run(
+                    self._docker_cmd(host, "images", "-q", f"{SNAPSHOT_IMAGE_REPOSITORY}/{vm_id}"),
+                    capture_output=True, text=True, timeout=30
+                ).stdout.split()
+                if images:
+                    subprocess.run(self._docker_cmd(host, "rmi", "-f", *set(images)), capture_output=True, timeout=60)
+            except (OSError, subprocess.TimeoutExpired) as e:
+                logger.warning(f"스냅샷 이미지 삭제 실패: {vm_id}: {e}")
+    
+    def list_snapshots(self, vm_id: str) -> List[Dict]:
+        """
+        VM 스냅샷 목록 (생성 시각 순)
+        """
+        snapshots = []
+        for path in self._snapshot_dir(vm_id).glob("*.json"):
+            try:
+                snapshots.append(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue
+        return sorted(snapshots, key=lambda snapshot: snapshot.get("created_at", 0))
+    
+    def _load_snapshot(self, vm_id: str, name: str) -> Dict:
+        if not SNAPSHOT_NAME_PATTERN.match(name or ""):
+            raise VMOperationError(f"스냅샷 이름이 올바르지 않습니다: {name}")
+        try:
+            return json.loads((self._snapshot_dir(vm_id) / f"{name}.json").read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            raise VMOperationError(f"스냅샷을 찾을 수 없습니다: {vm_id}/{name}")
+    
+    def snapshot_vm(self, vm_id: str, name: Optional[str] = None, docker_host: Optional[str] = None) -> Dict:
+        """
+        VM 스냅샷 생성
+        
+        libvirt 도메인은 qcow2 스냅샷(VM_SNAPSHOT_MODE: internal은 메모리 포함, external은
+        디스크 전용 오버레이)을 만듭니다. 컨테이너는 일시 정지한 상태에서 컨테이너 파일시스템을
+        이미지로 커밋하고 웹 디렉토리를 함께 보관해 두 부분이 같은 시점이 되도록 합니다.
+        
+        Returns:
+            스냅샷 정보
+        """
+        name = name or datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+        if not SNAPSHOT_NAME_PATTERN.match(name):
+            raise VMOperationError(f"스냅샷 이름이 올바르지 않습니다: {name}")
+        
+        snapshot_dir = self._snapshot_dir(vm_id)
+        meta_path = snapshot_dir / f"{name}.json"
+        if meta_path.exists():
+            raise VMOperationError(f"이미 존재하는 스냅샷입니다: {vm_id}/{name}")
+        snapshot_dir.mkdir(parents=True, exist_ok=True)
+        
+        started = time.monotonic()
+        snapshot = {"name": name, "vm_id": vm_id, "created_at": time.time(), "docker_host": docker_host}
+        
+        if self._has_domain(vm_id, docker_host):
+            command = ["virsh", "snapshot-create-as", vm_id, name, "--atomic"]
+            if settings.VM_SNAPSHOT_MODE == "external":
+                command += ["--disk-only", "--quiesce"]
+            try:
+                subprocess.run(command, check=True, capture_output=True, text=True, timeout=300)
+            except subprocess.CalledProcessError as e:
+                raise VMOperationError(f"도메인 스냅샷 생성 실패: {e.stderr.strip()}")
+            except subprocess.TimeoutExpired as e:
+                raise VMOperationError(f"도메인 스냅샷 생성 시간 초과: {e}")
+            snapshot.update({"backend": "domain", "mode": settings.VM_SNAPSHOT_MODE})
+        else:
+            container_name = f"webhost-{vm_id}"
+            image = f"{SNAPSHOT_IMAGE_REPOSITORY}/{vm_id}:{name}"
+            web_dir = self.image_path / "containers" / vm_id / "www"
+            archive = snapshot_dir / f"{name}.tar.gz"
+            
+            running = self._container_spec(vm_id, docker_host)["running"]
+            if running:
+                self._docker(docker_host, "pause", container_name)
+            try:
+                self._docker(docker_host, "commit", "--pause=false", container_name, image, timeout=300)
+                with tarfile.open(archive, "w:gz") as tar:
+                    if web_dir.exists():
+                        # 배포 후에는 www가 릴리스 링크이므로 링크가 아닌 현재 릴리스 내용을 저장
+                        tar.add(str(web_dir.resolve()), arcname="www")
+            finally:
+                if running:
+                    self._docker(docker_host, "unpause", container_name)
+            snapshot.update({"backend": "container", "image": image, "archive": str(archive), "size_bytes": archive.stat().st_size})
+        
+        snapshot["seconds"] = round(time.monotonic() - started, 3)
+        meta_path.write_text(json.dumps(snapshot, ensure_ascii=False), encoding="utf-8")
+        logger.info(f"스냅샷 생성 완료: {vm_id}/{name} ({snapshot['backend']}, {snapshot['seconds']}초)")
+        return snapshot
+    
+    def restore_vm(
+        self,
+        vm_id: str,
+        name: str,
+        resources: Optional[Dict] = None,
+        docker_host: Optional[str] = None
+    ) -> Dict:
+        """
+        스냅샷으로 VM 복원
+        
+        컨테이너는 현재 설정(포트, 볼륨)을 유지한 채 스냅샷 이미지로 다시 만들고,
+        웹 디렉토리는 임시 디렉토리에 푼 뒤 교체합니다. 스냅샷을 만든 노드와 현재 노드가
+        다르면 이미지를 먼저 전송합니다.
+        
+        Returns:
+            복원한 스냅샷 정보
+        """
+        snapshot = self._load_snapshot(vm_id, name)
+        started = time.monotonic()
+        
+        if snapshot["backend"] == "domain":
+            try:
+                subprocess.run(["virsh", "snapshot-revert", vm_id, name], check=True, capture_output=True, text=True, timeout=300)
+            except subprocess.CalledProcessError as e:
+                raise VMOperationError(f"도메인 스냅샷 복원 실패: {e.stderr.strip()}")
+            except subprocess.TimeoutExpired as e:
+                raise VMOperationError(f"도메인 스냅샷 복원 시간 초과: {e}")
+        else:
+            if snapshot.get("docker_host") != docker_host:
+                self._transfer_image(snapshot["image"], snapshot.get("docker_host"), docker_host)
+            
+            spec = self._container_spec(vm_id, docker_host)
+            web_dir = self.image_path / "containers" / vm_id / "www"
+            staging = web_dir.with_name(f"www.restore-{os.getpid()}")
+            shutil.rmtree(staging, ignore_errors=True)
+            staging.mkdir(parents=True)
+            with tarfile.open(snapshot["archive"], "r:gz") as tar:
+                tar.extractall(staging, filter="data")
+            
+            self._docker(docker_host, "rm", "-f", f"webhost-{vm_id}")
+            previous = web_dir.with_name(f"www.previous-{os.getpid()}")
+            if web_dir.is_symlink():
+                # 배포 릴리스 링크는 링크만 교체 (릴리스는 롤백용으로 유지)
+                web_dir.unlink()
+            elif web_dir.exists():
+                web_dir.rename(previous)
+            (staging / "www").rename(web_dir)
+            shutil.rmtree(previous, ignore_errors=True)
+            shutil.rmtree(staging, ignore_errors=True)
+            
+            self._run_container(vm_id, snapshot["image"], self._network_spec(vm_id, spec, docker_host), resources, docker_host)
+        
+        logger.info(f"스냅샷 복원 완료: {vm_id}/{name} ({round(time.monotonic() - started, 3)}초)")
+        return snapshot
+    
+    def migrate_vm(
+        self,
+        vm_id: str,
+        source_docker_host: Optional[str],
+        target_docker_host: str,
+        target_address: str,
+        resources: Optional[Dict] = None
+    ) -> Dict:
+        """
+        VM을 다른 노드로 이동
+        
+        libvirt 도메인은 virsh migrate --live로 옮기고 domjobinfo의 전송량/다운타임을 사용합니다.
+        컨테이너는 중지 → 커밋 → 이미지 스트리밍 전송 → 대상 노드에서 같은 포트로 실행 순으로
+        옮기며, 중지부터 대상 컨테이너 실행까지를 다운타임으로 측정합니다. 웹 디렉토리는
+        모든 노드에 공유 마운트되어 있으므로 전송하지 않습니다. 대상에서 실행하지 못하면
+        원래 컨테이너를 다시 시작합니다.
+        
+        Returns:
+            마이그레이션 지표 (backend, bytes, transfer_rate_mbps, downtime_seconds 등)
+        """
+        if self._has_domain(vm_id, source_docker_host):
+            target_uri = settings.LIBVIRT_MIGRATION_URI.format(address=target_address)
+            started = time.monotonic()
+            try:
+                subprocess.run([
+                    "virsh", "migrate", "--live", "--persistent", "--undefinesource",
+                    "--copy-storage-inc", vm_id, target_uri
+                ], check=True, capture_output=True, text=True, timeout=settings.VM_MIGRATION_TIMEOUT)
+            except subprocess.CalledProcessError as e:
+                raise VMOperationError(f"도메인 마이그레이션 실패: {e.stderr.strip()}")
+            except subprocess.TimeoutExpired:
+                subprocess.run(["virsh", "domjobabort", vm_id], capture_output=True, timeout=30)
+                raise VMOperationError(f"도메인 마이그레이션 시간 초과: {vm_id}")
+            elapsed = time.monotonic() - started
+            
+            job = subprocess.run(["virsh", "domjobinfo", vm_id, "--completed"], capture_output=True, text=True, timeout=10)
+            info = parse_domjobinfo(job.stdout)
+            metrics = transfer_metrics(
+                int(info.get("bytes", 0)),
+                info.get("elapsed_ms", elapsed * 1000) / 1000,
+                info.get("downtime_ms", 0) / 1000
+            )
+            return {"backend": "domain", "target": target_uri, **metrics}
+        
+        container_name = f"webhost-{vm_id}"
+        image = f"{SNAPSHOT_IMAGE_REPOSITORY}/{vm_id}:migrate-{int(time.time())}"
+        spec = self._container_spec(vm_id, source_docker_host)
+        # 원격 노드에서는 프록시가 노드 주소의 게시 포트로 접근하므로 웹 포트를 다시 게시
+        target_spec = self._network_spec(vm_id, spec, target_docker_host)
+        
+        stopped_at = time.monotonic()
+        self._docker(source_docker_host, "stop", container_name, timeout=60)
+        try:
+            self._docker(source_docker_host, "commit", container_name, image, timeout=300)
+            byte_count, transfer_seconds = self._transfer_image(image, source_docker_host, target_docker_host)
+            self._docker(target_docker_host, "rm", "-f", container_name)
+            self._run_container(vm_id, image, target_spec, resources, target_docker_host)
+            downtime = time.monotonic() - stopped_at
+        except VMOperationError:
+            logger.error(f"마이그레이션 실패, 원래 노드에서 다시 시작: {vm_id}")
+            subprocess.run(self._docker_cmd(target_docker_host, "rm", "-f", container_name), capture_output=True, timeout=60)
+            if spec["running"]:
+                self._docker(source_docker_host, "start", container_name)
+            raise
+        
+        # 원래 노드 정리 (실패해도 마이그레이션은 완료된 것으로 처리, 고아 리소스 GC가 정리)
+        for host, args in ((source_docker_host, ("rm", "-f", container_name)), (source_docker_host, ("rmi", image))):
+            result = subprocess.run(self._docker_cmd(host, *args), capture_output=True, text=True, timeout=60)
+            if result.returncode != 0:
+                logger.warning(f"원래 노드 정리 실패: {' '.join(args)}: {result.stderr.strip()}")
+        
+        web_port = next((int(port.split(":")[0]) for port in target_spec["ports"] if port.endswith(":80")), None)
+        return {
+            "backend": "container",
+            "target": target_docker_host,
+            "web_port": web_port,
+            **transfer_metrics(byte_count, transfer_seconds, downtime)
+        }
+    
+    def _uses_tenant_network(self, docker_host: Optional[str] = None) -> bool:
+        """
+        전용 브리지 네트워크 사용 여부 (원격 노드의 컨테이너 IP는 프록시에서 접근할 수 없어 로컬만)
+        """
+        return settings.CONTAINER_NETWORK_MODE == "bridge" and not docker_host
+    
+    def _published_web_port(self, vm_id: str) -> int:
+        return 8000 + (hash(vm_id) % 1000)
+    
+    def _ssh_port_flags(self, ssh_port: int, docker_host: Optional[str] = None) -> List[str]:
+        """
+        SSH 포트 게시 플래그
+        
+        SSH 게이트웨이 모드에서는 게이트웨이가 내부 네트워크로 컨테이너 22번 포트에 접속하므로
+        로컬 컨테이너는 게시하지 않습니다. 원격 노드는 노드 주소로 접속해야 하므로 계속 게시합니다.
+        """
+        if settings.SSH_GATEWAY_ENABLED and docker_host is None:
+            return []
+        return ["-p", f"{ssh_port}:22"]
+    
+    def _network_flags(self, vm_id: str, docker_host: Optional[str], web_port: int) -> List[str]:
+        """
+        컨테이너 웹 트래픽 연결 옵션
+        
+        전용 네트워크 방식은 호스트 포트를 게시하지 않으므로 컨테이너마다 docker-proxy
+        프로세스와 DNAT 규칙이 생기지 않습니다.
+        """
+        if self._uses_tenant_network(docker_host):
+            return ["--network", settings.CONTAINER_NETWORK_NAME, "--network-alias", vm_id]
+        return ["-p", f"{web_port}:80"]
+    
+    def _network_spec(self, vm_id: str, spec: Dict, docker_host: Optional[str] = None) -> Dict:
+        """
+        대상 Docker 호스트의 네트워크 방식에 맞게 컨테이너 설정 조정 (복원, 마이그레이션용)
+        """
+        spec = dict(spec)
+        web_ports = [port for port in spec["ports"] if port.endswith(":80")]
+        if self._uses_tenant_network(docker_host):
+            self.ensure_tenant_network(docker_host)
+            spec["network"] = settings.CONTAINER_NETWORK_NAME
+            spec["ports"] = [port for port in spec["ports"] if port not in web_ports]
+        else:
+            spec["network"] = None
+            if not web_ports:
+                spec["ports"] = [f"{self._published_web_port(vm_id)}:80", *spec["ports"]]
+        return spec
+    
+    def ensure_tenant_network(self, docker_host: Optional[str] = None) -> str:
+        """
+        테넌트 전용 사용자 정의 브리지 네트워크 생성 (이미 있으면 그대로 사용)
+        
+        컨테이너 간 통신(ICC)은 기본으로 막아 테넌트끼리 접근할 수 없고,
+        호스트의 nginx는 브리지 게이트웨이를 통해 컨테이너 IP로 접근합니다.
+        """
+        name = settings.CONTAINER_NETWORK_NAME
+        if (docker_host, name) in _ready_networks:
+            return name
+        
+        inspect = subprocess.run(self._docker_cmd(docker_host, "network", "inspect", name), capture_output=True, text=True, timeout=30)
+        if inspect.returncode != 0:
+            args = (
+                "network", "create", "--driver", "bridge",
+                "--label", "webhost.managed=true",
+                "--opt", f"com.docker.network.bridge.enable_icc={str(settings.CONTAINER_NETWORK_ICC).lower()}"
+            )
+            self._docker(docker_host, *args, "--subnet", settings.CONTAINER_NETWORK_SUBNET, name)
+            logger.info(f"테넌트 네트워크 생성: {name}")
+        
+        _ready_networks.add((docker_host, name))
+        return name
+    
+    def _domain_adapter(self) -> Optional[LibvirtAdapter]:
+        """
+        libvirt 이벤트 어댑터 (사용할 수 없으면 None, 이 경우 virsh 사용)
+        """
+        adapter = get_libvirt_adapter()
+        if adapter and adapter.ensure_connected():
+            return adapter
+        return None
+    
+    def _docker_cmd(self, docker_host: Optional[str], *args: str) -> List[str]:
+        """
+        docker CLI 명령 구성 (docker_host가 있으면 해당 노드의 Docker API 사용)
+        """
+        if docker_host:
+            return ["docker", "-H", docker_host, *args]
+        return ["docker", *args]
+    
+    def _resource_flags(self, resources: Optional[Dict]) -> List[str]:
+        """
+        리소스 제한을 docker run/update 옵션으로 변환
+        """
+        if not resources:
+            return []
+        
+        flags = []
+        if resources.get("memory_mb"):
+            memory = f"{resources['memory_mb']}m"
+            # 스왑으로 메모리 제한을 우회하지 못하도록 동일 값 지정
+            flags += ["--memory", memory, "--memory-swap", memory]
+        if resources.get("cpus"):
+            flags += ["--cpus", str(resources["cpus"])]
+        if resources.get("cpu_shares"):
+            flags += ["--cpu-shares", str(resources["cpu_shares"])]
+        if resources.get("pids_limit"):
+            flags += ["--pids-limit", str(resources["pids_limit"])]
+        if resources.get("blkio_weight"):
+            flags += ["--blkio-weight", str(resources["blkio_weight"])]
+        if resources.get("cpuset"):
+            # 배치 엔진이 배정한 호스트 CPU (호스팅의 cpuset, vCPU 순서 → 커널 목록 형식)
+            flags += ["--cpuset-cpus", format_cpulist(parse_cpulist(resources["cpuset"]))]
+        return flags
+    
+    def update_container_resources(self, vm_id: str, resources: Dict, docker_host: Optional[str] = None) -> None:
+        """
+        실행 중인 컨테이너 리소스 제한 변경 (docker update, 재시작 없음)
+        """
+        flags = self._resource_flags(resources)
+        if not flags:
+            return
+        
+        container_name = f"webhost-{vm_id}"
+        try:
+            result = subprocess.run(
+                self._docker_cmd(docker_host, "update", *flags, container_name),
+                capture_output=True, text=True, timeout=30
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise VMOperationError(f"컨테이너 리소스 변경 실패: {e}")
+        
+        if result.returncode != 0:
+            logger.error(f"컨테이너 리소스 변경 실패: {container_name}: {result.stderr.strip()}")
+            raise VMOperationError(f"컨테이너 리소스 변경 실패: {result.stderr.strip()}")
+        
+        logger.info(f"컨테이너 리소스 변경 완료: {container_name}, {resources}")
+    
+    def stop_container(self, vm_id: str, docker_host: Optional[str] = None, timeout: int = 10) -> None:
+        """
+        컨테이너 중지 (유휴 자동 중지용, 컨테이너와 웹 디렉토리는 그대로 유지)
+        """
+        self._docker(docker_host, "stop", "-t", str(timeout), f"webhost-{vm_id}", timeout=timeout + 30)
+        logger.info(f"컨테이너 중지 완료: webhost-{vm_id}")
+    
+    def start_container(self, vm_id: str, docker_host: Optional[str] = None) -> Optional[str]:
+        """
+        중지된 컨테이너 시작
+        
+        Returns:
+            전용 네트워크의 컨테이너 IP (다시 시작하면 바뀔 수 있음, 포트 게시 방식이면 None)
+        """
+        self._docker(docker_host, "start", f"webhost-{vm_id}")
+        logger.info(f"컨테이너 시작 완료: webhost-{vm_id}")
+        if self._uses_tenant_network(docker_host):
+            return self._container_spec(vm_id, docker_host)["ip"]
+        return None
+    
+    def remove_container(self, vm_id: str, docker_host: Optional[str] = None) -> bool:
+        """
+        VM 컨테이너 강제 삭제 (존재하지 않으면 성공으로 간주)
+        """
+        container_name = f"webhost-{vm_id}"
+        try:
+            result = subprocess.run(
+                self._docker_cmd(docker_host, "rm", "-f", container_name),
+                capture_output=True, text=True, timeout=60
+            )
+        except FileNotFoundError:
+            logger.warning(f"docker 명령어가 없어 컨테이너 삭제를 건너뜁니다: {container_name}")
+            return True
+        except subprocess.TimeoutExpired:
+            logger.error(f"컨테이너 삭제 시간 초과: {container_name}")
+            return False
+        
+        if result.returncode == 0:
+            logger.info(f"컨테이너 삭제 완료: {container_name}")
+            return True
+        
+        if "No such container" in result.stderr:
+            return True
+        
+        logger.error(f"컨테이너 삭제 실패: {container_name}: {result.stderr.strip()}")
+        return False
+    
+    def remove_vm_files(self, vm_id: str) -> List[str]:
+        """
+        VM 관련 파일 삭제 (SSH 키, 웹 디렉토리, cloud-init, 디스크)
+        
+        Returns:
+            삭제하지 못한 경로 목록
+        """
+        failed = []
+        for path in self.get_vm_file_paths(vm_id):
+            if not path.exists():
+                continue
+            try:
+                if path.is_dir():
+                    shutil.rmtree(path)
+                else:
+                    path.unlink()
+            except OSError as e:
+                logger.warning(f"VM 파일 삭제 실패 {path}: {e}")
+                failed.append(str(path))
+        
+        if not failed:
+            # 디스크가 삭제되었으므로 골든 이미지 참조 해제
+            try:
+                get_golden_image_manager().release_overlay(vm_id)
+            except (VMOperationError, OSError) as e:
+                logger.warning(f"골든 이미지 참조 해제 실패 {vm_id}: {e}")
+            logger.info(f"VM 파일 정리 완료: {vm_id}")
+        return failed
+    
+    def get_vm_file_paths(self, vm_id: str) -> List[Path]:
+        """
+        VM이 이미지 경로에 생성하는 파일/디렉토리 목록
+        """
+        return vm_file_paths(self.image_path, vm_id)
+    
     def cleanup_vm(self, vm_id: str) -> None:
         """
         VM 정리 (파일 삭제 포함) (개발 환경용 Mock 버전)
@@ -1154,6 +1527,11 @@ maxretry = 6
                 logger.info(f"개발 환경: Mock VM 상태 조회 - {vm_id}")
                 return HostingStatus.RUNNING
                 
+            # 이벤트로 갱신되는 인덱스에서 조회 (virsh 실행 없음)
+            adapter = self._domain_adapter()
+            if adapter:
+                return adapter.get_status(vm_id)
+            
             result = subprocess.run([
                 "virsh", "domstate", vm_id
             ], capture_output=True, text=True, timeout=10)
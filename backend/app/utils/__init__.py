@@ -29,6 +29,7 @@ from .validation_utils import (
     is_safe_path,
     ValidationResult
 )
+from .stats_utils import percentile
 
 __all__ = [
     # Response utils
@@ -55,5 +56,7 @@ __all__ = [
     "validate_required_fields",
     "clean_filename",
     "is_safe_path",
-    "ValidationResult"
+    "ValidationResult",
+    # Stats utils
+    "percentile"
 ]
@@ -0,0 +1,241 @@
+"""
+ISO9660 + Joliet 이미지 생성 유틸리티 (cloud-init NoCloud seed용)
+
+루트 디렉토리에 파일 몇 개만 있는 작은 이미지를 외부 도구(genisoimage) 없이
+메모리에서 생성합니다. 기본 볼륨 디스크립터에는 8.3 형식 이름을, Joliet
+보조 디스크립터에는 원래 파일 이름(user-data, meta-data)을 기록하므로
+리눅스 게스트에서는 원래 이름으로 마운트됩니다.
+"""
+import re
+import struct
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+SECTOR_SIZE = 2048
+
+# 섹터 배치 (16번까지는 시스템 영역)
+PVD_SECTOR = 16
+JOLIET_SVD_SECTOR = 17
+TERMINATOR_SECTOR = 18
+PATH_TABLE_SECTORS = (19, 20, 21, 22)  # 기본 L/M, Joliet L/M
+PRIMARY_ROOT_SECTOR = 23
+JOLIET_ROOT_SECTOR = 24
+FIRST_FILE_SECTOR = 25
+
+# Joliet UCS-2 Level 3 이스케이프 시퀀스
+JOLIET_ESCAPE = b"%/E"
+
+
+def build_iso(files: Dict[str, bytes], volume_id: str = "cidata", timestamp: Optional[datetime] = None) -> bytes:
+    """
+    루트 디렉토리에 주어진 파일을 담은 ISO 이미지 생성
+    
+    Args:
+        files: 파일 이름 → 내용
+        volume_id: 볼륨 레이블 (NoCloud는 cidata)
+        timestamp: 기록할 생성 시각 (같은 입력에 같은 이미지를 만들려면 고정값 지정)
+    
+    Returns:
+        ISO 이미지 바이트
+    """
+    timestamp = timestamp or datetime.now(timezone.utc)
+    names = sorted(files)
+    primary_names = _primary_names(names)
+    
+    # 파일 데이터 위치 할당
+    extents: Dict[str, Tuple[int, int]] = {}
+    sector = FIRST_FILE_SECTOR
+    for name in names:
+        size = len(files[name])
+        extents[name] = (sector, size)
+        sector += _sectors(size)
+    total_sectors = sector
+    
+    record_date = _record_date(timestamp)
+    primary_root = _directory(
+        PRIMARY_ROOT_SECTOR,
+        [(primary_names[name].encode("ascii"), *extents[name]) for name in names],
+        record_date
+    )
+    joliet_root = _directory(
+        JOLIET_ROOT_SECTOR,
+        sorted((name.encode("utf-16-be"), *extents[name]) for name in names),
+        record_date
+    )
+    
+    image = bytearray(total_sectors * SECTOR_SIZE)
+    
+    def put(sector_no: int, data: bytes) -> None:
+        offset = sector_no * SECTOR_SIZE
+        image[offset:offset + len(data)] = data
+    
+    put(PVD_SECTOR, _volume_descriptor(1, volume_id, total_sectors, PRIMARY_ROOT_SECTOR, PATH_TABLE_SECTORS[:2], timestamp))
+    put(JOLIET_SVD_SECTOR, _volume_descriptor(2, volume_id, total_sectors, JOLIET_ROOT_SECTOR, PATH_TABLE_SECTORS[2:], timestamp))
+    put(TERMINATOR_SECTOR, b"\xff" + b"CD001" + b"\x01")
+    put(PATH_TABLE_SECTORS[0], _path_table(PRIMARY_ROOT_SECTOR, "<"))
+    put(PATH_TABLE_SECTORS[1], _path_table(PRIMARY_ROOT_SECTOR, ">"))
+    put(PATH_TABLE_SECTORS[2], _path_table(JOLIET_ROOT_SECTOR, "<"))
+    put(PATH_TABLE_SECTORS[3], _path_table(JOLIET_ROOT_SECTOR, ">"))
+    put(PRIMARY_ROOT_SECTOR, primary_root)
+    put(JOLIET_ROOT_SECTOR, joliet_root)
+    for name in names:
+        put(extents[name][0], files[name])
+    
+    return bytes(image)
+
+
+def read_iso_files(image: bytes) -> Dict[str, bytes]:
+    """
+    build_iso로 만든 이미지의 Joliet 루트 디렉토리 파일 읽기 (검증용)
+    """
+    svd = image[JOLIET_SVD_SECTOR * SECTOR_SIZE:(JOLIET_SVD_SECTOR + 1) * SECTOR_SIZE]
+    if svd[0] != 2 or svd[1:6] != b"CD001" or svd[88:91] != JOLIET_ESCAPE:
+        raise ValueError("Joliet 볼륨 디스크립터가 없습니다.")
+    
+    root_extent, root_size = struct.unpack_from("<I", svd, 158)[0], struct.unpack_from("<I", svd, 166)[0]
+    directory = image[root_extent * SECTOR_SIZE:root_extent * SECTOR_SIZE + root_size]
+    
+    files = {}
+    offset = 0
+    while offset < len(directory) and directory[offset]:
+        length = directory[offset]
+        extent = struct.unpack_from("<I", directory, offset + 2)[0]
+        size = struct.unpack_from("<I", directory, offset + 10)[0]
+        name_len = directory[offset + 32]
+        name = directory[offset + 33:offset + 33 + name_len]
+        if name not in (b"\x00", b"\x01"):
+            files[name.decode("utf-16-be")] = image[extent * SECTOR_SIZE:extent * SECTOR_SIZE + size]
+        offset += length
+    return files
+
+
+def _primary_names(names: List[str]) -> Dict[str, str]:
+    """
+    ISO9660 Level 1 (8.3, 대문자) 이름 생성 (충돌 시 번호 부여)
+    """
+    result = {}
+    used = set()
+    for name in names:
+        stem, _, ext = name.upper().rpartition(".") if "." in name else (name.upper(), "", "")
+        stem = re.sub(r"[^A-Z0-9_]", "", stem)[:8] or "FILE"
+        ext = re.sub(r"[^A-Z0-9_]", "", ext)[:3]
+        candidate = stem
+        counter = 1
+        while f"{candidate}.{ext}" in used:
+            suffix = str(counter)
+            candidate = stem[:8 - len(suffix)] + suffix
+            counter += 1
+        used.add(f"{candidate}.{ext}")
+        result[name] = f"{candidate}.{ext};1"
+    return result
+
+
+def _sectors(size: int) -> int:
+    return max(1, -(-size // SECTOR_SIZE))
+
+
+def _both16(value: int) -> bytes:
+    return struct.pack("<H", value) + struct.pack(">H", value)
+
+
+def _both32(value: int) -> bytes:
+    return struct.pack("<I", value) + struct.pack(">I", value)
+
+
+def _record_date(timestamp: datetime) -> bytes:
+    """디렉토리 레코드용 7바이트 날짜 (UTC)"""
+    ts = timestamp.astimezone(timezone.utc)
+    return bytes([ts.year - 1900, ts.month, ts.day, ts.hour, ts.minute, ts.second, 0])
+
+
+def _volume_date(timestamp: Optional[datetime]) -> bytes:
+    """볼륨 디스크립터용 17바이트 날짜 (UTC)"""
+    if timestamp is None:
+        return b"0" * 16 + b"\x00"
+    ts = timestamp.astimezone(timezone.utc)
+    return ts.strftime("%Y%m%d%H%M%S").encode("ascii") + f"{ts.microsecond // 10000:02d}".encode("ascii") + b"\x00"
+
+
+def _dir_record(name: bytes, extent: int, size: int, record_date: bytes, is_dir: bool = False) -> bytes:
+    length = 33 + len(name)
+    padding = b"\x00" if length % 2 else b""
+    return (
+        bytes([length + len(padding), 0])
+        + _both32(extent)
+        + _both32(size)
+        + record_date
+        + bytes([2 if is_dir else 0, 0, 0])
+        + _both16(1)
+        + bytes([len(name)])
+        + name
+        + padding
+    )
+
+
+def _directory(self_extent: int, entries: List[Tuple[bytes, int, int]], record_date: bytes) -> bytes:
+    """
+    루트 디렉토리 섹터 (., .., 파일 레코드)
+    """
+    data = _dir_record(b"\x00", self_extent, SECTOR_SIZE, record_date, is_dir=True)
+    data += _dir_record(b"\x01", self_extent, SECTOR_SIZE, record_date, is_dir=True)
+    for name, extent, size in entries:
+        data += _dir_record(name, extent, size, record_date)
+    if len(data) > SECTOR_SIZE:
+        raise ValueError("루트 디렉토리에 파일이 너무 많습니다.")
+    return data
+
+
+def _path_table(root_extent: int, byte_order: str) -> bytes:
+    """루트 디렉토리 하나만 있는 경로 테이블"""
+    return bytes([1, 0]) + struct.pack(f"{byte_order}I", root_extent) + struct.pack(f"{byte_order}H", 1) + b"\x00\x00"
+
+
+def _text(value: str, length: int, joliet: bool) -> bytes:
+    if joliet:
+        return value[:length // 2].ljust(length // 2).encode("utf-16-be")
+    return value[:length].ljust(length).encode("ascii")
+
+
+def _volume_descriptor(
+    descriptor_type: int,
+    volume_id: str,
+    total_sectors: int,
+    root_extent: int,
+    path_tables: Tuple[int, int],
+    timestamp: datetime
+) -> bytes:
+    """
+    기본(1) 또는 Joliet 보조(2) 볼륨 디스크립터
+    """
+    joliet = descriptor_type == 2
+    path_table_size = 10
+    root_record = _dir_record(b"\x00", root_extent, SECTOR_SIZE, _record_date(timestamp), is_dir=True)
+    
+    vd = bytearray(SECTOR_SIZE)
+    vd[0] = descriptor_type
+    vd[1:6] = b"CD001"
+    vd[6] = 1
+    vd[8:40] = _text("LINUX", 32, joliet)
+    vd[40:72] = _text(volume_id, 32, joliet)
+    vd[80:88] = _both32(total_sectors)
+    if joliet:
+        vd[88:91] = JOLIET_ESCAPE
+    vd[120:124] = _both16(1)
+    vd[124:128] = _both16(1)
+    vd[128:132] = _both16(SECTOR_SIZE)
+    vd[132:140] = _both32(path_table_size)
+    vd[140:144] = struct.pack("<I", path_tables[0])
+    vd[148:152] = struct.pack(">I", path_tables[1])
+    vd[156:190] = root_record
+    vd[190:318] = _text("", 128, joliet)
+    vd[318:446] = _text("", 128, joliet)
+    vd[446:574] = _text("", 128, joliet)
+    vd[574:702] = _text("WEBHOSTING", 128, joliet)
+    # 저작권/초록/서지 파일 식별자 (사용 안 함)
+    vd[702:813] = b" " * 111
+    vd[813:830] = _volume_date(timestamp)
+    vd[830:847] = _volume_date(timestamp)
+    vd[847:864] = _volume_date(None)
+    vd[864:881] = _volume_date(None)
+    vd[881] = 1
+    return bytes(vd)
@@ -0,0 +1,14 @@
+"""
+통계 계산 유틸리티
+"""
+from typing import List
+
+
+def percentile(values: List[float], percent: int) -> float:
+    """
+    최근접 순위(nearest-rank) 백분위수
+    - values는 비어 있지 않아야 함
+    """
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
@@ -4,6 +4,7 @@ pytest 테스트 설정 및 공통 fixture
 import asyncio
 import pytest
 from typing import Generator, Dict, Any
+from unittest.mock import patch, AsyncMock
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -82,8 +83,10 @@ def client(db_session) -> Generator[TestClient, None, None]:
     """
     FastAPI 테스트 클라이언트
     db_session fixture에 의존하여 동일한 테스트 데이터베이스를 사용하도록 함
+    (주기 작업은 시작하지 않음 - tests/test_events.py에서 따로 검증)
     """
-    with TestClient(app) as test_client:
+    with patch("app.core.events.start_background_tasks", AsyncMock(return_value=[])), \
+         TestClient(app) as test_client:
         yield test_client
 
 @pytest.fixture
@@ -0,0 +1,155 @@
+"""
+테넌트 공유 JSON 접근 로그 수집 테스트
+"""
+import json
+import os
+import jinja2
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from app.services.access_log_service import AccessLogIngester, TrafficRing, latency_quantile
+
+NGINX_DIR = Path(__file__).parents[2] / "nginx"
+
+
+def record(tenant, ts, status=200, size=1000, rt=0.004):
+    return json.dumps({
+        "ts": ts, "tenant": tenant, "status": status, "bytes": size,
+        "rt": rt, "urt": "0.003", "cache": "MISS", "method": "GET"
+    }) + "\n"
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    return tmp_path / "tenants.access.log"
+
+
+@pytest.fixture
+def ingester(tmp_path, log_file):
+    return AccessLogIngester(log_file, tmp_path / "state", window_seconds=60, retention_windows=10)
+
+
+class TestAccessLogIngester:
+    """이어 읽기, 체크포인트, 로테이션, 구간 집계 테스트"""
+    
+    def test_aggregates_per_tenant_windows(self, ingester, log_file):
+        """테넌트별 요청/바이트/상태 분류/분위수를 구간으로 집계하고, 테넌트 없는 줄과 깨진 줄은 무시"""
+        lines = [record("7", 1000 + i, rt=0.004) for i in range(9)]
+        lines += [record("7", 1010, status=502, size=200, rt=1.5), record("8", 1075, status=404)]
+        lines += [record("", 1000), "not json\n"]
+        log_file.write_text("".join(lines))
+        
+        assert ingester.poll(now=1100) == 11
+        assert sorted(path.name for path in ingester.windows_dir.iterdir()) == ["7.ring", "8.ring"]
+        window = ingester.load_windows("7", now=1100)[960]
+        assert (window["requests"], window["bytes"]) == (10, 9200)
+        assert (window["status"]["2xx"], window["status"]["5xx"]) == (9, 1)
+        assert latency_quantile(window["latency"], 0.5) == 5.0
+        assert latency_quantile(window["latency"], 0.99) == 2000.0
+        assert ingester.load_windows("8", now=1100)[1020]["status"]["4xx"] == 1
+    
+    def test_incremental_reads_skip_partial_line(self, ingester, log_file):
+        """쓰는 중인 마지막 줄은 다음 수집에서 읽고, 이미 읽은 줄은 다시 집계하지 않음"""
+        full = record("7", 1000)
+        log_file.write_text(full + full[:20])
+        assert ingester.poll(now=1000) == 1
+        assert ingester.poll(now=1000) == 0
+        
+        with open(log_file, "a") as f:
+            f.write(full[20:] + record("7", 1001))
+        assert ingester.poll(now=1000) == 2
+        assert ingester.load_windows("7", now=1000)[960]["requests"] == 3
+    
+    def test_rotation_drains_old_file(self, ingester, log_file):
+        """이름이 바뀐 이전 파일의 남은 줄을 읽은 뒤 새 파일을 처음부터 읽음"""
+        log_file.write_text(record("7", 1000))
+        ingester.poll(now=1000)
+        
+        with open(log_file, "a") as f:
+            f.write(record("7", 1001))
+        os.rename(log_file, log_file.with_name(log_file.name + ".1"))
+        log_file.write_text(record("7", 1002) + record("8", 1002))
+        
+        assert ingester.poll(now=1000) == 3
+        assert ingester.load_windows("7", now=1000)[960]["requests"] == 3
+        assert ingester.load_state()["checkpoint"] == {"inode": log_file.stat().st_ino, "offset": log_file.stat().st_size}
+    
+    def test_truncation_and_retention(self, ingester, log_file):
+        """copytruncate로 파일이 줄면 처음부터 읽고, 보관 기간이 지난 구간과 테넌트는 정리"""
+        log_file.write_text(record("7", 1000) + record("7", 1001) + record("8", 1000))
+        ingester.poll(now=1000)
+        size = ingester.ring("7").path.stat().st_size
+        
+        log_file.write_text(record("7", 1700))
+        assert ingester.poll(now=1700) == 1
+        assert list(ingester.load_windows("7", now=1700)) == [1680]
+        assert ingester.ring("7").path.stat().st_size == size
+        assert not ingester.ring("8").path.exists()
+        assert set(ingester.last_seen()[0]) == {"7"}
+        
+        stats = ingester.tenant_stats("7", minutes=10, now=1700)
+        assert stats["requests"] == 1 and stats["windows"][0]["start"] == 1680
+        assert ingester.overview(minutes=10, now=1700)["tenants"]["7"]["status"]["2xx"] == 1
+        assert ingester.tenant_stats("9")["latency_ms"]["p50"] is None
+    
+    def test_interrupted_batch_is_not_counted_twice(self, ingester, log_file):
+        """배치 단위로 체크포인트를 남기고, 체크포인트 전에 중단된 배치는 다시 읽어도 한 번만 집계"""
+        line = record("7", 1000)
+        log_file.write_text(line * 3)
+        save_state = ingester._save_state
+        calls = []
+        
+        def fail_second_batch(state):
+            calls.append(state["checkpoint"]["offset"])
+            if len(calls) == 2:
+                raise OSError("disk full")
+            save_state(state)
+        
+        with patch("app.services.access_log_service.READ_CHUNK_SIZE", len(line)):
+            with patch.object(ingester, "_save_state", side_effect=fail_second_batch):
+                with pytest.raises(OSError):
+                    ingester.poll(now=1000)
+            assert ingester.load_state()["checkpoint"]["offset"] == len(line)
+            
+            assert ingester.poll(now=1000) == 2
+        assert calls == [len(line), 2 * len(line)]
+        assert ingester.load_windows("7", now=1000)[960]["requests"] == 3
+        assert ingester.load_state()["checkpoint"]["offset"] == 3 * len(line)
+
+
+class TestTrafficRing:
+    """테넌트별 고정 크기 구간 집계 파일 테스트"""
+    
+    def test_slots_are_reused_after_retention(self, tmp_path):
+        """보관 구간 수가 지나면 같은 칸을 새 구간이 덮어쓰고, 늦게 도착한 오래된 구간은 버림"""
+        ring = TrafficRing(tmp_path / "7.ring", window_seconds=60, capacity=3)
+        window = {"requests": 1, "bytes": 10, "status": {"1xx": 0, "2xx": 1, "3xx": 0, "4xx": 0, "5xx": 0}, "latency": [1] + [0] * 13}
+        assert ring.merge({60: window, 120: window}, batch=1)
+        assert not ring.merge({60: window}, batch=1)
+        size = ring.path.stat().st_size
+        
+        assert ring.merge({240: window, 60: window}, batch=2)
+        assert sorted(ring.read(0, now=250)) == [120, 240]
+        assert ring.read(0, now=250)[240]["status"]["2xx"] == 1
+        assert ring.read(0, now=130)[120]["requests"] == 1
+        assert ring.path.stat().st_size == size
+
+
+class TestTenantLogTemplates:
+    """nginx 템플릿의 공유 로그 설정 테스트"""
+    
+    @pytest.mark.parametrize("template", ["user-hosting.conf.j2", "user-static.conf.j2"])
+    def test_templates_use_shared_buffered_log(self, template):
+        """테넌트별 로그 파일 대신 공유 JSON 로그를 버퍼링해서 기록"""
+        rendered = jinja2.Template((NGINX_DIR / "templates" / template).read_text()).render(
+            user_id="7", vm_id="vm-abc", vm_ip="127.0.0.1", web_port=8080, ssh_port=10000,
+            web_dir="/srv/www", static_root="/srv"
+        )
+        
+        assert "access_log /var/log/nginx/tenants.access.log tenant_json buffer=64k flush=5s;" in rendered
+        assert "hosting_7" not in rendered
+        
+        common = (NGINX_DIR / "sites-available" / "tenant-upstreams.conf").read_text()
+        assert "log_format tenant_json escape=json" in common
+        assert "map $request_uri $tenant" in common
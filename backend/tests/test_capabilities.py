@@ -0,0 +1,86 @@
+"""
+호스트 기능 탐지 캐시 테스트
+"""
+import pytest
+from unittest.mock import patch, MagicMock
+
+from app.services.capability_service import CapabilityDetector
+
+
+class TestCapabilityCache:
+    """기능 탐지 캐시 테스트"""
+
+    @pytest.fixture
+    def fake_tools(self, tmp_path):
+        """PATH에 가짜 도구 바이너리 생성"""
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        for tool in ["virsh", "qemu-img", "docker"]:
+            tool_path = bin_dir / tool
+            tool_path.write_text("#!/bin/sh\n")
+            tool_path.chmod(0o755)
+        with patch.dict("os.environ", {"PATH": str(bin_dir)}):
+            yield bin_dir
+
+    def _detector(self, tmp_path):
+        return CapabilityDetector(cache_path=str(tmp_path / "caps.json"), bridge_name="virbr0", max_age=0)
+
+    @patch("app.services.capability_service.subprocess.run")
+    def test_probe_writes_cache(self, mock_run, tmp_path, fake_tools):
+        """최초 탐지 시 캐시 파일 생성"""
+        mock_run.return_value = MagicMock(returncode=0, stdout="9.0.0\n", stderr="")
+
+        capabilities = self._detector(tmp_path).get()
+
+        assert capabilities.source == "probe"
+        assert capabilities.tool_available("virsh")
+        assert capabilities.tool_version("virsh") == "9.0.0"
+        assert not capabilities.tool_available("genisoimage")
+        assert (tmp_path / "caps.json").exists()
+        # PATH에 존재하는 도구만 fork
+        assert mock_run.call_count == 3
+
+    @patch("app.services.capability_service.subprocess.run")
+    def test_restart_reuses_cache_without_fork(self, mock_run, tmp_path, fake_tools):
+        """바이너리가 변경되지 않았으면 재시작 시 fork 없이 캐시 사용"""
+        mock_run.return_value = MagicMock(returncode=0, stdout="9.0.0\n", stderr="")
+        self._detector(tmp_path).get()
+        mock_run.reset_mock()
+
+        capabilities = self._detector(tmp_path).get()
+
+        assert capabilities.source == "cache"
+        assert capabilities.tool_available("docker")
+        mock_run.assert_not_called()
+
+    @patch("app.services.capability_service.subprocess.run")
+    def test_binary_change_invalidates_cache(self, mock_run, tmp_path, fake_tools):
+        """바이너리 교체 시 다시 탐지"""
+        mock_run.return_value = MagicMock(returncode=0, stdout="9.0.0\n", stderr="")
+        self._detector(tmp_path).get()
+
+        (fake_tools / "virsh").write_text("#!/bin/sh\n# upgraded\n")
+        mock_run.return_value = MagicMock(returncode=0, stdout="10.0.0\n", stderr="")
+
+        capabilities = self._detector(tmp_path).get()
+
+        assert capabilities.source == "probe"
+        assert capabilities.tool_version("virsh") == "10.0.0"
+
+    @patch("app.services.capability_service.subprocess.run")
+    def test_libvirt_daemon_checked_on_every_get(self, mock_run, tmp_path, fake_tools):
+        """virsh 클라이언트가 있어도 데몬 소켓이 없으면 사용 불가, 소켓은 캐시 없이 매번 확인"""
+        mock_run.return_value = MagicMock(returncode=0, stdout="9.0.0\n", stderr="")
+        socket_path = tmp_path / "libvirt-sock"
+        detector = self._detector(tmp_path)
+
+        with patch("app.services.capability_service.LIBVIRT_SOCKET_PATHS", (str(socket_path),)):
+            capabilities = detector.get()
+            assert capabilities.tool_available("virsh")
+            assert not capabilities.libvirt_daemon_available
+
+            socket_path.touch()
+            mock_run.reset_mock()
+            assert detector.get().libvirt_daemon_available
+            assert self._detector(tmp_path).get().to_dict()["libvirt_daemon"]["socket"] == str(socket_path)
+            mock_run.assert_not_called()
@@ -0,0 +1,97 @@
+"""
+호스트 용량 스케줄러 테스트
+"""
+import threading
+import pytest
+from unittest.mock import patch
+
+from app.models.user import User
+from app.models.hosting import Hosting, HostingStatus
+from app.services.capacity_service import CapacityScheduler, _read_cgroup_cpu_limit
+from app.core.exceptions import HostCapacityExceededError
+
+
+class TestCapacityScheduler:
+    """용량 승인 제어 테스트"""
+    
+    @pytest.fixture
+    def capacity(self):
+        """호스트 용량을 메모리 2048MB, CPU 4로 고정"""
+        with patch(
+            "app.services.capacity_service.host_capacity",
+            return_value={"memory_mb": 2048.0, "cpus": 4.0}
+        ):
+            yield
+    
+    @pytest.fixture
+    def running_hosting(self, db_session):
+        """메모리 1536MB를 사용 중인 호스팅"""
+        user = User(email="cap@example.com", username="cap_user", hashed_password="not-a-real-hash")
+        db_session.add(user)
+        db_session.commit()
+        hosting = Hosting(
+            user_id=user.id,
+            name="cap-hosting",
+            vm_id="vm-cap00001",
+            vm_ip="172.17.0.3",
+            ssh_port=10030,
+            status=HostingStatus.RUNNING,
+            memory_mb=1536,
+            cpus=1.0
+        )
+        db_session.add(hosting)
+        db_session.commit()
+        return hosting
+    
+    def test_rejects_when_host_full(self, db_session, capacity, running_hosting):
+        """커밋된 메모리 + 요청이 용량을 넘으면 즉시 503"""
+        scheduler = CapacityScheduler(max_concurrent=2, queue_size=2, queue_timeout=1)
+        
+        with pytest.raises(HostCapacityExceededError) as exc_info:
+            with scheduler.admit(db_session, 1, {"memory_mb": 1024, "cpus": 1.0}):
+                pass
+        
+        assert exc_info.value.status_code == 503
+        assert "Retry-After" in exc_info.value.headers
+        
+        with scheduler.admit(db_session, 1, {"memory_mb": 256, "cpus": 1.0}):
+            assert scheduler.status(db_session)["in_flight"] == 1
+    
+    def test_queues_beyond_concurrency_limit(self, db_session, capacity):
+        """동시 실행 한도를 넘는 요청은 대기열에서 순번을 받고 슬롯이 비면 진행"""
+        scheduler = CapacityScheduler(max_concurrent=1, queue_size=2, queue_timeout=5)
+        admitted = threading.Event()
+        
+        def waiter():
+            with scheduler.admit(db_session, 2, {}):
+                admitted.set()
+        
+        with scheduler.admit(db_session, 1, {}):
+            thread = threading.Thread(target=waiter)
+            thread.start()
+            for _ in range(100):
+                if scheduler.queue_position(2) == 1:
+                    break
+                threading.Event().wait(0.01)
+            assert scheduler.queue_position(2) == 1
+            assert not admitted.is_set()
+        
+        thread.join(timeout=5)
+        assert admitted.is_set()
+        assert scheduler.queue_position(2) is None
+    
+    def test_queue_full_rejected(self, db_session, capacity):
+        """대기열이 가득 차면 즉시 거부"""
+        scheduler = CapacityScheduler(max_concurrent=1, queue_size=0, queue_timeout=1)
+        
+        with scheduler.admit(db_session, 1, {}):
+            with pytest.raises(HostCapacityExceededError):
+                with scheduler.admit(db_session, 2, {}):
+                    pass
+    
+    def test_cgroup_cpu_limit(self, tmp_path):
+        """cgroup v2 cpu.max 파싱"""
+        (tmp_path / "cpu.max").write_text("150000 100000\n")
+        
+        with patch("app.services.capacity_service.CGROUP_ROOT", tmp_path):
+            assert _read_cgroup_cpu_limit() == 1.5
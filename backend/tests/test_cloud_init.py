@@ -0,0 +1,135 @@
+"""
+cloud-init 프로필 및 부팅 시간 측정 테스트
+"""
+import yaml
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from app.services.vm_service import VMService
+from app.services.boot_time_service import BootTimeRecorder
+from app.services.cloud_init_service import CloudInitSeedBuilder, _static_fragments
+from app.utils.iso9660 import build_iso, read_iso_files
+from app.core.exceptions import VMOperationError
+
+
+class TestCloudInitProfiles:
+    """프로필별 user-data 생성 테스트"""
+    
+    @pytest.fixture
+    def vm_service(self, tmp_path):
+        """환경 검증 없이 임시 경로를 사용하는 VM 서비스"""
+        service = VMService.__new__(VMService)
+        service.image_path = tmp_path
+        return service
+    
+    def load_user_data(self, tmp_path, vm_id):
+        text = (tmp_path / "cloud-init" / vm_id / "user-data").read_text(encoding="utf-8")
+        assert text.startswith("#cloud-config\n")
+        return yaml.safe_load(text)
+    
+    def create(self, vm_service, vm_id, profile):
+        # 외부 도구(genisoimage)가 호출되지 않아야 함
+        with patch("app.services.vm_service.subprocess.run", side_effect=AssertionError("subprocess 호출")):
+            return vm_service.create_cloud_init_config(vm_id, "7", ssh_public_key="ssh-rsa AAAA test", profile=profile)
+    
+    def test_minimal_profile_skips_packages(self, vm_service, tmp_path):
+        """minimal 프로필은 패키지 설치/업그레이드와 웹 설정이 없음"""
+        self.create(vm_service, "vm-ci000001", "minimal")
+        user_data = self.load_user_data(tmp_path, "vm-ci000001")
+        
+        assert user_data["package_update"] is False
+        assert user_data["package_upgrade"] is False
+        assert user_data["packages"] == []
+        assert user_data["write_files"] == []
+        assert not any("apt-get" in cmd for cmd in user_data["runcmd"])
+        assert not any("nginx" in cmd for cmd in user_data["runcmd"])
+    
+    def test_docker_profile_and_apt_proxy(self, vm_service, tmp_path):
+        """docker 프로필은 docker 그룹과 패키지를 포함하고 apt 프록시가 적용됨"""
+        with patch("app.services.vm_service.settings.CLOUD_INIT_APT_PROXY", "http://192.168.122.1:3142"):
+            self.create(vm_service, "vm-ci000002", "docker")
+        user_data = self.load_user_data(tmp_path, "vm-ci000002")
+        
+        assert user_data["apt"] == {"proxy": "http://192.168.122.1:3142"}
+        assert "docker.io" in user_data["packages"]
+        assert user_data["package_update"] is True
+        assert user_data["package_upgrade"] is False
+        assert "docker" in user_data["users"][1]["groups"]
+        assert user_data["write_files"][0]["path"] == "/etc/nginx/sites-available/default"
+    
+    def test_web_profile_seed_iso(self, vm_service, tmp_path):
+        """seed ISO는 cidata 볼륨에 user-data/meta-data를 담고, 환영 페이지에는 사용자 값만 치환됨"""
+        iso_path = self.create(vm_service, "vm-ci000005", "web")
+        assert iso_path == str(tmp_path / "cloud-init" / "vm-ci000005" / "cloud-init.iso")
+        
+        image = open(iso_path, "rb").read()
+        assert image[16 * 2048 + 40:16 * 2048 + 72].rstrip() == b"cidata"
+        
+        files = read_iso_files(image)
+        assert sorted(files) == ["meta-data", "user-data"]
+        assert files["user-data"] == (tmp_path / "cloud-init" / "vm-ci000005" / "user-data").read_bytes()
+        assert yaml.safe_load(files["meta-data"]) == {
+            "instance-id": "vm-ci000005",
+            "local-hostname": "vm-ci000005",
+            "public-keys": {"webhoster": "ssh-rsa AAAA test"}
+        }
+        
+        user_data = yaml.safe_load(files["user-data"])
+        welcome = user_data["write_files"][-1]
+        assert welcome["path"] == "/var/www/html/index.html"
+        assert "<code>vm-ci000005</code>" in welcome["content"]
+        assert "location ~ \\.php$ {" in user_data["write_files"][0]["content"]
+        assert user_data["users"][0]["sudo"] == "ALL=(ALL) NOPASSWD:ALL"
+    
+    def test_unknown_profile_rejected(self, vm_service):
+        """존재하지 않는 프로필은 오류"""
+        with pytest.raises(VMOperationError):
+            self.create(vm_service, "vm-ci000003", "full")
+    
+    def test_phone_home_measures_boot_time(self, vm_service, tmp_path):
+        """phone_home URL이 설정되고 완료 알림 시 프로필별 부팅 시간이 기록됨"""
+        with patch("app.services.boot_time_service.settings.CLOUD_INIT_PHONE_HOME_URL", "http://192.168.122.1:8000/api/v1/"):
+            self.create(vm_service, "vm-ci000004", "web")
+        user_data = self.load_user_data(tmp_path, "vm-ci000004")
+        
+        recorder = BootTimeRecorder(str(tmp_path))
+        token = recorder.phone_home_token("vm-ci000004")
+        assert user_data["phone_home"]["url"] == f"http://192.168.122.1:8000/api/v1/host/vm-ready/vm-ci000004/{token}"
+        assert recorder.verify_token("vm-ci000004", token)
+        assert not recorder.verify_token("vm-ci000004", "0" * 32)
+        
+        record = recorder.mark_ready("vm-ci000004")
+        assert record["profile"] == "web"
+        assert recorder.mark_ready("vm-ci000004") is None
+        
+        stats = recorder.stats()
+        assert stats["web"]["count"] == 1
+        assert stats["web"]["p95_seconds"] == record["seconds"]
+
+
+class TestIso9660:
+    """프로세스 내 ISO 생성 테스트"""
+    
+    def test_round_trip_and_deterministic(self):
+        """같은 입력과 시각이면 같은 이미지가 생성되고 원래 파일 이름으로 읽힘"""
+        files = {"user-data": b"#cloud-config\n", "meta-data": b"instance-id: vm-1\n"}
+        timestamp = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        
+        image = build_iso(files, timestamp=timestamp)
+        assert image == build_iso(dict(reversed(list(files.items()))), timestamp=timestamp)
+        assert len(image) % 2048 == 0
+        assert image[16 * 2048 + 1:16 * 2048 + 6] == b"CD001"
+        assert read_iso_files(image) == files
+    
+    def test_builder_reuses_static_fragments(self, tmp_path):
+        """정적 조각은 프로필별로 한 번만 렌더링되고 VM별 값만 달라짐"""
+        _static_fragments.cache_clear()
+        builder = CloudInitSeedBuilder(str(tmp_path))
+        first, _ = builder.render("vm-ci000006", "7", "ssh-rsa AAAA one", profile="docker")
+        second, _ = builder.render("vm-ci000007", "8", "ssh-rsa AAAA two", profile="docker")
+        
+        assert _static_fragments.cache_info().misses == 1
+        assert _static_fragments.cache_info().hits == 1
+        assert "vm-ci000006" in first and "vm-ci000007" not in first
+        assert yaml.safe_load(first)["runcmd"][:-4] == yaml.safe_load(second)["runcmd"][:-4]
@@ -0,0 +1,96 @@
+"""
+테넌트 전용 브리지 네트워크 테스트
+"""
+import subprocess
+import pytest
+from unittest.mock import patch
+
+from app.services import vm_service as vm_module
+from app.services.vm_service import VMService
+
+
+class FakeDocker:
+    """docker CLI 호출을 기록하는 대역 (네트워크는 처음에 없음)"""
+    
+    def __init__(self):
+        self.calls = []
+        self.networks = set()
+    
+    def run(self, command, **kwargs):
+        self.calls.append(command)
+        args = command[1:]
+        if args[:2] == ["network", "inspect"]:
+            return subprocess.CompletedProcess(command, 0 if args[2] in self.networks else 1, "[]", "")
+        if args[:2] == ["network", "create"]:
+            self.networks.add(args[-1])
+        if args[0] == "inspect":
+            stdout = "172.30.0.5" if "IPAddress" in args[2] else "true"
+            return subprocess.CompletedProcess(command, 0, stdout, "")
+        return subprocess.CompletedProcess(command, 0, "container-id", "")
+    
+    def commands(self, *prefix):
+        return [call for call in self.calls if call[1:1 + len(prefix)] == list(prefix)]
+
+
+@pytest.fixture
+def docker():
+    fake = FakeDocker()
+    vm_module._ready_networks.clear()
+    with patch("app.services.vm_service.subprocess.run", side_effect=fake.run), \
+         patch("app.services.vm_service.time.sleep"), \
+         patch("app.services.vm_service.settings.CONTAINER_NETWORK_MODE", "bridge"):
+        yield fake
+    vm_module._ready_networks.clear()
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = VMService.__new__(VMService)
+    service.image_path = tmp_path
+    with patch.object(VMService, "_test_container_connection", return_value=True):
+        yield service
+
+
+class TestTenantNetwork:
+    """호스트 포트 게시 없는 컨테이너 네트워크 테스트"""
+    
+    def test_create_without_published_web_port(self, service, docker):
+        """웹 포트를 게시하지 않고 전용 네트워크의 컨테이너 IP:80으로 라우팅"""
+        first = service.create_vm("vm-net00001", 10041, "1")
+        service.create_vm("vm-net00002", 10042, "2")
+        
+        assert (first["vm_ip"], first["web_port"]) == ("172.30.0.5", 80)
+        assert len(docker.commands("network", "create")) == 1
+        create = docker.commands("network", "create")[0]
+        assert "com.docker.network.bridge.enable_icc=false" in create
+        assert "172.30.0.0/16" in create
+        
+        run = docker.commands("run")[0]
+        assert run[run.index("--network") + 1] == "webhost-net"
+        assert run[run.index("--network-alias") + 1] == "vm-net00001"
+        assert [run[i + 1] for i, arg in enumerate(run) if arg == "-p"] == ["10041:22"]
+        assert not docker.commands("port")
+    
+    def test_remote_node_keeps_published_port(self, service, docker):
+        """원격 노드는 프록시가 노드 주소로 접근해야 하므로 웹 포트 게시"""
+        result = service.create_vm("vm-net00003", 10043, "3", docker_host="tcp://10.0.0.12:2376", node_address="10.0.0.12")
+        
+        run = docker.commands("-H", "tcp://10.0.0.12:2376", "run")[0]
+        assert "--network" not in run
+        assert f"{result['web_port']}:80" in run
+        assert not docker.commands("network", "create")
+    
+    def test_recreate_keeps_ip_and_republishes_for_remote(self, service, docker):
+        """같은 호스트에서 다시 만들면 IP 유지, 원격 노드로 옮기면 웹 포트 다시 게시"""
+        spec = {
+            "image": "nginx:alpine", "ports": ["10044:22"], "network": "webhost-net",
+            "ip": "172.30.0.9", "binds": [], "env": [], "running": True
+        }
+        
+        service._run_container("vm-net00004", "nginx:alpine", service._network_spec("vm-net00004", spec))
+        run = docker.commands("run")[0]
+        assert run[run.index("--ip") + 1] == "172.30.0.9"
+        
+        remote = service._network_spec("vm-net00004", spec, "tcp://10.0.0.12:2376")
+        assert remote["network"] is None
+        assert remote["ports"][0].endswith(":80") and remote["ports"][1] == "10044:22"
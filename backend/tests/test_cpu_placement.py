@@ -0,0 +1,171 @@
+"""
+vCPU/NUMA 배치 테스트
+"""
+import pytest
+import xml.etree.ElementTree as ET
+from unittest.mock import patch
+
+from app.models.user import User
+from app.models.hosting import Hosting, HostingStatus
+from app.services.cpu_placement_service import (
+    CpuPlacementEngine,
+    CpuTopology,
+    Placement,
+    format_cpulist,
+    parse_cpulist,
+    read_cpu_topology
+)
+from app.services.vm_service import VMService
+
+
+@pytest.fixture
+def user(db_session):
+    """테스트 사용자 생성"""
+    user = User(email="numa@example.com", username="numa_user", hashed_password="not-a-real-hash")
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    return user
+
+
+@pytest.fixture
+def topology():
+    """NUMA 노드 2개, 노드당 물리 코어 2개 x 하이퍼스레드 2개 (노드 0: 0,1,4,5 / 노드 1: 2,3,6,7)"""
+    return CpuTopology(
+        nodes={0: [0, 1, 4, 5], 1: [2, 3, 6, 7]},
+        node_memory_mb={0: 4096, 1: 4096},
+        siblings={0: [0, 4], 4: [0, 4], 1: [1, 5], 5: [1, 5], 2: [2, 6], 6: [2, 6], 3: [3, 7], 7: [3, 7]}
+    )
+
+
+def add_hosting(db_session, user, vm_id, ssh_port, placement, memory_mb=512):
+    hosting = Hosting(
+        user_id=user.id, name=vm_id, vm_id=vm_id, vm_ip="0.0.0.0", ssh_port=ssh_port,
+        status=HostingStatus.RUNNING, memory_mb=memory_mb,
+        cpuset=placement.cpuset if placement else None,
+        numa_node=placement.numa_node if placement else None
+    )
+    db_session.add(hosting)
+    db_session.commit()
+    return hosting
+
+
+class TestCpuTopology:
+    """sysfs 토폴로지 읽기 테스트"""
+    
+    def test_cpulist_format(self):
+        """커널 CPU 목록 형식 변환"""
+        assert parse_cpulist("0-3,8,10-11\n") == [0, 1, 2, 3, 8, 10, 11]
+        assert format_cpulist([11, 0, 1, 2, 3, 8, 10]) == "0-3,8,10-11"
+    
+    def test_read_sysfs(self, tmp_path):
+        """노드별 CPU/메모리와 형제 스레드를 읽고 오프라인 CPU는 제외"""
+        (tmp_path / "cpu").mkdir()
+        (tmp_path / "cpu" / "online").write_text("0-2\n")
+        for node, cpus in ((0, "0-1"), (1, "2-3")):
+            node_dir = tmp_path / "node" / f"node{node}"
+            node_dir.mkdir(parents=True)
+            (node_dir / "cpulist").write_text(cpus + "\n")
+            (node_dir / "meminfo").write_text(f"Node {node} MemTotal:       2097152 kB\nNode {node} MemFree:  1 kB\n")
+        topology_dir = tmp_path / "cpu" / "cpu0" / "topology"
+        topology_dir.mkdir(parents=True)
+        (topology_dir / "thread_siblings_list").write_text("0-1\n")
+        
+        topology = read_cpu_topology(tmp_path)
+        
+        assert topology.nodes == {0: [0, 1], 1: [2]}
+        assert topology.node_memory_mb == {0: 2048, 1: 2048}
+        assert topology.siblings[0] == [0, 1]
+        assert topology.siblings[2] == [2]
+    
+    def test_without_numa(self, tmp_path):
+        """NUMA 정보가 없으면 온라인 CPU 전체를 노드 0으로 간주"""
+        (tmp_path / "cpu").mkdir()
+        (tmp_path / "cpu" / "online").write_text("0-3\n")
+        assert read_cpu_topology(tmp_path).nodes == {0: [0, 1, 2, 3]}
+
+
+class TestCpuPlacementEngine:
+    """배치/재배치 테스트"""
+    
+    def test_spreads_across_nodes_and_cores(self, db_session, user, topology):
+        """예약 CPU를 제외하고 한가한 노드와 한가한 물리 코어 순으로 배정"""
+        engine = CpuPlacementEngine(db_session, topology)
+        
+        first = engine.place("vm-numa0001", 2)
+        assert first.numa_node == 1
+        assert first.cpus == [2, 3]
+        add_hosting(db_session, user, "vm-numa0001", 10070, first)
+        
+        second = engine.place("vm-numa0002", 2)
+        assert second.numa_node == 0
+        assert 0 not in second.cpus
+        assert second.cpus == [1, 4]
+    
+    def test_memory_bound_node_skipped(self, db_session, user, topology):
+        """메모리가 부족한 노드에는 배치하지 않음"""
+        engine = CpuPlacementEngine(db_session, topology)
+        add_hosting(db_session, user, "vm-numa0003", 10071, engine.place("vm-numa0003", 1), memory_mb=4000)
+        
+        placement = engine.place("vm-numa0004", 1, memory_mb=512)
+        assert placement.numa_node == 0
+    
+    def test_rebalance_after_delete(self, db_session, user, topology):
+        """삭제 후 같은 노드 안에서 CPU별 부하 차이가 1 이하가 되도록 재배치"""
+        engine = CpuPlacementEngine(db_session, topology)
+        stacked = add_hosting(db_session, user, "vm-numa0010", 10080, Placement(1, [2, 2]))
+        add_hosting(db_session, user, "vm-numa0011", 10081, Placement(1, [3]))
+        add_hosting(db_session, user, "vm-numa0012", 10082, Placement(1, [6]))
+        deleted = add_hosting(db_session, user, "vm-numa0013", 10083, Placement(1, [7]))
+        assert engine.rebalance() == []
+        
+        db_session.delete(deleted)
+        db_session.commit()
+        moves = engine.rebalance()
+        
+        assert moves == [{"vm_id": "vm-numa0010", "numa_node": 1, "cpus": [7, 2], "moved": [(0, 2, 7)]}]
+        assert stacked.cpuset == "7,2"
+        assert {cpu: engine.status()["cpu_load"][str(cpu)] for cpu in (2, 3, 6, 7)} == {2: 1, 3: 1, 6: 1, 7: 1}
+    
+    def test_disabled(self, db_session, topology):
+        """배치가 비활성화되면 배정하지 않음"""
+        with patch("app.services.cpu_placement_service.settings.VM_CPU_PLACEMENT_ENABLED", False):
+            assert CpuPlacementEngine(db_session, topology).place("vm-numa0020", 1) is None
+
+
+class TestDomainPlacementXml:
+    """도메인 XML의 cputune/numatune 테스트"""
+    
+    def test_domain_xml_placement(self, topology):
+        """고정 프로필은 vCPU별 vcpupin, 그 외에는 노드 CPU 범위와 preferred 메모리 정책"""
+        service = VMService.__new__(VMService)
+        service.bridge_name = "virbr0"
+        
+        with patch("app.services.vm_service.get_cpu_topology", return_value=topology):
+            pinned = ET.fromstring(service.create_vm_xml(
+                "vm-numa0030", "/tmp/disk.qcow2", 10022, vcpus=2, profile="throughput", cpuset=[6, 7], numa_node=1
+            ))
+            floating = ET.fromstring(service.create_vm_xml(
+                "vm-numa0031", "/tmp/disk.qcow2", 10023, vcpus=2, profile="balanced", cpuset=[6, 7], numa_node=1
+            ))
+        
+        assert [pin.get("cpuset") for pin in pinned.findall("cputune/vcpupin")] == ["6", "7"]
+        assert pinned.find("numatune/memory").attrib == {"mode": "strict", "nodeset": "1"}
+        assert floating.find("cputune") is None
+        assert floating.find("vcpu").get("cpuset") == "2-3,6-7"
+        assert floating.find("numatune/memory").attrib == {"mode": "preferred", "nodeset": "1"}
+    
+    def test_container_placement(self):
+        """컨테이너는 배정된 CPU를 --cpuset-cpus로 받고, 재배치는 virsh 대신 docker update로 반영"""
+        assert VMService._resource_flags(None, {"cpus": 2, "cpuset": "7,2"}) == [
+            "--cpus", "2", "--cpuset-cpus", "2,7"
+        ]
+        
+        service = VMService.__new__(VMService)
+        with patch.object(VMService, "_has_domain", return_value=False), \
+             patch.object(VMService, "_docker") as docker, \
+             patch("app.services.vm_service.subprocess.run") as run:
+            assert service.apply_cpu_placement("vm-numa0040", [7, 2]) is True
+        
+        docker.assert_called_once_with(None, "update", "--cpuset-cpus", "2,7", "webhost-vm-numa0040")
+        run.assert_not_called()
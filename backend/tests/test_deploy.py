@@ -0,0 +1,163 @@
+"""
+웹 디렉토리 배포(릴리스 링크 교체) 테스트
+"""
+import asyncio
+import io
+import os
+import tarfile
+import zipfile
+import pytest
+from unittest.mock import patch
+
+from app.core.exceptions import InvalidDeployError, DeployTooLargeError
+from app.services.deploy_service import SiteDeployer, ensure_container_web_link
+from app.services.vm_service import VMService
+
+
+def tar_bytes(files, compression="gz"):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode=f"w:{compression}") as tar:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+def zip_bytes(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for name, content in files.items():
+            zip_file.writestr(name, content)
+    return buffer.getvalue()
+
+
+async def stream(data, chunk_size=1000):
+    for offset in range(0, len(data), chunk_size):
+        yield data[offset:offset + chunk_size]
+
+
+class FakeUpload:
+    """filename과 비동기 read(size)만 가진 업로드 대역"""
+    
+    def __init__(self, filename, content):
+        self.filename = filename
+        self.buffer = io.BytesIO(content)
+    
+    async def read(self, size=-1):
+        return self.buffer.read(size)
+
+
+@pytest.fixture
+def site_dir(tmp_path):
+    site_dir = tmp_path / "containers" / "vm-dep0001"
+    (site_dir / "www").mkdir(parents=True)
+    (site_dir / "www" / "index.html").write_text("legacy")
+    ensure_container_web_link(site_dir)
+    return site_dir
+
+
+class TestSiteDeployer:
+    """스트리밍 배포와 링크 교체 테스트"""
+    
+    def test_deploy_swaps_link_and_rolls_back(self, site_dir):
+        """압축 파일을 새 릴리스로 풀고 상대 링크로 교체, 기존 웹 디렉토리는 롤백 대상으로 유지"""
+        deployer = SiteDeployer(site_dir)
+        archive = tar_bytes({"index.html": b"v1", "css/site.css": b"body{}"})
+        
+        result = asyncio.run(deployer.deploy_archive(stream(archive)))
+        
+        assert os.readlink(site_dir / "www") == f"releases/{result['release_id']}"
+        # 컨테이너 웹 루트(/var/www/html)가 따라가는 경로
+        assert (site_dir / "html" / "index.html").read_text() == "v1"
+        assert (site_dir / "www" / "css" / "site.css").read_text() == "body{}"
+        assert result["received_bytes"] == len(archive) and result["files"] == 2
+        assert not [path for path in (site_dir / "releases").iterdir() if path.name.startswith(".")]
+        
+        rolled_back = deployer.rollback()
+        assert rolled_back["release_id"] == result["previous_release_id"]
+        assert (site_dir / "www" / "index.html").read_text() == "legacy"
+        assert [release["current"] for release in deployer.list_releases()] == [False, True]
+    
+    def test_rejects_unsafe_archive_without_touching_site(self, site_dir):
+        """릴리스 밖을 가리키는 경로는 거부하고 현재 웹 디렉토리와 스테이징은 그대로/정리"""
+        deployer = SiteDeployer(site_dir)
+        for archive in (tar_bytes({"../escape.html": b"x"}), zip_bytes({"/etc/passwd": b"x"}), b"not an archive"):
+            with pytest.raises(InvalidDeployError):
+                asyncio.run(deployer.deploy_archive(stream(archive)))
+        
+        assert not (site_dir / "www").is_symlink()
+        assert (site_dir / "www" / "index.html").read_text() == "legacy"
+        assert not (site_dir.parent / "escape.html").exists()
+        assert list((site_dir / "releases").iterdir()) == []
+    
+    def test_size_limits(self, site_dir):
+        """업로드 크기와 실제 압축 해제 크기 제한 (압축 폭탄)"""
+        deployer = SiteDeployer(site_dir)
+        bomb = zip_bytes({"zeros.bin": b"\0" * (3 * 1024 * 1024)})
+        with patch("app.services.deploy_service.settings.DEPLOY_MAX_EXTRACTED_MB", 1):
+            with pytest.raises(DeployTooLargeError):
+                asyncio.run(deployer.deploy_archive(stream(bomb)))
+        with patch("app.services.deploy_service.settings.DEPLOY_MAX_UPLOAD_MB", 1):
+            with pytest.raises(DeployTooLargeError):
+                asyncio.run(deployer.deploy_archive(stream(b"x" * (2 * 1024 * 1024), 64 * 1024)))
+        assert (site_dir / "www" / "index.html").read_text() == "legacy"
+    
+    def test_multi_file_deploy_precompresses_and_prunes(self, site_dir):
+        """여러 파일 업로드는 디렉토리를 유지하고, 정적 호스팅은 교체 전에 .gz 생성, 오래된 릴리스 정리"""
+        deployer = SiteDeployer(site_dir, precompress_files=True)
+        page = b"<html>" + b"hello " * 500 + b"</html>"
+        
+        with patch("app.services.deploy_service.settings.DEPLOY_KEEP_RELEASES", 2):
+            results = [
+                asyncio.run(deployer.deploy_files([FakeUpload("index.html", page), FakeUpload("js/app.js", b"1;")]))
+                for _ in range(3)
+            ]
+        
+        assert (site_dir / "www" / "index.html").read_bytes() == page
+        assert (site_dir / "www" / "index.html.gz").exists()
+        assert (site_dir / "www" / "js" / "app.js").read_bytes() == b"1;"
+        # 같은 초에 만든 릴리스도 생성 순서대로 정렬되어 기존 웹 디렉토리와 첫 릴리스가 정리됨
+        assert [release["release_id"] for release in deployer.list_releases()] == [results[2]["release_id"], results[1]["release_id"]]
+        assert results[0]["pruned"] == [] and results[1]["pruned"] == [results[0]["previous_release_id"]]
+        assert results[2]["pruned"] == [results[0]["release_id"]]
+        assert results[2]["previous_release_id"] == results[1]["release_id"]
+    
+    def test_release_ids_sort_in_creation_order(self, site_dir):
+        """순번이 같은 초의 릴리스 순서를 정하고, 이전 형식 ID는 순번 릴리스보다 먼저"""
+        deployer = SiteDeployer(site_dir)
+        with patch("app.services.deploy_service.time.time", return_value=1_800_000_000):
+            first = deployer._release_id(9)
+            second = deployer._release_id(10)
+        assert first.startswith("000009-") and first[7:] == second[7:]
+        assert deployer._release_order("20270115-080000-abcdef") < deployer._release_order(deployer._release_id(0))
+        assert deployer._release_order(first) < deployer._release_order(second)
+
+
+class TestSiteMount:
+    """기존 컨테이너의 사이트 디렉토리 마운트 전환 테스트"""
+    
+    def test_legacy_web_dir_mount_is_recreated_once(self, tmp_path):
+        """웹 디렉토리만 마운트한 컨테이너는 커밋 후 사이트 디렉토리 마운트로 다시 생성"""
+        service = VMService.__new__(VMService)
+        service.image_path = tmp_path
+        site_dir = tmp_path / "containers" / "vm-dep0001"
+        (site_dir / "www").mkdir(parents=True)
+        spec = {
+            "image": "nginx:alpine", "ports": ["8001:80"], "network": None, "ip": None,
+            "binds": [f"{site_dir}/www:/var/www/html"], "env": ["USER_ID=7"], "running": True
+        }
+        
+        with patch.object(VMService, "_container_spec", return_value=spec), \
+             patch.object(VMService, "_docker") as docker:
+            assert service.ensure_site_mount("vm-dep0001") is True
+            commands = [call.args[1:] for call in docker.call_args_list]
+            assert commands[0][0] == "commit" and commands[1][:2] == ("rm", "-f")
+            assert f"{site_dir.resolve()}:/var/www" in commands[2]
+            assert f"{site_dir}/www:/var/www/html" not in commands[2]
+            assert os.readlink(site_dir / "html") == "www"
+            
+            docker.reset_mock()
+            spec["binds"] = [f"{site_dir}:/var/www"]
+            assert service.ensure_site_mount("vm-dep0001") is False
+            docker.assert_not_called()
@@ -0,0 +1,88 @@
+"""
+libvirt 도메인 MAC/UUID 할당 테스트
+"""
+import pytest
+from unittest.mock import patch
+
+from app.models.user import User
+from app.models.hosting import Hosting, HostingStatus
+from app.services.domain_identity_service import (
+    DomainIdentityAllocator,
+    derive_mac_address,
+    derive_domain_uuid
+)
+from app.services.vm_service import VMService
+from app.core.exceptions import VMOperationError
+
+
+@pytest.fixture
+def user(db_session):
+    """테스트 사용자 생성"""
+    user = User(email="mac@example.com", username="mac_user", hashed_password="not-a-real-hash")
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    return user
+
+
+def add_hosting(db_session, user, vm_id, ssh_port, mac_address, domain_uuid):
+    hosting = Hosting(
+        user_id=user.id, name=vm_id, vm_id=vm_id, vm_ip="0.0.0.0", ssh_port=ssh_port,
+        status=HostingStatus.RUNNING, mac_address=mac_address, domain_uuid=domain_uuid
+    )
+    db_session.add(hosting)
+    db_session.commit()
+    return hosting
+
+
+class TestDomainIdentityAllocator:
+    """MAC/UUID 할당 및 검증 테스트"""
+    
+    def test_deterministic_derivation(self):
+        """같은 vm_id는 항상 같은 MAC/UUID"""
+        assert derive_mac_address("vm-mac00001") == derive_mac_address("vm-mac00001")
+        assert derive_mac_address("vm-mac00001") != derive_mac_address("vm-mac00001", attempt=1)
+        assert derive_mac_address("vm-mac00001").startswith("52:54:00:")
+        assert len(derive_mac_address("vm-mac00001")) == 17
+        assert derive_domain_uuid("vm-mac00001") == derive_domain_uuid("vm-mac00001")
+        assert derive_domain_uuid("vm-mac00001") != derive_domain_uuid("vm-mac00002")
+    
+    def test_mac_collision_uses_next_candidate(self, db_session, user):
+        """다른 호스팅이 이미 사용 중인 MAC이면 다음 후보 사용"""
+        add_hosting(db_session, user, "vm-other001", 10060, derive_mac_address("vm-mac00001"), None)
+        
+        mac_address, domain_uuid = DomainIdentityAllocator(db_session).allocate("vm-mac00001")
+        
+        assert mac_address == derive_mac_address("vm-mac00001", attempt=1)
+        assert domain_uuid == derive_domain_uuid("vm-mac00001")
+    
+    def test_exhausted_candidates_rejected(self, db_session):
+        """모든 후보가 사용 중이면 오류"""
+        allocator = DomainIdentityAllocator(db_session)
+        with patch("app.services.domain_identity_service.MAX_MAC_ATTEMPTS", 0):
+            with pytest.raises(VMOperationError):
+                allocator.allocate("vm-mac00001")
+    
+    def test_verify_against_dumpxml(self, db_session, user):
+        """dumpxml 결과와 DB를 대조해 불일치/중복/누락을 보고"""
+        service = VMService.__new__(VMService)
+        service.bridge_name = "virbr0"
+        
+        for index, vm_id in enumerate(["vm-ok000001", "vm-bad00001", "vm-gone0001"]):
+            mac_address, domain_uuid = DomainIdentityAllocator(db_session).allocate(vm_id)
+            add_hosting(db_session, user, vm_id, 10061 + index, mac_address, domain_uuid)
+        
+        allocator = DomainIdentityAllocator(db_session)
+        domain_xmls = {
+            "vm-ok000001": service.create_vm_xml("vm-ok000001", "/tmp/a.qcow2", 10061),
+            "vm-bad00001": service.create_vm_xml("vm-bad00001", "/tmp/b.qcow2", 10062, mac_address=derive_mac_address("vm-ok000001")),
+            "vm-stray001": "<domain><name>vm-stray001</name></domain>"
+        }
+        report = allocator.verify(domain_xmls)
+        
+        assert report["ok"] == 1
+        assert report["mismatched"][0]["domain"] == "vm-bad00001"
+        assert report["mismatched"][0]["problems"][0]["field"] == "mac_address"
+        assert report["unknown_domains"] == ["vm-stray001"]
+        assert report["missing_domains"] == ["vm-gone0001"]
+        assert report["duplicate_macs"] == {derive_mac_address("vm-ok000001"): ["vm-bad00001", "vm-ok000001"]}
@@ -0,0 +1,112 @@
+"""
+libvirt 도메인 XML 생성 테스트
+"""
+import pytest
+import xml.etree.ElementTree as ET
+from unittest.mock import patch
+
+from app.core.domain_profiles import select_domain_profile
+from app.services.domain_xml_service import (
+    METADATA_NAMESPACE,
+    build_domain_xml,
+    compile_domain_template
+)
+from app.services.vm_service import VMService
+from app.core.exceptions import VMOperationError
+
+MAC = "52:54:00:12:34:56"
+UUID = "6f1c2a4e-9b3d-5e7f-8a10-2c4b6d8e0f12"
+
+
+def build(profile, **kwargs):
+    values = {"cloud_init_iso": "/tmp/seed.iso", "vcpus": 2, "memory_mb": 1024}
+    values.update(kwargs)
+    xml = build_domain_xml("vm-dom00001", "/tmp/disk.qcow2", MAC, UUID, "virbr0", profile=profile, **values)
+    return ET.fromstring(xml)
+
+
+class TestDomainXmlBuilder:
+    """프로필별 도메인 정의 테스트"""
+    
+    def test_legacy_profile_matches_previous_layout(self):
+        """legacy 프로필은 i440fx + IDE cdrom, 디스크 튜닝 없음"""
+        domain = build("legacy")
+        
+        assert domain.find("os/type").get("machine") == "pc-i440fx-2.9"
+        assert domain.find("devices/disk[@device='cdrom']/target").get("bus") == "ide"
+        assert domain.find("devices/disk[@device='disk']/driver").get("cache") is None
+        assert domain.find("devices/rng") is None
+        assert domain.find(".//address") is None
+    
+    def test_balanced_profile(self):
+        """balanced 프로필은 q35 + SATA cdrom + cache=none/io=native + virtio-rng"""
+        domain = build("balanced")
+        driver = domain.find("devices/disk[@device='disk']/driver")
+        
+        assert domain.findtext("name") == "vm-dom00001"
+        assert domain.findtext("uuid") == UUID
+        assert domain.find("os/type").get("machine") == "q35"
+        assert domain.find("devices/disk[@device='cdrom']/target").get("bus") == "sata"
+        assert (driver.get("cache"), driver.get("io"), driver.get("iothread")) == ("none", "native", "1")
+        assert domain.findtext("iothreads") == "1"
+        assert domain.find("devices/rng").get("model") == "virtio"
+        assert domain.find("devices/interface/mac").get("address") == MAC
+        assert domain.find(f"metadata/{{{METADATA_NAMESPACE}}}instance").get("profile") == "balanced"
+    
+    def test_throughput_profile_with_pinning(self):
+        """throughput 프로필은 virtio-scsi, hugepages, 멀티큐, vCPU 고정 사용"""
+        domain = build("throughput", vcpus=2, cpuset=[4, 5, 6])
+        
+        assert domain.find("devices/disk[@device='disk']/target").attrib == {"dev": "sda", "bus": "scsi"}
+        assert domain.find("devices/controller[@type='scsi']").get("model") == "virtio-scsi"
+        assert domain.find("devices/controller/driver").get("queues") == "2"
+        assert domain.find("devices/interface/driver").get("queues") == "2"
+        assert domain.find("memoryBacking/hugepages/page") is not None
+        assert [pin.get("cpuset") for pin in domain.findall("cputune/vcpupin")] == ["4", "5"]
+        assert domain.find("cputune/emulatorpin").get("cpuset") == "4,5,6"
+    
+    def test_missing_iso_and_pinning_omitted(self):
+        """cloud-init ISO와 CPU 목록이 없으면 cdrom/cputune 생략"""
+        domain = build("throughput", cloud_init_iso=None)
+        assert domain.find("devices/disk[@device='cdrom']") is None
+        assert domain.find("cputune") is None
+    
+    def test_template_compiled_once(self):
+        """템플릿은 프로필별로 한 번만 구성되고 VM별 값은 템플릿에 남지 않음"""
+        compile_domain_template.cache_clear()
+        build("balanced")
+        build("balanced")
+        
+        assert compile_domain_template.cache_info().misses == 1
+        assert not compile_domain_template("balanced").findtext("name")
+    
+    def test_invalid_values_rejected(self):
+        """잘못된 VM별 값과 프로필은 거부"""
+        with pytest.raises(VMOperationError):
+            build_domain_xml("vm-dom00001", "/tmp/disk.qcow2", "not-a-mac", UUID, "virbr0")
+        with pytest.raises(VMOperationError):
+            build("throughput", memory_mb=1023)
+        with pytest.raises(ValueError):
+            build("unknown")
+    
+    def test_experiment_split(self):
+        """A/B 실험 중이면 vm_id별로 고정된 프로필을 고르게 분배"""
+        vm_ids = [f"vm-ab{i:06d}" for i in range(200)]
+        with patch("app.core.domain_profiles.settings.VM_DOMAIN_PROFILE_EXPERIMENT", ["balanced", "throughput"]):
+            chosen = [select_domain_profile(vm_id) for vm_id in vm_ids]
+            assert chosen == [select_domain_profile(vm_id) for vm_id in vm_ids]
+        
+        assert 60 < chosen.count("throughput") < 140
+        assert select_domain_profile("vm-ab000001") == "balanced"
+    
+    def test_vm_service_uses_builder(self, tmp_path):
+        """VMService는 존재하는 ISO만 연결하고 vm_id에서 유도한 값을 사용"""
+        service = VMService.__new__(VMService)
+        service.bridge_name = "virbr0"
+        
+        xml = service.create_vm_xml("vm-dom00002", "/tmp/disk.qcow2", 10022, cloud_init_iso=str(tmp_path / "missing.iso"))
+        domain = ET.fromstring(xml)
+        
+        assert domain.find("devices/disk[@device='cdrom']") is None
+        assert domain.find("devices/interface/mac").get("address").startswith("52:54:00:")
+        assert domain.find("devices/interface/source").get("bridge") == "virbr0"
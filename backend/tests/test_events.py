@@ -0,0 +1,46 @@
+"""
+애플리케이션 시작/종료 이벤트의 백그라운드 작업 테스트
+"""
+import asyncio
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from app.core import events
+from app.main import app
+
+LOOPS = (
+    "background_cleanup_task", "provisioning_sweep_task", "orphan_gc_task", "static_promotion_task",
+    "proxy_cache_cap_task", "access_log_ingest_task", "scale_to_zero_task", "usage_collect_task"
+)
+
+
+class TestBackgroundTasks:
+    """시작 이벤트에서 주기 작업 예약, 종료 이벤트에서 취소"""
+    
+    def test_startup_schedules_enabled_loops_and_shutdown_cancels(self):
+        """설정 플래그가 켜진 작업만 시작 이벤트에서 예약되고 종료 시 모두 취소됨 (DEBUG와 무관)"""
+        started, cancelled = [], []
+        
+        def fake_loop(name):
+            async def loop():
+                started.append(name)
+                try:
+                    await asyncio.Event().wait()
+                except asyncio.CancelledError:
+                    cancelled.append(name)
+                    raise
+            loop.__name__ = name
+            return loop
+        
+        with patch.multiple(events, **{name: fake_loop(name) for name in LOOPS}), \
+             patch.object(events.settings, "DEBUG", True), \
+             patch.object(events.settings, "SCALE_TO_ZERO_ENABLED", True), \
+             patch.object(events.settings, "USAGE_COLLECT_ENABLED", False):
+            with TestClient(app) as client:
+                client.get("/health")
+                assert sorted(task.get_name() for task in events._background_tasks) == sorted(
+                    name for name in LOOPS if name != "usage_collect_task"
+                )
+            
+            assert sorted(started) == sorted(cancelled) == sorted(name for name in LOOPS if name != "usage_collect_task")
+            assert events._background_tasks == []
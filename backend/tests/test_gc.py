@@ -0,0 +1,148 @@
+"""
+고아 리소스 GC 테스트
+"""
+import os
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+
+from app.models.user import User
+from app.models.hosting import Hosting, HostingStatus
+from app.services.gc_service import OrphanCollector
+
+
+class TestOrphanCollector:
+    """고아 리소스 수집기 테스트"""
+    
+    @pytest.fixture
+    def hosting(self, db_session):
+        """DB에 등록된 호스팅 (vm-live0001, 사용자 1)"""
+        user = User(
+            email="gc@example.com",
+            username="gc_user",
+            hashed_password="not-a-real-hash",
+            is_active=True
+        )
+        db_session.add(user)
+        db_session.commit()
+        
+        hosting = Hosting(
+            user_id=user.id,
+            name="gc-hosting",
+            vm_id="vm-live0001",
+            vm_ip="172.17.0.2",
+            ssh_port=10022,
+            status=HostingStatus.RUNNING
+        )
+        db_session.add(hosting)
+        db_session.commit()
+        db_session.refresh(hosting)
+        return hosting
+    
+    @pytest.fixture
+    def image_path(self, tmp_path, hosting):
+        """VM 파일이 있는 이미지 경로 (살아있는 VM 1개, 고아 VM 1개)"""
+        old = time.time() - 7200
+        for vm_id in ["vm-live0001", "vm-dead0001"]:
+            for dir_name in ["ssh-keys", "containers", "snapshots"]:
+                path = tmp_path / dir_name / vm_id
+                path.mkdir(parents=True)
+                os.utime(path, (old, old))
+        for name in ["vm-dead0001.qcow2", "usage/vm-dead0001.ring", "usage/vm-live0001.ring"]:
+            path = tmp_path / name
+            path.parent.mkdir(exist_ok=True)
+            path.write_bytes(b"")
+            os.utime(path, (old, old))
+        (tmp_path / "ubuntu-22.04-server-cloudimg-amd64.img").write_bytes(b"")
+        return tmp_path
+    
+    @pytest.fixture
+    def proxy_service(self, tmp_path, hosting):
+        """nginx 호스팅 설정 디렉토리 Mock"""
+        hosting_dir = tmp_path / "nginx-hosting"
+        hosting_dir.mkdir()
+        old = time.time() - 7200
+        for user_id in [str(hosting.user_id), "999"]:
+            config_file = hosting_dir / f"{user_id}.conf"
+            config_file.write_text("location /\n")
+            os.utime(config_file, (old, old))
+        
+        proxy_service = MagicMock()
+        proxy_service.list_proxy_config_files.return_value = {
+            path.stem: path for path in hosting_dir.glob("*.conf")
+        }
+        proxy_service.remove_proxy_rules.return_value = {"999": True}
+        return proxy_service
+    
+    def _docker(self, *args, **kwargs):
+        cmd = args[0]
+        if cmd[:2] == ["docker", "ps"]:
+            stdout = (
+                "webhost-vm-live0001\t2020-01-01 00:00:00 +0000 UTC\n"
+                "webhost-vm-dead0001\t2020-01-01 00:00:00 +0000 UTC\n"
+                f"webhost-vm-new00001\t{time.strftime('%Y-%m-%d %H:%M:%S +0000 UTC', time.gmtime())}\n"
+            )
+            return MagicMock(returncode=0, stdout=stdout, stderr="")
+        if cmd[:2] == ["docker", "images"]:
+            stdout = (
+                "webhost-snapshot/vm-live0001\t2020-01-01 00:00:00 +0000 UTC\n"
+                "webhost-snapshot/vm-gone0001\t2020-01-01 00:00:00 +0000 UTC\n"
+                "webhost-snapshot/vm-gone0001\t2020-01-02 00:00:00 +0000 UTC\n"
+            )
+            return MagicMock(returncode=0, stdout=stdout, stderr="")
+        if cmd[:2] == ["docker", "rm"]:
+            return MagicMock(returncode=0, stdout="\n".join(cmd[3:]), stderr="")
+        raise AssertionError(f"예상하지 못한 명령어: {cmd}")
+    
+    @patch("app.services.gc_service.subprocess.run")
+    def test_dry_run_reports_only_orphans(self, mock_run, db_session, image_path, proxy_service):
+        """dry-run은 DB에 없는 오래된 리소스만 보고하고 삭제하지 않음"""
+        mock_run.side_effect = self._docker
+        
+        with patch("app.services.gc_service.settings.VM_IMAGE_PATH", str(image_path)):
+            report = OrphanCollector(db_session, proxy_service=proxy_service).collect(dry_run=True)
+        
+        assert report["orphans"]["containers"] == ["webhost-vm-dead0001"]
+        assert report["orphans"]["proxy_configs"] == ["999.conf"]
+        assert sorted(report["orphans"]["vm_files"]) == [
+            "containers/vm-dead0001", "snapshots/vm-dead0001", "ssh-keys/vm-dead0001",
+            "usage/vm-dead0001.ring", "vm-dead0001.qcow2"
+        ]
+        assert sorted(report["orphans"]["snapshot_images"]) == [
+            "webhost-snapshot/vm-dead0001", "webhost-snapshot/vm-gone0001"
+        ]
+        assert sum(report["deleted"].values()) == 0
+        assert (image_path / "vm-dead0001.qcow2").exists()
+        proxy_service.remove_proxy_rules.assert_not_called()
+    
+    @patch("app.services.gc_service.subprocess.run")
+    def test_collect_deletes_in_batches(self, mock_run, db_session, image_path, proxy_service):
+        """삭제 모드는 고아 리소스만 배치로 삭제 (스냅샷 이미지는 메타데이터 삭제 전에)"""
+        mock_run.side_effect = self._docker
+        snapshot_dirs = {}
+        vm_service = MagicMock()
+        vm_service._remove_snapshot_images.side_effect = lambda vm_id: snapshot_dirs.update(
+            {vm_id: (image_path / "snapshots" / vm_id).exists()}
+        )
+        
+        with patch("app.services.gc_service.settings.VM_IMAGE_PATH", str(image_path)):
+            report = OrphanCollector(
+                db_session, proxy_service=proxy_service, vm_service=vm_service
+            ).collect(dry_run=False, batch_size=2)
+        
+        assert report["deleted"] == {
+            "snapshot_images": 2, "containers": 1, "proxy_configs": 1, "vm_files": 5
+        }
+        assert report["errors"] == []
+        assert snapshot_dirs == {"vm-dead0001": True, "vm-gone0001": False}
+        assert not (image_path / "ssh-keys" / "vm-dead0001").exists()
+        assert not (image_path / "snapshots" / "vm-dead0001").exists()
+        assert not (image_path / "usage" / "vm-dead0001.ring").exists()
+        assert (image_path / "usage" / "vm-live0001.ring").exists()
+        assert (image_path / "ssh-keys" / "vm-live0001").exists()
+        assert (image_path / "ubuntu-22.04-server-cloudimg-amd64.img").exists()
+        mock_run.assert_any_call(
+            ["docker", "rm", "-f", "webhost-vm-dead0001"],
+            capture_output=True, text=True, timeout=120
+        )
+        proxy_service.remove_proxy_rules.assert_called_once_with(["999"])
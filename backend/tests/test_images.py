@@ -0,0 +1,87 @@
+"""
+골든 이미지 관리 테스트
+"""
+import os
+import pytest
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+from app.services.image_service import GoldenImageManager
+from app.core.exceptions import VMOperationError
+
+
+def fake_qemu_img(cmd, **kwargs):
+    """qemu-img convert/create 대신 대상 파일만 생성"""
+    if cmd[:2] == ["qemu-img", "convert"]:
+        Path(cmd[-1]).write_bytes(b"golden")
+    elif cmd[:2] == ["qemu-img", "create"]:
+        target = cmd[-2] if cmd[-1].endswith("G") else cmd[-1]
+        Path(target).write_bytes(b"overlay")
+    return MagicMock(returncode=0, stdout="", stderr="")
+
+
+class TestGoldenImageManager:
+    """템플릿 버전 및 오버레이 참조 관리 테스트"""
+    
+    @pytest.fixture
+    def manager(self, tmp_path):
+        """소스 이미지가 준비된 골든 이미지 관리자"""
+        (tmp_path / "source.img").write_bytes(b"cloud-image")
+        with patch("app.services.image_service.subprocess.run", side_effect=fake_qemu_img) as mock_run:
+            manager = GoldenImageManager(str(tmp_path))
+            manager.mock_run = mock_run
+            yield manager
+    
+    def build(self, manager):
+        return manager.build_template("base", source=str(manager.image_root / "source.img"), packages=[])
+    
+    def test_no_template_falls_back(self, manager, tmp_path):
+        """빌드된 템플릿이 없으면 오버레이를 만들지 않음"""
+        assert manager.create_overlay("vm-img00001", str(tmp_path / "vm.qcow2")) is None
+        manager.mock_run.assert_not_called()
+    
+    def test_build_and_overlay(self, manager, tmp_path):
+        """빌드된 버전은 읽기 전용이며 오버레이의 backing으로 사용되고 참조가 기록됨"""
+        info = self.build(manager)
+        template_file = manager.golden_dir / info["file"]
+        assert template_file.exists()
+        assert not os.access(template_file, os.W_OK) or os.geteuid() == 0
+        
+        disk = tmp_path / "vm-img00001.qcow2"
+        assert manager.create_overlay("vm-img00001", str(disk), name="base", size_gb=20) == str(disk)
+        
+        cmd = manager.mock_run.call_args[0][0]
+        assert cmd == [
+            "qemu-img", "create", "-f", "qcow2",
+            "-b", str(template_file), "-F", "qcow2", str(disk), "20G"
+        ]
+        assert manager.status()["base"]["versions"][info["version"]]["refcount"] == 1
+        
+        manager.release_overlay("vm-img00001")
+        assert manager.status()["base"]["versions"][info["version"]]["refcount"] == 0
+    
+    def test_rebase_moves_reference_and_prune_keeps_used(self, manager, tmp_path):
+        """rebase 후 이전 버전은 참조가 없을 때만 정리됨"""
+        old = self.build(manager)
+        manager.create_overlay("vm-img00001", str(tmp_path / "a.qcow2"), name="base")
+        new = self.build(manager)
+        
+        # 이전 버전은 아직 참조 중이므로 유지
+        assert manager.prune("base", keep=1) == []
+        
+        assert manager.rebase_overlay("vm-img00001", str(tmp_path / "a.qcow2"), name="base") == new["version"]
+        assert manager.mock_run.call_args[0][0][:3] == ["qemu-img", "rebase", "-f"]
+        
+        assert manager.prune("base", keep=1) == [f"base@{old['version']}"]
+        assert not (manager.golden_dir / old["file"]).exists()
+        assert manager.status()["base"]["versions"][new["version"]]["refcount"] == 1
+    
+    def test_failed_build_leaves_no_version(self, manager):
+        """빌드 실패 시 임시 파일과 매니페스트 항목이 남지 않음"""
+        manager.mock_run.side_effect = lambda cmd, **kwargs: MagicMock(returncode=1, stdout="", stderr="disk full")
+        
+        with pytest.raises(VMOperationError):
+            self.build(manager)
+        
+        assert manager.status() == {}
+        assert not list(manager.golden_dir.glob("*.qcow2"))
@@ -306,12 +306,15 @@ class TestServiceIntegration:
         proxy_info = proxy_service.get_proxy_info("nonexistent_user")
         assert proxy_info is None
     
+    @patch('app.services.vm_service.VMService._bridge_exists', return_value=True)
+    @patch('app.services.vm_service.get_capability_detector')
     @patch('app.services.vm_service.subprocess.run')
-    def test_vm_creation_simulation(self, mock_subprocess):
+    def test_vm_creation_simulation(self, mock_subprocess, mock_detector, mock_bridge):
         """VM 생성 시뮬레이션 테스트"""
-        # subprocess 모의 설정
+        # subprocess 및 호스트 기능 탐지 모의 설정
         mock_subprocess.return_value = MagicMock(returncode=0, stdout="success")
-        
+        mock_detector.return_value.get.return_value.tool_available.return_value = True
+
         vm_service = VMService()
         
         # VM 디스크 생성 시뮬레이션
@@ -0,0 +1,148 @@
+"""
+DHCP 리스 인덱스 테스트
+"""
+import json
+import xml.etree.ElementTree as ET
+import time
+import pytest
+from unittest.mock import patch
+
+from app.services.lease_service import (
+    LeaseIndex,
+    parse_dnsmasq_status,
+    parse_dnsmasq_leases,
+    parse_isc_leases
+)
+from app.services.vm_service import VMService
+
+ISC_LEASES = """
+lease 192.168.122.50 {
+  starts 4 2024/01/04 10:00:00;
+  ends 4 2099/01/04 22:00:00;
+  binding state active;
+  hardware ethernet 52:54:00:aa:bb:01;
+  client-hostname "vm-isc00001";
+}
+lease 192.168.122.51 {
+  starts 4 2024/01/04 10:00:00;
+  ends 4 2099/01/04 22:00:00;
+  binding state active;
+  hardware ethernet 52:54:00:aa:bb:02;
+}
+lease 192.168.122.51 {
+  starts 4 2024/01/04 11:00:00;
+  ends 4 2024/01/04 11:00:00;
+  binding state free;
+  hardware ethernet 52:54:00:aa:bb:02;
+}
+"""
+
+
+class TestLeaseParsers:
+    """리스 파일 형식별 파싱 테스트"""
+    
+    def test_dnsmasq_status_json(self):
+        """dnsmasq 상태 JSON은 MAC을 소문자로 정규화하고 IPv6는 제외"""
+        text = json.dumps([
+            {"ip-address": "192.168.122.10", "mac-address": "52:54:00:AA:BB:CC", "hostname": "vm-a", "expiry-time": 4102444800},
+            {"ip-address": "fd00::10", "mac-address": "52:54:00:aa:bb:dd", "expiry-time": 4102444800}
+        ])
+        assert parse_dnsmasq_status(text) == {"52:54:00:aa:bb:cc": ("192.168.122.10", 4102444800.0, "vm-a")}
+        assert parse_dnsmasq_status("") == {}
+    
+    def test_dnsmasq_leases(self):
+        """dnsmasq 리스 파일의 * 호스트 이름은 None"""
+        text = "4102444800 52:54:00:aa:bb:cc 192.168.122.10 vm-a 01:52:54:00:aa:bb:cc\n0 52:54:00:aa:bb:dd 192.168.122.11 * *\n"
+        leases = parse_dnsmasq_leases(text)
+        assert leases["52:54:00:aa:bb:cc"] == ("192.168.122.10", 4102444800.0, "vm-a")
+        assert leases["52:54:00:aa:bb:dd"] == ("192.168.122.11", 0.0, None)
+    
+    def test_isc_leases_last_block_wins(self):
+        """ISC 리스는 뒤쪽 블록이 우선이고 해제된 리스는 제외"""
+        leases = parse_isc_leases(ISC_LEASES)
+        assert leases["52:54:00:aa:bb:01"][0] == "192.168.122.50"
+        assert leases["52:54:00:aa:bb:01"][2] == "vm-isc00001"
+        assert "52:54:00:aa:bb:02" not in leases
+
+
+class TestLeaseIndex:
+    """인덱스 조회 및 증분 갱신 테스트"""
+    
+    @pytest.fixture
+    def paths(self, tmp_path):
+        return {
+            "status": tmp_path / "virbr0.status",
+            "isc": tmp_path / "dhcpd.leases"
+        }
+    
+    def test_lookup_by_mac_and_hostname(self, paths):
+        """MAC과 호스트 이름으로 조회하고 만료된 리스는 무시"""
+        paths["status"].write_text(json.dumps([
+            {"ip-address": "192.168.122.10", "mac-address": "52:54:00:00:00:01", "hostname": "vm-lease001", "expiry-time": time.time() + 3600},
+            {"ip-address": "192.168.122.11", "mac-address": "52:54:00:00:00:02", "expiry-time": time.time() - 10}
+        ]))
+        index = LeaseIndex([str(paths["status"]), str(paths["isc"])])
+        
+        assert index.lookup("52:54:00:00:00:01") == "192.168.122.10"
+        assert index.lookup("52-54-00-00-00-01") == "192.168.122.10"
+        assert index.lookup_hostname("vm-lease001") == "192.168.122.10"
+        assert index.lookup("52:54:00:00:00:02") is None
+        assert index.lookup("52:54:00:00:00:99") is None
+    
+    def test_append_only_file_read_incrementally(self, paths):
+        """ISC 리스 파일은 추가된 부분만 읽고, 쓰는 중인 블록은 완성된 뒤 반영"""
+        paths["isc"].write_text(ISC_LEASES)
+        index = LeaseIndex([str(paths["isc"])])
+        assert index.lookup("52:54:00:aa:bb:01") == "192.168.122.50"
+        
+        lease_file = index.files[0]
+        first_offset = lease_file.offset
+        
+        with open(paths["isc"], "a") as f:
+            f.write("lease 192.168.122.52 {\n  ends 4 2099/01/04 22:00:00;\n  binding state active;\n")
+        assert index.refresh()
+        assert b"lease 192.168.122.52" in lease_file.tail
+        
+        with open(paths["isc"], "a") as f:
+            f.write("  hardware ethernet 52:54:00:aa:bb:03;\n}\n")
+            f.write("lease 192.168.122.50 {\n  binding state free;\n  hardware ethernet 52:54:00:aa:bb:01;\n}\n")
+        
+        with patch("app.services.lease_service.parse_isc_leases", wraps=parse_isc_leases) as parser:
+            lease_file.parser = parser
+            assert index.refresh()
+            assert "192.168.122.50 {\n  starts" not in parser.call_args[0][0]
+        
+        assert lease_file.offset > first_offset
+        assert index.lookup("52:54:00:aa:bb:03") == "192.168.122.52"
+        assert index.lookup("52:54:00:aa:bb:01") is None
+    
+    def test_unchanged_files_not_reparsed(self, paths):
+        """변경되지 않은 파일은 다시 읽지 않음"""
+        paths["status"].write_text("[]")
+        index = LeaseIndex([str(paths["status"])])
+        assert not index.refresh()
+
+
+class TestVMServiceLeaseLookup:
+    """VMService IP 조회 테스트"""
+    
+    def test_get_vm_ip_uses_persisted_mac(self, tmp_path):
+        """저장된 MAC으로 리스 인덱스에서 조회하고, 없으면 고정 IP 대신 None"""
+        status = tmp_path / "virbr0.status"
+        status.write_text(json.dumps([
+            {"ip-address": "192.168.122.20", "mac-address": "52:54:00:12:34:56", "expiry-time": 0}
+        ]))
+        service = VMService.__new__(VMService)
+        
+        with patch("app.services.vm_service.get_lease_index", return_value=LeaseIndex([str(status)])), \
+                patch("app.services.vm_service.get_libvirt_adapter", return_value=None), \
+                patch("app.services.vm_service.subprocess.run", side_effect=FileNotFoundError):
+            assert service.get_vm_ip("vm-ip000001", mac_address="52:54:00:12:34:56") == "192.168.122.20"
+            assert service.get_vm_ip("vm-ip000002", mac_address="52:54:00:00:00:00") is None
+    
+    def test_domain_xml_uses_given_mac(self):
+        """도메인 XML은 호스팅에 저장된 MAC을 사용"""
+        service = VMService.__new__(VMService)
+        service.bridge_name = "virbr0"
+        xml = service.create_vm_xml("vm-xml00001", "/tmp/disk.qcow2", 10022, mac_address="52:54:00:12:34:56")
+        assert ET.fromstring(xml).find("devices/interface/mac").get("address") == "52:54:00:12:34:56"
@@ -0,0 +1,105 @@
+"""
+libvirt 이벤트 어댑터 테스트 (가짜 백엔드 사용)
+"""
+import threading
+import pytest
+from unittest.mock import patch
+
+from app.services.libvirt_service import LibvirtAdapter, FakeDomainBackend
+from app.services.vm_service import VMService
+from app.models.hosting import HostingStatus
+
+
+class TestLibvirtAdapter:
+    """도메인 상태/IP 인덱스 테스트"""
+    
+    @pytest.fixture
+    def backend(self):
+        return FakeDomainBackend({
+            "vm-run00001": ("running", "192.168.122.11"),
+            "vm-off00001": ("shutoff", None)
+        })
+    
+    @pytest.fixture
+    def adapter(self, backend):
+        adapter = LibvirtAdapter(backend)
+        assert adapter.ensure_connected()
+        return adapter
+    
+    def test_initial_sync_then_events(self, adapter, backend):
+        """연결 시 한 번만 전체 조회하고 이후에는 이벤트로 갱신"""
+        assert adapter.get_status("vm-run00001") == HostingStatus.RUNNING
+        assert adapter.get_ip("vm-run00001") == "192.168.122.11"
+        assert adapter.get_status("vm-off00001") == HostingStatus.STOPPED
+        assert adapter.get_status("vm-missing1") == HostingStatus.ERROR
+        
+        backend.emit_state("vm-run00001", "shutoff")
+        assert adapter.get_status("vm-run00001") == HostingStatus.STOPPED
+        assert adapter.get_ip("vm-run00001") is None
+        
+        backend.emit_state("vm-new00001", "running")
+        backend.emit_ip("vm-new00001", "192.168.122.12")
+        assert adapter.get_ip("vm-new00001") == "192.168.122.12"
+        
+        backend.emit_state("vm-off00001", "undefined")
+        assert "vm-off00001" not in adapter.snapshot()
+        assert backend.list_count == 1
+    
+    def test_wait_for_ip_wakes_on_event(self, adapter, backend):
+        """IP 대기는 IP 이벤트가 오면 바로 반환"""
+        backend.emit_state("vm-boot0001", "running")
+        timer = threading.Timer(0.05, backend.emit_ip, args=("vm-boot0001", "192.168.122.13"))
+        timer.start()
+        
+        assert adapter.wait_for_ip("vm-boot0001", timeout=5) == "192.168.122.13"
+        assert adapter.wait_for_ip("vm-noip0001", timeout=0.01) is None
+    
+    def test_reconnect_resyncs(self, adapter, backend):
+        """연결이 끊기면 다음 조회 때 재연결하고 전체 인덱스를 다시 채움"""
+        backend.drop_connection()
+        assert not adapter.connected
+        backend.domains["vm-late0001"] = ("running", None)
+        
+        with patch("app.services.libvirt_service.RECONNECT_INTERVAL", 0):
+            assert adapter.ensure_connected()
+        
+        assert backend.connect_count == 2
+        assert adapter.get_status("vm-late0001") == HostingStatus.RUNNING
+    
+    def test_failed_connect_is_rate_limited(self):
+        """연결 실패 시 재시도 간격 동안은 다시 연결하지 않음"""
+        backend = FakeDomainBackend()
+        backend.fail_connect = True
+        adapter = LibvirtAdapter(backend)
+        
+        assert not adapter.ensure_connected()
+        backend.fail_connect = False
+        assert not adapter.ensure_connected()
+        assert backend.connect_count == 0
+
+
+class TestVMServiceWithAdapter:
+    """VMService가 virsh 대신 인덱스를 사용하는지 테스트"""
+    
+    @pytest.fixture
+    def vm_service(self, tmp_path):
+        adapter = LibvirtAdapter(FakeDomainBackend({"vm-svc00001": ("shutoff", None)}))
+        service = VMService.__new__(VMService)
+        service.image_path = tmp_path
+        with patch("app.services.vm_service.get_libvirt_adapter", return_value=adapter), \
+                patch("app.services.vm_service.settings.DEBUG", False), \
+                patch("app.services.vm_service.subprocess.run", side_effect=AssertionError("virsh 호출")):
+            yield service
+    
+    def test_lifecycle_without_virsh(self, vm_service):
+        """상태 조회/시작/중지/삭제가 virsh를 실행하지 않음"""
+        assert vm_service.get_vm_status("vm-svc00001") == HostingStatus.STOPPED
+        assert vm_service.start_vm("vm-svc00001")
+        assert vm_service.get_vm_status("vm-svc00001") == HostingStatus.RUNNING
+        assert vm_service.stop_vm("vm-svc00001")
+        assert vm_service.get_vm_status("vm-svc00001") == HostingStatus.STOPPED
+        assert not vm_service.start_vm("vm-missing1")
+        
+        with patch.object(vm_service, "remove_container", return_value=True):
+            assert vm_service.delete_vm("vm-svc00001")
+        assert vm_service.get_vm_status("vm-svc00001") == HostingStatus.ERROR
@@ -0,0 +1,245 @@
+"""
+VM 스냅샷/마이그레이션 테스트
+"""
+import io
+import json
+import pytest
+import subprocess
+import tarfile
+from unittest.mock import patch, MagicMock
+
+from app.core.exceptions import VMOperationError, InvalidOperationError, HostCapacityExceededError
+from app.models.user import User
+from app.models.node import Node
+from app.models.hosting import Hosting, HostingStatus
+from app.services.hosting_service import HostingService
+from app.services.migration_service import MigrationRecorder, parse_domjobinfo, transfer_metrics
+from app.services.vm_service import VMService
+
+
+INSPECT = [{
+    "Config": {"Image": "nginx:alpine", "Env": ["USER_ID=7", "VM_ID=vm-mig0001", "PATH=/usr/bin"]},
+    "HostConfig": {
+        "PortBindings": {"80/tcp": [{"HostPort": "8001"}], "22/tcp": [{"HostPort": "10022"}]},
+        "Binds": ["/images/containers/vm-mig0001/www:/var/www/html"]
+    },
+    "State": {"Running": True}
+}]
+
+
+class FakeDocker:
+    """docker CLI 호출을 기록하고 실패할 명령을 지정할 수 있는 대역"""
+    
+    def __init__(self, image_bytes=b"x" * 3000, fail=()):
+        self.calls = []
+        self.loaded = b""
+        self.image_bytes = image_bytes
+        self.fail = fail
+    
+    def run(self, command, **kwargs):
+        self.calls.append(command)
+        args = command[3:] if command[1] == "-H" else command[1:]
+        if args[0] in self.fail:
+            return subprocess.CompletedProcess(command, 1, "", f"{args[0]} failed")
+        stdout = json.dumps(INSPECT) if args[0] == "inspect" else ""
+        return subprocess.CompletedProcess(command, 0, stdout, "")
+    
+    def popen(self, command, **kwargs):
+        self.calls.append(command)
+        process = MagicMock()
+        process.wait.return_value = 0
+        process.stderr = io.BytesIO()
+        if "save" in command:
+            process.stdout = io.BytesIO(self.image_bytes)
+        else:
+            process.stdin.write.side_effect = lambda chunk: setattr(self, "loaded", self.loaded + chunk)
+        return process
+    
+    def commands(self, name):
+        return [call for call in self.calls if name in call]
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = VMService.__new__(VMService)
+    service.image_path = tmp_path
+    web_dir = tmp_path / "containers" / "vm-mig0001" / "www"
+    web_dir.mkdir(parents=True)
+    (web_dir / "index.html").write_text("v1")
+    return service
+
+
+@pytest.fixture
+def docker():
+    fake = FakeDocker()
+    with patch("app.services.vm_service.subprocess.run", side_effect=fake.run), \
+         patch("app.services.vm_service.subprocess.Popen", side_effect=fake.popen), \
+         patch.object(VMService, "_has_domain", return_value=False):
+        yield fake
+
+
+class TestMigrationMetrics:
+    """마이그레이션 지표 테스트"""
+    
+    def test_parse_domjobinfo(self):
+        """virsh domjobinfo 출력에서 전송량/다운타임 추출"""
+        info = parse_domjobinfo(
+            "Job type:         Completed\n"
+            "Time elapsed:     2500         ms\n"
+            "Data processed:   1.500 GiB\n"
+            "Memory bandwidth: 600.000 MiB/s\n"
+            "Total downtime:   48           ms\n"
+        )
+        assert info == {
+            "elapsed_ms": 2500, "bytes": 1.5 * 1024 ** 3,
+            "memory_bandwidth": 600 * 1024 ** 2, "downtime_ms": 48
+        }
+    
+    def test_recorder_stats(self, tmp_path):
+        """방식별 평균 전송 속도와 다운타임 백분위"""
+        recorder = MigrationRecorder(str(tmp_path))
+        for downtime in (1.0, 2.0, 3.0):
+            recorder.record("vm-mig0001", {"backend": "container", **transfer_metrics(10 * 1024 * 1024, 2.0, downtime)})
+        recorder.record("vm-mig0002", {"backend": "domain", **transfer_metrics(0, 0, 0.05)})
+        
+        stats = recorder.stats()
+        assert stats["container"]["count"] == 3
+        assert stats["container"]["avg_transfer_rate_mbps"] == 5.0
+        assert stats["container"]["p50_downtime_seconds"] == 2.0
+        assert stats["domain"]["avg_transfer_rate_mbps"] is None
+
+
+class TestContainerSnapshot:
+    """컨테이너 스냅샷/복원 테스트"""
+    
+    def test_snapshot_pauses_commits_and_archives(self, service, docker):
+        """일시 정지 상태에서 커밋과 웹 디렉토리 보관 후 재개"""
+        snapshot = service.snapshot_vm("vm-mig0001", "before-deploy")
+        
+        verbs = [call[1] for call in docker.calls if call[1] in ("pause", "commit", "unpause")]
+        assert verbs == ["pause", "commit", "unpause"]
+        assert docker.commands("commit")[0][-1] == "webhost-snapshot/vm-mig0001:before-deploy"
+        with tarfile.open(snapshot["archive"]) as tar:
+            assert tar.extractfile("www/index.html").read() == b"v1"
+        assert [s["name"] for s in service.list_snapshots("vm-mig0001")] == ["before-deploy"]
+        
+        with pytest.raises(VMOperationError):
+            service.snapshot_vm("vm-mig0001", "before-deploy")
+        with pytest.raises(VMOperationError):
+            service.snapshot_vm("vm-mig0001", "../escape")
+    
+    def test_restore_recreates_container_and_web_dir(self, service, docker):
+        """스냅샷 이미지로 같은 포트/볼륨의 컨테이너를 다시 만들고 웹 디렉토리 복원"""
+        service.snapshot_vm("vm-mig0001", "good")
+        web_dir = service.image_path / "containers" / "vm-mig0001" / "www"
+        (web_dir / "index.html").write_text("broken")
+        (web_dir / "new.html").write_text("added later")
+        
+        service.restore_vm("vm-mig0001", "good", resources={"memory_mb": 256})
+        
+        assert (web_dir / "index.html").read_text() == "v1"
+        assert not (web_dir / "new.html").exists()
+        run = docker.commands("run")[0]
+        assert run[-1] == "webhost-snapshot/vm-mig0001:good"
+        assert "8001:80" in run and "10022:22" in run
+        assert "/images/containers/vm-mig0001/www:/var/www/html" in run
+        assert "PATH=/usr/bin" not in run
+        assert "256m" in run
+        assert not docker.commands("save")
+
+
+class TestContainerMigration:
+    """컨테이너 노드 간 이동 테스트"""
+    
+    def test_migrate_streams_image_and_cleans_source(self, service, docker):
+        """이미지를 스트리밍 전송하고 대상에서 같은 포트로 실행한 뒤 원래 컨테이너 삭제"""
+        metrics = service.migrate_vm("vm-mig0001", None, "tcp://10.0.0.12:2376", "10.0.0.12")
+        
+        assert docker.loaded == docker.image_bytes
+        assert metrics["backend"] == "container"
+        assert metrics["bytes"] == 3000
+        assert metrics["web_port"] == 8001
+        assert metrics["downtime_seconds"] >= 0
+        assert docker.commands("run")[0][:3] == ["docker", "-H", "tcp://10.0.0.12:2376"]
+        assert ["docker", "rm", "-f", "webhost-vm-mig0001"] in docker.calls
+    
+    def test_failed_migration_restarts_source(self, service):
+        """대상 노드에서 실행하지 못하면 원래 노드에서 다시 시작"""
+        fake = FakeDocker(fail=("run",))
+        with patch("app.services.vm_service.subprocess.run", side_effect=fake.run), \
+             patch("app.services.vm_service.subprocess.Popen", side_effect=fake.popen), \
+             patch.object(VMService, "_has_domain", return_value=False):
+            with pytest.raises(VMOperationError):
+                service.migrate_vm("vm-mig0001", None, "tcp://10.0.0.12:2376", "10.0.0.12")
+        
+        assert ["docker", "start", "webhost-vm-mig0001"] in fake.calls
+        assert ["docker", "-H", "tcp://10.0.0.12:2376", "rm", "-f", "webhost-vm-mig0001"] in fake.calls
+
+
+class TestHostingMigration:
+    """관리자 호스팅 노드 이동 테스트"""
+    
+    def test_migrate_updates_node_and_proxy(self, db_session, tmp_path):
+        """이동 후 노드/IP/프록시 규칙이 대상 노드로 바뀌고 지표가 기록됨"""
+        user = User(email="mig@example.com", username="mig_user", hashed_password="not-a-real-hash")
+        target = Node(name="node-b", docker_host="tcp://10.0.0.12:2376", address="10.0.0.12", memory_mb=4096, cpus=4)
+        db_session.add_all([user, target])
+        db_session.commit()
+        hosting = Hosting(
+            user_id=user.id, name="mig", vm_id="vm-mig0001", vm_ip="172.17.0.5",
+            ssh_port=10022, status=HostingStatus.RUNNING
+        )
+        db_session.add(hosting)
+        db_session.commit()
+        
+        with patch("app.services.hosting_service.VMService"), \
+             patch("app.services.hosting_service.ProxyService"):
+            service = HostingService(db_session)
+        service.vm_service.migrate_vm.return_value = {
+            "backend": "container", "web_port": 8001, **transfer_metrics(1024, 1.0, 0.5)
+        }
+        
+        with patch("app.services.migration_service.settings.VM_IMAGE_PATH", str(tmp_path)):
+            result = service.migrate_hosting(hosting.id, target.id)
+            assert MigrationRecorder().stats()["container"]["count"] == 1
+        
+        assert result.node_id == target.id
+        assert result.vm_ip == "10.0.0.12"
+        args = service.vm_service.migrate_vm.call_args[0]
+        assert args[:4] == ("vm-mig0001", None, "tcp://10.0.0.12:2376", "10.0.0.12")
+        _, proxy_kwargs = service.proxy_service.update_proxy_rule.call_args
+        assert proxy_kwargs["vm_ip"] == "10.0.0.12"
+        assert proxy_kwargs["web_port"] == 8001
+        
+        with pytest.raises(InvalidOperationError):
+            service.migrate_hosting(hosting.id, target.id)
+        with pytest.raises(InvalidOperationError):
+            service.migrate_hosting(hosting.id, None)
+    
+    def test_migrate_rejects_full_target_node(self, db_session):
+        """대상 노드에 남은 용량이 없으면 이동하지 않음"""
+        user = User(email="mig2@example.com", username="mig_user2", hashed_password="not-a-real-hash")
+        target = Node(name="node-c", docker_host="tcp://10.0.0.13:2376", address="10.0.0.13", memory_mb=1024, cpus=2)
+        db_session.add_all([user, target])
+        db_session.commit()
+        db_session.add_all([
+            Hosting(
+                user_id=user.id, name="full", vm_id="vm-mig0002", vm_ip="10.0.0.13", ssh_port=10023,
+                status=HostingStatus.RUNNING, node_id=target.id, memory_mb=768, cpus=1
+            ),
+            Hosting(
+                user_id=user.id, name="big", vm_id="vm-mig0003", vm_ip="172.17.0.6", ssh_port=10024,
+                status=HostingStatus.RUNNING, memory_mb=512, cpus=1
+            )
+        ])
+        db_session.commit()
+        hosting = db_session.query(Hosting).filter(Hosting.vm_id == "vm-mig0003").one()
+        
+        with patch("app.services.hosting_service.VMService"), \
+             patch("app.services.hosting_service.ProxyService"):
+            service = HostingService(db_session)
+        
+        with pytest.raises(HostCapacityExceededError):
+            service.migrate_hosting(hosting.id, target.id)
+        service.vm_service.migrate_vm.assert_not_called()
+        assert hosting.node_id is None
@@ -0,0 +1,146 @@
+"""
+멀티 노드 배치 테스트
+"""
+import pytest
+from pydantic import ValidationError
+from unittest.mock import patch, MagicMock
+
+from app.models.user import User
+from app.models.hosting import Hosting, HostingStatus
+from app.services.node_service import NodeService
+from app.services.hosting_service import HostingService
+from app.services.vm_service import VMService
+from app.schemas.node import NodeCreate
+from app.schemas.hosting import HostingCreate
+from app.core.exceptions import HostCapacityExceededError, NodeAlreadyExistsError
+
+
+@pytest.fixture
+def user(db_session):
+    """테스트 사용자 생성"""
+    user = User(email="node@example.com", username="node_user", hashed_password="not-a-real-hash")
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    return user
+
+
+@pytest.fixture
+def nodes(db_session, user):
+    """메모리 4096MB 노드 2개 (node-a에 1024MB 사용 중인 호스팅)"""
+    node_service = NodeService(db_session)
+    node_a = node_service.register_node(NodeCreate(
+        name="node-a", docker_host="tcp://10.0.0.11:2376", address="10.0.0.11",
+        memory_mb=4096, cpus=4, labels={"zone": "a"}
+    ))
+    node_b = node_service.register_node(NodeCreate(
+        name="node-b", docker_host="tcp://10.0.0.12:2376", address="10.0.0.12",
+        memory_mb=4096, cpus=4, labels={"zone": "b"}
+    ))
+    db_session.add(Hosting(
+        user_id=user.id,
+        name="busy-hosting",
+        vm_id="vm-node0001",
+        vm_ip="10.0.0.11",
+        ssh_port=10040,
+        status=HostingStatus.RUNNING,
+        memory_mb=1024,
+        cpus=1.0,
+        node_id=node_a.id
+    ))
+    db_session.commit()
+    return node_a, node_b
+
+
+class TestPlacement:
+    """노드 배치 정책 테스트"""
+    
+    def test_least_loaded_picks_emptiest_node(self, db_session, nodes):
+        """least_loaded는 배치 후 사용률이 가장 낮은 노드 선택"""
+        node = NodeService(db_session).place({"memory_mb": 512, "cpus": 0.5}, policy="least_loaded")
+        assert node.name == "node-b"
+    
+    def test_bin_packing_fills_busiest_node(self, db_session, nodes):
+        """bin_packing은 들어갈 수 있는 가장 꽉 찬 노드 선택"""
+        node = NodeService(db_session).place({"memory_mb": 512, "cpus": 0.5}, policy="bin_packing")
+        assert node.name == "node-a"
+    
+    def test_skips_full_node_and_filters_labels(self, db_session, nodes):
+        """용량이 부족하거나 라벨이 다른 노드는 제외"""
+        node_service = NodeService(db_session)
+        
+        node = node_service.place({"memory_mb": 3584, "cpus": 1.0}, policy="bin_packing")
+        assert node.name == "node-b"
+        
+        with pytest.raises(HostCapacityExceededError):
+            node_service.place({"memory_mb": 3584, "cpus": 1.0}, labels={"zone": "a"})
+    
+    def test_duplicate_node_name_rejected(self, db_session, nodes):
+        """같은 이름의 노드는 등록 불가"""
+        with pytest.raises(NodeAlreadyExistsError):
+            NodeService(db_session).register_node(NodeCreate(
+                name="node-a", docker_host="ssh://root@10.0.0.13", address="10.0.0.13",
+                memory_mb=1024, cpus=1
+            ))
+
+    @pytest.mark.parametrize("address", ["node-a.example.com", "fd00::12", "10.0.0.256"])
+    def test_node_address_must_be_ipv4(self, address):
+        """노드 주소는 호스팅 vm_ip 컬럼에 들어가므로 IPv4만 등록 가능"""
+        with pytest.raises(ValidationError):
+            NodeCreate(name="node-c", docker_host="tcp://10.0.0.14:2376", address=address, memory_mb=1024, cpus=1)
+        assert NodeCreate(name="node-c", docker_host="tcp://10.0.0.14:2376", address=" 10.0.0.14 ", memory_mb=1024, cpus=1).address == "10.0.0.14"
+
+
+class TestRemoteDocker:
+    """원격 노드 Docker 명령 테스트"""
+    
+    def test_docker_cmd_targets_node(self):
+        """docker_host가 있으면 -H 옵션으로 노드 Docker API 지정"""
+        assert VMService._docker_cmd(None, None, "rm", "-f", "webhost-vm-1") == ["docker", "rm", "-f", "webhost-vm-1"]
+        assert VMService._docker_cmd(None, "tcp://10.0.0.11:2376", "rm", "-f", "webhost-vm-1") == [
+            "docker", "-H", "tcp://10.0.0.11:2376", "rm", "-f", "webhost-vm-1"
+        ]
+    
+    def test_remove_container_on_node(self):
+        """컨테이너 삭제가 배치된 노드로 전달됨"""
+        with patch("app.services.vm_service.subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+            assert VMService.remove_container(VMService.__new__(VMService), "vm-1", docker_host="tcp://10.0.0.11:2376")
+        
+        assert mock_run.call_args[0][0] == ["docker", "-H", "tcp://10.0.0.11:2376", "rm", "-f", "webhost-vm-1"]
+
+
+class TestHostingPlacement:
+    """호스팅 생성 시 노드 배치 테스트"""
+    
+    @pytest.fixture
+    def service(self, db_session):
+        """VM/프록시 서비스가 Mock 처리된 호스팅 서비스"""
+        with patch("app.services.hosting_service.VMService"), \
+             patch("app.services.hosting_service.ProxyService"):
+            service = HostingService(db_session)
+        service.vm_service = MagicMock()
+        service.vm_service.generate_vm_id.return_value = "vm-node0002"
+        service.vm_service.get_available_ssh_port.return_value = 10041
+        service.vm_service.create_vm.return_value = {"vm_ip": "10.0.0.12", "web_port": 8123}
+        service.proxy_service = MagicMock()
+        service.proxy_service.add_proxy_rule.return_value = {"verified": True}
+        return service
+    
+    def test_create_records_node_and_routes_to_it(self, db_session, nodes, service):
+        """배치된 노드가 기록되고 컨테이너 생성 및 프록시가 노드 주소를 사용"""
+        other = User(email="node2@example.com", username="node_user2", hashed_password="not-a-real-hash")
+        db_session.add(other)
+        db_session.commit()
+        
+        with patch("app.services.node_service.settings.NODE_PLACEMENT_POLICY", "least_loaded"):
+            hosting = service.create_hosting(other.id, HostingCreate(plan="basic"))
+        
+        assert hosting.node_id == nodes[1].id
+        assert hosting.vm_ip == "10.0.0.12"
+        _, kwargs = service.vm_service.create_vm.call_args
+        assert kwargs["docker_host"] == "tcp://10.0.0.12:2376"
+        assert kwargs["node_address"] == "10.0.0.12"
+        _, proxy_kwargs = service.proxy_service.add_proxy_rule.call_args
+        assert proxy_kwargs["vm_ip"] == "10.0.0.12"
+        assert proxy_kwargs["web_port"] == 8123
@@ -0,0 +1,150 @@
+"""
+프로비저닝 단계 저널 (재개/보상) 테스트
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch, MagicMock
+
+from app.models.user import User
+from app.models.hosting import Hosting, HostingStatus
+from app.models.provisioning import ProvisioningStep
+from app.services.hosting_service import HostingService
+from app.schemas.hosting import HostingCreate
+from app.core.exceptions import VMOperationError
+
+
+class TestProvisioningJournal:
+    """프로비저닝 저널 테스트"""
+    
+    @pytest.fixture
+    def user(self, db_session):
+        """테스트 사용자 생성"""
+        user = User(
+            email="journal@example.com",
+            username="journal_user",
+            hashed_password="not-a-real-hash",
+            is_active=True
+        )
+        db_session.add(user)
+        db_session.commit()
+        db_session.refresh(user)
+        return user
+    
+    @pytest.fixture
+    def service(self, db_session):
+        """VM/프록시 서비스가 Mock 처리된 호스팅 서비스"""
+        with patch("app.services.hosting_service.VMService"), \
+             patch("app.services.hosting_service.ProxyService"):
+            service = HostingService(db_session)
+        service.vm_service = MagicMock()
+        service.vm_service.generate_vm_id.return_value = "vm-journal01"
+        service.vm_service.get_available_ssh_port.return_value = 10022
+        service.vm_service.get_ssh_key_dir.return_value = "/tmp/ssh-keys/vm-journal01"
+        service.vm_service.create_vm.return_value = {
+            "vm_ip": "172.17.0.5",
+            "web_port": 8123,
+            "container_name": "webhost-vm-journal01"
+        }
+        service.vm_service.remove_container.return_value = True
+        service.proxy_service = MagicMock()
+        service.proxy_service.add_proxy_rule.return_value = {
+            "web_url": "http://localhost/1",
+            "ssh_command": "ssh -p 10022 ubuntu@localhost",
+            "verified": True
+        }
+        service.proxy_service.remove_proxy_rule.return_value = True
+        return service
+    
+    def _make_stale(self, db_session, hosting):
+        db_session.query(Hosting).filter(Hosting.id == hosting.id).update(
+            {Hosting.updated_at: datetime.now(timezone.utc) - timedelta(hours=1)},
+            synchronize_session=False
+        )
+        db_session.commit()
+        db_session.refresh(hosting)
+    
+    def test_create_records_all_steps(self, db_session, user, service):
+        """정상 생성 시 모든 단계가 기록되고 RUNNING 상태"""
+        hosting = service.create_hosting(user.id, HostingCreate())
+        
+        assert hosting.status == HostingStatus.RUNNING
+        assert hosting.vm_ip == "172.17.0.5"
+        assert service.journal.next_step(hosting.id) is None
+        service.proxy_service.add_proxy_rule.assert_called_once_with(
+            user_id=str(user.id),
+            vm_ip="172.17.0.5",
+            ssh_port=10022,
+            web_port=8123,
+            vm_id="vm-journal01"
+        )
+    
+    def test_proxy_failure_compensates_completed_steps(self, db_session, user, service):
+        """프록시 단계 실패 시 컨테이너와 키를 역순으로 정리하고 레코드 삭제"""
+        service.proxy_service.add_proxy_rule.side_effect = Exception("nginx reload 실패")
+        
+        with pytest.raises(VMOperationError):
+            service.create_hosting(user.id, HostingCreate())
+        
+        service.vm_service.remove_container.assert_called_with("vm-journal01")
+        service.vm_service.remove_ssh_keypair.assert_called_once_with("vm-journal01")
+        service.proxy_service.remove_proxy_rule.assert_not_called()
+        assert db_session.query(Hosting).count() == 0
+    
+    def test_resume_skips_completed_steps(self, db_session, user, service):
+        """중단된 작업 재개 시 완료된 단계는 다시 실행하지 않음"""
+        service.proxy_service.add_proxy_rule.side_effect = Exception("워커 종료")
+        with patch.object(service, "compensate_provisioning"):
+            with pytest.raises(VMOperationError):
+                service.create_hosting(user.id, HostingCreate())
+        
+        hosting = db_session.query(Hosting).one()
+        assert service.journal.next_step(hosting.id) == ProvisioningStep.PROXY_CONFIGURED
+        self._make_stale(db_session, hosting)
+        
+        service.proxy_service.add_proxy_rule.side_effect = None
+        service.vm_service.create_vm.reset_mock()
+        service.vm_service.generate_ssh_keypair.reset_mock()
+        
+        resumed = service.create_hosting(user.id, HostingCreate())
+        
+        assert resumed.id == hosting.id
+        assert resumed.status == HostingStatus.RUNNING
+        service.vm_service.create_vm.assert_not_called()
+        service.vm_service.generate_ssh_keypair.assert_not_called()
+    
+    def test_sweep_ignores_fresh_provisioning(self, db_session, user, service):
+        """최근 진행된 작업은 스위퍼가 건드리지 않음"""
+        service.proxy_service.add_proxy_rule.side_effect = Exception("워커 종료")
+        with patch.object(service, "compensate_provisioning"):
+            with pytest.raises(VMOperationError):
+                service.create_hosting(user.id, HostingCreate())
+        
+        result = service.sweep_stale_provisioning()
+        
+        assert result["found"] == 0
+        assert db_session.query(Hosting).one().status == HostingStatus.CREATING
+    
+    def test_stale_check_compares_aware_times(self, service):
+        """UTC가 아닌 시간대로 읽힌 updated_at과 시간대 없는 UTC 값 모두 같은 기준으로 비교"""
+        seoul = timezone(timedelta(hours=9))
+        now = datetime.now(timezone.utc)
+        fresh, stale = now - timedelta(seconds=10), now - timedelta(hours=1)
+        
+        assert not service._is_provisioning_stale(Hosting(updated_at=fresh.astimezone(seoul)))
+        assert service._is_provisioning_stale(Hosting(updated_at=stale.astimezone(seoul)))
+        assert not service._is_provisioning_stale(Hosting(updated_at=fresh.replace(tzinfo=None)))
+        assert service._is_provisioning_stale(Hosting(updated_at=stale.replace(tzinfo=None)))
+    
+    def test_sweep_compensates_unrecoverable(self, db_session, user, service):
+        """재개에 실패한 방치 작업은 보상 후 삭제"""
+        service.proxy_service.add_proxy_rule.side_effect = Exception("워커 종료")
+        with patch.object(service, "compensate_provisioning"):
+            with pytest.raises(VMOperationError):
+                service.create_hosting(user.id, HostingCreate())
+        
+        self._make_stale(db_session, db_session.query(Hosting).one())
+        
+        result = service.sweep_stale_provisioning()
+        
+        assert result == {"found": 1, "resumed": 0, "compensated": 1, "skipped": 0}
+        assert db_session.query(Hosting).count() == 0
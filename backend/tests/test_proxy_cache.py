@@ -0,0 +1,138 @@
+"""
+테넌트 프록시 캐시(공유 캐시 영역, 마이크로캐시, 삭제) 테스트
+"""
+import hashlib
+import os
+import jinja2
+import pytest
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+from app.core.exceptions import InsufficientPermissionError
+from app.models.user import User
+from app.models.hosting import Hosting, HostingStatus
+from app.schemas.hosting import HostingCacheUpdate
+from app.services.hosting_service import HostingService
+from app.services.proxy_cache_service import ProxyCacheManager, read_cache_key
+
+TEMPLATE_DIR = Path(__file__).parents[2] / "nginx" / "templates"
+
+
+def write_entry(cache_dir, key, size, mtime):
+    """nginx 캐시 파일 형식 (바이너리 헤더 + KEY 줄 + 응답) 흉내"""
+    digest = hashlib.md5(key.encode()).hexdigest()
+    path = cache_dir / digest[-1] / digest[-3:-1] / digest
+    path.parent.mkdir(parents=True, exist_ok=True)
+    header = b"\x05\x00\x00\x00" + b"\x00" * 330 + f"\nKEY: {key}\n".encode() + b"HTTP/1.1 200 OK\r\n\r\n"
+    path.write_bytes(header + b"x" * (size - len(header)))
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+class TestProxyCacheManager:
+    """공유 캐시 디렉토리의 테넌트별 관리 테스트"""
+    
+    def test_purge_only_tenant_entries(self, tmp_path):
+        """KEY 접두어가 같은 사용자 항목만 삭제하고, nginx 임시 파일은 건드리지 않음"""
+        page = write_entry(tmp_path, "7:http://localhost/7/", 1000, 100)
+        write_entry(tmp_path, "7:http://localhost/7/app.css", 2000, 100)
+        other = write_entry(tmp_path, "70:http://localhost/70/", 1000, 100)
+        temp_file = page.with_name(page.name + ".0000000001")
+        temp_file.write_bytes(b"writing")
+        
+        manager = ProxyCacheManager(tmp_path)
+        assert read_cache_key(page) == "7:http://localhost/7/"
+        assert manager.usage() == {"7": {"entries": 2, "bytes": 3000}, "70": {"entries": 1, "bytes": 1000}}
+        
+        assert manager.purge("7") == {"removed": 2, "bytes": 3000}
+        assert other.exists() and temp_file.exists()
+        assert ProxyCacheManager(tmp_path / "missing").purge("7")["removed"] == 0
+    
+    def test_enforce_caps_evicts_oldest(self, tmp_path):
+        """테넌트별 제한을 넘으면 오래된 항목부터 삭제"""
+        old = write_entry(tmp_path, "7:http://localhost/7/old", 1000, 100)
+        newer = write_entry(tmp_path, "7:http://localhost/7/new", 1000, 200)
+        small_tenant = write_entry(tmp_path, "8:http://localhost/8/", 1000, 100)
+        
+        evicted = ProxyCacheManager(tmp_path).enforce_caps({"8": 4096}, default_bytes=1500)
+        
+        assert evicted == {"7": 1}
+        assert not old.exists() and newer.exists() and small_tenant.exists()
+
+
+class TestCacheTemplates:
+    """사용자별 nginx 설정의 캐시 지시어 테스트"""
+    
+    def render(self, **values):
+        template = jinja2.Template((TEMPLATE_DIR / "user-hosting.conf.j2").read_text())
+        return template.render(user_id="7", vm_id="vm-c0000007", vm_ip="172.30.0.7", web_port=80, ssh_port=10007, **values)
+    
+    def test_microcache_is_opt_in(self):
+        """공유 영역과 사용자 키는 항상 사용하고, HTML 마이크로캐시는 설정 시에만 추가"""
+        default = self.render()
+        assert "proxy_cache tenant_content;" in default
+        assert 'proxy_cache_key "7:$scheme$host$request_uri";' in default
+        assert "proxy_cache_valid 200 3s;" not in default
+        
+        assert "proxy_cache_valid 200 3s;" in self.render(microcache_seconds="3")
+        assert "proxy_cache_valid 200 0s;" not in self.render(microcache_seconds="0")
+
+
+class TestHostingCacheSettings:
+    """호스팅 캐시 설정 변경 및 삭제 API 서비스 테스트"""
+    
+    @pytest.fixture
+    def service(self, db_session):
+        with patch("app.services.hosting_service.VMService"), \
+             patch("app.services.hosting_service.ProxyService"):
+            service = HostingService(db_session)
+        service.proxy_service = MagicMock()
+        service.proxy_service.get_proxy_info.return_value = {"web_port": 8007}
+        service.proxy_service.purge_cache.return_value = {"removed": 3, "bytes": 4096}
+        return service
+    
+    @pytest.fixture
+    def hosting(self, db_session):
+        user = User(email="cache@example.com", username="cache_user", hashed_password="not-a-real-hash")
+        db_session.add(user)
+        db_session.commit()
+        hosting = Hosting(
+            user_id=user.id, name="cache-hosting", vm_id="vm-c0000007", vm_ip="172.17.0.7",
+            ssh_port=10007, status=HostingStatus.RUNNING, plan="basic"
+        )
+        db_session.add(hosting)
+        db_session.commit()
+        return hosting
+    
+    def test_microcache_regenerates_proxy_rule(self, service, hosting):
+        """마이크로캐시 시간이 바뀔 때만 프록시 설정을 다시 생성"""
+        updated = service.update_cache_settings(hosting.id, hosting.user_id, HostingCacheUpdate(microcache_seconds=2))
+        
+        assert updated.microcache_seconds == 2
+        _, kwargs = service.proxy_service.update_proxy_rule.call_args
+        assert (kwargs["web_port"], kwargs["microcache_seconds"]) == (8007, 2)
+        
+        service.update_cache_settings(hosting.id, hosting.user_id, HostingCacheUpdate(cache_max_mb=32))
+        assert service.proxy_service.update_proxy_rule.call_count == 1
+        assert service.get_hosting_by_id(hosting.id).cache_max_mb == 32
+    
+    def test_purge_requires_owner(self, service, hosting):
+        """본인 호스팅만 캐시 삭제 가능"""
+        assert service.purge_cache(hosting.id, hosting.user_id)["removed"] == 3
+        service.proxy_service.purge_cache.assert_called_once_with(str(hosting.user_id))
+        
+        with pytest.raises(InsufficientPermissionError):
+            service.purge_cache(hosting.id, hosting.user_id + 1)
+    
+    def test_caps_from_hosting_settings(self, service, hosting, db_session):
+        """호스팅별 cache_max_mb가 있으면 기본 제한 대신 사용"""
+        hosting.cache_max_mb = 8
+        db_session.commit()
+        
+        with patch("app.services.hosting_service.ProxyCacheManager") as manager, \
+             patch("app.services.hosting_service.settings.PROXY_CACHE_TENANT_MAX_MB", 64):
+            service.enforce_cache_caps()
+        
+        manager.return_value.enforce_caps.assert_called_once_with(
+            {str(hosting.user_id): 8 * 1024 * 1024}, 64 * 1024 * 1024
+        )
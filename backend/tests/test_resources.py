@@ -0,0 +1,105 @@
+"""
+테넌트 리소스 플랜 및 컨테이너 제한 테스트
+"""
+import pytest
+from unittest.mock import patch, MagicMock
+
+from app.models.user import User
+from app.services.hosting_service import HostingService
+from app.services.vm_service import VMService
+from app.schemas.hosting import HostingCreate, HostingResourceUpdate
+from app.core.resource_plans import get_resource_plan
+from app.core.exceptions import VMOperationError
+
+
+class TestResourceFlags:
+    """docker 리소스 옵션 변환 테스트"""
+    
+    def test_resource_flags(self):
+        """리소스 제한이 docker 옵션으로 변환됨"""
+        flags = VMService._resource_flags(None, {
+            "memory_mb": 512,
+            "cpus": 0.5,
+            "cpu_shares": 512,
+            "pids_limit": 128,
+            "blkio_weight": 300
+        })
+        
+        assert flags == [
+            "--memory", "512m", "--memory-swap", "512m",
+            "--cpus", "0.5",
+            "--cpu-shares", "512",
+            "--pids-limit", "128",
+            "--blkio-weight", "300"
+        ]
+        assert VMService._resource_flags(None, None) == []
+    
+    def test_invalid_plan_rejected(self):
+        """존재하지 않는 플랜은 거부"""
+        with pytest.raises(ValueError):
+            HostingCreate(plan="unlimited")
+
+
+class TestHostingResources:
+    """호스팅 리소스 플랜 적용 테스트"""
+    
+    @pytest.fixture
+    def service(self, db_session):
+        """VM/프록시 서비스가 Mock 처리된 호스팅 서비스"""
+        with patch("app.services.hosting_service.VMService"), \
+             patch("app.services.hosting_service.ProxyService"):
+            service = HostingService(db_session)
+        service.vm_service = MagicMock()
+        service.vm_service.generate_vm_id.return_value = "vm-plan0001"
+        service.vm_service.get_available_ssh_port.return_value = 10023
+        service.vm_service.create_vm.return_value = {"vm_ip": "172.17.0.6", "web_port": 8200}
+        service.proxy_service = MagicMock()
+        service.proxy_service.add_proxy_rule.return_value = {"verified": True}
+        return service
+    
+    @pytest.fixture
+    def user(self, db_session):
+        """테스트 사용자 생성"""
+        user = User(
+            email="plan@example.com",
+            username="plan_user",
+            hashed_password="not-a-real-hash",
+            is_active=True
+        )
+        db_session.add(user)
+        db_session.commit()
+        db_session.refresh(user)
+        return user
+    
+    def test_create_applies_plan(self, user, service):
+        """생성 시 플랜 제한값이 저장되고 컨테이너 생성에 전달됨"""
+        hosting = service.create_hosting(user.id, HostingCreate(plan="basic"))
+        
+        assert hosting.plan == "basic"
+        assert hosting.resources == get_resource_plan("basic")
+        service.vm_service.create_vm.assert_called_once_with(
+            "vm-plan0001", 10023, str(user.id), resources=get_resource_plan("basic")
+        )
+    
+    def test_update_resources_live(self, user, service):
+        """플랜 변경 시 docker update로 즉시 적용"""
+        hosting = service.create_hosting(user.id, HostingCreate(plan="basic"))
+        
+        updated = service.update_hosting_resources(
+            hosting.id, HostingResourceUpdate(plan="premium", pids_limit=1024)
+        )
+        
+        expected = {**get_resource_plan("premium"), "pids_limit": 1024}
+        assert updated.plan == "premium"
+        assert updated.resources == expected
+        service.vm_service.update_container_resources.assert_called_once_with("vm-plan0001", expected)
+    
+    def test_update_failure_keeps_previous_limits(self, user, service):
+        """docker update 실패 시 DB 값은 변경되지 않음"""
+        hosting = service.create_hosting(user.id, HostingCreate(plan="basic"))
+        service.vm_service.update_container_resources.side_effect = VMOperationError("메모리 부족")
+        
+        with pytest.raises(VMOperationError):
+            service.update_hosting_resources(hosting.id, HostingResourceUpdate(memory_mb=64))
+        
+        assert service.get_hosting_by_id(hosting.id).resources == get_resource_plan("basic")
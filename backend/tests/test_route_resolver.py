@@ -0,0 +1,141 @@
+"""
+테넌트 라우트 리졸버 테스트
+"""
+import asyncio
+import json
+import pytest
+from unittest.mock import patch, MagicMock
+
+from app.core.middleware import TenantRouteResolverMiddleware
+from app.models.user import User
+from app.models.hosting import Hosting, HostingStatus
+from app.models.provisioning import ProvisioningJournal, ProvisioningStep
+from app.services.proxy_service import ProxyService
+from app.services.route_service import MISS, RouteTable, load_routes_from_db
+
+
+def call(resolver, path, client="127.0.0.1"):
+    """리졸버 ASGI 호출 결과 (상태 코드, 헤더)"""
+    messages = []
+    
+    async def receive():
+        return {"type": "http.request", "body": b""}
+    
+    async def send(message):
+        messages.append(message)
+    
+    asyncio.run(resolver({"type": "http", "path": path, "client": (client, 50000)}, receive, send))
+    return messages[0]["status"], dict(messages[0]["headers"])
+
+
+class TestRouteTable:
+    """메모리 라우트 테이블 테스트"""
+    
+    def test_set_and_remove_without_db(self):
+        """추가/삭제는 즉시 반영되고 DB를 조회하지 않음"""
+        loader = MagicMock(side_effect=AssertionError("DB 조회"))
+        table = RouteTable(loader=loader, ttl=60)
+        
+        table.set("7", "10.0.0.12", 8001)
+        assert table.resolve("7") == "10.0.0.12:8001"
+        assert table.remove("7")
+        assert table.resolve("7") is None
+    
+    def test_miss_and_expiry_reload_from_db(self):
+        """다른 워커에서 추가된 테넌트나 만료된 항목은 DB에서 다시 읽음"""
+        loader = MagicMock(side_effect=["172.17.0.5:80", "10.0.0.12:8001", None])
+        table = RouteTable(loader=loader, ttl=60)
+        
+        assert table.cached("7") is MISS
+        assert table.resolve("7") == "172.17.0.5:80"
+        assert table.resolve("7") == "172.17.0.5:80"
+        assert loader.call_count == 1
+        
+        with patch("app.services.route_service.time.monotonic", return_value=1e12):
+            assert table.resolve("7") == "10.0.0.12:8001"
+        
+        # 없는 사용자는 부재로 기록되어 잠시 동안 DB를 다시 조회하지 않음
+        assert table.resolve("8") is None
+        assert table.resolve("8") is None
+        assert loader.call_count == 3
+    
+    def test_load_from_db(self, db_session):
+        """실행 중인 호스팅의 IP와 컨테이너 생성 단계의 웹 포트로 라우트 구성"""
+        users = [User(email=f"route{i}@example.com", username=f"route_user{i}", hashed_password="not-a-real-hash") for i in range(3)]
+        db_session.add_all(users)
+        db_session.commit()
+        statuses = (HostingStatus.RUNNING, HostingStatus.RUNNING, HostingStatus.STOPPED)
+        for i, (user, status) in enumerate(zip(users, statuses)):
+            hosting = Hosting(
+                user_id=user.id, name=f"route{i}", vm_id=f"vm-route000{i}",
+                vm_ip=f"10.0.0.{i + 10}", ssh_port=10090 + i, status=status
+            )
+            db_session.add(hosting)
+            db_session.flush()
+            if i != 1:
+                db_session.add(ProvisioningJournal(
+                    hosting_id=hosting.id, step=ProvisioningStep.CONTAINER_CREATED,
+                    payload=json.dumps({"web_port": 8100 + i})
+                ))
+        db_session.commit()
+        
+        assert load_routes_from_db(db_session) == {
+            str(users[0].id): "10.0.0.10:8100",
+            str(users[1].id): "10.0.0.11:80"
+        }
+        assert load_routes_from_db(db_session, str(users[0].id)) == {str(users[0].id): "10.0.0.10:8100"}
+        assert load_routes_from_db(db_session, "../etc") == {}
+
+
+class TestResolverMiddleware:
+    """auth_request 리졸버 테스트"""
+    
+    @pytest.fixture
+    def table(self):
+        table = RouteTable(loader=lambda user_id: None, ttl=60)
+        table.set("7", "10.0.0.12", 8001)
+        with patch("app.core.middleware.get_route_table", return_value=table):
+            yield table
+    
+    def test_resolves_upstream_header(self, table):
+        """알려진 사용자는 200과 upstream 헤더, 없는 사용자는 403"""
+        app = MagicMock(side_effect=AssertionError("앱으로 전달됨"))
+        resolver = TenantRouteResolverMiddleware(app)
+        
+        assert call(resolver, "/internal/routes/7") == (200, {b"x-tenant-upstream": b"10.0.0.12:8001", b"content-length": b"0"})
+        assert call(resolver, "/internal/routes/8")[0] == 403
+    
+    def test_other_paths_and_clients_pass_through(self, table):
+        """리졸버 경로가 아니거나 허용되지 않은 클라이언트는 앱으로 전달"""
+        seen = []
+        
+        async def app(scope, receive, send):
+            seen.append(scope["path"])
+            await send({"type": "http.response.start", "status": 404, "headers": []})
+        
+        resolver = TenantRouteResolverMiddleware(app)
+        assert call(resolver, "/api/v1/health")[0] == 404
+        assert call(resolver, "/internal/routes/7", client="203.0.113.5")[0] == 404
+        assert seen == ["/api/v1/health", "/internal/routes/7"]
+
+
+class TestProxyServiceResolverMode:
+    """리졸버 모드의 프록시 규칙 관리 테스트"""
+    
+    def test_add_and_remove_without_reload(self):
+        """규칙 추가/삭제 시 nginx 관리 스크립트와 리로드를 실행하지 않음"""
+        table = RouteTable(loader=lambda user_id: None, ttl=60)
+        with patch("app.services.proxy_service.settings.PROXY_ROUTING_MODE", "resolver"), \
+             patch("app.services.proxy_service.get_route_table", return_value=table), \
+             patch("app.services.proxy_service.subprocess.run", side_effect=AssertionError("nginx 스크립트 실행")), \
+             patch.object(ProxyService, "_validate_setup"), \
+             patch.object(ProxyService, "_test_vm_connection", return_value=True):
+            service = ProxyService()
+            info = service.add_proxy_rule("7", "10.0.0.12", 10022, web_port=8001, vm_id="vm-route0007")
+            
+            assert info["verified"] and info["routing"] == "resolver"
+            assert table.resolve("7") == "10.0.0.12:8001"
+            assert service.get_proxy_info("7")["web_port"] == 8001
+            
+            assert service.remove_proxy_rules(["7"]) == {"7": True}
+            assert table.resolve("7") is None
@@ -0,0 +1,216 @@
+"""
+유휴 컨테이너 자동 중지/깨우기(scale-to-zero) 테스트
+"""
+import asyncio
+import json
+import time
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch, MagicMock
+from sqlalchemy.orm import sessionmaker
+
+from app.core import events
+from app.core.exceptions import VMOperationError
+from app.core.middleware import TenantWakeMiddleware
+from app.models.user import User
+from app.models.hosting import Hosting, HostingStatus
+from app.models.provisioning import ProvisioningJournal, ProvisioningStep
+from app.services.hosting_service import HostingService
+from app.services.route_service import MISS, RouteTable, load_routes_from_db, wake_upstream
+from app.services.scale_to_zero_service import ColdStartRecorder
+
+
+def call(middleware, path, headers=(), query=b""):
+    """ASGI 호출 결과 (상태 코드, 헤더, 본문)"""
+    messages = []
+    
+    async def receive():
+        return {"type": "http.request", "body": b""}
+    
+    async def send(message):
+        messages.append(message)
+    
+    scope = {"type": "http", "path": path, "query_string": query, "headers": list(headers), "client": ("127.0.0.1", 50000)}
+    asyncio.run(middleware(scope, receive, send))
+    return messages[0]["status"], dict(messages[0]["headers"]), messages[1]["body"]
+
+
+@pytest.fixture
+def service(db_session, tmp_path):
+    with patch("app.services.hosting_service.VMService"), \
+         patch("app.services.hosting_service.ProxyService"), \
+         patch("app.services.scale_to_zero_service.settings.VM_IMAGE_PATH", str(tmp_path)):
+        service = HostingService(db_session)
+        yield service
+
+
+@pytest.fixture
+def hostings(db_session):
+    users = [User(email=f"idle{i}@example.com", username=f"idle_user{i}", hashed_password="not-a-real-hash") for i in range(3)]
+    db_session.add_all(users)
+    db_session.commit()
+    hostings = []
+    for i, (user, plan) in enumerate(zip(users, ("basic", "basic", "static"))):
+        hosting = Hosting(
+            user_id=user.id, name=f"idle{i}", vm_id=f"vm-idle000{i}", vm_ip=f"172.30.0.{i + 10}",
+            ssh_port=10150 + i, status=HostingStatus.RUNNING, plan=plan
+        )
+        db_session.add(hosting)
+        db_session.flush()
+        db_session.add(ProvisioningJournal(
+            hosting_id=hosting.id, step=ProvisioningStep.CONTAINER_CREATED, payload=json.dumps({"web_port": 80})
+        ))
+        hostings.append(hosting)
+    db_session.commit()
+    return hostings
+
+
+class TestIdleStop:
+    """접근 로그 기반 유휴 컨테이너 중지 테스트"""
+    
+    def test_stops_only_idle_container_hostings(self, service, hostings):
+        """최근 요청이 있는 테넌트와 정적 호스팅은 두고 유휴 컨테이너만 중지, 라우트는 깨우기 경로로"""
+        now = time.time() + 7200
+        busy, idle, static = hostings
+        table = RouteTable(loader=lambda user_id: None, ttl=60)
+        
+        with patch("app.services.hosting_service.AccessLogIngester") as ingester, \
+             patch("app.services.hosting_service.get_route_table", return_value=table), \
+             patch("app.services.hosting_service.settings.PROXY_ROUTING_MODE", "resolver"):
+            ingester.return_value.last_seen.return_value = ({str(busy.user_id): now - 60}, now - 5)
+            assert service.stop_idle_hostings(now=now) == [idle.id]
+            
+            # 수집이 멈춰 있으면 요청 여부를 알 수 없으므로 중지하지 않음
+            ingester.return_value.last_seen.return_value = ({}, now - 3600)
+            assert service.stop_idle_hostings(now=now) == []
+        
+        service.vm_service.stop_container.assert_called_once_with(idle.vm_id, None)
+        assert idle.status == HostingStatus.STOPPED and idle.idle_stopped_at is not None
+        assert busy.status == static.status == HostingStatus.RUNNING
+        assert table.resolve(str(idle.user_id)) == wake_upstream(str(idle.user_id))
+    
+    def test_sleeping_hosting_routes_to_wake_path(self, db_session, hostings):
+        """자동 중지된 호스팅은 깨우기 경로로, 깨우기 항목은 짧게만 캐시"""
+        hostings[1].status = HostingStatus.STOPPED
+        hostings[1].idle_stopped_at = hostings[1].created_at
+        hostings[2].status = HostingStatus.STOPPED
+        db_session.commit()
+        
+        routes = load_routes_from_db(db_session)
+        assert routes[str(hostings[1].user_id)] == f"127.0.0.1:8000/internal/wake/{hostings[1].user_id}"
+        assert str(hostings[2].user_id) not in routes
+        
+        table = RouteTable(loader=lambda user_id: None, ttl=60)
+        with patch("app.services.route_service.time.monotonic", return_value=0):
+            table.set_upstream("7", wake_upstream("7"))
+        with patch("app.services.route_service.time.monotonic", return_value=2):
+            assert table.cached("7") is MISS
+
+
+class TestScheduledIdleStop:
+    """시작 이벤트가 예약하는 접근 로그 수집 + 유휴 중지 작업 경로 테스트"""
+    
+    def test_background_loops_stop_idle_container(self, db_session, hostings, tmp_path):
+        """수집 작업이 로그를 집계한 뒤에야 유휴 점검 작업이 유휴 컨테이너만 중지"""
+        busy, idle, static = hostings
+        db_session.query(Hosting).update(
+            {Hosting.updated_at: datetime.now(timezone.utc) - timedelta(hours=2)}, synchronize_session=False
+        )
+        db_session.commit()
+        log_file = tmp_path / "tenants.access.log"
+        log_file.write_text(json.dumps({
+            "ts": time.time(), "tenant": str(busy.user_id), "status": 200, "bytes": 100, "rt": 0.004
+        }) + "\n")
+        
+        async def run_loops(stop_container):
+            tasks = await events.start_background_tasks()
+            try:
+                for _ in range(500):
+                    if stop_container.called:
+                        break
+                    await asyncio.sleep(0.01)
+            finally:
+                await events.stop_background_tasks()
+            return tasks
+        
+        disabled = {
+            flag: False for flag in (
+                "TEMP_CLEANUP_ENABLED", "PROVISIONING_SWEEP_ENABLED", "GC_ENABLED", "STATIC_PROMOTION_ENABLED",
+                "PROXY_CACHE_ENFORCE_ENABLED", "USAGE_COLLECT_ENABLED"
+            )
+        }
+        loop_settings = dict(
+            disabled, ACCESS_LOG_INGEST_ENABLED=True, SCALE_TO_ZERO_ENABLED=True,
+            ACCESS_LOG_INGEST_INTERVAL=0, SCALE_TO_ZERO_CHECK_INTERVAL=0,
+            TENANT_ACCESS_LOG_PATH=str(log_file), VM_IMAGE_PATH=str(tmp_path)
+        )
+        with patch.multiple(events.settings, **loop_settings), \
+             patch("app.core.events.SessionLocal", sessionmaker(bind=db_session.get_bind())), \
+             patch("app.services.hosting_service.VMService") as vm_service, \
+             patch("app.services.hosting_service.ProxyService"):
+            tasks = asyncio.run(run_loops(vm_service.return_value.stop_container))
+        
+        assert sorted(task.get_name() for task in tasks) == ["access_log_ingest_task", "scale_to_zero_task"]
+        vm_service.return_value.stop_container.assert_called_once_with(idle.vm_id, None)
+        db_session.expire_all()
+        assert idle.status == HostingStatus.STOPPED and idle.idle_stopped_at is not None
+        assert busy.status == static.status == HostingStatus.RUNNING
+
+
+class TestWake:
+    """첫 요청 때 컨테이너 깨우기 테스트"""
+    
+    def test_wake_restores_route_and_records_cold_start(self, service, hostings, db_session):
+        """컨테이너를 시작하고 바뀐 IP로 라우트를 되돌린 뒤 콜드 스타트 시간 기록"""
+        hosting = hostings[1]
+        hosting.status = HostingStatus.STOPPED
+        hosting.idle_stopped_at = hosting.created_at
+        db_session.commit()
+        service.vm_service.start_container.return_value = "172.30.0.99"
+        table = RouteTable(loader=lambda user_id: None, ttl=60)
+        
+        with patch("app.services.hosting_service.wait_until_ready", return_value=True) as ready, \
+             patch("app.services.hosting_service.get_route_table", return_value=table), \
+             patch("app.services.hosting_service.settings.PROXY_ROUTING_MODE", "resolver"):
+            record = service.wake_idle_hosting(hosting.user_id)
+            assert service.wake_idle_hosting(hosting.user_id) is None
+        
+        ready.assert_called_once_with("172.30.0.99:80", 30)
+        assert table.resolve(str(hosting.user_id)) == "172.30.0.99:80"
+        assert hosting.status == HostingStatus.RUNNING and hosting.idle_stopped_at is None
+        assert record["vm_id"] == hosting.vm_id
+        assert ColdStartRecorder().stats()["basic"]["count"] == 1
+    
+    def test_user_stopped_hosting_is_not_woken(self, service, hostings, db_session):
+        """사용자가 직접 중지한 호스팅은 요청이 와도 시작하지 않음"""
+        hostings[0].status = HostingStatus.STOPPED
+        db_session.commit()
+        
+        assert service.wake_idle_hosting(hostings[0].user_id) is None
+        service.vm_service.start_container.assert_not_called()
+
+
+class TestWakeMiddleware:
+    """nginx 폴백이 호출하는 깨우기 경로 테스트"""
+    
+    @pytest.fixture
+    def middleware(self):
+        return TenantWakeMiddleware(MagicMock(side_effect=AssertionError("앱으로 전달됨")))
+    
+    def test_redirects_to_original_uri_after_wake(self, middleware):
+        """깨우면 원래 주소로 307, 다른 사용자 경로의 헤더는 무시하고 요청 경로 사용"""
+        with patch("app.core.middleware.wake_tenant", return_value={"seconds": 1.2}) as wake:
+            status, headers, _ = call(middleware, "/internal/wake/7", [(b"x-original-uri", b"/7/shop?page=2")])
+            assert (status, headers[b"location"]) == (307, b"/7/shop?page=2")
+            
+            status, headers, _ = call(middleware, "/internal/wake/7/app.js", [(b"x-original-uri", b"/70/x")], b"v=3")
+            assert headers[b"location"] == b"/7/app.js?v=3"
+        wake.assert_called_with("7")
+    
+    def test_starting_page_when_nothing_to_wake(self, middleware):
+        """깨울 호스팅이 없거나 실패하면 리다이렉트 대신 새로고침하는 준비 중 페이지"""
+        for outcome in ({"return_value": None}, {"side_effect": VMOperationError("시간 초과")}):
+            with patch("app.core.middleware.wake_tenant", **outcome):
+                status, headers, body = call(middleware, "/internal/wake/7")
+            assert status == 503 and headers[b"refresh"] == b"5"
+            assert "준비 중".encode() in body
@@ -0,0 +1,168 @@
+"""
+단일 포트 SSH 게이트웨이 테스트
+"""
+import asyncio
+import pytest
+from unittest.mock import patch
+from sqlalchemy.orm import sessionmaker
+
+from app.models.user import User
+from app.models.hosting import Hosting, HostingStatus
+from app.services.ssh_gateway_service import (
+    GatewayStats, SSHRouter, load_gateway_stats, parse_login, public_key_fingerprint, pump
+)
+from app.services.vm_service import VMService
+
+
+class FakeReader:
+    """정해진 청크를 돌려주고 끝나면 EOF (중간에 예외를 끼워 넣을 수 있음)"""
+    
+    def __init__(self, *chunks):
+        self.chunks = list(chunks)
+    
+    async def read(self, n):
+        if not self.chunks:
+            return b""
+        chunk = self.chunks.pop(0)
+        if isinstance(chunk, Exception):
+            raise chunk
+        return chunk
+
+
+class FakeWriter:
+    def __init__(self):
+        self.data = b""
+        self.eof = False
+    
+    def write(self, data):
+        self.data += data
+    
+    async def drain(self):
+        pass
+    
+    def write_eof(self):
+        self.eof = True
+
+
+class TestLoginParsing:
+    """사용자 이름/공개키 지문 파싱 테스트"""
+    
+    def test_parse_login(self):
+        """"계정+호스팅" 형식을 분리하고 잘못된 이름은 거부"""
+        assert parse_login("ubuntu+7") == ("ubuntu", "7")
+        assert parse_login("webhoster+vm-abc12345") == ("webhoster", "vm-abc12345")
+        assert parse_login("ubuntu") == ("ubuntu", None)
+        assert parse_login("ubuntu+") == (None, None)
+        assert parse_login("root;rm -rf /+1") == (None, None)
+    
+    def test_public_key_fingerprint(self):
+        """OpenSSH 공개키의 SHA256 지문 (ssh-keygen -l과 같은 형식)"""
+        line = "ssh-ed25519 AAAAC3NzaC1lZDI1NTE5AAAAIOMqqnkVzrm0SdG6UOoqKLsabgH5C9okWi0dh2l9GKJl webhoster-vm-1"
+        
+        assert public_key_fingerprint(line) == "SHA256:+DiY3wvvV6TuJJhbpZisF/zLDA0zPMSvHdkr4UvCOqU"
+        assert public_key_fingerprint("ssh-rsa not-base64!") is None
+        assert public_key_fingerprint("") is None
+
+
+class TestSSHRouter:
+    """사용자 이름/공개키로 대상 테넌트를 찾는 라우터 테스트"""
+    
+    @pytest.fixture
+    def router(self, db_session, tmp_path):
+        user = User(email="gw@example.com", username="gw_user", hashed_password="not-a-real-hash")
+        db_session.add(user)
+        db_session.commit()
+        for index, (vm_id, plan) in enumerate([("vm-gw000001", "basic"), ("vm-gw000002", "static")]):
+            db_session.add(Hosting(
+                user_id=user.id, name=vm_id, vm_id=vm_id, vm_ip=f"172.30.0.{index + 5}",
+                ssh_port=10050 + index, status=HostingStatus.RUNNING, plan=plan
+            ))
+        db_session.commit()
+        
+        vm_service = VMService.__new__(VMService)
+        vm_service.image_path = tmp_path
+        vm_service.generate_ssh_keypair("vm-gw000001")
+        return SSHRouter(image_root=tmp_path, session_factory=sessionmaker(bind=db_session.get_bind()))
+    
+    def test_routes_by_hosting_id_or_vm_id(self, router, db_session, tmp_path):
+        """호스팅 ID와 VM ID 모두 같은 컨테이너의 내부 주소 22번 포트로 라우팅"""
+        hosting = db_session.query(Hosting).filter(Hosting.vm_id == "vm-gw000001").one()
+        
+        target = router.resolve(f"ubuntu+{hosting.id}")
+        assert (target["host"], target["port"], target["login"]) == ("172.30.0.5", 22, "ubuntu")
+        assert target["key_path"] == str(tmp_path / "ssh-keys" / "vm-gw000001" / "id_rsa")
+        assert router.resolve("webhoster+vm-gw000001")["hosting_id"] == hosting.id
+        
+        assert router.resolve("ubuntu+vm-gw000002") is None
+        assert router.resolve("ubuntu+999") is None
+    
+    def test_routes_by_key_fingerprint(self, router, tmp_path):
+        """호스팅 참조가 없으면 테넌트 키 지문으로 찾고, 다른 키는 인증 거부"""
+        public_key = (tmp_path / "ssh-keys" / "vm-gw000001" / "id_rsa.pub").read_text()
+        fingerprint = public_key_fingerprint(public_key)
+        
+        target = router.resolve("ubuntu", fingerprint)
+        assert target["vm_id"] == "vm-gw000001"
+        assert router.authorizes(target, fingerprint)
+        assert not router.authorizes(target, "SHA256:other")
+        assert router.resolve("ubuntu", "SHA256:other") is None
+
+
+class TestGatewayStats:
+    """세션 수/전송량 집계와 중계 테스트"""
+    
+    def test_pump_counts_bytes_and_forwards_events(self):
+        """EOF까지 복사하며 바이트를 집계하고, 처리 가능한 예외는 건너뜀"""
+        stats = GatewayStats()
+        writer = FakeWriter()
+        resize = RuntimeError("terminal size changed")
+        
+        total = asyncio.run(pump(
+            FakeReader(b"ls -al\n", resize, b"exit\n"), writer,
+            lambda n: stats.add_bytes("7", inbound=n),
+            lambda exc: exc is resize
+        ))
+        
+        assert total == 12 and writer.data == b"ls -al\nexit\n" and writer.eof
+        assert stats.snapshot()["tenants"]["7"]["bytes_in"] == 12
+        
+        with pytest.raises(ValueError):
+            asyncio.run(pump(FakeReader(ValueError("끊김")), FakeWriter(), lambda n: None))
+    
+    def test_session_counts_written_for_api(self, tmp_path):
+        """활성/누적 세션 수를 파일로 기록하고 API 쪽에서 읽음"""
+        stats = GatewayStats()
+        stats.session_opened("7")
+        stats.session_opened("7")
+        stats.session_closed("7")
+        stats.add_bytes("7", outbound=2048)
+        
+        stats.write(tmp_path / "ssh-gateway" / "stats.json")
+        loaded = load_gateway_stats(tmp_path)
+        
+        assert loaded["active_sessions"] == 1
+        assert loaded["tenants"]["7"] == {"active_sessions": 1, "total_sessions": 2, "bytes_in": 0, "bytes_out": 2048}
+        assert load_gateway_stats(tmp_path / "missing")["tenants"] == {}
+
+
+class TestGatewayMode:
+    """게이트웨이 모드의 포트 배정 테스트"""
+    
+    def test_ssh_port_is_identifier_without_range_limit(self, db_session):
+        """게이트웨이 모드는 SSH 포트 범위를 넘어서도 배정하고 컨테이너에 게시하지 않음"""
+        vm_service = VMService.__new__(VMService)
+        user = User(email="gw2@example.com", username="gw_user2", hashed_password="not-a-real-hash")
+        db_session.add(user)
+        db_session.commit()
+        for port in (10000, 10001):
+            db_session.add(Hosting(
+                user_id=user.id, name=f"h{port}", vm_id=f"vm-{port}", vm_ip="172.30.0.2",
+                ssh_port=port, status=HostingStatus.RUNNING
+            ))
+        db_session.commit()
+        
+        with patch("app.services.vm_service.settings.SSH_GATEWAY_ENABLED", True), \
+             patch.object(VMService, "_is_port_available", return_value=False):
+            assert vm_service.get_available_ssh_port(10000, 10001, db_session=db_session) == 10002
+            assert vm_service._ssh_port_flags(10002) == []
+            assert vm_service._ssh_port_flags(10002, "tcp://10.0.0.12:2376") == ["-p", "10002:22"]
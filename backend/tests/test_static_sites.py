@@ -0,0 +1,159 @@
+"""
+정적 호스팅(static 플랜) 테스트
+"""
+import gzip
+import os
+import pytest
+from unittest.mock import patch, MagicMock
+
+from app.core.exceptions import VMOperationError
+from app.core.resource_plans import get_resource_plan
+from app.models.user import User
+from app.models.hosting import HostingStatus
+from app.models.provisioning import ProvisioningStep
+from app.schemas.hosting import HostingCreate, HostingResourceUpdate
+from app.services.hosting_service import HostingService
+from app.services.route_service import RouteTable, load_routes_from_db
+from app.services.static_site_service import dynamic_markers, precompress
+from app.services.vm_service import VMService
+
+
+class TestPrecompress:
+    """gzip_static용 사전 압축 테스트"""
+    
+    def test_precompress_only_changed_files(self, tmp_path):
+        """압축 가능한 큰 파일만 압축하고, 원본이 바뀐 파일만 다시 압축"""
+        (tmp_path / "assets").mkdir()
+        page = tmp_path / "index.html"
+        page.write_text("<p>hello</p>" * 200)
+        (tmp_path / "assets" / "app.js").write_text("console.log(1);" * 100)
+        (tmp_path / "small.css").write_text("body{}")
+        (tmp_path / "photo.png").write_bytes(b"\x89PNG" * 1000)
+        
+        assert precompress(tmp_path) == 2
+        assert gzip.decompress((tmp_path / "index.html.gz").read_bytes()) == page.read_bytes()
+        assert (tmp_path / "assets" / "app.js.gz").exists()
+        assert not (tmp_path / "small.css.gz").exists()
+        assert not (tmp_path / "photo.png.gz").exists()
+        assert precompress(tmp_path) == 0
+        
+        page.write_text("<p>changed</p>" * 200)
+        os.utime(page, ns=(0, 10 ** 18))
+        assert precompress(tmp_path) == 1
+        assert gzip.decompress((tmp_path / "index.html.gz").read_bytes()) == page.read_bytes()
+    
+    def test_stale_gzip_removed(self, tmp_path):
+        """원본이 삭제된 .gz는 제거하고, 사용자가 올린 압축 파일은 유지"""
+        (tmp_path / "old.html").write_text("x" * 2000)
+        precompress(tmp_path)
+        (tmp_path / "old.html").unlink()
+        (tmp_path / "backup.tar.gz").write_bytes(b"archive")
+        
+        precompress(tmp_path)
+        
+        assert not (tmp_path / "old.html.gz").exists()
+        assert (tmp_path / "backup.tar.gz").exists()
+    
+    def test_dynamic_markers(self, tmp_path):
+        """서버 측 스크립트 파일만 동적 콘텐츠로 판단"""
+        (tmp_path / "api").mkdir()
+        (tmp_path / "index.html").write_text("hi")
+        assert dynamic_markers(tmp_path) == []
+        
+        (tmp_path / "api" / "login.PHP").write_text("<?php ?>")
+        assert dynamic_markers(tmp_path) == ["api/login.PHP"]
+        assert dynamic_markers(tmp_path / "missing") == []
+
+
+class TestStaticHosting:
+    """정적 호스팅 생성 및 컨테이너 플랜 전환 테스트"""
+    
+    @pytest.fixture
+    def service(self, db_session, tmp_path):
+        """웹 디렉토리만 실제로 만드는 호스팅 서비스 (컨테이너/nginx는 Mock)"""
+        with patch("app.services.hosting_service.VMService"), \
+             patch("app.services.hosting_service.ProxyService"):
+            service = HostingService(db_session)
+        vm_service = VMService.__new__(VMService)
+        vm_service.image_path = tmp_path
+        service.vm_service = MagicMock(wraps=vm_service)
+        service.vm_service.image_path = tmp_path
+        service.vm_service.generate_vm_id.return_value = "vm-static01"
+        service.vm_service.get_available_ssh_port.return_value = 10031
+        service.vm_service.generate_ssh_keypair.return_value = ("", "")
+        service.vm_service.create_vm.return_value = {"vm_ip": "172.17.0.9", "web_port": 8300}
+        service.proxy_service = MagicMock()
+        service.proxy_service.add_static_rule.return_value = {"web_url": "http://localhost/1", "verified": True}
+        service.proxy_service.update_proxy_rule.return_value = {"verified": True}
+        return service
+    
+    @pytest.fixture
+    def user(self, db_session):
+        user = User(email="static@example.com", username="static_user", hashed_password="not-a-real-hash")
+        db_session.add(user)
+        db_session.commit()
+        return user
+    
+    def test_static_plan_creates_no_container(self, user, service, tmp_path):
+        """정적 플랜은 컨테이너 없이 웹 디렉토리 직접 서빙 규칙만 추가"""
+        hosting = service.create_hosting(user.id, HostingCreate(plan="static"))
+        
+        web_dir = tmp_path / "containers" / "vm-static01" / "www"
+        assert hosting.status == HostingStatus.RUNNING
+        assert hosting.resources == {}
+        assert hosting.cpuset is None
+        assert (web_dir / "index.html").exists()
+        service.vm_service.create_vm.assert_not_called()
+        service.proxy_service.add_proxy_rule.assert_not_called()
+        service.proxy_service.add_static_rule.assert_called_once_with(
+            str(user.id), str(web_dir.resolve()), "vm-static01"
+        )
+        
+        with pytest.raises(VMOperationError):
+            service.perform_operation(hosting.id, "restart", user.id)
+        assert service.sync_hosting_status(hosting.id).status == HostingStatus.RUNNING
+    
+    def test_dynamic_content_promotes_to_container(self, user, service, tmp_path):
+        """서버 측 스크립트가 올라오면 같은 웹 디렉토리로 컨테이너를 만들고 프록시로 전환"""
+        hosting = service.create_hosting(user.id, HostingCreate(plan="static"))
+        web_dir = tmp_path / "containers" / "vm-static01" / "www"
+        (web_dir / "app.css").write_text("a{}" * 1000)
+        
+        assert service.refresh_static_hostings()["precompressed"] == 1
+        service.vm_service.create_vm.assert_not_called()
+        
+        (web_dir / "index.php").write_text("<?php echo 1; ?>")
+        result = service.refresh_static_hostings()
+        
+        assert result["promoted"] == 1
+        promoted = service.get_hosting_by_id(hosting.id)
+        assert promoted.plan == "basic"
+        assert promoted.vm_ip == "172.17.0.9"
+        assert promoted.resources == get_resource_plan("basic")
+        service.vm_service.create_vm.assert_called_once_with(
+            "vm-static01", 10031, str(user.id), resources=get_resource_plan("basic")
+        )
+        _, proxy_kwargs = service.proxy_service.update_proxy_rule.call_args
+        assert proxy_kwargs["web_port"] == 8300
+        assert service.journal.get_entries(hosting.id)[ProvisioningStep.CONTAINER_CREATED]["web_port"] == 8300
+        assert service.refresh_static_hostings()["checked"] == 0
+    
+    def test_failed_promotion_keeps_static_serving(self, user, service):
+        """전환 중 프록시 변경이 실패하면 컨테이너를 정리하고 정적 호스팅 유지"""
+        hosting = service.create_hosting(user.id, HostingCreate(plan="static"))
+        service.proxy_service.update_proxy_rule.side_effect = Exception("nginx 오류")
+        
+        with pytest.raises(VMOperationError):
+            service.update_hosting_resources(hosting.id, HostingResourceUpdate(plan="standard"))
+        
+        assert service.get_hosting_by_id(hosting.id).plan == "static"
+        service.vm_service.remove_container.assert_called_with("vm-static01")
+    
+    def test_resolver_routes_static_hosting(self, user, service, db_session):
+        """리졸버 라우트는 정적 호스팅을 내부 정적 서버의 VM ID 경로로 연결"""
+        service.create_hosting(user.id, HostingCreate(plan="static"))
+        
+        assert load_routes_from_db(db_session) == {str(user.id): "127.0.0.1:8081/vm-static01"}
+        table = RouteTable(loader=lambda user_id: None, ttl=60)
+        table.set_upstream(str(user.id), "127.0.0.1:8081/vm-static01")
+        assert table.resolve(str(user.id)) == "127.0.0.1:8081/vm-static01"
@@ -0,0 +1,74 @@
+"""
+사용자별 upstream keepalive 연결 풀 테스트
+"""
+import jinja2
+from pathlib import Path
+from unittest.mock import patch
+
+from app.services.proxy_service import ProxyService
+
+TEMPLATE_DIR = Path(__file__).parents[2] / "nginx" / "templates"
+
+
+def render(name, **values):
+    return jinja2.Template((TEMPLATE_DIR / name).read_text()).render(**values)
+
+
+class TestUpstreamTemplates:
+    """nginx 템플릿 렌더링 테스트"""
+    
+    def test_location_uses_named_upstream(self):
+        """location은 IP:포트 대신 사용자별 upstream으로 프록시하고 일반 요청은 Connection을 비움"""
+        config = render("user-hosting.conf.j2", user_id="7", vm_id="vm-ka000007", vm_ip="172.30.0.7", web_port=80, ssh_port=10007)
+        
+        assert "proxy_pass http://tenant_7;" in config
+        assert "proxy_pass http://172.30.0.7" not in config
+        assert 'proxy_set_header Connection "upgrade"' not in config
+        assert "proxy_set_header Connection $connection_upgrade;" in config
+    
+    def test_upstream_keepalive_pool(self):
+        """upstream 블록에 keepalive 설정을 넣고, 0이면 연결 풀 없이 생성"""
+        config = render(
+            "user-upstream.conf.j2", user_id="7", vm_id="vm-ka000007", vm_ip="172.30.0.7", web_port=80,
+            keepalive="32", keepalive_requests="500", keepalive_timeout="30"
+        )
+        assert "upstream tenant_7 {" in config
+        assert "server 172.30.0.7:80;" in config
+        assert "keepalive 32;" in config and "keepalive_requests 500;" in config and "keepalive_timeout 30s;" in config
+        
+        disabled = render("user-upstream.conf.j2", user_id="7", vm_id="vm-ka000007", vm_ip="172.30.0.7", web_port=80, keepalive="0")
+        assert "keepalive" not in disabled.split("{", 1)[1]
+
+
+class TestProxyServiceKeepalive:
+    """설정 파일 방식의 keepalive 옵션 전달과 설정 조회 테스트"""
+    
+    def test_add_rule_passes_keepalive_options(self):
+        """관리 스크립트에 설정값의 keepalive 옵션 전달"""
+        with patch("app.services.proxy_service.subprocess.run") as run, \
+             patch("app.services.proxy_service.time.sleep"), \
+             patch("app.services.proxy_service.settings.PROXY_UPSTREAM_KEEPALIVE", 8), \
+             patch.object(ProxyService, "_validate_setup"), \
+             patch.object(ProxyService, "_validate_nginx_config_with_sudo", return_value=True), \
+             patch.object(ProxyService, "_reload_nginx"), \
+             patch.object(ProxyService, "_test_vm_connection", return_value=True), \
+             patch.object(ProxyService, "_test_proxy_rule", return_value=True):
+            ProxyService().add_proxy_rule("7", "172.30.0.7", 10007, web_port=80, vm_id="vm-ka000007")
+        
+        command = run.call_args_list[0].args[0]
+        assert command[command.index("--keepalive") + 1] == "8"
+        assert command[command.index("--keepalive-requests") + 1] == "1000"
+    
+    def test_proxy_info_from_upstream_and_legacy_configs(self, tmp_path):
+        """upstream 방식 설정과 이전 proxy_pass 설정 모두에서 주소 조회"""
+        with patch.object(ProxyService, "_validate_setup"):
+            service = ProxyService()
+        service.hosting_dir = tmp_path
+        (tmp_path / "7.conf").write_text(
+            render("user-hosting.conf.j2", user_id="7", vm_id="vm-ka000007", vm_ip="172.30.0.7", web_port=80, ssh_port=10007)
+        )
+        (tmp_path / "8.conf").write_text("# VM ID: vm-ka000008\nlocation /8 {\n    proxy_pass http://172.17.0.8:8008;\n}\n")
+        
+        info = service.get_proxy_info("7")
+        assert (info["vm_ip"], info["web_port"], info["ssh_port"]) == ("172.30.0.7", 80, 10007)
+        assert (service.get_proxy_info("8")["vm_ip"], service.get_proxy_info("8")["web_port"]) == ("172.17.0.8", 8008)
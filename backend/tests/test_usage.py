@@ -0,0 +1,117 @@
+"""
+테넌트 컨테이너 리소스 사용량 수집 테스트
+"""
+import pytest
+from unittest.mock import patch, MagicMock
+
+from app.services.usage_service import UsageCollector, UsageRing, load_usage, parse_window
+
+CONTAINER_ID = "a" * 64
+OTHER_ID = "b" * 64
+
+
+def write_cgroup(cgroup_root, container_id, cpu_usec, memory, rbytes, wbytes, pid="4242"):
+    """systemd 드라이버 형식의 가짜 cgroup v2 디렉토리"""
+    path = cgroup_root / "system.slice" / f"docker-{container_id}.scope"
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "cpu.stat").write_text(f"usage_usec {cpu_usec}\nuser_usec 0\nsystem_usec 0\n")
+    (path / "memory.current").write_text(f"{memory}\n")
+    (path / "io.stat").write_text(f"8:0 rbytes={rbytes} wbytes={wbytes} rios=1 wios=1\n259:0 rbytes=0 wbytes=0\n")
+    (path / "cgroup.procs").write_text(f"{pid}\n")
+    return path
+
+
+def write_net(proc_root, rx, tx, pid="4242"):
+    path = proc_root / pid / "net"
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "dev").write_text(
+        "Inter-|   Receive                            |  Transmit\n"
+        " face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets\n"
+        "    lo: 999 1 0 0 0 0 0 0 999 1 0 0 0 0 0 0\n"
+        f"  eth0: {rx} 10 0 0 0 0 0 0 {tx} 10 0 0 0 0 0 0\n"
+    )
+
+
+@pytest.fixture
+def collector(tmp_path):
+    collector = UsageCollector(tmp_path / "cgroup", tmp_path / "proc", tmp_path / "usage")
+    ps = MagicMock(returncode=0, stdout=f"{CONTAINER_ID} webhost-vm-usage0001\n{OTHER_ID} unrelated\n")
+    with patch("app.services.usage_service.subprocess.run", return_value=ps) as run:
+        collector.run = run
+        yield collector
+
+
+class TestUsageRing:
+    """고정 크기 링 버퍼 테스트"""
+    
+    def test_wraps_around_with_fixed_file_size(self, tmp_path):
+        """용량을 넘으면 오래된 샘플을 덮어쓰고 파일 크기는 그대로"""
+        ring = UsageRing(tmp_path / "vm.ring", capacity=4)
+        ring.append(1, [0.1] * 6)
+        size = ring.path.stat().st_size
+        for timestamp in range(2, 7):
+            ring.append(timestamp, [timestamp] * 6)
+        
+        timestamps, columns = ring.read()
+        assert list(timestamps) == [3, 4, 5, 6]
+        assert list(columns["memory_bytes"]) == [3, 4, 5, 6]
+        assert list(ring.read(since=4)[0]) == [5, 6]
+        assert ring.path.stat().st_size == size
+
+
+class TestUsageCollector:
+    """cgroup v2 직접 읽기 수집 테스트"""
+    
+    def test_rates_from_counter_deltas(self, collector, tmp_path):
+        """두 번째 수집부터 누적 카운터 차이로 초당 사용량 기록, docker ps는 새 컨테이너가 보일 때만"""
+        cgroup_root, proc_root = tmp_path / "cgroup", tmp_path / "proc"
+        write_cgroup(cgroup_root, CONTAINER_ID, 1_000_000, 100 << 20, 0, 0)
+        write_cgroup(cgroup_root, OTHER_ID, 0, 1, 0, 0, pid="1")
+        write_net(proc_root, 1000, 2000)
+        assert collector.collect(now=1000) == 0
+        
+        write_cgroup(cgroup_root, CONTAINER_ID, 6_000_000, 120 << 20, 10_000, 20_000)
+        write_net(proc_root, 11_000, 2000)
+        assert collector.collect(now=1010) == 1
+        
+        timestamps, columns = collector.ring("vm-usage0001").read()
+        assert list(timestamps) == [1010]
+        assert columns["cpu_cores"][0] == pytest.approx(0.5)
+        assert columns["memory_bytes"][0] == 120 << 20
+        assert (columns["io_read_bps"][0], columns["io_write_bps"][0]) == (1000, 2000)
+        assert (columns["net_rx_bps"][0], columns["net_tx_bps"][0]) == (1000, 0)
+        collector.run.assert_called_once()
+    
+    def test_skips_counter_reset_after_restart(self, collector, tmp_path):
+        """컨테이너 재시작으로 카운터가 줄면 그 구간은 기록하지 않음"""
+        cgroup_root = tmp_path / "cgroup"
+        write_cgroup(cgroup_root, CONTAINER_ID, 9_000_000, 1, 0, 0)
+        collector.collect(now=1000)
+        write_cgroup(cgroup_root, CONTAINER_ID, 100, 1, 0, 0)
+        assert collector.collect(now=1010) == 0
+        write_cgroup(cgroup_root, CONTAINER_ID, 200, 1, 0, 0)
+        assert collector.collect(now=1020) == 1
+
+
+class TestUsageQuery:
+    """사용량 조회와 다운샘플링 테스트"""
+    
+    def test_downsamples_window_into_buckets(self, tmp_path):
+        """조회 기간을 구간으로 나눠 평균, 요약은 전체 샘플 기준"""
+        ring = UsageRing(tmp_path / "vm-q.ring", capacity=100)
+        for second in range(0, 60, 10):
+            ring.append(1000 + second, [second, 0, 0, 0, 0, 0])
+        
+        usage = load_usage("vm-q", 60, points=2, now=1060, store_dir=tmp_path)
+        assert usage["samples"] == 5
+        assert [point["cpu_cores"] for point in usage["series"]] == [15, 40]
+        assert usage["summary"]["cpu_cores"]["max"] == 50
+        assert usage["summary"]["cpu_cores"]["avg"] == 30
+    
+    def test_parse_window(self):
+        """조회 기간 문자열 변환"""
+        assert parse_window("15m") == 900
+        assert parse_window("1h") == 3600
+        assert parse_window("1d") == 86400
+        with pytest.raises(ValueError):
+            parse_window("1w")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+테넌트 라우트 리졸버 벤치마크 스크립트
+
+nginx auth_request 서브요청 1건이 백엔드에서 처리되는 경로(순수 ASGI 리졸버)와
+라우트 테이블 조회만의 소요 시간을 테넌트 수별로 측정합니다.
+
+사용법: python scripts/benchmark_tenant_resolver.py [반복 횟수] [테넌트 수]
+"""
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+
+def report(label, durations):
+    durations = sorted(durations)
+    average = sum(durations) / len(durations)
+    p99 = durations[min(len(durations) - 1, int(len(durations) * 0.99))]
+    print(f"  {label:<16} 평균 {average * 1e6:8.2f}µs   p99 {p99 * 1e6:8.2f}µs   ({len(durations)}회)")
+
+
+async def call(resolver, path):
+    """uvicorn이 전달하는 것과 같은 scope로 리졸버 1회 호출"""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await resolver({
+        "type": "http", "method": "GET", "path": path,
+        "headers": [], "client": ("127.0.0.1", 50000)
+    }, receive, send)
+    return messages[0]["status"]
+
+
+async def benchmark(iterations, tenants):
+    """리졸버 벤치마크"""
+    project_root = Path(__file__).parent.parent
+    sys.path.append(str(project_root / "backend"))
+
+    from app.core.middleware import TenantRouteResolverMiddleware
+    from app.services.route_service import get_route_table
+
+    async def not_found(scope, receive, send):
+        raise AssertionError("리졸버 경로가 앱으로 전달됨")
+
+    table = get_route_table()
+    table.load({str(user_id): f"10.0.{user_id // 250}.{user_id % 250}:80" for user_id in range(1, tenants + 1)})
+    resolver = TenantRouteResolverMiddleware(not_found)
+    paths = [f"/internal/routes/{(i * 7919) % tenants + 1}" for i in range(iterations)]
+
+    print(f"🚀 테넌트 라우트 리졸버 벤치마크 (테넌트 {tenants}개)")
+
+    durations = []
+    for path in paths:
+        user_id = path.rsplit("/", 1)[1]
+        started = time.perf_counter()
+        table.cached(user_id)
+        durations.append(time.perf_counter() - started)
+    report("라우트 테이블", durations)
+
+    durations = []
+    for path in paths:
+        started = time.perf_counter()
+        status = await call(resolver, path)
+        durations.append(time.perf_counter() - started)
+        assert status == 200
+    report("ASGI 리졸버", durations)
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+    os.environ.setdefault("PROXY_ROUTING_MODE", "resolver")
+    asyncio.run(benchmark(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    ))
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+업스트림 keepalive 벤치마크 스크립트
+
+nginx 템플릿(user-hosting.conf.j2 + user-upstream.conf.j2)으로 렌더링한 프록시 설정을
+로컬 nginx로 띄우고, 테넌트 대신 응답하는 로컬 HTTP 서버 앞에서 keepalive 없음(이전 방식:
+요청마다 새 연결)과 keepalive 연결 풀의 처리량(req/s), p50/p99 지연, 백엔드 연결 수를 비교합니다.
+
+nginx 실행 파일이 필요합니다 (PATH 또는 NGINX 환경 변수).
+
+사용법: python scripts/benchmark_upstream_keepalive.py [요청 수] [동시 연결 수]
+"""
+import asyncio
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import jinja2
+
+PROJECT_ROOT = Path(__file__).parent.parent
+USER_ID = "1"
+RESPONSE_BODY = b"<html><body>tenant</body></html>"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def report(label, durations, elapsed, connections):
+    durations = sorted(durations)
+    p50 = durations[len(durations) // 2]
+    p99 = durations[min(len(durations) - 1, int(len(durations) * 0.99))]
+    print(
+        f"  {label:<14} {len(durations) / elapsed:9.0f} req/s   p50 {p50 * 1e3:7.2f}ms   "
+        f"p99 {p99 * 1e3:7.2f}ms   백엔드 연결 {connections}개"
+    )
+
+
+class StandInBackend:
+    """테넌트 컨테이너 대역 (HTTP/1.1 keep-alive 지원, 받은 TCP 연결 수 집계)"""
+    
+    def __init__(self):
+        self.connections = 0
+    
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                close = b"connection: close" in head.lower()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n"
+                    b"Content-Length: " + str(len(RESPONSE_BODY)).encode() + b"\r\n"
+                    + (b"Connection: close\r\n" if close else b"") + b"\r\n" + RESPONSE_BODY
+                )
+                await writer.drain()
+                if close:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def write_nginx_config(prefix, listen_port, backend_port, keepalive):
+    """템플릿으로 사용자 설정을 렌더링해 최소 nginx.conf에 포함"""
+    templates = PROJECT_ROOT / "nginx" / "templates"
+    values = dict(
+        user_id=USER_ID, vm_id="vm-bench", vm_ip="127.0.0.1", web_port=backend_port, ssh_port=10000,
+        keepalive=keepalive, keepalive_requests=1000, keepalive_timeout=60,
+        enable_logging=False, security_headers=False
+    )
+    for name, target in (("user-hosting.conf.j2", "hosting.conf"), ("user-upstream.conf.j2", "upstream.conf")):
+        template = jinja2.Template((templates / name).read_text())
+        (prefix / target).write_text(template.render(**values))
+    
+    # 운영 설정의 include 경로만 임시 디렉토리로 바꿔 같은 map/upstream 구성을 사용
+    common = (PROJECT_ROOT / "nginx" / "sites-available" / "tenant-upstreams.conf").read_text()
+    common = common.replace("/etc/nginx/sites-available/hosting-upstreams/*.conf", str(prefix / "upstream.conf"))
+    (prefix / "tenant-upstreams.conf").write_text(common)
+    
+    (prefix / "nginx.conf").write_text(f"""
+worker_processes 1;
+daemon off;
+error_log {prefix}/error.log warn;
+pid {prefix}/nginx.pid;
+events {{ worker_connections 4096; }}
+http {{
+    access_log off;
+    client_body_temp_path {prefix}/body;
+    proxy_temp_path {prefix}/proxy;
+    fastcgi_temp_path {prefix}/fastcgi;
+    uwsgi_temp_path {prefix}/uwsgi;
+    scgi_temp_path {prefix}/scgi;
+    include {prefix}/tenant-upstreams.conf;
+    server {{
+        listen 127.0.0.1:{listen_port};
+        include {prefix}/hosting.conf;
+    }}
+}}
+""")
+
+
+async def client(port, count, durations):
+    """keep-alive 클라이언트 연결 하나로 count번 요청"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    request = f"GET /{USER_ID}/ HTTP/1.1\r\nHost: localhost\r\n\r\n".encode()
+    try:
+        for _ in range(count):
+            started = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = next(
+                int(line.split(b":", 1)[1]) for line in head.split(b"\r\n")
+                if line.lower().startswith(b"content-length:")
+            )
+            await reader.readexactly(length)
+            durations.append(time.perf_counter() - started)
+            assert head.startswith(b"HTTP/1.1 200"), head.split(b"\r\n", 1)[0]
+    finally:
+        writer.close()
+
+
+async def run_case(nginx, label, keepalive, requests, concurrency):
+    backend = StandInBackend()
+    server = await asyncio.start_server(backend.handle, "127.0.0.1", 0)
+    backend_port = server.sockets[0].getsockname()[1]
+    listen_port = free_port()
+    
+    with tempfile.TemporaryDirectory(prefix="keepalive-bench-") as temp_dir:
+        prefix = Path(temp_dir)
+        write_nginx_config(prefix, listen_port, backend_port, keepalive)
+        process = subprocess.Popen([nginx, "-p", str(prefix), "-c", str(prefix / "nginx.conf")])
+        try:
+            for _ in range(50):
+                try:
+                    _, probe = await asyncio.open_connection("127.0.0.1", listen_port)
+                    probe.close()
+                    break
+                except OSError:
+                    await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError((prefix / "error.log").read_text())
+            
+            # 워밍업 후 연결 수를 다시 셈
+            await client(listen_port, 10, [])
+            backend.connections = 0
+            
+            durations = []
+            started = time.perf_counter()
+            await asyncio.gather(*(
+                client(listen_port, requests // concurrency, durations) for _ in range(concurrency)
+            ))
+            report(label, durations, time.perf_counter() - started, backend.connections)
+        finally:
+            process.terminate()
+            process.wait()
+            server.close()
+            await server.wait_closed()
+
+
+async def benchmark(requests, concurrency):
+    nginx = os.environ.get("NGINX") or shutil.which("nginx")
+    if not nginx:
+        print("❌ nginx 실행 파일을 찾을 수 없습니다 (NGINX 환경 변수로 지정)")
+        sys.exit(1)
+    
+    print(f"🚀 업스트림 keepalive 벤치마크 (요청 {requests}개, 동시 연결 {concurrency}개)")
+    await run_case(nginx, "keepalive 없음", 0, requests, concurrency)
+    await run_case(nginx, "keepalive 16", 16, requests, concurrency)
+
+
+if __name__ == "__main__":
+    asyncio.run(benchmark(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    ))
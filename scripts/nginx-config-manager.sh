@@ -17,6 +17,11 @@ NGINX_DIR="/etc/nginx"
 PROJECT_NGINX_DIR="$(dirname "$0")/../nginx"
 HOSTING_DIR="$NGINX_DIR/sites-available/hosting"
 TEMPLATE_FILE="$PROJECT_NGINX_DIR/templates/user-hosting.conf.j2"
+STATIC_TEMPLATE_FILE="$PROJECT_NGINX_DIR/templates/user-static.conf.j2"
+UPSTREAM_TEMPLATE_FILE="$PROJECT_NGINX_DIR/templates/user-upstream.conf.j2"
+UPSTREAM_DIR="$NGINX_DIR/sites-available/hosting-upstreams"
+RESOLVER_TEMPLATE="$PROJECT_NGINX_DIR/templates/tenant-resolver.conf"
+RESOLVER_CONFIG="$HOSTING_DIR/_tenant-resolver.conf"
 LOG_DIR="/var/log/nginx"
 
 # 로깅 함수
@@ -47,6 +52,8 @@ Nginx 설정 관리 스크립트 (리팩토링 버전)
 명령어:
   init                    Nginx 설정 디렉토리 초기화
   add-user <user_id>      사용자 호스팅 설정 추가
+  add-static-user <user_id>
+                          정적 호스팅 설정 추가 (웹 디렉토리 직접 서빙, 컨테이너 없음)
   remove-user <user_id>   사용자 호스팅 설정 제거
   update-user <user_id>   사용자 호스팅 설정 업데이트
   list-users              등록된 사용자 목록 출력
@@ -55,19 +62,31 @@ Nginx 설정 관리 스크립트 (리팩토링 버전)
   status                  Nginx 상태 확인
   cleanup                 중복/불필요한 설정 파일 정리
   migrate                 기존 설정을 새 구조로 마이그레이션
+  enable-resolver         auth_request 리졸버 라우팅 설치 (PROXY_ROUTING_MODE=resolver)
+  disable-resolver        리졸버 라우팅 제거 (사용자별 설정 파일 방식)
 
 옵션:
   --vm-id <vm_id>         VM ID 지정
   --vm-ip <vm_ip>         VM IP 주소 지정 (기본값: 127.0.0.1)
   --web-port <port>       웹 포트 지정
   --ssh-port <port>       SSH 포트 지정
+  --web-dir <path>        정적 호스팅 웹 디렉토리 지정
+  --microcache <seconds>  HTML 마이크로캐시 시간 (0-5초, 기본값: 0 = 사용 안 함)
+  --keepalive <n>         워커별 업스트림 유휴 연결 수 (기본값: 16, 0이면 연결 재사용 안 함)
+  --keepalive-requests <n>
+                          업스트림 연결 하나로 보낼 최대 요청 수 (기본값: 1000)
+  --keepalive-timeout <s> 업스트림 유휴 연결 유지 시간 (기본값: 60)
   --dry-run               실제 작업 없이 미리보기만 실행
   --force                 강제 실행 (확인 없이)
   --backup                백업 생성 후 작업
 
+환경 변수:
+  VM_IMAGE_PATH           enable-resolver 시 정적 호스팅 웹 루트 (백엔드 설정과 동일, 기본값: /var/lib/libvirt/images)
+
 예시:
   $(basename "$0") init
   $(basename "$0") add-user 7 --vm-id vm-abc123 --vm-ip 192.168.122.100 --web-port 8007 --ssh-port 10007
+  $(basename "$0") add-static-user 8 --vm-id vm-def456 --web-dir /opt/vm-images/containers/vm-def456/www
   $(basename "$0") remove-user 7
   $(basename "$0") cleanup --backup
   $(basename "$0") migrate
@@ -82,13 +101,18 @@ VM_ID=""
 VM_IP="127.0.0.1"
 WEB_PORT=""
 SSH_PORT=""
+WEB_DIR=""
+MICROCACHE=0
+KEEPALIVE=16
+KEEPALIVE_REQUESTS=1000
+KEEPALIVE_TIMEOUT=60
 DRY_RUN=false
 FORCE=false
 BACKUP=false
 
 while [[ $# -gt 0 ]]; do
     case $1 in
-        init|add-user|remove-user|update-user|list-users|validate|reload|status|cleanup|migrate)
+        init|add-user|add-static-user|remove-user|update-user|list-users|validate|reload|status|cleanup|migrate|enable-resolver|disable-resolver)
             COMMAND="$1"
             shift
             ;;
@@ -108,6 +132,26 @@ while [[ $# -gt 0 ]]; do
             SSH_PORT="$2"
             shift 2
             ;;
+        --web-dir)
+            WEB_DIR="$2"
+            shift 2
+            ;;
+        --microcache)
+            MICROCACHE="$2"
+            shift 2
+            ;;
+        --keepalive)
+            KEEPALIVE="$2"
+            shift 2
+            ;;
+        --keepalive-requests)
+            KEEPALIVE_REQUESTS="$2"
+            shift 2
+            ;;
+        --keepalive-timeout)
+            KEEPALIVE_TIMEOUT="$2"
+            shift 2
+            ;;
         --dry-run)
             DRY_RUN=true
             shift
@@ -175,6 +219,7 @@ init_nginx_config() {
     # 디렉토리 생성
     mkdir -p "$NGINX_DIR/conf.d"
     mkdir -p "$NGINX_DIR/sites-available/hosting"
+    mkdir -p "$UPSTREAM_DIR"
     mkdir -p "$LOG_DIR"
     
     # 기본 설정 파일 복사
@@ -187,6 +232,15 @@ init_nginx_config() {
     log_success "Nginx 설정 초기화 완료"
 }
 
+# 테넌트 업스트림 공통 설정 설치 ($connection_upgrade map + hosting-upstreams include)
+ensure_upstream_config() {
+    mkdir -p "$UPSTREAM_DIR" /var/cache/nginx/tenant-content
+    if ! cmp -s "$PROJECT_NGINX_DIR/sites-available/tenant-upstreams.conf" "$NGINX_DIR/sites-available/tenant-upstreams.conf"; then
+        cp "$PROJECT_NGINX_DIR/sites-available/tenant-upstreams.conf" "$NGINX_DIR/sites-available/"
+        log_info "테넌트 업스트림 공통 설정 설치 완료"
+    fi
+}
+
 # 사용자 호스팅 설정 추가
 add_user_config() {
     local user_id="$1"
@@ -203,6 +257,7 @@ add_user_config() {
     fi
     
     local config_file="$HOSTING_DIR/${user_id}.conf"
+    local upstream_file="$UPSTREAM_DIR/${user_id}.conf"
     local main_config_file="$NGINX_DIR/sites-available/main.conf"
     
     # 기존 설정 확인
@@ -219,29 +274,34 @@ add_user_config() {
             log_warning "컨테이너 연결 테스트 실패: $VM_IP:$WEB_PORT, 계속 진행..."
         fi
         
-        # 템플릿을 사용하여 설정 파일 생성
+        ensure_upstream_config
+        
+        # 템플릿을 사용하여 설정 파일 생성 (location은 hosting/, upstream은 http 컨텍스트인 hosting-upstreams/)
         python3 -c "
 import jinja2
 from datetime import datetime
 
-template_str = open('$TEMPLATE_FILE').read()
-template = jinja2.Template(template_str)
-
-config = template.render(
+values = dict(
     user_id='$user_id',
     vm_id='$VM_ID',
     vm_ip='$VM_IP',
     web_port='$WEB_PORT',
     ssh_port='$SSH_PORT',
+    microcache_seconds='$MICROCACHE',
+    keepalive='$KEEPALIVE',
+    keepalive_requests='$KEEPALIVE_REQUESTS',
+    keepalive_timeout='$KEEPALIVE_TIMEOUT',
     creation_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 )
 
-with open('$config_file', 'w') as f:
-    f.write(config)
+for template_file, target in (('$TEMPLATE_FILE', '$config_file'), ('$UPSTREAM_TEMPLATE_FILE', '$upstream_file')):
+    template = jinja2.Template(open(template_file).read())
+    with open(target, 'w') as f:
+        f.write(template.render(**values))
 "
         
         # 권한 설정
-        chmod 644 "$config_file"
+        chmod 644 "$config_file" "$upstream_file"
         
         # main.conf에 include 추가 (중복 체크)
         if ! grep -q "include $HOSTING_DIR/\*.conf;" "$main_config_file" 2>/dev/null; then
@@ -283,6 +343,75 @@ with open('$config_file', 'w') as f:
     fi
 }
 
+# 정적 호스팅 설정 추가 (프록시 없이 웹 디렉토리를 alias로 서빙)
+add_static_user_config() {
+    local user_id="$1"
+    
+    if [[ -z "$user_id" ]]; then
+        log_error "사용자 ID가 필요합니다"
+        return 1
+    fi
+    
+    if [[ -z "$VM_ID" || -z "$WEB_DIR" ]]; then
+        log_error "VM ID와 웹 디렉토리가 모두 필요합니다"
+        return 1
+    fi
+    
+    if [[ ! -d "$WEB_DIR" ]]; then
+        log_error "웹 디렉토리가 없습니다: $WEB_DIR"
+        return 1
+    fi
+    
+    local config_file="$HOSTING_DIR/${user_id}.conf"
+    
+    if [[ -f "$config_file" && "$FORCE" != true ]]; then
+        log_warning "사용자 $user_id의 설정이 이미 존재합니다. --force 옵션을 사용하세요."
+        return 1
+    fi
+    
+    log_info "사용자 $user_id 정적 호스팅 설정 생성 중... (웹 디렉토리: $WEB_DIR)"
+    
+    if [[ "$DRY_RUN" == false ]]; then
+        python3 -c "
+import jinja2
+from datetime import datetime
+
+template = jinja2.Template(open('$STATIC_TEMPLATE_FILE').read())
+
+config = template.render(
+    user_id='$user_id',
+    vm_id='$VM_ID',
+    web_dir='${WEB_DIR%/}',
+    creation_time=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+)
+
+with open('$config_file', 'w') as f:
+    f.write(config)
+"
+        
+        chmod 644 "$config_file"
+        
+        # 컨테이너 플랜에서 바뀐 경우 남은 업스트림 제거
+        rm -f "$UPSTREAM_DIR/${user_id}.conf"
+        
+        if validate_config; then
+            log_success "사용자 $user_id 정적 호스팅 설정 생성 및 검증 완료: $config_file"
+            if systemctl reload nginx 2>/dev/null; then
+                log_success "nginx 리로드 완료"
+            else
+                log_error "nginx 리로드 실패"
+                return 1
+            fi
+        else
+            log_error "nginx 설정 검증 실패"
+            rm -f "$config_file"
+            return 1
+        fi
+    else
+        log_info "[DRY RUN] 사용자 $user_id 정적 호스팅 설정 파일이 생성될 예정: $config_file"
+    fi
+}
+
 # 컨테이너 연결 테스트
 test_container_connection() {
     local vm_ip="$1"
@@ -352,10 +481,11 @@ auto_fix_config() {
         if [[ -n "$actual_ip" && "$actual_ip" != "$vm_ip" ]]; then
             log_info "실제 컨테이너 IP 발견: $actual_ip (기존: $vm_ip)"
             
-            # 설정 파일에서 IP 주소 수정
-            local config_file="$HOSTING_DIR/${user_id}.conf"
+            # 업스트림 설정 파일에서 IP 주소 수정
+            local config_file="$UPSTREAM_DIR/${user_id}.conf"
             if [[ -f "$config_file" ]]; then
-                sed -i "s|proxy_pass http://$vm_ip:|proxy_pass http://$actual_ip:|g" "$config_file"
+                sed -i "s|server $vm_ip:|server $actual_ip:|g" "$config_file"
+                sed -i "s|업스트림 서버: $vm_ip:|업스트림 서버: $actual_ip:|g" "$HOSTING_DIR/${user_id}.conf"
                 log_info "설정 파일 IP 주소 수정: $vm_ip -> $actual_ip"
                 
                 # nginx 리로드
@@ -397,7 +527,9 @@ remove_user_config() {
     
     if [[ "$DRY_RUN" == false ]]; then
         rm -f "$config_file"
-        rm -f "$LOG_DIR/hosting_${user_id}.access.log" 2>/dev/null || true
+        rm -f "$UPSTREAM_DIR/${user_id}.conf"
+        # 이전 방식의 테넌트별 로그 파일 정리 (현재는 공유 tenants.access.log 사용)
+        rm -f "$LOG_DIR/hosting_${user_id}".{access,error}.log 2>/dev/null || true
         
         log_success "사용자 $user_id 설정 제거 완료"
     else
@@ -405,6 +537,40 @@ remove_user_config() {
     fi
 }
 
+# 리졸버 라우팅 설치 (테넌트 추가/삭제 시 리로드 불필요)
+enable_resolver() {
+    log_info "테넌트 라우트 리졸버 설치 중..."
+    
+    if [[ "$DRY_RUN" == false ]]; then
+        mkdir -p "$HOSTING_DIR" /var/cache/nginx/tenant-routes /var/cache/nginx/tenant-content
+        # 정적 호스팅 웹 루트는 백엔드 VM_IMAGE_PATH를 따름
+        sed "s|root /var/lib/libvirt/images/containers;|root ${VM_IMAGE_PATH:-/var/lib/libvirt/images}/containers;|" \
+            "$PROJECT_NGINX_DIR/sites-available/tenant-routes.conf" > "$NGINX_DIR/sites-available/tenant-routes.conf"
+        cp "$RESOLVER_TEMPLATE" "$RESOLVER_CONFIG"
+        ensure_upstream_config
+        
+        # 리졸버가 사용자 ID 경로를 모두 처리하므로 사용자별 설정 파일은 제거
+        find "$HOSTING_DIR" "$UPSTREAM_DIR" -maxdepth 1 -name '[0-9]*.conf' -delete
+        reload_nginx
+        log_success "리졸버 라우팅 설치 완료"
+    else
+        log_info "[DRY RUN] 다음 파일이 설치될 예정: $RESOLVER_CONFIG"
+    fi
+}
+
+# 리졸버 라우팅 제거
+disable_resolver() {
+    log_info "테넌트 라우트 리졸버 제거 중..."
+    
+    if [[ "$DRY_RUN" == false ]]; then
+        rm -f "$RESOLVER_CONFIG"
+        reload_nginx
+        log_success "리졸버 라우팅 제거 완료 (사용자별 설정 파일을 다시 생성하세요)"
+    else
+        log_info "[DRY RUN] 다음 파일이 제거될 예정: $RESOLVER_CONFIG"
+    fi
+}
+
 # 등록된 사용자 목록
 list_users() {
     log_info "등록된 호스팅 사용자 목록:"
@@ -414,6 +580,7 @@ list_users() {
         for config_file in "$HOSTING_DIR"/*.conf; do
             if [[ -f "$config_file" ]]; then
                 local user_id=$(basename "$config_file" .conf)
+                [[ "$user_id" =~ ^[0-9]+$ ]] || continue
                 local vm_id=$(grep "# VM ID:" "$config_file" 2>/dev/null | cut -d: -f2 | xargs || echo "N/A")
                 echo "  • 사용자 ID: $user_id (VM: $vm_id)"
                 ((count++))
@@ -570,6 +737,9 @@ main() {
         add-user)
             add_user_config "$USER_ID"
             ;;
+        add-static-user)
+            add_static_user_config "$USER_ID"
+            ;;
         remove-user)
             remove_user_config "$USER_ID"
             ;;
@@ -595,6 +765,12 @@ main() {
         migrate)
             migrate_configs
             ;;
+        enable-resolver)
+            enable_resolver
+            ;;
+        disable-resolver)
+            disable_resolver
+            ;;
         *)
             log_error "알 수 없는 명령어: $COMMAND"
             print_help
@@ -0,0 +1,36 @@
+#!/bin/bash
+echo "🚀 SSH 게이트웨이 시작 중..."
+
+# 디렉토리 이동
+cd backend || {
+    echo "❌ 백엔드 디렉토리로 이동 실패"
+    exit 1
+}
+
+# 가상환경 활성화
+if [ -f "venv/bin/activate" ]; then
+    source venv/bin/activate
+    echo "✅ 가상환경 활성화 완료"
+else
+    echo "❌ 가상환경을 찾을 수 없습니다"
+    exit 1
+fi
+
+# 환경변수 로딩
+if [ -f ".env" ]; then
+    export $(grep -v '^#' .env | grep -v '^$' | xargs)
+    echo "✅ 환경변수 로딩 완료"
+else
+    echo "❌ .env 파일을 찾을 수 없습니다"
+    exit 1
+fi
+
+# asyncssh 확인 (선택 의존성)
+python -c "import asyncssh" 2>/dev/null || {
+    echo "❌ asyncssh가 설치되지 않았습니다 (pip install asyncssh)"
+    exit 1
+}
+
+# 게이트웨이 시작 (모든 테넌트 SSH 접속을 SSH_GATEWAY_PORT 하나로 받음)
+echo "🔄 SSH 게이트웨이 시작 중..."
+python -m app.services.ssh_gateway_service
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+libvirt 도메인 MAC/UUID 일괄 검증 스크립트
+
+DB에 저장된 호스팅별 MAC 주소/도메인 UUID와 실제 도메인 정의(virsh dumpxml)를
+대조합니다. 불일치나 중복이 있으면 종료 코드 1을 반환합니다.
+
+사용법:
+    python scripts/verify_domain_identities.py              # virsh로 전체 도메인 조회
+    python scripts/verify_domain_identities.py --xml-dir DIR  # <도메인>.xml 파일 사용
+"""
+import sys
+import json
+import argparse
+import subprocess
+from pathlib import Path
+
+
+def load_from_virsh(uri):
+    """virsh list/dumpxml로 전체 도메인 XML 수집"""
+    base = ["virsh", "-c", uri] if uri else ["virsh"]
+    names = subprocess.run(base + ["list", "--all", "--name"], capture_output=True, text=True, check=True).stdout.split()
+    return {
+        name: subprocess.run(base + ["dumpxml", name], capture_output=True, text=True, check=True).stdout
+        for name in names
+    }
+
+
+def load_from_dir(xml_dir):
+    """디렉토리의 <도메인>.xml 파일 수집"""
+    return {path.stem: path.read_text(encoding="utf-8") for path in sorted(Path(xml_dir).glob("*.xml"))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="libvirt 도메인 MAC/UUID 검증")
+    parser.add_argument("--xml-dir", help="virsh dumpxml 결과가 저장된 디렉토리")
+    parser.add_argument("--uri", help="libvirt 연결 URI (기본값: LIBVIRT_URI 설정)")
+    args = parser.parse_args()
+    
+    project_root = Path(__file__).parent.parent
+    sys.path.append(str(project_root / "backend"))
+    
+    from app.core.config import settings
+    from app.db.session import SessionLocal
+    from app.services.domain_identity_service import DomainIdentityAllocator
+    
+    domain_xmls = load_from_dir(args.xml_dir) if args.xml_dir else load_from_virsh(args.uri or settings.LIBVIRT_URI)
+    
+    db = SessionLocal()
+    try:
+        report = DomainIdentityAllocator(db).verify(domain_xmls)
+    finally:
+        db.close()
+    
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    
+    problems = report["mismatched"] or report["duplicate_macs"] or report["duplicate_uuids"] or report["invalid_xml"]
+    print(f"\n📋 도메인 {report['checked']}개 중 {report['ok']}개 일치", file=sys.stderr)
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()